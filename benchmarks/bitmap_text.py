@@ -0,0 +1,70 @@
+"""Compare the per-frame cost of 200 texts that change every frame, drawn as labels and as bitmap texts.
+
+Pyglet runs headless, so no display is needed, only an OpenGL driver with EGL. Run from the repository root:
+
+..  code-block::
+
+    PYTHONPATH=src python benchmarks/bitmap_text.py
+"""
+
+import time
+from pathlib import Path
+
+import pyglet
+
+pyglet.options['headless'] = True
+
+from kizuna.backends.pyglet import PygletBackend  # noqa: E402
+from kizuna.config import settings  # noqa: E402
+from kizuna.core.assets import DEFAULT_FONT_ASSET, BitmapFontAsset  # noqa: E402
+from kizuna.rendering import BitmapTextDrawable, DrawBatch, TextDrawable  # noqa: E402
+
+
+TEXT_COUNT = 200
+WARMUP_FRAMES = 30
+FRAMES = 300
+
+
+def measure(create_text, frames: int = FRAMES) -> float:
+    """Measure the mean time of a frame that changes every text, prepares it and draws the batch.
+
+    :param create_text: The function creating a text drawable from its text and position.
+    :param frames: The number of frames measured.
+    :return: The mean time of a frame, in seconds.
+    """
+    backend = settings.backend
+    batch = DrawBatch()
+    texts = [create_text('Score: 000000', (10 + 120 * (i % 5), 10 + 11 * (i // 5))) for i in range(TEXT_COUNT)]
+    start = 0.0
+    for frame in range(WARMUP_FRAMES + frames):
+        if frame == WARMUP_FRAMES:
+            pyglet.gl.glFinish()
+            start = time.perf_counter()
+        for i, text in enumerate(texts):
+            text.text = f'Score: {frame * 7 + i:06d}'
+            text.on_prepare_draw(batch)
+        backend.draw_batch(batch)
+    pyglet.gl.glFinish()
+    elapsed = time.perf_counter() - start
+    for text in texts:
+        text.on_destroy()
+    return elapsed / frames
+
+
+def main():
+    backend = PygletBackend(settings)
+    settings._backend = backend
+    backend.initialize(Path.cwd(), False)
+    backend.window = pyglet.window.Window(640, 480, visible=False)
+    bitmap_font = BitmapFontAsset(DEFAULT_FONT_ASSET)
+
+    label_time = measure(lambda text, position: TextDrawable(text, position, DEFAULT_FONT_ASSET))
+    bitmap_time = measure(lambda text, position: BitmapTextDrawable(text, position, bitmap_font))
+    print(f'{TEXT_COUNT} changing texts, mean of {FRAMES} frames:')
+    print(f'  pyglet.text.Label:  {label_time * 1000:.2f} ms per frame')
+    print(f'  BitmapTextDrawable: {bitmap_time * 1000:.2f} ms per frame ({label_time / bitmap_time:.1f}x faster)')
+    backend.window.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,2 +1,5 @@
 from .base import *
+from .capture import *
 from .pyglet import *
+from .snapshot import *
+from .software import *
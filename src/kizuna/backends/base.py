@@ -1,20 +1,173 @@
+import time
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Callable, Sequence
+
+import numpy
 
 from kizuna.core.controllers import Controller
 
 if TYPE_CHECKING:
-    from kizuna.core.assets import ImageAsset, FontAsset
+    from kizuna.backends.capture import FrameCapture
+    from kizuna.core.assets import ImageAsset, FontAsset, BitmapFontAsset
+    from kizuna.core.datatypes import IVector2, Vector2, Vector2Like
     from kizuna.config import Settings
-    from kizuna.rendering import DrawBatch, TextDrawable, SpriteDrawable
+    from kizuna.rendering import (
+        DrawBatch, TextDrawable, BitmapTextDrawable, SpriteDrawable, TileChunkDrawable, ParticlesDrawable,
+    )
+
+
+def to_vector_list(positions: Sequence['Vector2Like'] | numpy.ndarray) -> list['Vector2']:
+    """Convert positions given in bulk to vectors.
+
+    :param positions: Anything convertible to vectors, or an array of shape ``(n, 2)``.
+    :return: The positions as vectors.
+    """
+    from kizuna.core.datatypes import Vector2, validate_vector2
+
+    if isinstance(positions, numpy.ndarray):
+        return [Vector2(x, y) for x, y in positions.tolist()]
+    return [validate_vector2(position) for position in positions]
+
+
+class ResourceUsage:
+    """Live count and estimated memory footprint of one type of backend resource.
+
+    Estimates are approximations computed by the backend from the size of the resources it holds. They are meant to
+    spot regressions (e.g. resources that are never released), not to measure exact memory usage.
+    """
+    __slots__ = ('count', 'estimated_bytes')
+
+    def __init__(self, count: int = 0, estimated_bytes: int = 0):
+        """Create a resource usage record.
+
+        :param count: The number of live resources.
+        :param estimated_bytes: The estimated number of bytes used by those resources.
+        """
+        self.count = count
+        self.estimated_bytes = estimated_bytes
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'ResourceUsage(count={self.count}, estimated_bytes={self.estimated_bytes})'
+
+
+class BackendStatistics:
+    """Counters of the work done by a backend in each frame, and a rolling history of them.
+
+    Backends increment the counters of the current frame as they work, and :meth:`end_frame` is called after each
+    frame is drawn to record them. Counting is a plain integer addition, so statistics are always collected.
+
+    Counters that a backend cannot observe stay at zero.
+
+    :ivar batch_draws: The number of draw calls of whole batches. Batches drawn together count as one.
+    :ivar batch_merges: The number of times the drawables of batches drawn together were moved to share a batch.
+    :ivar static_batch_renders: The number of times a static batch was rendered to its texture.
+    :ivar sprites_created: The number of sprites created.
+    :ivar sprites_updated: The number of sprites moved, rotated or shown or hidden.
+    :ivar sprites_deleted: The number of sprites deleted.
+    :ivar labels_created: The number of text labels created.
+    :ivar labels_updated: The number of text labels changed, which lays out their text again.
+    :ivar labels_deleted: The number of text labels deleted.
+    :ivar vertex_lists_created: The number of vertex lists created for meshes, such as tile chunks and bitmap texts.
+    :ivar vertex_list_updates: The number of writes to the vertices of existing meshes.
+    :ivar vertex_lists_deleted: The number of vertex lists of meshes deleted.
+    :ivar textures_loaded: The number of textures loaded.
+    :ivar texture_bytes_loaded: The estimated size of the textures loaded.
+    :ivar frames_captured: The number of frames handed over to the frame capture.
+    :ivar frames_dropped: The number of frames dropped by the frame capture because its encoder fell behind.
+    :ivar capture_microseconds: The time spent in the game loop reading back and handing over frames to capture.
+    """
+    counter_names = (
+        'batch_draws', 'batch_merges', 'static_batch_renders', 'sprites_created', 'sprites_updated', 'sprites_deleted',
+        'labels_created', 'labels_updated', 'labels_deleted', 'vertex_lists_created', 'vertex_list_updates',
+        'vertex_lists_deleted', 'textures_loaded', 'texture_bytes_loaded', 'frames_captured', 'frames_dropped',
+        'capture_microseconds',
+    )
+
+    def __init__(self, history_size: int = 600):
+        """Create the statistics.
+
+        :param history_size: The number of frames kept in the history.
+        """
+        self.history_size = history_size
+        self._history = numpy.zeros((history_size, len(self.counter_names)), dtype=numpy.int64)
+        self._frame_count = 0
+        self._reset_counters()
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'BackendStatistics(frames={self._frame_count}, history_size={self.history_size})'
+
+    @property
+    def frame_count(self) -> int:
+        """Get the number of frames recorded since the statistics were created.
+        """
+        return self._frame_count
+
+    def end_frame(self):
+        """Record the counters of the current frame in the history, and start counting the next frame.
+        """
+        self._history[self._frame_count % self.history_size] = [getattr(self, name) for name in self.counter_names]
+        self._frame_count += 1
+        self._reset_counters()
+
+    def get_last_frame(self) -> dict[str, int]:
+        """Get the counters of the last recorded frame.
+
+        :return: The counters by name, all zero if no frame has been recorded.
+        """
+        if self._frame_count == 0:
+            return dict.fromkeys(self.counter_names, 0)
+        row = self._history[(self._frame_count - 1) % self.history_size]
+        return dict(zip(self.counter_names, row.tolist()))
+
+    def get_history(self) -> dict[str, numpy.ndarray]:
+        """Get the counters of the recorded frames still in the history.
+
+        :return: For each counter name, an array with its value in each frame, from the oldest to the latest.
+        """
+        rows = self._get_history_rows()
+        return {name: rows[:, i] for i, name in enumerate(self.counter_names)}
+
+    def save_csv(self, path: str | Path):
+        """Write the history to a CSV file, with the frame number in the first column.
+
+        :param path: The path of the file.
+        """
+        rows = self._get_history_rows()
+        frames = numpy.arange(self._frame_count - len(rows), self._frame_count)
+        numpy.savetxt(
+            path, numpy.column_stack([frames, rows]), fmt='%d', delimiter=',',
+            header=','.join(('frame', *self.counter_names)), comments='',
+        )
+
+    def _get_history_rows(self) -> numpy.ndarray:
+        if self._frame_count <= self.history_size:
+            return self._history[:self._frame_count].copy()
+        return numpy.roll(self._history, -(self._frame_count % self.history_size), axis=0)
+
+    def _reset_counters(self):
+        for name in self.counter_names:
+            setattr(self, name, 0)
 
 
 class Backend:
+    """Implementation of the windowing, asset loading and drawing used by Kizuna.
+
+    :ivar statistics: Counters of the work done by the backend in each frame.
+    :ivar capture: The frame capture the drawn frames are handed over to, if any.
+    """
 
     # ---- KIZUNA LIFECYCLE METHODS ----
 
     def __init__(self, settings: 'Settings'):
         self.settings = settings
+        self.statistics = BackendStatistics()
+        self.capture: 'FrameCapture | None' = None
 
     def initialize(self, base_directory: Path, standalone: bool):
         raise NotImplementedError()
@@ -35,23 +188,174 @@ class Backend:
     def load_font_asset(self, asset: 'FontAsset'):
         raise NotImplementedError()
 
+    def load_bitmap_font_asset(self, asset: 'BitmapFontAsset'):
+        """Load the image of a bitmap font, and set its metrics with :meth:`BitmapFontAsset.set_glyphs`.
+
+        :param asset: The bitmap font. If it is generated from a font asset, that asset is already loaded.
+        """
+        raise NotImplementedError()
+
+    def get_image_size(self, asset: 'ImageAsset') -> 'IVector2':
+        raise NotImplementedError()
+
+    def measure_text(self, text: str, font: 'FontAsset') -> 'Vector2':
+        """Get the size of a line of text drawn with a font.
+
+        This implementation estimates the size from the font size. Backends that can measure text should override it.
+
+        :param text: The text.
+        :param font: The font, which must be loaded.
+        :return: The width of the text and the height of the line.
+        """
+        from kizuna.core.datatypes import Vector2
+
+        return Vector2(0.6 * font.size * len(text), 1.25 * font.size)
+
     # ---- PRE-DRAWING METHODS ----
 
     def prepare_draw_text(self, drawable: 'TextDrawable', batch: 'DrawBatch'):
         raise NotImplementedError()
 
+    def prepare_draw_bitmap_text(self, drawable: 'BitmapTextDrawable', batch: 'DrawBatch'):
+        raise NotImplementedError()
+
     def prepare_draw_sprite(self, drawable: 'SpriteDrawable', batch: 'DrawBatch'):
         raise NotImplementedError()
 
+    def prepare_draw_sprites(
+        self,
+        drawables: Sequence['SpriteDrawable'],
+        positions: Sequence['Vector2Like'] | numpy.ndarray,
+        rotations: Sequence[float] | numpy.ndarray,
+        batch: 'DrawBatch',
+    ):
+        """Move and rotate many sprites, and prepare them to be drawn as part of a batch.
+
+        This is equivalent to setting the position and rotation of each drawable and calling
+        :meth:`prepare_draw_sprite` on it, which is what this implementation does. Backends should override it to
+        avoid the overhead of a call per sprite.
+
+        :param drawables: The sprites.
+        :param positions: The position of each sprite, as vectors or as an array of shape ``(n, 2)``.
+        :param rotations: The rotation of each sprite, counterclockwise in degrees.
+        :param batch: The :class:`DrawBatch` that will be drawn to.
+        """
+        for drawable, position, rotation in zip(drawables, to_vector_list(positions), rotations):
+            drawable.position = position
+            drawable.rotation = float(rotation)
+            self.prepare_draw_sprite(drawable, batch)
+
+    def prepare_draw_tile_chunk(self, drawable: 'TileChunkDrawable', batch: 'DrawBatch'):
+        raise NotImplementedError()
+
+    def prepare_draw_particles(self, drawable: 'ParticlesDrawable', batch: 'DrawBatch'):
+        raise NotImplementedError()
+
     # ---- DRAWING METHODS ----
 
+    def set_view_offset(self, offset: 'Vector2'):
+        """Set the position of the world that is drawn at the bottom-left corner of the window.
+
+        :param offset: The offset applied to everything drawn afterward.
+        """
+        raise NotImplementedError()
+
     def draw_batch(self, batch: 'DrawBatch'):
         raise NotImplementedError()
 
+    def draw_batches(self, batches: Sequence['DrawBatch']):
+        """Draw several batches, in the order given.
+
+        This is equivalent to calling :meth:`draw_batch` on each batch, which is what this implementation does.
+        Backends should override it to draw the batches with fewer draw calls and state changes. Batches drawn
+        together every frame should not also be drawn on their own, since backends may have to reorganize them.
+
+        :param batches: The batches, from the first to the last drawn.
+        """
+        for batch in batches:
+            self.draw_batch(batch)
+
     # ---- DRAWABLE DESTRUCTION METHODS ----
 
     def destroy_text(self, drawable: 'TextDrawable'):
         raise NotImplementedError()
 
+    def destroy_bitmap_text(self, drawable: 'BitmapTextDrawable'):
+        raise NotImplementedError()
+
     def destroy_sprite(self, drawable: 'SpriteDrawable'):
         raise NotImplementedError()
+
+    def destroy_tile_chunk(self, drawable: 'TileChunkDrawable'):
+        raise NotImplementedError()
+
+    def destroy_particles(self, drawable: 'ParticlesDrawable'):
+        raise NotImplementedError()
+
+    def request_redraw(self):
+        """Ask for the next frame to be drawn, for backends that can skip drawing frames when nothing changes.
+
+        Kizuna calls this when drawables are invalidated. Call it when something drawn changes outside of the
+        ``on_draw`` method of the controllers, e.g. in ``on_step``. This implementation does nothing.
+        """
+
+    def is_frame_throttled(self) -> bool:
+        """Return whether the frame being drawn is drawn below the full frame rate, or after frames that were due but
+        not drawn, e.g. while the window does not have the focus.
+
+        The work of such a frame covers more than one frame interval, so the quality governor does not measure it.
+        This implementation returns false.
+        """
+        return False
+
+    # ---- FRAME CAPTURE METHODS ----
+
+    def start_capture(self, capture: 'FrameCapture'):
+        """Start handing the drawn frames over to a frame capture, which is started.
+
+        :param capture: The frame capture.
+        """
+        self.stop_capture()
+        capture.start()
+        self.capture = capture
+
+    def stop_capture(self):
+        """Stop capturing frames, and close the frame capture once it has written the frames it holds.
+        """
+        capture, self.capture = self.capture, None
+        if capture is not None:
+            capture.close()
+
+    def capture_frame(self):
+        """Hand the frame read back by :meth:`read_frame` over to the frame capture. This is called after each frame
+        is drawn while capturing.
+        """
+        start = time.perf_counter()
+        frame = self.read_frame()
+        statistics = self.statistics
+        if frame is not None:
+            if self.capture.submit(frame):
+                statistics.frames_captured += 1
+            else:
+                statistics.frames_dropped += 1
+        statistics.capture_microseconds += round((time.perf_counter() - start) * 1_000_000)
+
+    def read_frame(self) -> numpy.ndarray | None:
+        """Read back a drawn frame for the frame capture.
+
+        Backends may return a frame drawn a few frames earlier, to avoid waiting for the GPU. This implementation
+        returns ``None``, for backends that cannot read frames back.
+
+        :return: An array of shape ``(height, width, 4)`` and type ``uint8`` with the RGBA pixels, starting from the
+            bottom row, or ``None`` if there is no frame to capture yet. The backend must not modify it afterward.
+        """
+        return None
+
+    # ---- DIAGNOSTIC METHODS ----
+
+    def get_resource_usage(self) -> dict[str, ResourceUsage]:
+        """Get the live accounting of the resources held by the backend, per resource type.
+
+        :return: A dictionary mapping resource type names (e.g. ``'sprites'``, ``'textures'``) to their usage.
+        """
+        raise NotImplementedError()
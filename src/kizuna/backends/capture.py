@@ -0,0 +1,167 @@
+import logging
+import queue
+import struct
+import threading
+import zlib
+from pathlib import Path
+
+import numpy
+
+from kizuna.core.validation import validate_choice, validate_positive_int
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_FORMATS = ('png', 'raw')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def encode_png(frame: numpy.ndarray, compression_level: int = 6) -> bytes:
+    """Encode an RGBA image as a PNG file.
+
+    Rows are not filtered, and the compression is done by ``zlib``, which releases the GIL while compressing.
+
+    :param frame: An array of shape ``(height, width, 4)`` and type ``uint8`` with the pixels, starting from the top
+        row.
+    :param compression_level: The ``zlib`` compression level, from ``0`` (none) to ``9`` (smallest).
+    :return: The contents of the file.
+    """
+    height, width = frame.shape[:2]
+    # Each row starts with its filter type, which is 0 (none).
+    rows = numpy.zeros((height, width * 4 + 1), dtype=numpy.uint8)
+    rows[:, 1:] = frame.reshape(height, width * 4)
+    chunks = (
+        (b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 6, 0, 0, 0)),
+        (b'IDAT', zlib.compress(rows.tobytes(), compression_level)),
+        (b'IEND', b''),
+    )
+    return PNG_SIGNATURE + b''.join(
+        struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data)) for tag, data in chunks
+    )
+
+
+class FrameCapture:
+    """Writes the frames of a running game to files from a background thread.
+
+    Backends read frames back and hand them over with :meth:`submit`, which never waits for the encoder: if it falls
+    behind and its queue is full, the frame is dropped instead of stalling the game loop.
+
+    With the ``'png'`` format, each frame is written to ``frame-NNNNNN.png``, numbered by the order it was submitted
+    in, so dropped frames leave gaps in the sequence. With the ``'raw'`` format, the RGBA pixels of the frames are
+    appended to ``frames.rgba`` from the top row, which can be converted to a video, e.g. with
+    ``ffmpeg -f rawvideo -pixel_format rgba -video_size WIDTHxHEIGHT -framerate FPS -i frames.rgba video.mp4``.
+
+    :ivar directory: The directory the frames are written to.
+    :ivar format: The format of the files, one of :data:`CAPTURE_FORMATS`.
+    :ivar queue_size: The number of frames that can wait to be written before new frames are dropped.
+    :ivar submitted_frames: The number of frames submitted, including the dropped ones.
+    :ivar dropped_frames: The number of frames dropped because the queue was full.
+    :ivar written_frames: The number of frames written.
+    """
+    directory: Path
+    format: str
+    queue_size: int
+    submitted_frames: int
+    dropped_frames: int
+    written_frames: int
+
+    _queue: queue.Queue[tuple[int, numpy.ndarray] | None]
+    _thread: threading.Thread | None
+
+    def __init__(self, directory: str | Path, format: str = 'png', queue_size: int = 8):
+        """Create a capture. Frames are only accepted after :meth:`start` is called.
+
+        :param directory: The directory to write the frames to. It is created if it does not exist.
+        :param format: The format of the files, one of :data:`CAPTURE_FORMATS`.
+        :param queue_size: The number of frames that can wait to be written before new frames are dropped.
+        """
+        self.directory = Path(directory)
+        self.format = validate_choice(format, CAPTURE_FORMATS)
+        self.queue_size = validate_positive_int(queue_size)
+        self.submitted_frames = 0
+        self.dropped_frames = 0
+        self.written_frames = 0
+        self._queue = queue.Queue(self.queue_size)
+        self._thread = None
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'FrameCapture("{self.directory}", format="{self.format}", submitted={self.submitted_frames}, '
+            f'dropped={self.dropped_frames})'
+        )
+
+    @property
+    def running(self) -> bool:
+        """Check whether the capture accepts frames.
+        """
+        return self._thread is not None
+
+    def start(self):
+        """Create the directory and start the encoder thread.
+        """
+        if self._thread is not None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='kizuna-frame-capture', daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: numpy.ndarray) -> bool:
+        """Hand a frame over to the encoder thread, without waiting.
+
+        :param frame: An array of shape ``(height, width, 4)`` and type ``uint8`` with the RGBA pixels, starting from
+            the bottom row as read from OpenGL. It must not be modified afterward.
+        :return: Whether the frame was queued. It is dropped if the queue is full or the capture is not running.
+        """
+        index = self.submitted_frames
+        self.submitted_frames = index + 1
+        if self._thread is None:
+            self.dropped_frames += 1
+            return False
+        try:
+            self._queue.put_nowait((index, frame))
+        except queue.Full:
+            self.dropped_frames += 1
+            return False
+        return True
+
+    def close(self):
+        """Write the frames still in the queue and stop the encoder thread.
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join()
+        self._thread = None
+        logger.info(
+            f'Captured {self.written_frames} frames to "{self.directory}", dropped {self.dropped_frames} of '
+            f'{self.submitted_frames}.'
+        )
+
+    def _run(self):
+        raw_file = None
+        failed = False
+        try:
+            while (item := self._queue.get()) is not None:
+                if failed:
+                    continue
+                index, frame = item
+                frame = frame[::-1]
+                try:
+                    if self.format == 'png':
+                        (self.directory / f'frame-{index:06d}.png').write_bytes(encode_png(frame, 1))
+                    else:
+                        if raw_file is None:
+                            raw_file = open(self.directory / 'frames.rgba', 'wb')
+                        raw_file.write(numpy.ascontiguousarray(frame).data)
+                    self.written_frames += 1
+                except OSError:
+                    # Keep emptying the queue so that the game loop is never blocked.
+                    logger.exception(f'Could not write captured frames to "{self.directory}".')
+                    failed = True
+        finally:
+            if raw_file is not None:
+                raw_file.close()
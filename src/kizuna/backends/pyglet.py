@@ -1,36 +1,422 @@
+import ctypes
 import importlib.resources
+import math
+import posixpath
+import weakref
 from pathlib import Path
-from typing import TYPE_CHECKING, Callable
+from typing import TYPE_CHECKING, Any, Callable, Sequence
 
+import numpy
 import pyglet
 
-from kizuna.backends.base import Backend
+from kizuna.backends.base import Backend, ResourceUsage, to_vector_list
 
 if TYPE_CHECKING:
-    from kizuna.core.assets import Asset, AssetPath, ImageAsset, FontAsset
+    from kizuna.core.assets import Asset, AssetPath, ImageAsset, FontAsset, BitmapFontAsset
     from kizuna.core.controllers import Controller
+    from kizuna.core.datatypes import IVector2, Vector2, Vector2Like
     from kizuna.config import Settings
-    from kizuna.rendering import DrawBatch, TextDrawable, SpriteDrawable
+    from kizuna.rendering import (
+        DrawBatch, Drawable, TextDrawable, BitmapTextDrawable, SpriteDrawable, TileChunkDrawable, ParticlesDrawable,
+    )
+    from kizuna.systems.input import Key, MouseButton
 
 
-PYGLET_CONSTANTS_TO_KIZUNA_KEYS = {
-    pyglet.window.key.LEFT: 'left',
-    pyglet.window.key.RIGHT: 'right',
-    pyglet.window.key.UP: 'up',
-    pyglet.window.key.DOWN: 'down',
-}
+# Rough per-object memory estimates used for resource accounting, covering both the Python object and its share of
+# the vertex and index buffers.
+ESTIMATED_SPRITE_BYTES = 4 * 52 + 6 * 4 + 400
+ESTIMATED_LABEL_BYTES = 2000
+ESTIMATED_GLYPH_BYTES = 4 * 52 + 6 * 4
+ESTIMATED_BATCH_BYTES = 1000
+ESTIMATED_VERTEX_BYTES = 52
+
+# Window events of user input.
+INPUT_EVENT_TYPES = (
+    'on_key_press', 'on_key_release', 'on_mouse_press', 'on_mouse_release', 'on_mouse_motion', 'on_mouse_drag',
+    'on_mouse_scroll',
+)
+
+# Counters of the backend statistics that show that a frame changed something drawn.
+FRAME_CHANGE_COUNTERS = (
+    'static_batch_renders', 'sprites_created', 'sprites_updated', 'sprites_deleted', 'labels_created',
+    'labels_updated', 'labels_deleted', 'vertex_lists_created', 'vertex_list_updates', 'vertex_lists_deleted',
+)
+
+# Number of pixel buffers frames are read back into when capturing. A frame is mapped to memory this many frames
+# after it is drawn, by which time the GPU has usually finished copying it.
+FRAME_READBACK_BUFFERS = 3
+
+# Extra area rendered around the view on each side when baking a static batch, as a fraction of the window size, so
+# that a moving camera can scroll this far before the batch is rendered again.
+STATIC_BATCH_BAKE_MARGIN = 0.5
+
+
+def create_input_maps() -> tuple[dict[int, 'Key'], dict[int, 'MouseButton']]:
+    """Map the keys and mouse buttons of Pyglet to the ones of the input system.
+
+    The input system is imported here, when the game loop is launched, so that backends do not depend on it.
+
+    :return: The maps of Pyglet key symbols to keys and of Pyglet mouse buttons to mouse buttons.
+    """
+    from kizuna.systems.input import Key, MouseButton
+
+    pyglet_key = pyglet.window.key
+    keys = {
+        pyglet_key.LEFT: Key.LEFT,
+        pyglet_key.RIGHT: Key.RIGHT,
+        pyglet_key.UP: Key.UP,
+        pyglet_key.DOWN: Key.DOWN,
+        **{getattr(pyglet_key, letter): Key[letter] for letter in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'},
+        **{getattr(pyglet_key, f'_{digit}'): Key[f'DIGIT_{digit}'] for digit in range(10)},
+        **{getattr(pyglet_key, f'F{number}'): Key[f'F{number}'] for number in range(1, 13)},
+        **{getattr(pyglet_key, f'NUM_{digit}'): Key[f'NUMPAD_{digit}'] for digit in range(10)},
+        pyglet_key.SPACE: Key.SPACE,
+        pyglet_key.RETURN: Key.ENTER,
+        pyglet_key.ESCAPE: Key.ESCAPE,
+        pyglet_key.TAB: Key.TAB,
+        pyglet_key.BACKSPACE: Key.BACKSPACE,
+        pyglet_key.DELETE: Key.DELETE,
+        pyglet_key.INSERT: Key.INSERT,
+        pyglet_key.HOME: Key.HOME,
+        pyglet_key.END: Key.END,
+        pyglet_key.PAGEUP: Key.PAGE_UP,
+        pyglet_key.PAGEDOWN: Key.PAGE_DOWN,
+        pyglet_key.LSHIFT: Key.LEFT_SHIFT,
+        pyglet_key.RSHIFT: Key.RIGHT_SHIFT,
+        pyglet_key.LCTRL: Key.LEFT_CTRL,
+        pyglet_key.RCTRL: Key.RIGHT_CTRL,
+        pyglet_key.LALT: Key.LEFT_ALT,
+        pyglet_key.RALT: Key.RIGHT_ALT,
+        pyglet_key.MINUS: Key.MINUS,
+        pyglet_key.EQUAL: Key.EQUAL,
+        pyglet_key.COMMA: Key.COMMA,
+        pyglet_key.PERIOD: Key.PERIOD,
+        pyglet_key.SLASH: Key.SLASH,
+        pyglet_key.BACKSLASH: Key.BACKSLASH,
+        pyglet_key.SEMICOLON: Key.SEMICOLON,
+        pyglet_key.APOSTROPHE: Key.APOSTROPHE,
+        pyglet_key.GRAVE: Key.GRAVE,
+        pyglet_key.BRACKETLEFT: Key.LEFT_BRACKET,
+        pyglet_key.BRACKETRIGHT: Key.RIGHT_BRACKET,
+        pyglet_key.NUM_ADD: Key.NUMPAD_ADD,
+        pyglet_key.NUM_SUBTRACT: Key.NUMPAD_SUBTRACT,
+        pyglet_key.NUM_MULTIPLY: Key.NUMPAD_MULTIPLY,
+        pyglet_key.NUM_DIVIDE: Key.NUMPAD_DIVIDE,
+        pyglet_key.NUM_DECIMAL: Key.NUMPAD_DECIMAL,
+        pyglet_key.NUM_ENTER: Key.NUMPAD_ENTER,
+    }
+
+    mouse_buttons = {
+        pyglet.window.mouse.LEFT: MouseButton.LEFT,
+        pyglet.window.mouse.MIDDLE: MouseButton.MIDDLE,
+        pyglet.window.mouse.RIGHT: MouseButton.RIGHT,
+        pyglet.window.mouse.MOUSE4: MouseButton.BACK,
+        pyglet.window.mouse.MOUSE5: MouseButton.FORWARD,
+    }
+    return keys, mouse_buttons
+
+
+def configure_resource_path(base_directory: Path, standalone: bool):
+    """Point Pyglet's resource loader to the asset directories of the project.
+
+    :param base_directory: The base directory of the project.
+    :param standalone: If true, the built-in assets are expected to be bundled with the project assets.
+    """
+    if standalone:
+        pyglet.resource.path = [
+            str(base_directory / 'assets'),
+        ]
+    else:
+        pyglet.resource.path = [
+            str(base_directory / 'assets'),
+            str(importlib.resources.files('kizuna') / 'assets'),
+        ]
+    pyglet.resource.reindex()
+
+
+def resolve_resource_name(path: 'AssetPath', standalone: bool) -> str:
+    """Get the name of an asset for Pyglet's resource loader.
+
+    :param path: The path of the asset.
+    :param standalone: Whether the resource path was configured in standalone mode.
+    :return: The resource name.
+    """
+    if standalone:
+        return path._namespace + path._path
+    else:
+        return path._path[1:]
+
+
+class PygletResource:
+    """Backend-side record of a Kizuna drawable: the Pyglet object drawing it and the batch it is currently in.
+
+    The record is released exactly once, either explicitly when the drawable is destroyed, or by its finalizer when
+    the drawable is garbage collected without being destroyed.
+
+    For drawables that are rebuilt on change, such as tile chunks, ``revision`` is the revision of the drawable the
+    Pyglet object was built from, or ``None`` if it has not been built. For drawables that are updated in place, such
+    as bitmap texts, particles and the position of tile chunks, ``contents`` describes what the Pyglet object currently
+    holds. For vertex lists,
+    ``group`` is the group they were created in, which is needed to move them to another Pyglet batch, and ``hidden``
+    tells whether they are collapsed so that they draw nothing while their drawable is hidden.
+    """
+    __slots__ = ('pyglet_object', 'batch', 'finalizer', 'revision', 'contents', 'group', 'hidden')
+
+    def __init__(
+        self,
+        pyglet_object: pyglet.sprite.Sprite | pyglet.text.Label | pyglet.graphics.vertexdomain.VertexList | None,
+    ):
+        self.pyglet_object = pyglet_object
+        self.batch: 'DrawBatch | None' = None
+        self.finalizer: weakref.finalize | None = None
+        self.revision: int | None = None
+        self.contents: Any = None
+        self.group: pyglet.graphics.Group | None = None
+        self.hidden = False
+
+
+class PygletLayerGroup(pyglet.graphics.Group):
+    """Group holding the drawables of a Kizuna batch inside a Pyglet batch.
+
+    Kizuna batches drawn together share a Pyglet batch, and their layer groups are ordered so that they are drawn in
+    the same order as if they were drawn one by one. Layer groups are compared by identity, so that the drawables of
+    different Kizuna batches are never merged, and so that their order can change without changing their hash.
+    """
+
+    def __eq__(self, other: pyglet.graphics.Group) -> bool:
+        return self is other
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __repr__(self) -> str:
+        return f'PygletLayerGroup(order={self._order})'
+
+    def set_order(self, order: int) -> bool:
+        """Change the order of the group. The Pyglet batches it is in must be invalidated if it changes.
+
+        :param order: The new order. Lower orders are drawn first.
+        :return: Whether the order changed.
+        """
+        if order == self._order:
+            return False
+        self._order = order
+        return True
+
+
+class PygletBakedBatch:
+    """Offscreen rendering of a static batch, and the sprite drawing it to the window.
+
+    The batch is rendered in world space, over the region of the stage around the view given by ``bounds``. The sprite
+    is placed at that region, so the view offset of the window moves it like any other drawable. ``revision`` is the
+    revision of the batch it was rendered with. It is rendered again if the revision changes, if the view leaves the
+    region, or if ``dirty`` is set because a drawable of the batch changed.
+    """
+    __slots__ = ('framebuffer', 'texture', 'sprite', 'sprite_batch', 'bounds', 'revision', 'dirty')
+
+    def __init__(self, width: int, height: int):
+        self.framebuffer = pyglet.image.Framebuffer()
+        self.texture = pyglet.image.Texture.create(width, height)
+        self.framebuffer.attach_texture(self.texture)
+        self.sprite_batch = pyglet.graphics.Batch()
+        self.sprite = pyglet.sprite.Sprite(self.texture, batch=self.sprite_batch)
+        self.bounds: tuple[float, float, float, float] | None = None
+        self.revision: int | None = None
+        self.dirty = True
+
+    def delete(self):
+        self.sprite.delete()
+        self.framebuffer.delete()
+        self.texture.delete()
+
+
+class PygletFrameReader:
+    """Ring of pixel buffer objects the frames drawn to the window are read back into without waiting for the GPU.
+
+    Reading pixels into a pixel buffer object returns as soon as the copy is queued. Each buffer is mapped to memory
+    when it is reused, :data:`FRAME_READBACK_BUFFERS` frames later.
+    """
+    __slots__ = ('width', 'height', 'buffers', 'index', 'filled')
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.buffers = (pyglet.gl.GLuint * FRAME_READBACK_BUFFERS)()
+        pyglet.gl.glGenBuffers(FRAME_READBACK_BUFFERS, self.buffers)
+        for buffer in self.buffers:
+            pyglet.gl.glBindBuffer(pyglet.gl.GL_PIXEL_PACK_BUFFER, buffer)
+            pyglet.gl.glBufferData(pyglet.gl.GL_PIXEL_PACK_BUFFER, width * height * 4, None, pyglet.gl.GL_STREAM_READ)
+        pyglet.gl.glBindBuffer(pyglet.gl.GL_PIXEL_PACK_BUFFER, 0)
+        self.index = 0
+        self.filled = 0
+
+    def read(self) -> numpy.ndarray | None:
+        """Queue the copy of the current frame, and get the frame queued :data:`FRAME_READBACK_BUFFERS` frames ago.
+
+        :return: The RGBA pixels of the frame from the bottom row, or ``None`` if no frame is old enough yet.
+        """
+        gl = pyglet.gl
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, self.buffers[self.index])
+        frame = None
+        if self.filled == FRAME_READBACK_BUFFERS:
+            size = self.width * self.height * 4
+            frame = numpy.empty((self.height, self.width, 4), dtype=numpy.uint8)
+            pointer = gl.glMapBufferRange(gl.GL_PIXEL_PACK_BUFFER, 0, size, gl.GL_MAP_READ_BIT)
+            ctypes.memmove(frame.ctypes.data, pointer, size)
+            gl.glUnmapBuffer(gl.GL_PIXEL_PACK_BUFFER)
+        else:
+            self.filled += 1
+        gl.glReadPixels(0, 0, self.width, self.height, gl.GL_RGBA, gl.GL_UNSIGNED_BYTE, 0)
+        gl.glBindBuffer(gl.GL_PIXEL_PACK_BUFFER, 0)
+        self.index = (self.index + 1) % FRAME_READBACK_BUFFERS
+        return frame
+
+    def delete(self):
+        pyglet.gl.glDeleteBuffers(FRAME_READBACK_BUFFERS, self.buffers)
+
+
+class FrameRatePolicy:
+    """Decides how often the window is drawn, from its state and from whether what is drawn changes.
+
+    Frames are drawn at the full frame rate while the window has the focus, at the unfocused frame rate otherwise,
+    and not at all while it is minimized if drawing is paused then. With redraw on change, frames are only drawn after
+    a redraw is requested, and for as long as the drawn frames keep changing something.
+
+    The simulation is stepped independently of this policy.
+
+    :ivar frames_missed: Whether frames were due but not drawn since the last frame drawn, or drawing was paused.
+    :ivar throttled: Whether the last frame drawn was drawn below the full frame rate, or after frames were missed.
+    """
+    frames_per_second: float
+    unfocused_frames_per_second: float
+    pause_when_minimized: bool
+    redraw_on_change: bool
+    focused: bool
+    minimized: bool
+    redraw_requested: bool
+    frames_missed: bool
+    throttled: bool
+
+    # Whether input was received since the last step.
+    _input_pending: bool
+
+    def __init__(
+        self,
+        frames_per_second: float,
+        unfocused_frames_per_second: float | None = None,
+        pause_when_minimized: bool = True,
+        redraw_on_change: bool = False,
+    ):
+        """Create a policy for a window that has the focus.
+
+        :param frames_per_second: The frame rate while the window has the focus.
+        :param unfocused_frames_per_second: The frame rate while the window does not have the focus. Defaults to the
+            full frame rate. It is never higher than the full frame rate.
+        :param pause_when_minimized: Whether to stop drawing while the window is minimized.
+        :param redraw_on_change: Whether to only draw frames when a redraw is requested or the scene changes.
+        """
+        self.frames_per_second = frames_per_second
+        self.unfocused_frames_per_second = min(
+            frames_per_second, unfocused_frames_per_second if unfocused_frames_per_second is not None else math.inf,
+        )
+        self.pause_when_minimized = pause_when_minimized
+        self.redraw_on_change = redraw_on_change
+        self.focused = True
+        self.minimized = False
+        self.redraw_requested = True
+        self.frames_missed = False
+        self.throttled = False
+        self._input_pending = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'FrameRatePolicy(interval={self.interval}, redraw_on_change={self.redraw_on_change})'
+
+    @property
+    def interval(self) -> float | None:
+        """Get the time between frames in seconds, or ``None`` if drawing is paused.
+        """
+        if self.minimized and self.pause_when_minimized:
+            return None
+        return 1 / (self.frames_per_second if self.focused else self.unfocused_frames_per_second)
+
+    def request_redraw(self):
+        """Ask for the next frame to be drawn.
+        """
+        self.redraw_requested = True
+
+    def input_received(self):
+        """Ask for a frame to be drawn after the next step, which handles the input received.
+        """
+        self._input_pending = True
+
+    def step_done(self):
+        """Record that the simulation was stepped.
+        """
+        if self._input_pending:
+            self._input_pending = False
+            self.redraw_requested = True
+
+    def begin_frame(self) -> bool:
+        """Check whether a frame that is due is drawn, consuming the pending redraw request.
+        """
+        if self.redraw_on_change:
+            drawn = self.redraw_requested
+            self.redraw_requested = False
+        else:
+            drawn = True
+        if drawn:
+            slowed = not self.focused and self.unfocused_frames_per_second < self.frames_per_second
+            self.throttled = self.frames_missed or slowed
+            self.frames_missed = False
+        else:
+            self.frames_missed = True
+        return drawn
+
+    def frame_drawn(self, changed: bool):
+        """Record that a frame was drawn.
+
+        :param changed: Whether drawing the frame changed something drawn, in which case the next frame is drawn too.
+        """
+        if changed:
+            self.redraw_requested = True
 
 
 class PygletBackend(Backend):
     # Map from Kizuna assets to Pyglet resources.
     assets: dict['Asset', pyglet.image.Texture | pyglet.image.TextureRegion | pyglet.font.base.Font]
 
-    # Maps from Kizuna batches to Pyglet batches.
+    # Map from bitmap fonts to the texture coordinates of the four corners of each glyph.
+    glyph_tex_coords: dict['BitmapFontAsset', numpy.ndarray]
+
+    # Maps from Kizuna batches to Pyglet batches, and number of live drawables using each batch. Batches are removed
+    # as soon as they are no longer used. Kizuna batches drawn together by draw_batches share a Pyglet batch, where
+    # their drawables are kept in their layer group.
     batches: dict['DrawBatch', pyglet.graphics.Batch]
+    batch_users: dict['DrawBatch', int]
+    layer_groups: dict['DrawBatch', PygletLayerGroup]
+    batch_members: dict[pyglet.graphics.Batch, set['DrawBatch']]
+
+    # Offscreen renderings of the static batches that have been drawn, and view offset set by the last call to
+    # set_view_offset.
+    baked_batches: dict['DrawBatch', PygletBakedBatch]
+    view_offset: tuple[float, float]
+
+    # Pixel buffers the frames are read back into while capturing, created on the first captured frame.
+    frame_reader: PygletFrameReader | None
 
-    # Maps from Kizuna drawables to Pyglet drawables.
-    texts: dict['TextDrawable', pyglet.text.Label]
-    sprites: dict['SpriteDrawable', pyglet.sprite.Sprite]
+    # When to draw frames, created when the game loop is launched.
+    frame_rate_policy: FrameRatePolicy | None
+
+    # Maps from Kizuna drawables to Pyglet drawables. Drawables are weakly referenced so that the Pyglet drawables
+    # are released even if the Kizuna drawables are garbage collected without being destroyed.
+    texts: weakref.WeakKeyDictionary['TextDrawable', PygletResource]
+    bitmap_texts: weakref.WeakKeyDictionary['BitmapTextDrawable', PygletResource]
+    sprites: weakref.WeakKeyDictionary['SpriteDrawable', PygletResource]
+    tile_chunks: weakref.WeakKeyDictionary['TileChunkDrawable', PygletResource]
+    particles: weakref.WeakKeyDictionary['ParticlesDrawable', PygletResource]
 
     window: pyglet.window.Window
     standalone: bool
@@ -40,25 +426,25 @@ class PygletBackend(Backend):
     def __init__(self, settings: 'Settings'):
         super().__init__(settings)
         self.assets = {}
+        self.glyph_tex_coords = {}
         self.batches = {}
-        self.sprites = {}
-        self.texts = {}
+        self.batch_users = {}
+        self.layer_groups = {}
+        self.batch_members = {}
+        self.baked_batches = {}
+        self.view_offset = 0.0, 0.0
+        self.frame_reader = None
+        self.frame_rate_policy = None
+        self.sprites = weakref.WeakKeyDictionary()
+        self.texts = weakref.WeakKeyDictionary()
+        self.bitmap_texts = weakref.WeakKeyDictionary()
+        self.tile_chunks = weakref.WeakKeyDictionary()
+        self.particles = weakref.WeakKeyDictionary()
 
     def initialize(self, base_directory: Path, standalone: bool):
         # Save if we are standalone for asset path resolution.
         self.standalone = standalone
-
-        # Configure asset path.
-        if standalone:
-            pyglet.resource.path = [
-                str(base_directory / 'assets'),
-            ]
-        else:
-            pyglet.resource.path = [
-                str(base_directory / 'assets'),
-                str(importlib.resources.files('kizuna') / 'assets'),
-            ]
-        pyglet.resource.reindex()
+        configure_resource_path(base_directory, standalone)
 
     def launch_game_loop(
         self,
@@ -66,107 +452,823 @@ class PygletBackend(Backend):
         draw_fn: Callable[[], None],
         controllers: list['Controller'],
     ):
+        from kizuna.core.datatypes import Vector2
         from kizuna.systems.input import InputController
 
-        window = pyglet.window.Window()
+        keys, mouse_buttons = create_input_maps()
+
+        window = self.window = pyglet.window.Window()
         window.size = tuple(self.settings.WINDOW_SIZE)
         window.set_caption(self.settings.WINDOW_CAPTION)
+        policy = self.frame_rate_policy = FrameRatePolicy(
+            self.settings.FRAMES_PER_SECOND,
+            self.settings.UNFOCUSED_FRAMES_PER_SECOND,
+            self.settings.PAUSE_DRAWING_WHEN_MINIMIZED,
+            self.settings.REDRAW_ON_CHANGE,
+        )
 
         # Schedule update calls.
-        pyglet.clock.schedule_interval(lambda dt: step_fn(dt), 1 / self.settings.STEPS_PER_SECOND)
+        def step(dt: float):
+            step_fn(dt)
+            policy.step_done()
+
+        pyglet.clock.schedule_interval(step, 1 / self.settings.STEPS_PER_SECOND)
+
+        # Schedule draw calls at the interval of the frame rate policy, rescheduling them when it changes.
+        def draw_frame(dt: float):
+            if policy.begin_frame():
+                window.draw(dt)
+
+        def schedule_frames():
+            pyglet.clock.unschedule(draw_frame)
+            interval = policy.interval
+            if interval is not None:
+                pyglet.clock.schedule_interval(draw_frame, interval)
+
+        @window.event
+        def on_activate():
+            policy.focused = True
+            # The first frame drawn at the full rate still covers the steps done since the last unfocused frame.
+            if policy.unfocused_frames_per_second < policy.frames_per_second:
+                policy.frames_missed = True
+            schedule_frames()
+
+        @window.event
+        def on_deactivate():
+            policy.focused = False
+            schedule_frames()
+
+        @window.event
+        def on_show():
+            policy.minimized = False
+            policy.request_redraw()
+            schedule_frames()
+
+        @window.event
+        def on_hide():
+            policy.minimized = True
+            if policy.pause_when_minimized:
+                policy.frames_missed = True
+            schedule_frames()
+
+        @window.event
+        def on_expose():
+            policy.request_redraw()
+
+        @window.event
+        def on_resize(width: int, height: int):
+            policy.request_redraw()
 
         # Attach the draw event handler.
         @window.event
         def on_draw():
             window.clear()
             draw_fn()
+            policy.frame_drawn(self._has_frame_changed())
 
         # Attach the input handlers.
         input_controller = next((ctr for ctr in controllers if isinstance(ctr, InputController)), None)
         if input_controller is not None:
             @window.event
             def on_key_press(symbol: int, modifiers: int):
-                kizuna_key_value = PYGLET_CONSTANTS_TO_KIZUNA_KEYS.get(symbol)
-                if kizuna_key_value is not None:
-                    input_controller.held_keys[kizuna_key_value] = True
+                key = keys.get(symbol)
+                if key is not None:
+                    input_controller.press_key(key)
 
             @window.event
             def on_key_release(symbol: int, modifiers: int):
-                kizuna_key_value = PYGLET_CONSTANTS_TO_KIZUNA_KEYS.get(symbol)
-                if kizuna_key_value is not None:
-                    input_controller.held_keys[kizuna_key_value] = False
+                key = keys.get(symbol)
+                if key is not None:
+                    input_controller.release_key(key)
+
+            @window.event
+            def on_mouse_press(x: int, y: int, pyglet_button: int, modifiers: int):
+                button = mouse_buttons.get(pyglet_button)
+                if button is not None:
+                    input_controller.press_mouse_button(button, Vector2(x, y))
+
+            @window.event
+            def on_mouse_release(x: int, y: int, pyglet_button: int, modifiers: int):
+                button = mouse_buttons.get(pyglet_button)
+                if button is not None:
+                    input_controller.release_mouse_button(button, Vector2(x, y))
+
+            @window.event
+            def on_mouse_motion(x: int, y: int, dx: int, dy: int):
+                input_controller.move_mouse(Vector2(x, y))
+
+            @window.event
+            def on_mouse_drag(x: int, y: int, dx: int, dy: int, buttons: int, modifiers: int):
+                input_controller.move_mouse(Vector2(x, y))
+
+        # Any input may change what is drawn, once the step handling it has run.
+        def on_input(*args):
+            policy.input_received()
+
+        window.push_handlers(**dict.fromkeys(INPUT_EVENT_TYPES, on_input))
 
         # Run the app.
-        pyglet.app.run(1 / self.settings.FRAMES_PER_SECOND)
+        schedule_frames()
+        pyglet.app.run(None)
 
     # ---- ASSET LOADING METHODS ----
 
-    def _resolve_path(self, path: 'AssetPath') -> str:
-        if self.standalone:
-            return path._namespace + path._path
-        else:
-            return path._path[1:]
-
     def load_image_asset(self, asset: 'ImageAsset'):
-        pyglet_image = pyglet.resource.image(self._resolve_path(asset._path))
+        pyglet_image = pyglet.resource.image(resolve_resource_name(asset._path, self.standalone))
         pyglet_image.anchor_x, pyglet_image.anchor_y = (pyglet_image.width, pyglet_image.height) * asset.origin
         self.assets[asset] = pyglet_image
+        self.statistics.textures_loaded += 1
+        self.statistics.texture_bytes_loaded += pyglet_image.width * pyglet_image.height * 4
 
     def load_font_asset(self, asset: 'FontAsset'):
-        pyglet.resource.add_font(self._resolve_path(asset._path))
+        pyglet.resource.add_font(resolve_resource_name(asset._path, self.standalone))
         self.assets[asset] = pyglet.font.load(name=asset.family_name, size=asset.size)
 
+    def load_bitmap_font_asset(self, asset: 'BitmapFontAsset'):
+        from kizuna.core.assets import BitmapGlyph, parse_bmfont
+
+        # Generated fonts take their glyphs from the texture atlas Pyglet renders the font to.
+        if asset.source_font is not None:
+            pyglet_font = self.assets[asset.source_font]
+            pyglet_glyphs, _ = pyglet_font.get_glyphs(asset.characters)
+            texture = pyglet_glyphs[0].owner
+            if any(pyglet_glyph.owner is not texture for pyglet_glyph in pyglet_glyphs):
+                raise ValueError(f'The characters of {asset} do not fit in a single texture.')
+            glyphs = {}
+            for character, pyglet_glyph in zip(asset.characters, pyglet_glyphs):
+                left, bottom, right, top = pyglet_glyph.vertices
+                glyphs[character] = BitmapGlyph(
+                    pyglet_glyph.x, pyglet_glyph.y, right - left, top - bottom, left, pyglet_font.ascent - top,
+                    pyglet_glyph.advance,
+                )
+            asset.set_glyphs(pyglet_font.ascent - pyglet_font.descent, pyglet_font.ascent, glyphs)
+            self.assets[asset] = texture
+            self.glyph_tex_coords[asset] = numpy.array(
+                [pyglet_glyph.tex_coords for pyglet_glyph in pyglet_glyphs], dtype=numpy.float32,
+            )
+            return
+
+        # Descriptors reference their page image relative to themselves.
+        name = resolve_resource_name(asset._path, self.standalone)
+        with pyglet.resource.file(name) as file:
+            line_height, base, page, glyphs = parse_bmfont(file.read().decode('utf-8'))
+        asset.set_glyphs(line_height, base, glyphs)
+        pyglet_image = pyglet.resource.image(posixpath.join(posixpath.dirname(name), page))
+        self.assets[asset] = pyglet_image
+        self.statistics.textures_loaded += 1
+        self.statistics.texture_bytes_loaded += pyglet_image.width * pyglet_image.height * 4
+
+        u0, v0, r = pyglet_image.tex_coords[0:3]
+        u1, v1 = pyglet_image.tex_coords[6:8]
+        u_per_pixel = (u1 - u0) / pyglet_image.width
+        v_per_pixel = (v1 - v0) / pyglet_image.height
+        rects = numpy.array(
+            [(glyph.x, glyph.y, glyph.width, glyph.height) for glyph in glyphs.values()], dtype=numpy.float32,
+        )
+        left = u0 + rects[:, 0] * u_per_pixel
+        right = left + rects[:, 2] * u_per_pixel
+        top = v1 - rects[:, 1] * v_per_pixel
+        bottom = top - rects[:, 3] * v_per_pixel
+        r = numpy.full_like(left, r)
+        self.glyph_tex_coords[asset] = numpy.column_stack(
+            [left, bottom, r, right, bottom, r, right, top, r, left, top, r],
+        )
+
+    def get_image_size(self, asset: 'ImageAsset') -> 'IVector2':
+        from kizuna.core.datatypes import IVector2
+
+        pyglet_image = self.assets[asset]
+        return IVector2(pyglet_image.width, pyglet_image.height)
+
+    def measure_text(self, text: str, font: 'FontAsset') -> 'Vector2':
+        from kizuna.core.datatypes import Vector2
+
+        pyglet_font = self.assets[font]
+        width = sum(glyph.advance for glyph in pyglet_font.get_glyphs(text))
+        return Vector2(width, pyglet_font.ascent - pyglet_font.descent)
+
     # ---- PRE-DRAWING METHODS ----
 
     def prepare_draw_text(self, drawable: 'TextDrawable', batch: 'DrawBatch'):
+        resource = self._get_or_create_text(drawable)
+        visible = drawable.visible and not drawable.culled
+        contents = (drawable.text, drawable.font, drawable.position, batch) if visible else False
+        if contents == resource.contents:
+            return
+        resource.contents = contents
+        self._touch(resource.batch)
+
+        self.statistics.labels_updated += 1
         pyglet_font = self.assets[drawable.font]
-        pyglet_label = self._get_or_create_text(drawable)
-        pyglet_label.visible = drawable.visible
-        if drawable.visible:
+        pyglet_label = resource.pyglet_object
+        pyglet_label.visible = visible
+        if visible:
             pyglet_label.text = drawable.text
             pyglet_label.font_name = pyglet_font.name
             pyglet_label.font_size = drawable.font.size
             pyglet_label.position = drawable.position.x, drawable.position.y, 0.0
-            pyglet_label.batch = self._get_or_create_batch(batch)
+            if resource.batch is not batch:
+                pyglet_batch = self._assign_batch(resource, batch)
+                pyglet_label.group = self.layer_groups[batch]
+                pyglet_label.batch = pyglet_batch
+
+    def prepare_draw_bitmap_text(self, drawable: 'BitmapTextDrawable', batch: 'DrawBatch'):
+        resource = self.bitmap_texts.get(drawable)
+        if resource is None:
+            resource = self._track(drawable, PygletResource(None))
+            self.bitmap_texts[drawable] = resource
+
+        # Hidden texts keep their vertex list, so that showing them again does not rebuild it.
+        if not drawable.visible or drawable.culled:
+            self._set_mesh_hidden(resource, True)
+            return
+
+        # Rewrite only the quads of the characters that changed, unless the vertex list is too small for the text.
+        font = drawable.font
+        text = drawable.text
+        position = drawable.position.x, drawable.position.y
+        if resource.pyglet_object is None or len(text) > resource.pyglet_object.count // 4:
+            self._release(resource)
+            pyglet_batch = self._assign_batch(resource, batch)
+            resource.group = self._create_mesh_group(self.assets[font].get_texture(), batch)
+            resource.pyglet_object = self._create_bitmap_text_vertex_list(
+                len(text), pyglet_batch, resource.group,
+            )
+            changed_range = 0, len(text)
+            old_position = None
+        else:
+            self._assign_batch(resource, batch)
+            old_text, old_position = resource.contents
+            changed_range = font.changed_range(old_text, text)
+        resource.contents = text, position
+        self._set_mesh_hidden(resource, False)
+
+        vertex_list = resource.pyglet_object
+        if position != old_position or changed_range is not None:
+            self.statistics.vertex_list_updates += 1
+            self._touch(batch)
+        if position != old_position:
+            self._get_vertex_region(vertex_list, 'translate', 0, vertex_list.count).reshape(-1, 3)[:, :2] = position
+        if changed_range is None:
+            return
+        start, end = changed_range
+        text_end = min(end, len(text))
+        positions = self._get_vertex_region(vertex_list, 'position', start * 4, (end - start) * 4).reshape(-1, 12)
+        tex_coords = self._get_vertex_region(vertex_list, 'tex_coords', start * 4, (end - start) * 4).reshape(-1, 12)
+        quads, glyph_indices = font.layout(text, start, text_end)
+        left, bottom, right, top = quads.T
+        z = numpy.zeros_like(left)
+        positions[:text_end - start] = numpy.column_stack(
+            [left, bottom, z, right, bottom, z, right, top, z, left, top, z],
+        )
+        positions[text_end - start:] = 0.0
+        tex_coords[:text_end - start] = self.glyph_tex_coords[font][glyph_indices]
 
     def prepare_draw_sprite(self, drawable: 'SpriteDrawable', batch: 'DrawBatch'):
-        pyglet_sprite = self._get_or_create_sprite(drawable)
-        pyglet_sprite.visible = drawable.visible
-        if drawable.visible:
-            pyglet_sprite.batch = self._get_or_create_batch(batch)
-            pyglet_sprite.position = drawable.position.x, drawable.position.y, 0.0
-            pyglet_sprite.rotation = -drawable.rotation
+        self.prepare_draw_sprites((drawable,), (drawable.position,), (drawable.rotation,), batch)
+
+    def prepare_draw_sprites(
+        self,
+        drawables: Sequence['SpriteDrawable'],
+        positions: Sequence['Vector2Like'] | numpy.ndarray,
+        rotations: Sequence[float] | numpy.ndarray,
+        batch: 'DrawBatch',
+    ):
+        sprites = self.sprites
+        baked_batches = self.baked_batches
+        statistics = self.statistics
+        for drawable, position, rotation in zip(drawables, to_vector_list(positions), rotations):
+            drawable.position = position
+            drawable.rotation = rotation = float(rotation)
+            resource = sprites.get(drawable)
+            if resource is None:
+                resource = self._get_or_create_sprite(drawable)
+
+            # Sprites that did not change since they were last prepared are left as they are.
+            visible = drawable.visible and not drawable.culled
+            contents = (position, rotation, drawable.asset, batch) if visible else False
+            if contents == resource.contents:
+                continue
+            resource.contents = contents
+            if baked_batches:
+                self._touch(resource.batch)
+
+            statistics.sprites_updated += 1
+            pyglet_sprite = resource.pyglet_object
+            pyglet_sprite.visible = visible
+            if visible:
+                image = self.assets[drawable.asset]
+                if pyglet_sprite.image is not image:
+                    pyglet_sprite.image = image
+                if resource.batch is not batch:
+                    pyglet_batch = self._assign_batch(resource, batch)
+                    pyglet_sprite.group = self.layer_groups[batch]
+                    pyglet_sprite.batch = pyglet_batch
+                pyglet_sprite.position = position.x, position.y, 0.0
+                pyglet_sprite.rotation = -rotation
+
+    def prepare_draw_tile_chunk(self, drawable: 'TileChunkDrawable', batch: 'DrawBatch'):
+        resource = self.tile_chunks.get(drawable)
+        if resource is None:
+            resource = self._track(drawable, PygletResource(None))
+            self.tile_chunks[drawable] = resource
+
+        # Hidden chunks keep their mesh, so that scrolling back to them does not rebuild it. The mesh is only rebuilt
+        # if the tiles changed since it was last built, and not before the chunk is shown again. Its vertices are
+        # relative to the chunk, which is moved through the "translate" attribute without rebuilding it.
+        visible = drawable.visible and not drawable.culled
+        if visible and resource.revision != drawable.revision:
+            self._release(resource)
+            resource.revision = drawable.revision
+            if any(tile >= 0 for tile in drawable.tiles):
+                pyglet_batch = self._assign_batch(resource, batch)
+                resource.group = self._create_mesh_group(self.assets[drawable.asset].get_texture(), batch)
+                resource.pyglet_object = self._build_tile_chunk(drawable, pyglet_batch, resource.group)
+                resource.contents = drawable.position
+        elif visible and resource.pyglet_object is not None and resource.contents != drawable.position:
+            translate = numpy.ctypeslib.as_array(resource.pyglet_object.translate).reshape(-1, 3)
+            translate[:, :2] = tuple(drawable.position)
+            resource.contents = drawable.position
+            self.statistics.vertex_list_updates += 1
+            self._touch(resource.batch)
+        self._set_mesh_hidden(resource, not visible)
+
+    def prepare_draw_particles(self, drawable: 'ParticlesDrawable', batch: 'DrawBatch'):
+        resource = self.particles.get(drawable)
+        if resource is None:
+            resource = self._track(drawable, PygletResource(None))
+            self.particles[drawable] = resource
+
+        # The vertex list is created once with room for every particle, and kept while the drawable is alive.
+        count = drawable.count if drawable.visible and not drawable.culled else 0
+        if resource.pyglet_object is None:
+            if count == 0:
+                return
+            pyglet_batch = self._assign_batch(resource, batch)
+            resource.group = self._create_mesh_group(self.assets[drawable.asset].get_texture(), batch)
+            resource.pyglet_object = self._create_particles_vertex_list(drawable, pyglet_batch, resource.group)
+
+        # Skip the upload if the vertex list already holds these particles, so idle emitters do not change the frame.
+        if resource.contents == count and (count == 0 or resource.revision == drawable.revision):
+            return
+        resource.contents = count
+        resource.revision = drawable.revision
+
+        # Copy the arrays straight into the vertex buffers. Dead particles are collapsed with a zero scale.
+        self.statistics.vertex_list_updates += 1
+        self._touch(resource.batch)
+        vertex_list = resource.pyglet_object
+        scale = numpy.ctypeslib.as_array(vertex_list.scale).reshape(-1, 4, 2)
+        scale[:count] = 1.0
+        scale[count:] = 0.0
+        if count == 0:
+            return
+        translate = numpy.ctypeslib.as_array(vertex_list.translate).reshape(-1, 4, 3)
+        translate[:count, :, :2] = drawable.positions[:count, numpy.newaxis, :]
+        rotation = numpy.ctypeslib.as_array(vertex_list.rotation).reshape(-1, 4)
+        rotation[:count] = -drawable.rotations[:count, numpy.newaxis]
+        colors = numpy.ctypeslib.as_array(vertex_list.colors).reshape(-1, 4, 4)
+        colors[:count] = drawable.colors[:count, numpy.newaxis, :]
 
     # ---- DRAWING METHODS ----
 
+    def set_view_offset(self, offset: 'Vector2'):
+        view_offset = offset.x, offset.y
+        if view_offset != self.view_offset:
+            self.view_offset = view_offset
+            self.request_redraw()
+        self.window.view = pyglet.math.Mat4.from_translation(pyglet.math.Vec3(-offset.x, -offset.y, 0.0))
+
     def draw_batch(self, batch: 'DrawBatch'):
-        self._get_or_create_batch(batch).draw()
+        # Batches without drawables are not kept, so there is nothing to draw.
+        pyglet_batch = self.batches.get(batch)
+        if pyglet_batch is None:
+            return
+        if len(self.batch_members[pyglet_batch]) > 1:
+            pyglet_batch = self._share_batch((batch,))
+        self.statistics.batch_draws += 1
+        if not batch.static:
+            pyglet_batch.draw()
+            return
+
+        # Render static batches again only if they changed or the view left the region rendered. The rendering is
+        # drawn in world space, so moving the camera within the region only moves the sprite.
+        window = self.window
+        pixel_ratio = window.get_framebuffer_size()[0] / window.width
+        margin_x = math.ceil(window.width * STATIC_BATCH_BAKE_MARGIN)
+        margin_y = math.ceil(window.height * STATIC_BATCH_BAKE_MARGIN)
+        width = window.width + 2 * margin_x
+        height = window.height + 2 * margin_y
+        texture_size = round(width * pixel_ratio), round(height * pixel_ratio)
+        baked = self.baked_batches.get(batch)
+        if baked is not None and (baked.texture.width, baked.texture.height) != texture_size:
+            baked.delete()
+            baked = None
+        if baked is None:
+            baked = self.baked_batches[batch] = PygletBakedBatch(*texture_size)
+        view_x, view_y = self.view_offset
+        left, bottom, right, top = baked.bounds or (math.inf, math.inf, -math.inf, -math.inf)
+        in_bounds = left <= view_x <= right - window.width and bottom <= view_y <= top - window.height
+        if baked.dirty or baked.revision != batch.revision or not in_bounds:
+            left, bottom = view_x - margin_x, view_y - margin_y
+            self._bake_batch(baked, pyglet_batch, left, bottom, width, height)
+            baked.sprite.update(x=left, y=bottom, scale=1 / pixel_ratio)
+            baked.bounds = left, bottom, left + width, bottom + height
+            baked.revision = batch.revision
+            baked.dirty = False
+        baked.sprite_batch.draw()
+
+    def draw_batches(self, batches: Sequence['DrawBatch']):
+        # Consecutive batches that are not static share a Pyglet batch, and are drawn with a single call.
+        batches_to_share = []
+        for batch in batches:
+            if batch not in self.batches:
+                continue
+            if not batch.static:
+                batches_to_share.append(batch)
+                continue
+            self._draw_shared_batches(batches_to_share)
+            batches_to_share.clear()
+            self.draw_batch(batch)
+        self._draw_shared_batches(batches_to_share)
 
     # ---- DRAWABLE DESTRUCTION METHODS ----
 
     def destroy_text(self, drawable: 'TextDrawable'):
-        pyglet_label = self.texts.get(drawable)
-        if pyglet_label is not None:
-            pyglet_label.delete()
+        resource = self.texts.pop(drawable, None)
+        if resource is not None:
+            resource.finalizer()
+
+    def destroy_bitmap_text(self, drawable: 'BitmapTextDrawable'):
+        resource = self.bitmap_texts.pop(drawable, None)
+        if resource is not None:
+            resource.finalizer()
 
     def destroy_sprite(self, drawable: 'SpriteDrawable'):
-        pyglet_sprite = self.sprites.get(drawable)
-        if pyglet_sprite is not None:
-            pyglet_sprite.delete()
+        resource = self.sprites.pop(drawable, None)
+        if resource is not None:
+            resource.finalizer()
+
+    def destroy_tile_chunk(self, drawable: 'TileChunkDrawable'):
+        resource = self.tile_chunks.pop(drawable, None)
+        if resource is not None:
+            resource.finalizer()
+
+    def destroy_particles(self, drawable: 'ParticlesDrawable'):
+        resource = self.particles.pop(drawable, None)
+        if resource is not None:
+            resource.finalizer()
+
+    def request_redraw(self):
+        if self.frame_rate_policy is not None:
+            self.frame_rate_policy.request_redraw()
+
+    def is_frame_throttled(self) -> bool:
+        return self.frame_rate_policy is not None and self.frame_rate_policy.throttled
+
+    # ---- FRAME CAPTURE METHODS ----
+
+    def stop_capture(self):
+        super().stop_capture()
+        # The buffers are released with the OpenGL context if the window is already closed.
+        if self.frame_reader is not None and self.window.context is not None:
+            self.frame_reader.delete()
+        self.frame_reader = None
+
+    def read_frame(self) -> numpy.ndarray | None:
+        width, height = self.window.get_framebuffer_size()
+        reader = self.frame_reader
+        if reader is not None and (reader.width, reader.height) != (width, height):
+            reader.delete()
+            reader = None
+        if reader is None:
+            reader = self.frame_reader = PygletFrameReader(width, height)
+        return reader.read()
+
+    # ---- DIAGNOSTIC METHODS ----
+
+    def get_resource_usage(self) -> dict[str, ResourceUsage]:
+        from kizuna.core.assets import BitmapFontAsset, FontAsset, ImageAsset
+
+        textures = ResourceUsage()
+        fonts = ResourceUsage()
+        for asset, pyglet_asset in self.assets.items():
+            if isinstance(asset, ImageAsset):
+                textures.count += 1
+                textures.estimated_bytes += pyglet_asset.width * pyglet_asset.height * 4
+            elif isinstance(asset, FontAsset):
+                fonts.count += 1
+                fonts.estimated_bytes += sum(glyph.width * glyph.height * 4 for glyph in pyglet_asset.glyphs.values())
+            elif isinstance(asset, BitmapFontAsset):
+                fonts.count += 1
+                fonts.estimated_bytes += sum(glyph.width * glyph.height * 4 for glyph in asset.glyphs.values())
+
+        return {
+            'sprites': ResourceUsage(len(self.sprites), len(self.sprites) * ESTIMATED_SPRITE_BYTES),
+            'texts': ResourceUsage(len(self.texts), sum(
+                ESTIMATED_LABEL_BYTES + len(resource.pyglet_object.text) * ESTIMATED_GLYPH_BYTES
+                for resource in self.texts.values()
+            )),
+            'bitmap_texts': ResourceUsage(len(self.bitmap_texts), sum(
+                resource.pyglet_object.count * ESTIMATED_VERTEX_BYTES
+                for resource in self.bitmap_texts.values() if resource.pyglet_object is not None
+            )),
+            'tile_chunks': ResourceUsage(len(self.tile_chunks), sum(
+                resource.pyglet_object.count * ESTIMATED_VERTEX_BYTES
+                for resource in self.tile_chunks.values() if resource.pyglet_object is not None
+            )),
+            'particles': ResourceUsage(len(self.particles), sum(
+                resource.pyglet_object.count * ESTIMATED_VERTEX_BYTES
+                for resource in self.particles.values() if resource.pyglet_object is not None
+            )),
+            'batches': ResourceUsage(len(self.batches), len(self.batches) * ESTIMATED_BATCH_BYTES),
+            'textures': textures,
+            'fonts': fonts,
+        }
 
     # ---- PRIVATE METHODS ----
 
-    def _get_or_create_batch(self, batch: 'DrawBatch'):
-        if batch not in self.batches:
-            self.batches[batch] = pyglet.graphics.Batch()
+    def _draw_shared_batches(self, batches: Sequence['DrawBatch']):
+        if len(batches) == 1:
+            self.draw_batch(batches[0])
+        elif batches:
+            self.statistics.batch_draws += 1
+            self._share_batch(batches).draw()
+
+    def _has_frame_changed(self) -> bool:
+        # The statistics of the frame were recorded at the end of draw_fn.
+        last_frame = self.statistics.get_last_frame()
+        return any(last_frame[name] for name in FRAME_CHANGE_COUNTERS)
+
+    def _assign_batch(self, resource: PygletResource, batch: 'DrawBatch') -> pyglet.graphics.Batch:
+        if resource.batch is not batch:
+            self._acquire_batch(batch)
+            self._touch(batch)
+            if resource.batch is not None:
+                self._touch(resource.batch)
+                self._release_batch(resource.batch)
+            resource.batch = batch
         return self.batches[batch]
 
-    def _get_or_create_sprite(self, drawable: 'SpriteDrawable'):
-        if drawable not in self.sprites:
-            self.sprites[drawable] = pyglet.sprite.Sprite(self.assets[drawable.asset])
-        return self.sprites[drawable]
+    def _acquire_batch(self, batch: 'DrawBatch'):
+        if batch not in self.batches:
+            pyglet_batch = self.batches[batch] = pyglet.graphics.Batch()
+            self.batch_members[pyglet_batch] = {batch}
+            self.layer_groups[batch] = PygletLayerGroup()
+            self.batch_users[batch] = 0
+        self.batch_users[batch] += 1
+
+    def _release_batch(self, batch: 'DrawBatch'):
+        self.batch_users[batch] -= 1
+        if self.batch_users[batch] == 0:
+            pyglet_batch = self.batches.pop(batch)
+            members = self.batch_members[pyglet_batch]
+            members.discard(batch)
+            if not members:
+                del self.batch_members[pyglet_batch]
+            del self.batch_users[batch]
+            del self.layer_groups[batch]
+            baked = self.baked_batches.pop(batch, None)
+            if baked is not None:
+                baked.delete()
+
+    def _share_batch(self, batches: Sequence['DrawBatch']) -> pyglet.graphics.Batch:
+        # Move the drawables of the given batches to a Pyglet batch of their own, unless they already share one.
+        pyglet_batch = self.batches[batches[0]]
+        shared = len(self.batch_members[pyglet_batch]) == len(batches) and all(
+            self.batches[batch] is pyglet_batch for batch in batches
+        )
+        if not shared:
+            pyglet_batch = pyglet.graphics.Batch()
+            old_pyglet_batches = {batch: self.batches[batch] for batch in batches}
+            for resources in (self.sprites, self.texts, self.bitmap_texts, self.tile_chunks, self.particles):
+                for resource in resources.values():
+                    pyglet_object = resource.pyglet_object
+                    old_pyglet_batch = old_pyglet_batches.get(resource.batch)
+                    if pyglet_object is None or old_pyglet_batch is None:
+                        continue
+                    if isinstance(pyglet_object, (pyglet.sprite.Sprite, pyglet.text.Label)):
+                        pyglet_object.batch = pyglet_batch
+                    else:
+                        old_pyglet_batch.migrate(pyglet_object, pyglet.gl.GL_TRIANGLES, resource.group, pyglet_batch)
+            for batch, old_pyglet_batch in old_pyglet_batches.items():
+                members = self.batch_members[old_pyglet_batch]
+                members.discard(batch)
+                if not members:
+                    del self.batch_members[old_pyglet_batch]
+                self.batches[batch] = pyglet_batch
+            self.batch_members[pyglet_batch] = set(batches)
+            self.statistics.batch_merges += 1
+
+        # Order the layers as the batches are given.
+        reordered = False
+        for order, batch in enumerate(batches):
+            reordered |= self.layer_groups[batch].set_order(order)
+        if reordered:
+            pyglet_batch.invalidate()
+        return pyglet_batch
+
+    def _bake_batch(
+        self,
+        baked: PygletBakedBatch,
+        pyglet_batch: pyglet.graphics.Batch,
+        left: float,
+        bottom: float,
+        width: float,
+        height: float,
+    ):
+        # Render the region of the stage to the texture, with a projection covering the whole texture.
+        window = self.window
+        view, projection = window.view, window.projection
+        clear_color = (pyglet.gl.GLfloat * 4)()
+        pyglet.gl.glGetFloatv(pyglet.gl.GL_COLOR_CLEAR_VALUE, clear_color)
+        baked.framebuffer.bind()
+        pyglet.gl.glViewport(0, 0, baked.texture.width, baked.texture.height)
+        window.projection = pyglet.math.Mat4.orthogonal_projection(0.0, width, 0.0, height, -255.0, 255.0)
+        window.view = pyglet.math.Mat4.from_translation(pyglet.math.Vec3(-left, -bottom, 0.0))
+        pyglet.gl.glClearColor(0.0, 0.0, 0.0, 0.0)
+        pyglet.gl.glClear(pyglet.gl.GL_COLOR_BUFFER_BIT)
+        pyglet_batch.draw()
+        baked.framebuffer.unbind()
+        window.view, window.projection = view, projection
+        pyglet.gl.glViewport(0, 0, *window.get_framebuffer_size())
+        pyglet.gl.glClearColor(*clear_color)
+        self.statistics.static_batch_renders += 1
+
+    def _touch(self, batch: 'DrawBatch | None'):
+        # Mark the rendering of a static batch as outdated after one of its drawables changed.
+        baked = self.baked_batches.get(batch)
+        if baked is not None:
+            baked.dirty = True
+
+    def _track(self, drawable: 'Drawable', resource: PygletResource) -> PygletResource:
+        # The finalizer must not reference the drawable, or it would never be garbage collected.
+        resource.finalizer = weakref.finalize(drawable, self._release, resource)
+        return resource
+
+    def _release(self, resource: PygletResource):
+        pyglet_object = resource.pyglet_object
+        if pyglet_object is not None:
+            if isinstance(pyglet_object, pyglet.sprite.Sprite):
+                self.statistics.sprites_deleted += 1
+            elif isinstance(pyglet_object, pyglet.text.Label):
+                self.statistics.labels_deleted += 1
+            else:
+                self.statistics.vertex_lists_deleted += 1
+            pyglet_object.delete()
+            resource.pyglet_object = None
+        if resource.batch is not None:
+            self._touch(resource.batch)
+            self._release_batch(resource.batch)
+            resource.batch = None
+        resource.revision = None
+        resource.contents = None
+        resource.group = None
+        resource.hidden = False
+
+    def _set_mesh_hidden(self, resource: PygletResource, hidden: bool):
+        # Meshes use the sprite shader, so a zero scale collapses every quad without touching the other attributes.
+        if resource.pyglet_object is not None and resource.hidden != hidden:
+            numpy.ctypeslib.as_array(resource.pyglet_object.scale)[:] = 0.0 if hidden else 1.0
+            resource.hidden = hidden
+            self.statistics.vertex_list_updates += 1
+            self._touch(resource.batch)
+
+    def _build_tile_chunk(
+        self,
+        drawable: 'TileChunkDrawable',
+        pyglet_batch: pyglet.graphics.Batch,
+        group: pyglet.sprite.SpriteGroup,
+    ) -> pyglet.graphics.vertexdomain.VertexList:
+        # The region of the tileset image inside its texture is given by its tex coords.
+        pyglet_image = self.assets[drawable.asset]
+        u0, v0, r = pyglet_image.tex_coords[0:3]
+        u1, v1 = pyglet_image.tex_coords[6:8]
+        u_per_pixel = (u1 - u0) / pyglet_image.width
+        v_per_pixel = (v1 - v0) / pyglet_image.height
+        tile_width, tile_height = drawable.tile_size
+        tileset_columns = pyglet_image.width // tile_width
+        tile_u = tile_width * u_per_pixel
+        tile_v = tile_height * v_per_pixel
+
+        positions = []
+        tex_coords = []
+        indices = []
+        columns = drawable.columns
+        vertex_count = 0
+        for i, tile in enumerate(drawable.tiles):
+            if tile < 0:
+                continue
+            x = (i % columns) * tile_width
+            y = (i // columns) * tile_height
+            x2 = x + tile_width
+            y2 = y + tile_height
+            positions += (x, y, 0.0, x2, y, 0.0, x2, y2, 0.0, x, y2, 0.0)
+            u = u0 + (tile % tileset_columns) * tile_u
+            v = v1 - (tile // tileset_columns + 1) * tile_v
+            tex_coords += (u, v, r, u + tile_u, v, r, u + tile_u, v + tile_v, r, u, v + tile_v, r)
+            n = vertex_count
+            indices += (n, n + 1, n + 2, n, n + 2, n + 3)
+            vertex_count += 4
+
+        program = pyglet.sprite.get_default_shader()
+        self.statistics.vertex_lists_created += 1
+        return program.vertex_list_indexed(
+            vertex_count, pyglet.gl.GL_TRIANGLES, indices, pyglet_batch, group,
+            position=('f', positions),
+            colors=('Bn', (255, 255, 255, 255) * vertex_count),
+            translate=('f', (drawable.position.x, drawable.position.y, 0.0) * vertex_count),
+            scale=('f', (1.0, 1.0) * vertex_count),
+            rotation=('f', (0.0,) * vertex_count),
+            tex_coords=('f', tex_coords),
+        )
+
+    def _create_mesh_group(self, texture: pyglet.image.Texture, batch: 'DrawBatch') -> pyglet.sprite.SpriteGroup:
+        # Meshes are drawn with the sprite shader so that they share groups (and therefore draw calls) with sprites
+        # using the same texture in the same batch.
+        return pyglet.sprite.SpriteGroup(
+            texture, pyglet.gl.GL_SRC_ALPHA, pyglet.gl.GL_ONE_MINUS_SRC_ALPHA, pyglet.sprite.get_default_shader(),
+            self.layer_groups[batch],
+        )
+
+    def _get_or_create_sprite(self, drawable: 'SpriteDrawable') -> PygletResource:
+        resource = self.sprites.get(drawable)
+        if resource is None:
+            resource = self._track(drawable, PygletResource(pyglet.sprite.Sprite(self.assets[drawable.asset])))
+            self.sprites[drawable] = resource
+            self.statistics.sprites_created += 1
+        return resource
+
+    def _get_or_create_text(self, drawable: 'TextDrawable') -> PygletResource:
+        resource = self.texts.get(drawable)
+        if resource is None:
+            resource = self._track(drawable, PygletResource(pyglet.text.Label()))
+            self.texts[drawable] = resource
+            self.statistics.labels_created += 1
+        return resource
+
+    def _create_particles_vertex_list(
+        self,
+        drawable: 'ParticlesDrawable',
+        pyglet_batch: pyglet.graphics.Batch,
+        group: pyglet.sprite.SpriteGroup,
+    ) -> pyglet.graphics.vertexdomain.IndexedVertexList:
+        # Particles use the sprite shader: the quad corners are fixed, and each particle moves through "translate".
+        pyglet_image = self.assets[drawable.asset]
+        capacity = drawable.capacity
+        program = pyglet.sprite.get_default_shader()
+        indices = (numpy.arange(capacity)[:, numpy.newaxis] * 4 + (0, 1, 2, 0, 2, 3)).ravel().tolist()
+        vertex_list = program.vertex_list_indexed(
+            capacity * 4, pyglet.gl.GL_TRIANGLES, indices, pyglet_batch, group,
+            position='f', colors='Bn', translate='f', scale='f', rotation='f', tex_coords='f',
+        )
+        self.statistics.vertex_lists_created += 1
+
+        x1 = -pyglet_image.anchor_x
+        y1 = -pyglet_image.anchor_y
+        x2 = x1 + pyglet_image.width
+        y2 = y1 + pyglet_image.height
+        position = numpy.ctypeslib.as_array(vertex_list.position).reshape(-1, 12)
+        position[:] = (x1, y1, 0.0, x2, y1, 0.0, x2, y2, 0.0, x1, y2, 0.0)
+        tex_coords = numpy.ctypeslib.as_array(vertex_list.tex_coords).reshape(-1, 12)
+        tex_coords[:] = pyglet_image.tex_coords
+        numpy.ctypeslib.as_array(vertex_list.translate)[:] = 0.0
+        numpy.ctypeslib.as_array(vertex_list.scale)[:] = 0.0
+        return vertex_list
+
+    def _create_bitmap_text_vertex_list(
+        self,
+        length: int,
+        pyglet_batch: pyglet.graphics.Batch,
+        group: pyglet.sprite.SpriteGroup,
+    ) -> pyglet.graphics.vertexdomain.IndexedVertexList:
+        # Room is left for longer texts, so that texts growing a character at a time are not rebuilt every time.
+        capacity = 8
+        while capacity < length:
+            capacity *= 2
+        program = pyglet.sprite.get_default_shader()
+        indices = (numpy.arange(capacity)[:, numpy.newaxis] * 4 + (0, 1, 2, 0, 2, 3)).ravel().tolist()
+        vertex_list = program.vertex_list_indexed(
+            capacity * 4, pyglet.gl.GL_TRIANGLES, indices, pyglet_batch, group,
+            position='f', colors='Bn', translate='f', scale='f', rotation='f', tex_coords='f',
+        )
+        self.statistics.vertex_lists_created += 1
+        numpy.ctypeslib.as_array(vertex_list.position)[:] = 0.0
+        numpy.ctypeslib.as_array(vertex_list.colors)[:] = 255
+        numpy.ctypeslib.as_array(vertex_list.scale)[:] = 1.0
+        numpy.ctypeslib.as_array(vertex_list.rotation)[:] = 0.0
+        return vertex_list
 
-    def _get_or_create_text(self, drawable: 'TextDrawable'):
-        if drawable not in self.texts:
-            self.texts[drawable] = pyglet.text.Label()
-        return self.texts[drawable]
+    @staticmethod
+    def _get_vertex_region(
+        vertex_list: pyglet.graphics.vertexdomain.VertexList,
+        attribute: str,
+        start: int,
+        count: int,
+    ) -> numpy.ndarray:
+        # Unlike the attribute properties of vertex lists, which mark the whole list as changed, this only marks the
+        # given vertices, so that only they are uploaded.
+        buffer = vertex_list.domain.attrib_name_buffers[attribute]
+        region = buffer.get_region(vertex_list.start + start, count)
+        buffer.invalidate_region(vertex_list.start + start, count)
+        return numpy.ctypeslib.as_array(region)
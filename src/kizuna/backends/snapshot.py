@@ -0,0 +1,588 @@
+import multiprocessing
+import queue
+import threading
+import time
+import weakref
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy
+import pyglet
+
+from kizuna.backends.base import Backend, ResourceUsage
+from kizuna.backends.pyglet import configure_resource_path, resolve_resource_name
+from kizuna.management.exceptions import (
+    SimulationProcessLostError, SimulationProcessUnsupportedError, SimulationSnapshotOverflowError,
+)
+
+if TYPE_CHECKING:
+    from kizuna.core.assets import Asset, ImageAsset, FontAsset, BitmapFontAsset
+    from kizuna.core.controllers import Controller
+    from kizuna.core.datatypes import IVector2, Vector2
+    from kizuna.config import Settings
+    from kizuna.rendering import (
+        DrawBatch, Drawable, TextDrawable, BitmapTextDrawable, SpriteDrawable, TileChunkDrawable, ParticlesDrawable,
+    )
+    from kizuna.systems.input import InputController
+
+
+# Drawing commands recorded in a snapshot. Each row of a snapshot is one command.
+COMMAND_SPRITE = 1
+COMMAND_TEXT = 2
+COMMAND_VIEW = 3
+COMMAND_DRAW = 4
+
+SNAPSHOT_ROW_DTYPE = numpy.dtype([
+    ('command', numpy.uint8),
+    ('visible', numpy.uint8),
+    ('batch', numpy.uint32),
+    ('drawable', numpy.uint32),
+    ('asset', numpy.uint32),
+    ('x', numpy.float32),
+    ('y', numpy.float32),
+    ('rotation', numpy.float32),
+])
+"""Layout of a row of a snapshot.
+"""
+
+# Header fields: index of the front buffer, sequence number of the last snapshot published, and number of rows of each
+# buffer.
+HEADER_FRONT = 0
+HEADER_SEQUENCE = 1
+HEADER_COUNTS = 2
+HEADER_LENGTH = 4
+
+# Seconds the render process waits for a description used by a snapshot before giving up on the simulation process.
+SNAPSHOT_MESSAGE_TIMEOUT = 5.0
+
+
+class SnapshotBuffer:
+    """Double buffer in shared memory holding the drawing commands of the latest frame of the simulation.
+
+    The simulation process writes each frame to the back buffer and then swaps the buffers, while the render process
+    copies the front buffer out of shared memory. Only the swap and the copy take the lock, so the simulation never
+    waits for the render process to draw, and vice versa.
+
+    The rows are copied rather than read in place: the front buffer becomes the back buffer at the next swap and is
+    overwritten by the following snapshot, so reading it in place would hold the lock for the whole replay. The copy
+    is a single bulk copy, much faster than converting the rows to tuples, which is done after the lock is released.
+    """
+
+    def __init__(self, capacity: int, name: str | None = None, lock: Any = None):
+        """Create a new buffer, or attach to an existing one.
+
+        :param capacity: The maximum number of rows of each snapshot.
+        :param name: The name of the shared memory block to attach to. If not given, a new block is created.
+        :param lock: The lock shared by both processes. If not given, a new lock is created.
+        """
+        self.capacity = capacity
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        header_bytes = HEADER_LENGTH * numpy.dtype(numpy.int64).itemsize
+        self._owner = name is None
+        self._memory = SharedMemory(
+            name=name, create=self._owner, size=header_bytes + 2 * capacity * SNAPSHOT_ROW_DTYPE.itemsize,
+        )
+        self._header = numpy.ndarray((HEADER_LENGTH,), dtype=numpy.int64, buffer=self._memory.buf)
+        self._rows = numpy.ndarray(
+            (2, capacity), dtype=SNAPSHOT_ROW_DTYPE, buffer=self._memory.buf, offset=header_bytes,
+        )
+        if self._owner:
+            self._header[:] = 0
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'SnapshotBuffer("{self.name}", capacity={self.capacity}, sequence={self.sequence})'
+
+    @property
+    def name(self) -> str:
+        """Get the name of the shared memory block, used to attach to the buffer from another process.
+        """
+        return self._memory.name
+
+    @property
+    def sequence(self) -> int:
+        """Get the sequence number of the latest snapshot published. It is zero until the first one is published.
+        """
+        return int(self._header[HEADER_SEQUENCE])
+
+    def publish(self, rows: list[tuple]) -> int:
+        """Write a snapshot to the back buffer and make it the front buffer.
+
+        Only one process may publish snapshots.
+
+        :param rows: The rows of the snapshot, following :data:`SNAPSHOT_ROW_DTYPE`.
+        :return: The sequence number of the snapshot.
+        :raise SimulationSnapshotOverflowError: If there are more rows than the capacity of the buffer.
+        """
+        count = len(rows)
+        if count > self.capacity:
+            raise SimulationSnapshotOverflowError(count, self.capacity)
+
+        # The reader never looks at the back buffer, so it can be written without the lock.
+        back = 1 - int(self._header[HEADER_FRONT])
+        if count > 0:
+            self._rows[back, :count] = numpy.array(rows, dtype=SNAPSHOT_ROW_DTYPE)
+        with self.lock:
+            self._header[HEADER_COUNTS + back] = count
+            self._header[HEADER_FRONT] = back
+            self._header[HEADER_SEQUENCE] += 1
+            return int(self._header[HEADER_SEQUENCE])
+
+    def read(self, last_sequence: int) -> tuple[int, list[tuple]] | None:
+        """Read the front buffer if a snapshot newer than the given one has been published.
+
+        :param last_sequence: The sequence number of the last snapshot read.
+        :return: The sequence number and rows of the latest snapshot, or ``None`` if there is no newer snapshot.
+        """
+        with self.lock:
+            sequence = int(self._header[HEADER_SEQUENCE])
+            if sequence == last_sequence:
+                return None
+            front = int(self._header[HEADER_FRONT])
+            count = int(self._header[HEADER_COUNTS + front])
+            # Converting the rows to tuples is much slower than copying them, so it is done after the lock is
+            # released, and the publisher is not kept waiting.
+            rows = numpy.copy(self._rows[front, :count])
+        return sequence, rows.tolist()
+
+    def close(self):
+        """Detach from the shared memory block, and free it if this buffer created it.
+        """
+        # Views of the block must be released before closing it.
+        del self._header
+        del self._rows
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+
+class SnapshotBackend(Backend):
+    """Backend used by the simulation process when the ``SIMULATION_MODE`` setting is ``'process'``.
+
+    It does not draw anything. Instead, the commands of each frame are recorded into a :class:`SnapshotBuffer`, and
+    a :class:`SnapshotPlayer` replays them with the actual backend in the render process. Assets, batches and texts
+    are described to the render process through a message queue the first time they are used or when they change.
+
+    The render process skips the snapshots published while it is busy, so each snapshot holds the complete state of
+    the frame: the last row recorded for every drawable is repeated in every snapshot until the drawable is
+    destroyed, even if it was not prepared again. A drawable hidden once stays hidden after a skipped snapshot.
+
+    Only sprites and texts can be drawn in this mode. Bitmap fonts, bitmap texts, tile maps and particles raise
+    :class:`~kizuna.management.exceptions.SimulationProcessUnsupportedError` when they are loaded or drawn, and must be
+    drawn by controllers that run in the render process instead.
+    """
+    # Ids given to every asset, batch and drawable recorded, shared with the render process.
+    asset_ids: dict['Asset', int]
+    batch_ids: dict['DrawBatch', int]
+    drawable_ids: weakref.WeakKeyDictionary['Drawable', int]
+
+    # Last priority and revision of each batch and last text of each text drawable sent to the render process.
+    batch_states: dict['DrawBatch', tuple[int, int]]
+    texts: dict[int, str]
+
+    image_sizes: dict['ImageAsset', 'IVector2']
+    finalizers: dict[int, weakref.finalize]
+
+    # Last row recorded for each drawable, and view and draw commands of the frame being recorded.
+    _drawable_rows: dict[int, tuple]
+    _commands: list[tuple]
+
+    # ---- KIZUNA LIFECYCLE METHODS ----
+
+    def __init__(
+        self,
+        settings: 'Settings',
+        buffer: SnapshotBuffer,
+        messages: multiprocessing.Queue,
+        inputs: multiprocessing.Queue,
+        stop_event: threading.Event,
+    ):
+        """Create the backend.
+
+        :param settings: The settings of the project.
+        :param buffer: The buffer snapshots are published to.
+        :param messages: The queue to send asset, batch and text descriptions to the render process.
+        :param inputs: The queue to receive input events from the render process.
+        :param stop_event: The event that is set when the game loop must end.
+        """
+        super().__init__(settings)
+        self.buffer = buffer
+        self.messages = messages
+        self.inputs = inputs
+        self.stop_event = stop_event
+        self.asset_ids = {}
+        self.batch_ids = {}
+        self.drawable_ids = weakref.WeakKeyDictionary()
+        self.batch_states = {}
+        self.texts = {}
+        self.image_sizes = {}
+        self.finalizers = {}
+        self.standalone = False
+        self._next_id = 1
+        self._drawable_rows = {}
+        self._commands = []
+
+    def initialize(self, base_directory: Path, standalone: bool):
+        self.standalone = standalone
+        configure_resource_path(base_directory, standalone)
+
+    def launch_game_loop(
+        self,
+        step_fn: Callable[[float], None],
+        draw_fn: Callable[[], None],
+        controllers: list['Controller'],
+    ):
+        from kizuna.systems.input import InputController
+
+        input_controller = next((ctr for ctr in controllers if isinstance(ctr, InputController)), None)
+        step_interval = 1 / self.settings.STEPS_PER_SECOND
+        frame_interval = 1 / self.settings.FRAMES_PER_SECOND
+        last_step = next_step = next_frame = time.perf_counter()
+
+        while not self.stop_event.is_set():
+            now = time.perf_counter()
+            if now < next_step:
+                self.stop_event.wait(next_step - now)
+                continue
+
+            # Step with the actual time passed, and skip steps rather than catching up if the simulation falls behind.
+            self._receive_inputs(input_controller)
+            step_fn(now - last_step)
+            last_step = now
+            next_step = max(next_step + step_interval, now)
+
+            # Publish a frame at most at the frame rate, since the render process cannot show more.
+            if now >= next_frame:
+                draw_fn()
+                self.buffer.publish(self._take_snapshot())
+                next_frame = max(next_frame + frame_interval, now)
+
+    # ---- ASSET LOADING METHODS ----
+
+    def load_image_asset(self, asset: 'ImageAsset'):
+        from kizuna.core.datatypes import IVector2
+
+        # Decode the image without creating a texture, only to know its size.
+        name = resolve_resource_name(asset._path, self.standalone)
+        with pyglet.resource.file(name) as file:
+            image = pyglet.image.load(name, file=file)
+        self.image_sizes[asset] = IVector2(image.width, image.height)
+        self.statistics.textures_loaded += 1
+        self.statistics.texture_bytes_loaded += image.width * image.height * 4
+        asset_id = self.asset_ids[asset] = self._generate_id()
+        self.messages.put(('image', asset_id, str(asset.path), tuple(asset.origin)))
+
+    def load_font_asset(self, asset: 'FontAsset'):
+        asset_id = self.asset_ids[asset] = self._generate_id()
+        self.messages.put(('font', asset_id, str(asset.path), asset.family_name, asset.size))
+
+    def load_bitmap_font_asset(self, asset: 'BitmapFontAsset'):
+        raise SimulationProcessUnsupportedError('Bitmap fonts')
+
+    def get_image_size(self, asset: 'ImageAsset') -> 'IVector2':
+        return self.image_sizes[asset]
+
+    # ---- PRE-DRAWING METHODS ----
+
+    def prepare_draw_text(self, drawable: 'TextDrawable', batch: 'DrawBatch'):
+        drawable_id = self._get_drawable_id(drawable)
+        if self.texts.get(drawable_id) != drawable.text:
+            self.texts[drawable_id] = drawable.text
+            self.messages.put(('text', drawable_id, drawable.text))
+        self._drawable_rows[drawable_id] = (
+            COMMAND_TEXT, drawable.visible and not drawable.culled, self._get_batch_id(batch), drawable_id,
+            self.asset_ids[drawable.font], drawable.position.x, drawable.position.y, 0.0,
+        )
+
+    def prepare_draw_bitmap_text(self, drawable: 'BitmapTextDrawable', batch: 'DrawBatch'):
+        raise SimulationProcessUnsupportedError('Bitmap texts')
+
+    def prepare_draw_sprite(self, drawable: 'SpriteDrawable', batch: 'DrawBatch'):
+        drawable_id = self._get_drawable_id(drawable)
+        self._drawable_rows[drawable_id] = (
+            COMMAND_SPRITE, drawable.visible and not drawable.culled, self._get_batch_id(batch), drawable_id,
+            self.asset_ids[drawable.asset], drawable.position.x, drawable.position.y, drawable.rotation,
+        )
+
+    def prepare_draw_tile_chunk(self, drawable: 'TileChunkDrawable', batch: 'DrawBatch'):
+        raise SimulationProcessUnsupportedError('Tile maps')
+
+    def prepare_draw_particles(self, drawable: 'ParticlesDrawable', batch: 'DrawBatch'):
+        raise SimulationProcessUnsupportedError('Particles')
+
+    # ---- DRAWING METHODS ----
+
+    def set_view_offset(self, offset: 'Vector2'):
+        self._commands.append((COMMAND_VIEW, 0, 0, 0, 0, offset.x, offset.y, 0.0))
+
+    def draw_batch(self, batch: 'DrawBatch'):
+        self.statistics.batch_draws += 1
+        self._commands.append((COMMAND_DRAW, 0, self._get_batch_id(batch), 0, 0, 0.0, 0.0, 0.0))
+
+    # ---- DRAWABLE DESTRUCTION METHODS ----
+
+    def destroy_text(self, drawable: 'TextDrawable'):
+        self._forget(drawable)
+
+    def destroy_bitmap_text(self, drawable: 'BitmapTextDrawable'):
+        self._forget(drawable)
+
+    def destroy_sprite(self, drawable: 'SpriteDrawable'):
+        self._forget(drawable)
+
+    def destroy_tile_chunk(self, drawable: 'TileChunkDrawable'):
+        self._forget(drawable)
+
+    def destroy_particles(self, drawable: 'ParticlesDrawable'):
+        self._forget(drawable)
+
+    # ---- DIAGNOSTIC METHODS ----
+
+    def get_resource_usage(self) -> dict[str, ResourceUsage]:
+        rows = len(self._drawable_rows) + len(self._commands)
+        return {
+            'drawables': ResourceUsage(len(self.drawable_ids)),
+            'batches': ResourceUsage(len(self.batch_ids)),
+            'snapshot': ResourceUsage(rows, rows * SNAPSHOT_ROW_DTYPE.itemsize),
+        }
+
+    # ---- PRIVATE METHODS ----
+
+    def _generate_id(self) -> int:
+        generated_id = self._next_id
+        self._next_id += 1
+        return generated_id
+
+    def _take_snapshot(self) -> list[tuple]:
+        rows = [*self._drawable_rows.values(), *self._commands]
+        self._commands = []
+        return rows
+
+    def _get_batch_id(self, batch: 'DrawBatch') -> int:
+        batch_id = self.batch_ids.get(batch)
+        if batch_id is None:
+            batch_id = self.batch_ids[batch] = self._generate_id()
+        state = batch.priority, batch.revision
+        if self.batch_states.get(batch) != state:
+            self.batch_states[batch] = state
+            self.messages.put(('batch', batch_id, batch.name, batch.priority, batch.static, batch.revision))
+        return batch_id
+
+    def _get_drawable_id(self, drawable: 'Drawable') -> int:
+        drawable_id = self.drawable_ids.get(drawable)
+        if drawable_id is None:
+            drawable_id = self.drawable_ids[drawable] = self._generate_id()
+            # The finalizer must not reference the drawable, or it would never be garbage collected.
+            self.finalizers[drawable_id] = weakref.finalize(drawable, self._send_destroy, drawable_id)
+        return drawable_id
+
+    def _forget(self, drawable: 'Drawable'):
+        drawable_id = self.drawable_ids.pop(drawable, None)
+        if drawable_id is not None:
+            self.finalizers[drawable_id]()
+
+    def _send_destroy(self, drawable_id: int):
+        # The drawable may still be part of the snapshot being recorded, but not of any snapshot after it.
+        del self.finalizers[drawable_id]
+        self.texts.pop(drawable_id, None)
+        self._drawable_rows.pop(drawable_id, None)
+        self.messages.put(('destroy', drawable_id, self.buffer.sequence + 2))
+
+    def _receive_inputs(self, input_controller: 'InputController | None'):
+        while True:
+            try:
+                event = self.inputs.get_nowait()
+            except queue.Empty:
+                return
+            if input_controller is not None:
+                input_controller.push_event(event)
+
+
+class SnapshotPlayer:
+    """Replays the frames recorded by a :class:`SnapshotBackend` with the backend of the render process.
+
+    The player keeps a copy of every drawable recorded by the simulation process. Copies are only prepared again when
+    a new snapshot changes their row, so frames drawn between two snapshots only draw the batches. Copies missing from
+    the snapshot applied are hidden, since each snapshot holds every drawable that is not destroyed.
+    """
+
+    def __init__(
+        self,
+        buffer: SnapshotBuffer,
+        messages: multiprocessing.Queue,
+        message_timeout: float = SNAPSHOT_MESSAGE_TIMEOUT,
+    ):
+        """Create a new player.
+
+        :param buffer: The buffer snapshots are read from.
+        :param messages: The queue to receive asset, batch and text descriptions from the simulation process.
+        :param message_timeout: The seconds to wait for a description used by a snapshot that has not arrived yet.
+        """
+        self.buffer = buffer
+        self.messages = messages
+        self.message_timeout = message_timeout
+        self.sequence = 0
+        self.assets: dict[int, 'Asset'] = {}
+        self.batches: dict[int, 'DrawBatch'] = {}
+        self.drawables: dict[int, 'Drawable'] = {}
+        self.texts: dict[int, str] = {}
+        # Ids of destroyed drawables, mapped to the first snapshot that no longer includes them. Until that snapshot
+        # is reached, they are skipped so that older snapshots do not create them again.
+        self._destroyed: dict[int, int] = {}
+        # Last row applied to each copy, to skip the rows that did not change and to hide the copies that are missing.
+        self._applied: dict[int, tuple] = {}
+        self._draw_commands: list[tuple] = []
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'SnapshotPlayer(sequence={self.sequence}, drawables={len(self.drawables)})'
+
+    def receive_messages(self):
+        """Process every message sent by the simulation process so far.
+        """
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                return
+            self._process_message(message)
+
+    def play(self):
+        """Prepare the drawables of the latest snapshot, if it has not been played yet, and draw its batches.
+
+        :raise SimulationProcessLostError: If the snapshot uses an asset or batch whose description never arrives.
+        """
+        from kizuna.config import settings
+        from kizuna.core.datatypes import Vector2
+
+        self.receive_messages()
+        snapshot = self.buffer.read(self.sequence)
+        if snapshot is not None:
+            self.sequence, rows = snapshot
+            self._draw_commands = self._prepare(rows)
+
+        # Batches drawn one after another with the same view offset are drawn together.
+        backend = settings.backend
+        batches = []
+        for command, x, y, batch_id in self._draw_commands:
+            if command == COMMAND_VIEW:
+                backend.draw_batches(batches)
+                batches.clear()
+                backend.set_view_offset(Vector2(x, y))
+            else:
+                batches.append(self.batches[batch_id])
+        backend.draw_batches(batches)
+
+    def close(self):
+        """Destroy the copies of every drawable.
+        """
+        for drawable in self.drawables.values():
+            drawable.on_destroy()
+        self.drawables.clear()
+        self._applied.clear()
+
+    def _prepare(self, rows: list[tuple]) -> list[tuple]:
+        from kizuna.core.datatypes import Vector2
+        from kizuna.rendering import SpriteDrawable, TextDrawable
+
+        draw_commands = []
+        drawables = self.drawables
+        destroyed = self._destroyed
+        applied = self._applied
+        missing = set(applied)
+        for row in rows:
+            command, visible, batch_id, drawable_id, asset_id, x, y, rotation = row
+            if drawable_id in destroyed:
+                continue
+            if command == COMMAND_SPRITE or command == COMMAND_TEXT:
+                missing.discard(drawable_id)
+                if applied.get(drawable_id) == row:
+                    continue
+                applied[drawable_id] = row
+            if command == COMMAND_SPRITE:
+                drawable = drawables.get(drawable_id)
+                if drawable is None:
+                    drawable = drawables[drawable_id] = SpriteDrawable(
+                        self._get(self.assets, asset_id), (x, y), rotation,
+                    )
+                else:
+                    drawable.position = Vector2(x, y)
+                    drawable.rotation = rotation
+                drawable.visible = bool(visible)
+                drawable.on_prepare_draw(self._get(self.batches, batch_id))
+            elif command == COMMAND_TEXT:
+                drawable = drawables.get(drawable_id)
+                if drawable is None:
+                    drawable = drawables[drawable_id] = TextDrawable(
+                        self.texts.get(drawable_id, ''), (x, y), self._get(self.assets, asset_id),
+                    )
+                else:
+                    drawable.position = Vector2(x, y)
+                    drawable.text = self.texts.get(drawable_id, drawable.text)
+                drawable.visible = bool(visible)
+                drawable.on_prepare_draw(self._get(self.batches, batch_id))
+            else:
+                if command == COMMAND_DRAW:
+                    self._get(self.batches, batch_id)
+                draw_commands.append((command, x, y, batch_id))
+
+        for drawable_id in missing:
+            # The copy may have been destroyed by a message received while applying the snapshot.
+            row = applied.pop(drawable_id, None)
+            drawable = drawables.get(drawable_id)
+            if row is not None and drawable is not None and drawable.visible:
+                drawable.visible = False
+                drawable.on_prepare_draw(self._get(self.batches, row[2]))
+
+        for drawable_id, sequence in list(destroyed.items()):
+            if self.sequence >= sequence:
+                del destroyed[drawable_id]
+        return draw_commands
+
+    def _get(self, table: dict[int, Any], item_id: int) -> Any:
+        # Messages are sent before the snapshots that use them, but they may still be on their way.
+        while item_id not in table:
+            try:
+                message = self.messages.get(timeout=self.message_timeout)
+            except queue.Empty:
+                raise SimulationProcessLostError(self.message_timeout) from None
+            self._process_message(message)
+        return table[item_id]
+
+    def _process_message(self, message: tuple):
+        from kizuna.core.assets import FontAsset, ImageAsset
+        from kizuna.rendering import DrawBatch
+
+        kind = message[0]
+        if kind == 'image':
+            _, asset_id, path, origin = message
+            self.assets[asset_id] = ImageAsset(path, origin=origin)
+        elif kind == 'font':
+            _, asset_id, path, family_name, size = message
+            self.assets[asset_id] = FontAsset(path, family_name=family_name, size=size)
+        elif kind == 'batch':
+            _, batch_id, name, priority, static, revision = message
+            batch = self.batches.get(batch_id)
+            if batch is None:
+                batch = self.batches[batch_id] = DrawBatch(priority, name, static)
+            batch.priority = priority
+            batch._revision = revision  # noqa
+        elif kind == 'text':
+            _, drawable_id, text = message
+            self.texts[drawable_id] = text
+            # The row of the text may not change, but it must be applied again.
+            self._applied.pop(drawable_id, None)
+        elif kind == 'destroy':
+            _, drawable_id, sequence = message
+            self.texts.pop(drawable_id, None)
+            self._applied.pop(drawable_id, None)
+            drawable = self.drawables.pop(drawable_id, None)
+            if drawable is not None:
+                drawable.on_destroy()
+            if self.sequence < sequence:
+                self._destroyed[drawable_id] = sequence
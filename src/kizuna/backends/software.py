@@ -0,0 +1,574 @@
+import math
+import posixpath
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Sequence
+
+import numpy
+import pyglet
+
+from kizuna.backends.base import Backend, ResourceUsage, to_vector_list
+from kizuna.backends.capture import encode_png
+from kizuna.backends.pyglet import configure_resource_path, resolve_resource_name
+
+if TYPE_CHECKING:
+    from kizuna.core.assets import Asset, ImageAsset, FontAsset, BitmapFontAsset
+    from kizuna.core.controllers import Controller
+    from kizuna.core.datatypes import IVector2, Vector2, Vector2Like
+    from kizuna.config import Settings
+    from kizuna.rendering import (
+        DrawBatch, Drawable, TextDrawable, BitmapTextDrawable, SpriteDrawable, TileChunkDrawable, ParticlesDrawable,
+    )
+
+
+# Kinds of items drawn by the software backend.
+ITEM_SPRITE = 0
+ITEM_BITMAP_TEXT = 1
+ITEM_TILE_CHUNK = 2
+ITEM_PARTICLES = 3
+ITEM_TEXT = 4
+
+# Texture coordinates given to glyphs before Pyglet's glyph renderers see them. Renderers that produce glyph images
+# from the top row swap the texture coordinates instead of the rows, which shows in the first coordinate.
+UNFLIPPED_GLYPH_TEX_COORDS = tuple(range(12))
+
+# Padding between the glyphs of bitmap fonts generated from font files, in pixels.
+GENERATED_GLYPH_PADDING = 1
+
+
+class SoftwareImage:
+    """Decoded image held by the software backend.
+
+    ``pixels`` is an array of shape ``(height, width, 4)`` with the RGBA pixels, starting from the bottom row.
+    ``anchor`` is the pixel the image is positioned and rotated around.
+    """
+    __slots__ = ('pixels', 'anchor')
+
+    def __init__(self, pixels: numpy.ndarray, anchor: tuple[float, float]):
+        self.pixels = pixels
+        self.anchor = anchor
+
+
+class SoftwareGlyph:
+    """Glyph rendered by Pyglet's glyph renderer, held as pixels instead of as a region of a texture.
+
+    ``pixels`` is an array of shape ``(height, width, 4)`` with the RGBA pixels, starting from the bottom row.
+    ``left`` and ``bottom`` locate the glyph from the pen position on the baseline, and ``advance`` is how far the pen
+    moves after drawing it.
+    """
+    __slots__ = ('pixels', 'tex_coords', 'left', 'bottom', 'advance')
+
+    def __init__(self, image_data: pyglet.image.ImageData):
+        width, height = image_data.width, image_data.height
+        pixels = numpy.frombuffer(image_data.get_data('RGBA', width * 4), dtype=numpy.uint8)
+        self.pixels = pixels.reshape(height, width, 4)
+        self.tex_coords = UNFLIPPED_GLYPH_TEX_COORDS
+        self.left = 0
+        self.bottom = 0
+        self.advance = 0
+
+    def set_bearings(self, baseline: int, left_side_bearing: int, advance: int):
+        # Called by the glyph renderer, with the same metrics as pyglet.font.base.Glyph.
+        self.left = left_side_bearing
+        self.bottom = -baseline
+        self.advance = advance
+
+
+class SoftwareFont:
+    """Font rasterized on the CPU with Pyglet's glyph renderer of the platform, e.g. FreeType on Linux.
+
+    Pyglet fonts normally pack their glyphs into textures. This font gives the renderer a font object whose glyphs
+    are kept as :class:`SoftwareGlyph` pixels instead, so that no OpenGL context is needed.
+    """
+
+    def __init__(self, family_name: str, size: float):
+        from pyglet import font as pyglet_font
+
+        # The platform font class is created directly, since pyglet.font.load caches fonts in the OpenGL context.
+        font_class = pyglet_font._system_font_class  # noqa
+        self.pyglet_font = type('SoftwarePygletFont', (font_class,), {
+            'create_glyph': lambda font, image_data, fmt=None: SoftwareGlyph(image_data),
+        })(family_name, size, weight='normal', italic=False, stretch=False, dpi=96)
+        self.ascent = self.pyglet_font.ascent
+        self.descent = self.pyglet_font.descent
+        self.glyphs: dict[str, SoftwareGlyph] = {}
+        self._renderer = None
+
+    def get_glyph(self, character: str) -> SoftwareGlyph:
+        """Get the glyph of a character, rendering it on first use.
+
+        :param character: The character.
+        :return: The glyph.
+        """
+        glyph = self.glyphs.get(character)
+        if glyph is None:
+            if self._renderer is None:
+                self._renderer = self.pyglet_font.glyph_renderer_class(self.pyglet_font)
+            glyph = self._renderer.render(' ' if character == '\t' else character)
+            if tuple(glyph.tex_coords) != UNFLIPPED_GLYPH_TEX_COORDS:
+                glyph.pixels = glyph.pixels[::-1]
+            glyph.pixels = numpy.ascontiguousarray(glyph.pixels)
+            self.glyphs[character] = glyph
+        return glyph
+
+
+class SoftwareBackend(Backend):
+    """Backend drawing to a NumPy framebuffer, without a window or a GPU.
+
+    Frames are composited with vectorized NumPy operations, with straight alpha blending and nearest-neighbor sampling
+    of rotated images. It is meant to render frames in continuous integration, e.g. to compare them with golden
+    images, and to measure the preparation of drawing without the cost of a GPU driver.
+
+    Images are decoded with Pyglet's image codecs, which fall back to a pure-Python PNG decoder. Fonts are rasterized
+    with Pyglet's glyph renderer of the platform, without a texture atlas (see :class:`SoftwareFont`).
+
+    The game loop runs ``SOFTWARE_BACKEND_FRAMES`` frames as fast as possible, stepping the simulation at the
+    configured rate in between, and saves each frame to ``SOFTWARE_BACKEND_FRAME_DIRECTORY`` if it is set.
+    """
+    # Map from Kizuna assets to decoded images, and from font assets to fonts.
+    assets: dict['Asset', SoftwareImage]
+    fonts: dict['FontAsset', SoftwareFont]
+
+    # Items drawn by each batch, in the order they were first prepared, and batch of each drawable. Drawables are
+    # weakly referenced so that their items are forgotten even if they are garbage collected without being destroyed.
+    batch_items: dict['DrawBatch', weakref.WeakKeyDictionary['Drawable', tuple]]
+    drawable_batches: weakref.WeakKeyDictionary['Drawable', 'DrawBatch']
+
+    # The frame being drawn, of shape (height, width, 4) and starting from the bottom row, and the view offset.
+    framebuffer: numpy.ndarray
+    view_offset: tuple[float, float]
+
+    standalone: bool
+
+    # ---- KIZUNA LIFECYCLE METHODS ----
+
+    def __init__(self, settings: 'Settings'):
+        super().__init__(settings)
+        self.assets = {}
+        self.fonts = {}
+        self.batch_items = {}
+        self.drawable_batches = weakref.WeakKeyDictionary()
+        width, height = settings.WINDOW_SIZE
+        self.framebuffer = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+        self.view_offset = 0.0, 0.0
+
+    def initialize(self, base_directory: Path, standalone: bool):
+        self.standalone = standalone
+        configure_resource_path(base_directory, standalone)
+
+    def launch_game_loop(
+        self,
+        step_fn: Callable[[float], None],
+        draw_fn: Callable[[], None],
+        controllers: list['Controller'],
+    ):
+        frame_directory = self.settings.SOFTWARE_BACKEND_FRAME_DIRECTORY
+        if frame_directory is not None:
+            Path(frame_directory).mkdir(parents=True, exist_ok=True)
+
+        # Step the simulation as many times as it would have been stepped in real time before each frame.
+        step_interval = 1 / self.settings.STEPS_PER_SECOND
+        frame_interval = 1 / self.settings.FRAMES_PER_SECOND
+        step_time = 0.0
+        for frame in range(self.settings.SOFTWARE_BACKEND_FRAMES):
+            while step_time <= frame * frame_interval:
+                step_fn(step_interval)
+                step_time += step_interval
+            self.clear()
+            draw_fn()
+            if frame_directory is not None:
+                self.save_frame(Path(frame_directory) / f'frame-{frame:05d}.png')
+
+    # ---- ASSET LOADING METHODS ----
+
+    def load_image_asset(self, asset: 'ImageAsset'):
+        pixels = self._decode_image(resolve_resource_name(asset._path, self.standalone))
+        height, width = pixels.shape[:2]
+        self.assets[asset] = SoftwareImage(pixels, (width * asset.origin.x, height * asset.origin.y))
+
+    def load_font_asset(self, asset: 'FontAsset'):
+        pyglet.resource.add_font(resolve_resource_name(asset._path, self.standalone))
+        self.fonts[asset] = SoftwareFont(asset.family_name, asset.size)
+
+    def load_bitmap_font_asset(self, asset: 'BitmapFontAsset'):
+        from kizuna.core.assets import parse_bmfont
+
+        if asset.source_font is not None:
+            self._generate_bitmap_font(asset)
+            return
+        name = resolve_resource_name(asset._path, self.standalone)
+        with pyglet.resource.file(name) as file:
+            line_height, base, page, glyphs = parse_bmfont(file.read().decode('utf-8'))
+        asset.set_glyphs(line_height, base, glyphs)
+        self.assets[asset] = SoftwareImage(self._decode_image(posixpath.join(posixpath.dirname(name), page)), (0, 0))
+
+    def get_image_size(self, asset: 'ImageAsset') -> 'IVector2':
+        from kizuna.core.datatypes import IVector2
+
+        height, width = self.assets[asset].pixels.shape[:2]
+        return IVector2(width, height)
+
+    def measure_text(self, text: str, font: 'FontAsset') -> 'Vector2':
+        from kizuna.core.datatypes import Vector2
+
+        software_font = self.fonts[font]
+        width = sum(software_font.get_glyph(character).advance for character in text)
+        return Vector2(width, software_font.ascent - software_font.descent)
+
+    # ---- PRE-DRAWING METHODS ----
+
+    def prepare_draw_text(self, drawable: 'TextDrawable', batch: 'DrawBatch'):
+        self._set_item(drawable, batch, (ITEM_TEXT, drawable.font, drawable.text, drawable.position))
+
+    def prepare_draw_bitmap_text(self, drawable: 'BitmapTextDrawable', batch: 'DrawBatch'):
+        self._set_item(drawable, batch, (ITEM_BITMAP_TEXT, drawable.font, drawable.text, drawable.position))
+
+    def prepare_draw_sprite(self, drawable: 'SpriteDrawable', batch: 'DrawBatch'):
+        self._set_item(drawable, batch, (ITEM_SPRITE, drawable.asset, drawable.position, drawable.rotation))
+
+    def prepare_draw_sprites(
+        self,
+        drawables: Sequence['SpriteDrawable'],
+        positions: Sequence['Vector2Like'] | numpy.ndarray,
+        rotations: Sequence[float] | numpy.ndarray,
+        batch: 'DrawBatch',
+    ):
+        for drawable, position, rotation in zip(drawables, to_vector_list(positions), rotations):
+            drawable.position = position
+            drawable.rotation = float(rotation)
+            self._set_item(drawable, batch, (ITEM_SPRITE, drawable.asset, position, drawable.rotation))
+
+    def prepare_draw_tile_chunk(self, drawable: 'TileChunkDrawable', batch: 'DrawBatch'):
+        # The tiles are composed into a single image, which is only composed again after the chunk is invalidated.
+        key = drawable.asset, drawable.tile_size, drawable.columns, drawable.revision
+        old_batch = self.drawable_batches.get(drawable)
+        old_item = self.batch_items[old_batch].get(drawable) if old_batch is not None else None
+        if old_item is not None and old_item[1] == key:
+            pixels = old_item[2]
+        else:
+            pixels = self._compose_tile_chunk(drawable)
+        self._set_item(drawable, batch, (ITEM_TILE_CHUNK, key, pixels, drawable.position))
+
+    def prepare_draw_particles(self, drawable: 'ParticlesDrawable', batch: 'DrawBatch'):
+        count = drawable.count
+        self._set_item(drawable, batch, (
+            ITEM_PARTICLES, drawable.asset, drawable.positions[:count].copy(), drawable.rotations[:count].copy(),
+            drawable.colors[:count].copy(),
+        ))
+
+    # ---- DRAWING METHODS ----
+
+    def set_view_offset(self, offset: 'Vector2'):
+        self.view_offset = offset.x, offset.y
+
+    def draw_batch(self, batch: 'DrawBatch'):
+        self.statistics.batch_draws += 1
+        items = self.batch_items.get(batch)
+        if items is None:
+            return
+        for item in list(items.values()):
+            kind = item[0]
+            if kind == ITEM_SPRITE:
+                _, asset, position, rotation = item
+                image = self.assets[asset]
+                self._blit(image.pixels, image.anchor, position.x, position.y, rotation)
+            elif kind == ITEM_TEXT:
+                self._draw_text(*item[1:])
+            elif kind == ITEM_BITMAP_TEXT:
+                self._draw_bitmap_text(*item[1:])
+            elif kind == ITEM_TILE_CHUNK:
+                _, _, pixels, position = item
+                self._blit(pixels, (0.0, 0.0), position.x, position.y, 0.0)
+            else:
+                _, asset, positions, rotations, colors = item
+                image = self.assets[asset]
+                self._blit_many(image.pixels, image.anchor, positions, rotations, colors)
+
+    def clear(self):
+        """Clear the framebuffer to transparent black, to start drawing a new frame.
+        """
+        self.framebuffer[:] = 0
+
+    def get_frame(self) -> numpy.ndarray:
+        """Get a copy of the framebuffer.
+
+        :return: An array of shape ``(height, width, 4)`` with the RGBA pixels, starting from the top row.
+        """
+        return self.framebuffer[::-1].copy()
+
+    def save_frame(self, path: str | Path):
+        """Write the framebuffer to a PNG file.
+
+        :param path: The path of the file.
+        """
+        Path(path).write_bytes(encode_png(self.framebuffer[::-1]))
+
+    # ---- DRAWABLE DESTRUCTION METHODS ----
+
+    def destroy_text(self, drawable: 'TextDrawable'):
+        self._remove_item(drawable)
+
+    def destroy_bitmap_text(self, drawable: 'BitmapTextDrawable'):
+        self._remove_item(drawable)
+
+    def destroy_sprite(self, drawable: 'SpriteDrawable'):
+        self._remove_item(drawable)
+
+    def destroy_tile_chunk(self, drawable: 'TileChunkDrawable'):
+        self._remove_item(drawable)
+
+    def destroy_particles(self, drawable: 'ParticlesDrawable'):
+        self._remove_item(drawable)
+
+    # ---- FRAME CAPTURE METHODS ----
+
+    def read_frame(self) -> numpy.ndarray | None:
+        return self.framebuffer.copy()
+
+    # ---- DIAGNOSTIC METHODS ----
+
+    def get_resource_usage(self) -> dict[str, ResourceUsage]:
+        return {
+            'drawables': ResourceUsage(len(self.drawable_batches)),
+            'batches': ResourceUsage(len(self.batch_items)),
+            'textures': ResourceUsage(len(self.assets), sum(image.pixels.nbytes for image in self.assets.values())),
+            'framebuffer': ResourceUsage(1, self.framebuffer.nbytes),
+        }
+
+    # ---- PRIVATE METHODS ----
+
+    def _decode_image(self, name: str) -> numpy.ndarray:
+        with pyglet.resource.file(name) as file:
+            image_data = pyglet.image.load(name, file=file).get_image_data()
+        pixels = numpy.frombuffer(image_data.get_bytes('RGBA', image_data.width * 4), dtype=numpy.uint8)
+        self.statistics.textures_loaded += 1
+        self.statistics.texture_bytes_loaded += pixels.nbytes
+        return pixels.reshape(image_data.height, image_data.width, 4)
+
+    def _set_item(self, drawable: 'Drawable', batch: 'DrawBatch', item: tuple):
+        # Hidden drawables are not drawn until they are prepared again while visible.
+        if not drawable.visible or drawable.culled:
+            self._remove_item(drawable)
+            return
+        old_batch = self.drawable_batches.get(drawable)
+        if old_batch is not batch:
+            self._remove_item(drawable)
+            self.drawable_batches[drawable] = batch
+        items = self.batch_items.get(batch)
+        if items is None:
+            items = self.batch_items[batch] = weakref.WeakKeyDictionary()
+        items[drawable] = item
+
+    def _remove_item(self, drawable: 'Drawable'):
+        batch = self.drawable_batches.pop(drawable, None)
+        if batch is not None:
+            items = self.batch_items[batch]
+            items.pop(drawable, None)
+            if not items:
+                del self.batch_items[batch]
+
+    def _draw_bitmap_text(self, font: 'BitmapFontAsset', text: str, position: 'Vector2'):
+        pixels = self.assets[font].pixels
+        page_height = pixels.shape[0]
+        glyphs = list(font.glyphs.values())
+        quads, glyph_indices = font.layout(text)
+        for (left, bottom, _, _), glyph_index in zip(quads.tolist(), glyph_indices.tolist()):
+            glyph = glyphs[glyph_index]
+            if glyph.width == 0 or glyph.height == 0:
+                continue
+            row = page_height - glyph.y - glyph.height
+            glyph_pixels = pixels[row:row + glyph.height, glyph.x:glyph.x + glyph.width]
+            self._blit(glyph_pixels, (0.0, 0.0), position.x + left, position.y + bottom, 0.0)
+
+    def _draw_text(self, font: 'FontAsset', text: str, position: 'Vector2'):
+        software_font = self.fonts[font]
+        x = position.x
+        for character in text:
+            glyph = software_font.get_glyph(character)
+            if glyph.pixels.size:
+                self._blit(glyph.pixels, (0.0, 0.0), x + glyph.left, position.y + glyph.bottom, 0.0)
+            x += glyph.advance
+
+    def _generate_bitmap_font(self, asset: 'BitmapFontAsset'):
+        # Lay the glyphs out in a single row of the page image, from its top-left corner as in BMFont descriptors.
+        from kizuna.core.assets import BitmapGlyph
+
+        if asset.source_font not in self.fonts:
+            self.load_font_asset(asset.source_font)
+        software_font = self.fonts[asset.source_font]
+        glyphs = [software_font.get_glyph(character) for character in asset.characters]
+        padding = GENERATED_GLYPH_PADDING
+        width = sum(glyph.pixels.shape[1] + padding for glyph in glyphs) + padding
+        height = max((glyph.pixels.shape[0] for glyph in glyphs), default=0) + 2 * padding
+        page = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+        bitmap_glyphs = {}
+        x = padding
+        for character, glyph in zip(asset.characters, glyphs):
+            glyph_height, glyph_width = glyph.pixels.shape[:2]
+            # The page starts from the bottom row, so the glyph is placed just below the top padding.
+            page[height - padding - glyph_height:height - padding, x:x + glyph_width] = glyph.pixels
+            bitmap_glyphs[character] = BitmapGlyph(
+                x, padding, glyph_width, glyph_height, glyph.left,
+                software_font.ascent - (glyph.bottom + glyph_height), glyph.advance,
+            )
+            x += glyph_width + padding
+        asset.set_glyphs(software_font.ascent - software_font.descent, software_font.ascent, bitmap_glyphs)
+        self.assets[asset] = SoftwareImage(page, (0, 0))
+
+    def _compose_tile_chunk(self, drawable: 'TileChunkDrawable') -> numpy.ndarray:
+        # Gather the tiles from the tileset, seen as an array of tiles, and arrange them as the rows of the chunk.
+        pixels = self.assets[drawable.asset].pixels
+        tile_width, tile_height = drawable.tile_size
+        columns = drawable.columns
+        tileset_rows = pixels.shape[0] // tile_height
+        tileset_columns = pixels.shape[1] // tile_width
+        tileset = pixels[:tileset_rows * tile_height, :tileset_columns * tile_width].reshape(
+            tileset_rows, tile_height, tileset_columns, tile_width, 4,
+        ).swapaxes(1, 2)
+
+        tiles = numpy.asarray(drawable.tiles, dtype=numpy.intp)
+        rows = -(-len(tiles) // columns)
+        tiles = numpy.concatenate([tiles, numpy.full(rows * columns - len(tiles), -1, dtype=numpy.intp)])
+        empty = tiles < 0
+        tiles = numpy.where(empty, 0, tiles)
+        tile_pixels = tileset[tileset_rows - 1 - tiles // tileset_columns, tiles % tileset_columns]
+        tile_pixels[empty] = 0
+        return numpy.ascontiguousarray(
+            tile_pixels.reshape(rows, columns, tile_height, tile_width, 4).swapaxes(1, 2).reshape(
+                rows * tile_height, columns * tile_width, 4,
+            ),
+        )
+
+    def _blit_many(
+        self,
+        pixels: numpy.ndarray,
+        anchor: tuple[float, float],
+        positions: numpy.ndarray,
+        rotations: numpy.ndarray,
+        colors: numpy.ndarray,
+    ):
+        # Draw many copies of an image at once, e.g. particles. Every copy is sampled at the pixels of a square
+        # around its position that fits it for any rotation, as _blit does for a single image.
+        count = len(positions)
+        if count == 0:
+            return
+        framebuffer = self.framebuffer
+        frame_height, frame_width = framebuffer.shape[:2]
+        height, width = pixels.shape[:2]
+        anchor_x, anchor_y = anchor
+        radius = math.hypot(max(anchor_x, width - anchor_x), max(anchor_y, height - anchor_y))
+        size = math.ceil(2 * radius) + 2
+        xs = positions[:, 0].astype(numpy.float64) - self.view_offset[0]
+        ys = positions[:, 1].astype(numpy.float64) - self.view_offset[1]
+        # Coordinates are computed in single precision, as in _blit, so that both sample the same pixels.
+        radians = numpy.radians(rotations.astype(numpy.float64))
+        cos = numpy.cos(radians).astype(numpy.float32)[:, numpy.newaxis, numpy.newaxis]
+        sin = numpy.sin(radians).astype(numpy.float32)[:, numpy.newaxis, numpy.newaxis]
+
+        steps = numpy.arange(size)
+        columns = numpy.floor(xs - radius).astype(numpy.intp)[:, numpy.newaxis] + steps
+        rows = numpy.floor(ys - radius).astype(numpy.intp)[:, numpy.newaxis] + steps
+        dx = columns.astype(numpy.float32) + (0.5 - xs).astype(numpy.float32)[:, numpy.newaxis]
+        dy = rows.astype(numpy.float32) + (0.5 - ys).astype(numpy.float32)[:, numpy.newaxis]
+        dx = dx[:, numpy.newaxis, :]
+        dy = dy[:, :, numpy.newaxis]
+        i = numpy.floor(dx * cos + dy * sin + anchor_x).astype(numpy.intp)
+        j = numpy.floor(dy * cos - dx * sin + anchor_y).astype(numpy.intp)
+        rows_inside = ((rows >= 0) & (rows < frame_height))[:, :, numpy.newaxis]
+        columns_inside = ((columns >= 0) & (columns < frame_width))[:, numpy.newaxis, :]
+        inside = (i >= 0) & (i < width) & (j >= 0) & (j < height) & rows_inside & columns_inside
+
+        # Keep the covered pixels, in the order of the copies, and tint them.
+        copy_indices, row_indices, column_indices = numpy.nonzero(inside)
+        source = pixels[j[inside], i[inside]].astype(numpy.uint32)
+        source = (source * colors[copy_indices].astype(numpy.uint32) + 127) // 255
+        visible = source[:, 3] > 0
+        source = source[visible]
+        copy_indices = copy_indices[visible]
+        targets = (
+            rows[copy_indices, row_indices[visible]] * frame_width + columns[copy_indices, column_indices[visible]]
+        )
+        if not len(targets):
+            return
+
+        # Blend in layers: the n-th layer holds the n-th copy covering each pixel, so that the pixels of a layer are
+        # all different and overlapping copies are blended in order, as if they were drawn one by one.
+        order = numpy.argsort(targets, kind='stable')
+        targets = targets[order]
+        source = source[order]
+        starts = numpy.ones(len(targets), dtype=bool)
+        starts[1:] = targets[1:] != targets[:-1]
+        positions_in_order = numpy.arange(len(targets))
+        layers = positions_in_order - numpy.maximum.accumulate(numpy.where(starts, positions_in_order, 0))
+        flat_framebuffer = framebuffer.reshape(-1, 4)
+        for layer in range(int(layers.max()) + 1):
+            in_layer = layers == layer
+            layer_targets = targets[in_layer]
+            layer_source = source[in_layer]
+            alpha = layer_source[:, 3:4]
+            blended = flat_framebuffer[layer_targets].astype(numpy.uint32) * (255 - alpha)
+            blended[:, :3] += layer_source[:, :3] * alpha
+            blended = (blended + 127) // 255
+            blended[:, 3:4] += alpha
+            flat_framebuffer[layer_targets] = blended
+
+    def _blit(
+        self,
+        pixels: numpy.ndarray,
+        anchor: tuple[float, float],
+        x: float,
+        y: float,
+        rotation: float,
+        color: numpy.ndarray | None = None,
+    ):
+        # Find the pixels of the framebuffer covered by the rotated image, and map their centers back to the image.
+        framebuffer = self.framebuffer
+        height, width = pixels.shape[:2]
+        anchor_x, anchor_y = anchor
+        x -= self.view_offset[0]
+        y -= self.view_offset[1]
+        if rotation % 360.0 == 0.0:
+            cos, sin = 1.0, 0.0
+        else:
+            radians = math.radians(rotation)
+            cos, sin = math.cos(radians), math.sin(radians)
+        corners = [
+            (-anchor_x, -anchor_y), (width - anchor_x, -anchor_y),
+            (-anchor_x, height - anchor_y), (width - anchor_x, height - anchor_y),
+        ]
+        xs = [x + cx * cos - cy * sin for cx, cy in corners]
+        ys = [y + cx * sin + cy * cos for cx, cy in corners]
+        left = max(0, math.floor(min(xs)))
+        right = min(framebuffer.shape[1], math.ceil(max(xs)))
+        bottom = max(0, math.floor(min(ys)))
+        top = min(framebuffer.shape[0], math.ceil(max(ys)))
+        if left >= right or bottom >= top:
+            return
+
+        dx = numpy.arange(left, right, dtype=numpy.float32) + (0.5 - x)
+        dy = numpy.arange(bottom, top, dtype=numpy.float32) + (0.5 - y)
+        if sin == 0.0:
+            # Without rotation, rows and columns of the image map to rows and columns of the framebuffer.
+            i = numpy.floor(dx + anchor_x).astype(numpy.intp)
+            j = numpy.floor(dy + anchor_y).astype(numpy.intp)
+            inside = ((j >= 0) & (j < height))[:, numpy.newaxis] & ((i >= 0) & (i < width))[numpy.newaxis, :]
+            source = pixels[numpy.clip(j, 0, height - 1)[:, numpy.newaxis], numpy.clip(i, 0, width - 1)]
+        else:
+            u = dx[numpy.newaxis, :] * cos + dy[:, numpy.newaxis] * sin + anchor_x
+            v = dy[:, numpy.newaxis] * cos - dx[numpy.newaxis, :] * sin + anchor_y
+            i = numpy.floor(u).astype(numpy.intp)
+            j = numpy.floor(v).astype(numpy.intp)
+            inside = (i >= 0) & (i < width) & (j >= 0) & (j < height)
+            source = pixels[numpy.clip(j, 0, height - 1), numpy.clip(i, 0, width - 1)]
+
+        # Blend with straight alpha, in integers so that frames are identical on every machine.
+        source = source.astype(numpy.uint32)
+        if color is not None:
+            source = (source * numpy.asarray(color, dtype=numpy.uint32) + 127) // 255
+        alpha = source[..., 3:4] * inside[..., numpy.newaxis]
+        destination = framebuffer[bottom:top, left:right]
+        blended = destination.astype(numpy.uint32) * (255 - alpha)
+        blended[..., :3] += source[..., :3] * alpha
+        blended = (blended + 127) // 255
+        blended[..., 3:4] += alpha
+        destination[:] = blended
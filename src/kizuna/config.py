@@ -4,7 +4,10 @@ from typing import Any, Callable, Iterable
 
 from kizuna.backends import Backend
 from kizuna.core.datatypes import validate_ivector2
-from kizuna.core.validation import validate_str, validate_list, validate_and_import_module_path, validate_positive_float
+from kizuna.core.validation import (
+    validate_choice, validate_str, validate_list, validate_and_import_module_path, validate_positive_float,
+    validate_positive_int, validate_type,
+)
 from kizuna.management.exceptions import BackendNotInstantiatedError, SettingsNotFoundError, SettingsValidationError
 from kizuna.utils import fullname
 
@@ -62,7 +65,20 @@ BASIC_SETTINGS = [
     ),
     SettingSpec.required('STEPS_PER_SECOND', validate_positive_float),
     SettingSpec.required('FRAMES_PER_SECOND', validate_positive_float),
+    SettingSpec.optional(
+        'UNFOCUSED_FRAMES_PER_SECOND', lambda v: None if v is None else validate_positive_float(v), None,
+    ),
+    SettingSpec.optional('PAUSE_DRAWING_WHEN_MINIMIZED', lambda v: validate_type(v, bool), True),
+    SettingSpec.optional('REDRAW_ON_CHANGE', lambda v: validate_type(v, bool), False),
     SettingSpec.required('BACKEND_CLASS', validate_and_import_module_path),
+    SettingSpec.optional('SIMULATION_MODE', lambda v: validate_choice(v, ('inline', 'process')), 'inline'),
+    SettingSpec.optional('SIMULATION_SNAPSHOT_CAPACITY', validate_positive_int, 65536),
+    SettingSpec.optional('ASYNC_BUDGET_MS', validate_positive_float, 2.0),
+    SettingSpec.optional('TASK_BUDGET_MS', validate_positive_float, 4.0),
+    SettingSpec.optional('JOB_THREAD_WORKERS', lambda v: None if v is None else validate_positive_int(v), None),
+    SettingSpec.optional('JOB_PROCESS_WORKERS', lambda v: None if v is None else validate_positive_int(v), None),
+    SettingSpec.optional('SOFTWARE_BACKEND_FRAMES', validate_positive_int, 600),
+    SettingSpec.optional('SOFTWARE_BACKEND_FRAME_DIRECTORY', lambda v: None if v is None else validate_str(v), None),
 ]
 
 
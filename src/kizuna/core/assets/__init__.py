@@ -2,3 +2,4 @@ from .paths import *
 from .base import *
 from .image import *
 from .font import *
+from .bitmap_font import *
@@ -0,0 +1,240 @@
+import re
+
+import numpy
+
+from kizuna.config import settings
+from kizuna.core.assets.base import Asset
+from kizuna.core.assets.font import FontAsset
+from kizuna.core.assets.paths import AssetPathLike
+from kizuna.core.datatypes import Vector2
+from kizuna.core.validation import validate_str
+
+BMFONT_ATTRIBUTE_REGEX = re.compile(r'(\w+)=("[^"]*"|\S*)')
+
+DEFAULT_BITMAP_FONT_CHARACTERS = ''.join(chr(code) for code in range(32, 127))
+"""Characters of the bitmap fonts generated from font assets by default: printable ASCII.
+"""
+
+
+class BitmapGlyph:
+    """Metrics of a glyph of a bitmap font, in pixels, following the conventions of the BMFont format.
+
+    ``x`` and ``y`` locate the glyph in the page image from its top-left corner. ``x_offset`` and ``y_offset`` locate
+    the glyph from the pen position, at the left of the character and the top of the line, growing right and down.
+    ``x_advance`` is how far the pen moves after drawing the glyph.
+    """
+    __slots__ = ('x', 'y', 'width', 'height', 'x_offset', 'y_offset', 'x_advance')
+
+    def __init__(
+        self,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+        x_offset: int,
+        y_offset: int,
+        x_advance: int,
+    ):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.x_advance = x_advance
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'BitmapGlyph(x={self.x}, y={self.y}, width={self.width}, height={self.height}, '
+            f'x_offset={self.x_offset}, y_offset={self.y_offset}, x_advance={self.x_advance})'
+        )
+
+
+def parse_bmfont(source: str) -> tuple[int, int, str, dict[str, BitmapGlyph]]:
+    """Parse a font descriptor in the text format of BMFont (``.fnt``).
+
+    Only fonts with a single page are supported. Kerning pairs are ignored.
+
+    :param source: The contents of the descriptor.
+    :return: The line height, the distance from the top of the line to the baseline, the file name of the page image
+        relative to the descriptor, and the glyphs by character.
+    :raise ValueError: If the descriptor is invalid or has more than one page.
+    """
+    line_height = base = None
+    page = None
+    glyphs = {}
+    for line in source.splitlines():
+        tag, _, rest = line.strip().partition(' ')
+        attributes = {key: value.strip('"') for key, value in BMFONT_ATTRIBUTE_REGEX.findall(rest)}
+        try:
+            if tag == 'common':
+                if int(attributes.get('pages', 1)) != 1:
+                    raise ValueError('Only bitmap fonts with a single page are supported.')
+                line_height = int(attributes['lineHeight'])
+                base = int(attributes['base'])
+            elif tag == 'page':
+                page = attributes['file']
+            elif tag == 'char':
+                glyphs[chr(int(attributes['id']))] = BitmapGlyph(
+                    int(attributes['x']), int(attributes['y']), int(attributes['width']),
+                    int(attributes['height']), int(attributes['xoffset']), int(attributes['yoffset']),
+                    int(attributes['xadvance']),
+                )
+        except KeyError as e:
+            raise ValueError(f'Missing attribute {e} in "{tag}" line of bitmap font.') from None
+    if line_height is None or page is None:
+        raise ValueError('Bitmap font has no "common" or "page" line.')
+    if not glyphs:
+        raise ValueError('Bitmap font has no glyphs.')
+    return line_height, base, page, glyphs
+
+
+class BitmapFontAsset(Asset):
+    """Asset encapsulating a bitmap font: a single image holding every glyph, and the metrics to lay them out.
+
+    Bitmap fonts are either loaded from BMFont descriptors (``.fnt`` files in text format, with the page image next
+    to them), or generated from a :class:`FontAsset` at its size. Characters missing from the font are drawn with the
+    glyph of ``?``, or of the first character if there is no ``?`` either.
+
+    Text drawn with bitmap fonts is laid out by adding the advances of the glyphs, without kerning. In exchange, it
+    can be changed every frame cheaply with :class:`kizuna.rendering.BitmapTextDrawable`.
+
+    :ivar source_font: The font the bitmap font is generated from, or ``None`` if it is loaded from a descriptor.
+    :ivar characters: The characters generated from :attr:`source_font`.
+    :ivar line_height: The distance between lines in pixels. Only available after the asset is loaded.
+    :ivar base: The distance from the top of the line to the baseline in pixels. Only available after the asset is
+        loaded.
+    :ivar glyphs: The glyphs by character. Only available after the asset is loaded.
+    """
+    source_font: FontAsset | None
+    characters: str
+    line_height: int
+    base: int
+    glyphs: dict[str, BitmapGlyph]
+
+    # Index, quad (left, bottom, right, top) relative to the pen position on the baseline, and advance of the glyph
+    # of each character, and of the glyph drawn for unknown characters.
+    _metrics: dict[str, tuple[int, float, float, float, float, float]]
+    _fallback_metrics: tuple[int, float, float, float, float, float]
+
+    def __init__(
+        self,
+        source: AssetPathLike | FontAsset,
+        characters: str = DEFAULT_BITMAP_FONT_CHARACTERS,
+        eager: bool = False,
+    ) -> None:
+        """Define a new asset.
+
+        :param source: Path to a BMFont descriptor, relative to the assets directory of the project, or a font asset
+            to generate the bitmap font from.
+        :param characters: The characters to generate when the source is a font asset.
+        :param eager: Whether this asset should be loaded immediately upon definition (``True``) or only until
+            required by Kizuna (``False``).
+        """
+        self.characters = validate_str(characters)
+        self.line_height = 0
+        self.base = 0
+        self.set_glyphs(0, 0, {})
+        if isinstance(source, FontAsset):
+            self.source_font = source
+            super().__init__(source.path, eager)
+        else:
+            self.source_font = None
+            super().__init__(source, eager)
+
+    def on_load(self) -> None:
+        if self.source_font is not None:
+            self.source_font.load()
+        settings.backend.load_bitmap_font_asset(self)
+
+    def set_glyphs(self, line_height: int, base: int, glyphs: dict[str, BitmapGlyph]):
+        """Set the metrics of the font. This is called by the backend when loading the asset.
+
+        :param line_height: The distance between lines in pixels.
+        :param base: The distance from the top of the line to the baseline in pixels.
+        :param glyphs: The glyphs by character. The order of the dictionary defines the index of each glyph.
+        """
+        self.line_height = line_height
+        self.base = base
+        self.glyphs = glyphs
+        metrics = {}
+        for i, (character, glyph) in enumerate(glyphs.items()):
+            top = base - glyph.y_offset
+            metrics[character] = (
+                i, glyph.x_offset, top - glyph.height, glyph.x_offset + glyph.width, top, glyph.x_advance,
+            )
+        self._metrics = metrics
+        self._fallback_metrics = metrics.get('?', next(iter(metrics.values()), (0, 0, 0, 0, 0, 0)))
+
+    def layout(self, text: str, start: int = 0, end: int | None = None) -> tuple[numpy.ndarray, numpy.ndarray]:
+        """Get the quads of some characters of a text.
+
+        Texts are expected to be short and to change a few characters at a time, so this is faster than laying out
+        whole texts with NumPy.
+
+        :param text: The text.
+        :param start: The index of the first character to lay out.
+        :param end: The index after the last character to lay out. Defaults to the end of the text.
+        :return: The quads (left, bottom, right, top) of the characters relative to the start of the baseline, and the
+            index of the glyph of each character, which is its index in :attr:`glyphs`.
+        """
+        get_metrics = self._metrics.get
+        fallback_metrics = self._fallback_metrics
+        pen_x = 0.0
+        for character in text[:start]:
+            pen_x += get_metrics(character, fallback_metrics)[5]
+        quads = []
+        glyph_indices = []
+        for character in text[start:end]:
+            index, left, bottom, right, top, advance = get_metrics(character, fallback_metrics)
+            quads.append((pen_x + left, bottom, pen_x + right, top))
+            glyph_indices.append(index)
+            pen_x += advance
+        return (
+            numpy.array(quads, dtype=numpy.float32).reshape(-1, 4),
+            numpy.array(glyph_indices, dtype=numpy.intp),
+        )
+
+    def changed_range(self, old_text: str, new_text: str) -> tuple[int, int] | None:
+        """Find the characters whose quads change when a text changes.
+
+        Characters before the first changed character keep their quads. Characters after the last changed character
+        also keep them if the length of the text and the width of the changed characters do not change, e.g. when a
+        digit of a counter changes in a font with fixed-width digits.
+
+        :param old_text: The previous text.
+        :param new_text: The new text.
+        :return: The range of characters to rewrite, which reaches the end of the longest text when the length
+            changes, or ``None`` if the text does not change.
+        """
+        if old_text == new_text:
+            return None
+        common_length = min(len(old_text), len(new_text))
+        start = 0
+        while start < common_length and old_text[start] == new_text[start]:
+            start += 1
+        if len(old_text) != len(new_text):
+            return start, max(len(old_text), len(new_text))
+
+        end = len(new_text)
+        while old_text[end - 1] == new_text[end - 1]:
+            end -= 1
+        if self._get_width(old_text[start:end]) != self._get_width(new_text[start:end]):
+            end = len(new_text)
+        return start, end
+
+    def measure(self, text: str) -> Vector2:
+        """Get the size of a line of text drawn with this font. The asset must be loaded.
+
+        :param text: The text.
+        :return: The width of the text and the height of the line.
+        """
+        return Vector2(self._get_width(text), self.line_height)
+
+    def _get_width(self, text: str) -> float:
+        get_metrics = self._metrics.get
+        fallback_metrics = self._fallback_metrics
+        return sum(get_metrics(character, fallback_metrics)[5] for character in text)
@@ -2,7 +2,7 @@ from kizuna.config import settings
 from kizuna.core.assets.base import Asset
 from kizuna.core.assets.paths import AssetPathLike
 from kizuna.core.constants import Alignment
-from kizuna.core.datatypes import Vector2Like, validate_vector2
+from kizuna.core.datatypes import IVector2, Vector2Like, validate_vector2
 
 
 class ImageAsset(Asset):
@@ -22,8 +22,16 @@ class ImageAsset(Asset):
             required by Kizuna (``False``).
         :param origin: Origin of the image, used for drawing.
         """
-        super().__init__(path, eager)
         self.origin = origin.value if isinstance(origin, Alignment) else validate_vector2(origin)
+        self._size = None
+        super().__init__(path, eager)
+
+    @property
+    def size(self) -> IVector2 | None:
+        """Get the size of the image in pixels, or ``None`` if the asset is not loaded yet.
+        """
+        return self._size
 
     def on_load(self) -> None:
         settings.backend.load_image_asset(self)
+        self._size = settings.backend.get_image_size(self)
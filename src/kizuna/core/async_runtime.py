@@ -0,0 +1,145 @@
+"""Integration of :mod:`asyncio` with the game loop.
+
+Kizuna owns an event loop that is never left running: at each step of the game loop, the event loop is run in short
+iterations until there is nothing ready to run or the time budget of the step is spent. Awaited I/O, such as reading
+files or sockets, then progresses between steps without blocking the frame.
+"""
+
+import asyncio
+import contextvars
+import logging
+import sys
+import time
+from typing import Any, Callable, Coroutine
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReadyTrackingEventLoop(asyncio.ProactorEventLoop if sys.platform == 'win32' else asyncio.SelectorEventLoop):
+    """Default event loop of the platform, which also keeps track of the callbacks scheduled to run soon.
+
+    Tasks and futures schedule their next step with :meth:`call_soon`, so the loop has work ready to run as long as
+    one of these callbacks has neither run nor been cancelled. Callbacks scheduled from other threads are not tracked,
+    and run at the next iteration the loop is driven.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._ready_handles: set[asyncio.Handle] = set()
+
+    def call_soon(
+        self,
+        callback: Callable[..., Any],
+        *args: Any,
+        context: contextvars.Context | None = None,
+    ) -> asyncio.Handle:
+        def run():
+            self._ready_handles.discard(handle)
+            callback(*args)
+
+        handle = super().call_soon(run, context=context)
+        self._ready_handles.add(handle)
+        return handle
+
+    @property
+    def has_ready_callbacks(self) -> bool:
+        """Get whether a callback scheduled with :meth:`call_soon` is waiting to run.
+        """
+        cancelled = [handle for handle in self._ready_handles if handle.cancelled()]
+        self._ready_handles.difference_update(cancelled)
+        return bool(self._ready_handles)
+
+
+class AsyncRuntime:
+    """Event loop driven by the game loop.
+
+    Use :data:`async_runtime` to access the runtime, or :meth:`kizuna.core.controllers.Controller.spawn_task` from a
+    controller. Coroutines only run while the runtime is driven, and a callback that blocks for longer than the
+    budget still delays the frame, since it cannot be interrupted.
+    """
+
+    def __init__(self):
+        self._loop: ReadyTrackingEventLoop | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'AsyncRuntime(tasks={len(self._tasks)})'
+
+    @property
+    def loop(self) -> ReadyTrackingEventLoop:
+        """Get the event loop, creating it if needed.
+        """
+        if self._loop is None or self._loop.is_closed():
+            self._loop = ReadyTrackingEventLoop()
+        return self._loop
+
+    @property
+    def pending_tasks(self) -> int:
+        """Get the number of tasks spawned that have not finished yet.
+        """
+        return len(self._tasks)
+
+    def spawn(self, coroutine: Coroutine[Any, Any, Any], log_exceptions: bool = True) -> asyncio.Task:
+        """Schedule a coroutine to run in the background.
+
+        :param coroutine: The coroutine to run.
+        :param log_exceptions: Whether to log the exception raised by the coroutine, if any. Pass false when the caller
+            retrieves the result of the task, and handles the exception itself.
+        :return: The task running the coroutine, which can be cancelled or checked for completion.
+        """
+        task = self.loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done if log_exceptions else self._tasks.discard)
+        return task
+
+    def run_until(self, deadline: float):
+        """Run the event loop until there is nothing ready to run or the deadline is reached.
+
+        At least one iteration is run, so that I/O is polled even if the deadline has already passed.
+
+        :param deadline: The time to stop at, as returned by :func:`time.perf_counter`.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        while True:
+            # Stopping the loop from a callback makes ``run_forever`` return after a single iteration.
+            loop.call_soon(loop.stop)
+            loop.run_forever()
+            if not loop.has_ready_callbacks or time.perf_counter() >= deadline:
+                return
+
+    def run_for(self, budget: float):
+        """Run the event loop for at most the given time.
+
+        :param budget: The maximum time to run, in seconds.
+        """
+        self.run_until(time.perf_counter() + budget)
+
+    def shutdown(self):
+        """Cancel every pending task and close the event loop.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+        self._tasks.clear()
+
+    def _on_task_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error('Unhandled exception in task.', exc_info=task.exception())
+
+
+async_runtime = AsyncRuntime()
+"""Async runtime singleton instance.
+"""
@@ -1,4 +1,11 @@
-from typing import TYPE_CHECKING
+import asyncio
+from typing import TYPE_CHECKING, Any, Callable, Coroutine
+
+from kizuna.core.async_runtime import async_runtime
+from kizuna.core.datatypes import Vector2, Vector2Like
+from kizuna.core.jobs import Job, job_pools
+from kizuna.core.tasks import Task, TaskGenerator, task_scheduler
+from kizuna.core.timers import Timer, Tween, timer_service
 
 if TYPE_CHECKING:
     from kizuna.config import SettingSpec
@@ -26,8 +33,24 @@ class Controller:
 
         ..  note:: The required settings in this list will be required only if the controller is listed in the
             ``CONTROLLERS`` setting.
+
+    :cvar render_process: Which side of the simulation/render boundary this controller lives on when the
+        ``SIMULATION_MODE`` setting is ``'process'``. By default, controllers run in the simulation process: their
+        :meth:`on_step` runs there, and whatever their :meth:`on_draw` prepares and draws is recorded and replayed by
+        the render process. Set this to true for controllers that must run next to the window instead, such as
+        debugging overlays. Controllers on different sides cannot depend on each other. This has no effect in the
+        default ``'inline'`` mode, where every controller runs in the same process.
+    :cvar step_rate: Number of times per second :meth:`on_step` is called, for controllers that do not need to run at
+        every step (e.g. AI or pathfinding). It is rounded to a whole number of steps between calls. If ``None``,
+        :meth:`on_step` is called at every step.
+    :cvar step_phase: For controllers with a :attr:`step_rate`, the position of their calls within their period, as a
+        fraction in ``[0, 1)``. If ``None``, Kizuna picks the phase that spreads the work of low-rate controllers
+        most evenly across steps.
     """
     settings: list['SettingSpec'] = []
+    render_process: bool = False
+    step_rate: float | None = None
+    step_phase: float | None = None
 
     def on_init(self):
         """Called when the controller class is initialized at the start of the game loop.
@@ -37,9 +60,14 @@ class Controller:
     def on_step(self, dt: float):
         """Called at each step of the game loop, to implement the game logic that must happen at each step.
 
-        :param dt: Time step or "delta time", in seconds. This is the actual time passed between time steps. Every
-            time-sensitive operation, such as moving a character, should be multiplied by this value to get a
-            consistent speed in all devices.
+        This method may also be implemented as a coroutine (``async def on_step``). In that case, each call runs as a
+        task of :data:`kizuna.core.async_runtime.async_runtime`, and steps are skipped while the previous call has
+        not finished yet. Exceptions raised by the coroutine are raised again at the next step it is due.
+
+        :param dt: Time step or "delta time", in seconds. This is the actual time passed since the last call to this
+            method, which spans several steps for controllers with a :attr:`step_rate`. Every time-sensitive
+            operation, such as moving a character, should be multiplied by this value to get a consistent speed in all
+            devices.
         """
         ...
 
@@ -47,3 +75,95 @@ class Controller:
         """Called to draw a frame of the game screen.
         """
         ...
+
+    def spawn_task(self, coroutine: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Run a coroutine in the background, such as loading a file or talking to a server, without blocking the
+        game loop.
+
+        The coroutine progresses between steps, within the time budget given by the ``ASYNC_BUDGET_MS`` setting.
+
+        :param coroutine: The coroutine to run.
+        :return: The task running the coroutine.
+        """
+        return async_runtime.spawn(coroutine)
+
+    def schedule_timer(self, delay: float, callback: Callable[[], None], interval: float | None = None) -> Timer:
+        """Call a function after some game time, such as a delay or a cooldown.
+
+        Pending timers cost nothing until they fire. See :mod:`kizuna.core.timers`.
+
+        :param delay: The game time to wait, in seconds.
+        :param callback: The function to call.
+        :param interval: If given, the timer repeats with this period, in seconds, until cancelled.
+        :return: The handle to the timer.
+        :raise ValueError: If the delay is negative, or the interval is not positive.
+        """
+        return timer_service.schedule(delay, callback, interval)
+
+    def start_tween(
+        self,
+        start: float | Vector2Like,
+        end: float | Vector2Like,
+        duration: float,
+        easing: str = 'linear',
+        on_update: Callable[[float | Vector2], None] | None = None,
+        on_complete: Callable[[], None] | None = None,
+    ) -> Tween:
+        """Interpolate a number or a vector over some game time.
+
+        See :meth:`kizuna.core.timers.TimerService.tween`.
+
+        :param start: The start value.
+        :param end: The end value. It must be of the same kind as the start value.
+        :param duration: The game time to go from the start to the end value, in seconds.
+        :param easing: The name of the easing function, one of :data:`kizuna.core.timers.EASINGS`.
+        :param on_update: Function called with the new value at each step.
+        :param on_complete: Function called once the end value is reached.
+        :return: The handle to the tween.
+        """
+        return timer_service.tween(start, end, duration, easing, on_update, on_complete)
+
+    def start_task(
+        self,
+        generator: TaskGenerator,
+        priority: int = 0,
+        callback: Callable[[Any], None] | None = None,
+    ) -> Task:
+        """Spread long-running work, such as generating a level, across steps.
+
+        The generator runs in slices between its ``yield`` statements, within the time budget given by the
+        ``TASK_BUDGET_MS`` setting. See :mod:`kizuna.core.tasks`.
+
+        :param generator: The generator to run.
+        :param priority: The priority of the task. Tasks with higher priority run first.
+        :param callback: Function called with the value returned by the generator once it finishes.
+        :return: The handle to the task.
+        """
+        return task_scheduler.spawn(generator, priority, callback)
+
+    def submit_job(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        callback: Callable[[Any], None] | None = None,
+        error_callback: Callable[[BaseException], None] | None = None,
+        process: bool = False,
+        **kwargs: Any,
+    ) -> Job:
+        """Run a CPU-heavy function in a worker thread or process, such as procedural generation or pathfinding.
+
+        The callbacks are called at the start of a later step, never concurrently with the game loop. The worker
+        must not touch game state: pass it the data it needs, and apply its result in the callback.
+
+        :param function: The function to run. For process jobs, it must be defined at module level.
+        :param args: Positional arguments for the function.
+        :param callback: Function called with the result of the job.
+        :param error_callback: Function called with the exception raised by the job. If not given, the exception is
+            raised in the game loop.
+        :param process: If true, the job runs in a worker process. Otherwise, it runs in a worker thread.
+        :param kwargs: Keyword arguments for the function.
+        :return: The handle to the job.
+        """
+        return job_pools.submit(
+            function, *args, callback=callback, error_callback=error_callback, process=process, **kwargs,
+        )
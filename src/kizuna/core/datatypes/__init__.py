@@ -1,3 +1,4 @@
 from .ivector2 import *  # noqa
 from .vector2 import *  # noqa
 from .color import *  # noqa
+from .transform2d import *  # noqa
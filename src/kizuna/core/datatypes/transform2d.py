@@ -0,0 +1,250 @@
+import math
+from typing import Any, Iterator
+
+from kizuna.core.datatypes.vector2 import Vector2, Vector2Like, validate_vector2
+from kizuna.core.validation import validate_float
+from kizuna.utils import fullname
+
+
+type Transform2DLike = Transform2D | tuple[float, float, float, float, float, float]
+"""Alias for a tuple of six numbers ``(a, b, c, d, tx, ty)`` that represents a 2D affine transform.
+
+Objects that match this type may be passed as function parameters or attributes where a :type:`Transform2D` is
+expected, and are automatically converted.
+"""
+
+
+class Transform2D:
+    """Affine transforms of a 2D space, such as the placement of an object given by its position and rotation.
+
+    A transform maps a point ``(x, y)`` to ``(a * x + c * y + tx, b * x + d * y + ty)``, that is, it is the matrix
+
+    ..  code-block::
+
+        | a  c  tx |
+        | b  d  ty |
+        | 0  0  1  |
+
+    Transforms are immutable. Let ``s`` and ``t`` be transform instances and ``p`` a vector. The following operators
+    are supported:
+
+    ==================== ========================================= ========================================
+    Operation            Result                                    Description
+    ==================== ========================================= ========================================
+    ``s @ t``            A transform equal to ``s(t(p))``          Composition, applying ``t`` first
+    ``t @ p``            ``t.apply(p)``                            Transformation of a point
+    ``tuple(t)``         ``(t.a, t.b, t.c, t.d, t.tx, t.ty)``      Convert to tuple
+    ``s == t``           ``tuple(s) == tuple(t)``                  Equality test
+    ``s != t``           ``tuple(s) != tuple(t)``                  Inequality test
+    ==================== ========================================= ========================================
+
+    The placement of an object attached to another one is its local transform composed with the placement of the
+    other object:
+
+    ..  code-block::
+
+        world = parent_world @ Transform2D.from_components(position, rotation)
+    """
+    __slots__ = ('_a', '_b', '_c', '_d', '_tx', '_ty')
+
+    def __init__(
+        self,
+        a: float = 1.0,
+        b: float = 0.0,
+        c: float = 0.0,
+        d: float = 1.0,
+        tx: float = 0.0,
+        ty: float = 0.0,
+    ):
+        """Create a :type:`Transform2D` with the given coefficients. Without arguments, it is the identity.
+
+        :param a: The *x*-component of the image of the *x*-axis unit vector.
+        :param b: The *y*-component of the image of the *x*-axis unit vector.
+        :param c: The *x*-component of the image of the *y*-axis unit vector.
+        :param d: The *y*-component of the image of the *y*-axis unit vector.
+        :param tx: The *x*-component of the translation.
+        :param ty: The *y*-component of the translation.
+        """
+        self._a = validate_float(a)
+        self._b = validate_float(b)
+        self._c = validate_float(c)
+        self._d = validate_float(d)
+        self._tx = validate_float(tx)
+        self._ty = validate_float(ty)
+
+    @staticmethod
+    def from_components(
+        position: Vector2Like = (0.0, 0.0),
+        rotation: float = 0.0,
+        scale: Vector2Like = (1.0, 1.0),
+    ) -> 'Transform2D':
+        """Create a :type:`Transform2D` that scales, then rotates, then translates.
+
+        :param position: The translation, which is where the origin is moved to.
+        :param rotation: The rotation, counterclockwise in degrees.
+        :param scale: The scale factor along each axis.
+        :return: A new transform with the result.
+        """
+        x, y = validate_vector2(position)
+        scale_x, scale_y = validate_vector2(scale)
+        rotation_rad = validate_float(rotation) * math.pi / 180
+        cos = math.cos(rotation_rad)
+        sin = math.sin(rotation_rad)
+        return Transform2D(cos * scale_x, sin * scale_x, -sin * scale_y, cos * scale_y, x, y)
+
+    @property
+    def a(self) -> float:
+        """Return the *x*-component of the image of the *x*-axis unit vector.
+        """
+        return self._a
+
+    @property
+    def b(self) -> float:
+        """Return the *y*-component of the image of the *x*-axis unit vector.
+        """
+        return self._b
+
+    @property
+    def c(self) -> float:
+        """Return the *x*-component of the image of the *y*-axis unit vector.
+        """
+        return self._c
+
+    @property
+    def d(self) -> float:
+        """Return the *y*-component of the image of the *y*-axis unit vector.
+        """
+        return self._d
+
+    @property
+    def tx(self) -> float:
+        """Return the *x*-component of the translation.
+        """
+        return self._tx
+
+    @property
+    def ty(self) -> float:
+        """Return the *y*-component of the translation.
+        """
+        return self._ty
+
+    @property
+    def translation(self) -> Vector2:
+        """Return the translation, which is where the origin is moved to.
+        """
+        return Vector2(self._tx, self._ty)
+
+    @property
+    def rotation(self) -> float:
+        """Return the angle the *x*-axis is rotated by, counterclockwise in degrees.
+        """
+        return math.atan2(self._b, self._a) * 180 / math.pi
+
+    @property
+    def determinant(self) -> float:
+        """Return the determinant of the linear part of the transform. It is zero if the transform is not invertible.
+        """
+        return self._a * self._d - self._b * self._c
+
+    def apply(self, point: Vector2Like) -> Vector2:
+        """Transform a point.
+
+        :param point: The point to transform.
+        :return: A new vector with the result.
+        :raise TypeError: If ``point`` is not a Vector2 and cannot be converted to a Vector2.
+        """
+        x, y = validate_vector2(point)
+        return Vector2(self._a * x + self._c * y + self._tx, self._b * x + self._d * y + self._ty)
+
+    def apply_vector(self, vector: Vector2Like) -> Vector2:
+        """Transform a displacement, ignoring the translation.
+
+        :param vector: The displacement to transform.
+        :return: A new vector with the result.
+        :raise TypeError: If ``vector`` is not a Vector2 and cannot be converted to a Vector2.
+        """
+        x, y = validate_vector2(vector)
+        return Vector2(self._a * x + self._c * y, self._b * x + self._d * y)
+
+    def inverse(self) -> 'Transform2D':
+        """Get the transform that undoes this one.
+
+        :return: A new transform with the result.
+        :raise ValueError: If the transform is not invertible.
+        """
+        determinant = self.determinant
+        if determinant == 0.0:
+            raise ValueError(f'{self!r} is not invertible.')
+        a = self._d / determinant
+        b = -self._b / determinant
+        c = -self._c / determinant
+        d = self._a / determinant
+        return Transform2D(a, b, c, d, -(a * self._tx + c * self._ty), -(b * self._tx + d * self._ty))
+
+    def __str__(self) -> str:
+        return f'[[{self._a}, {self._c}, {self._tx}], [{self._b}, {self._d}, {self._ty}]]'
+
+    def __repr__(self) -> str:
+        return f'Transform2D({self._a}, {self._b}, {self._c}, {self._d}, {self._tx}, {self._ty})'
+
+    def __matmul__(self, other: 'Transform2DLike | Vector2Like') -> 'Transform2D | Vector2':
+        """Compose two transforms, or transform a point.
+
+        :param other: The transform to apply before this one, or the point to transform.
+        :return: A new transform or vector with the result.
+        :raise TypeError: If ``other`` is not a transform or a vector and cannot be converted to such.
+        """
+        if isinstance(other, Vector2) or isinstance(other, tuple | list) and len(other) == 2:
+            return self.apply(other)
+        other = validate_transform2d(other)
+        a, b, c, d = self._a, self._b, self._c, self._d
+        return Transform2D(
+            a * other._a + c * other._b,
+            b * other._a + d * other._b,
+            a * other._c + c * other._d,
+            b * other._c + d * other._d,
+            a * other._tx + c * other._ty + self._tx,
+            b * other._tx + d * other._ty + self._ty,
+        )
+
+    def __iter__(self) -> Iterator[float]:
+        """Iterator over the coefficients ``a``, ``b``, ``c``, ``d``, ``tx`` and ``ty``.
+        """
+        return iter((self._a, self._b, self._c, self._d, self._tx, self._ty))
+
+    def __eq__(self, other: Any) -> bool:
+        """Coefficient-wise equality of two transforms.
+
+        :param other: The other transform.
+        :return: True if the two transforms are equal, false otherwise.
+        """
+        try:
+            return tuple(validate_transform2d(other)) == tuple(self)
+        except TypeError:
+            return False
+
+    def __ne__(self, other: Any) -> bool:
+        """Coefficient-wise inequality of two transforms.
+
+        :param other: The other transform.
+        :return: True if the two transforms are not equal, false otherwise.
+        """
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+
+def validate_transform2d(value: Transform2DLike) -> Transform2D:
+    """Validate that the given value is a :type:`Transform2D` or can be converted to a :type:`Transform2D`.
+
+    :param value: The value to validate.
+    :return: The validated value.
+    :raise TypeError: If the given value is not a :type:`Transform2D` and cannot be converted to such.
+    """
+    if isinstance(value, Transform2D):
+        return value
+    elif isinstance(value, tuple | list) and len(value) == 6 and all(isinstance(v, int | float) for v in value):
+        return Transform2D(*value)
+    else:
+        raise TypeError(f'Value must be Transform2D or convertible to Transform2D, got {fullname(type(value))}.')
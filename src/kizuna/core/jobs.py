@@ -0,0 +1,277 @@
+"""Background jobs that run in worker threads or processes, with their results delivered on the game loop.
+
+Jobs are submitted with :meth:`JobPools.submit` or :meth:`kizuna.core.controllers.Controller.submit_job`. Their
+callbacks are never called from the workers: finished jobs wait until :meth:`JobPools.deliver_results` is called at
+the start of the next step, so game state is never touched concurrently.
+"""
+
+import logging
+import multiprocessing
+import queue
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds the pools wait for running jobs when shutting down, so that closing the window is not held up by a long job.
+SHUTDOWN_TIMEOUT = 1.0
+
+
+def _run_timed(function: Callable[..., Any], args: tuple, kwargs: dict) -> tuple[float, Any]:
+    # Module-level so that it can be sent to worker processes. The monotonic clock is shared by all processes.
+    started_at = time.monotonic()
+    return started_at, function(*args, **kwargs)
+
+
+class Job:
+    """Handle to a job submitted to a :class:`JobPools` instance.
+    """
+    __slots__ = ('pool', 'future', 'callback', 'error_callback', 'submitted_at', 'started_at', 'finished_at')
+
+    def __init__(
+        self,
+        pool: str,
+        future: Future,
+        callback: Callable[[Any], None] | None,
+        error_callback: Callable[[BaseException], None] | None,
+    ):
+        self.pool = pool
+        self.future = future
+        self.callback = callback
+        self.error_callback = error_callback
+        self.submitted_at = time.monotonic()
+        self.started_at: float | None = None
+        self.finished_at: float | None = None
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Job(pool="{self.pool}", done={self.done})'
+
+    @property
+    def done(self) -> bool:
+        """Get whether the job has finished, regardless of whether its callback has been called yet.
+        """
+        return self.future.done()
+
+    def cancel(self) -> bool:
+        """Cancel the job if it has not started yet. Cancelled jobs do not call their callbacks.
+
+        :return: True if the job was cancelled, false if it is already running or finished.
+        """
+        return self.future.cancel()
+
+
+class JobStatistics:
+    """Metrics of one of the pools of a :class:`JobPools` instance.
+
+    Times are in seconds. Waits are measured from submission to the start of the job, and latencies from submission to
+    the delivery of the result on the game loop.
+    """
+    __slots__ = (
+        'submitted', 'completed', 'failed', 'queue_depth', 'running', 'total_wait', 'total_duration', 'total_latency',
+        'max_latency',
+    )
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_depth = 0
+        self.running = 0
+        self.total_wait = 0.0
+        self.total_duration = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'JobStatistics(submitted={self.submitted}, queue_depth={self.queue_depth}, running={self.running}, '
+            f'average_latency={self.average_latency:.6f})'
+        )
+
+    @property
+    def average_wait(self) -> float:
+        """Get the average time jobs waited in the queue before starting.
+        """
+        return self.total_wait / self.completed if self.completed > 0 else 0.0
+
+    @property
+    def average_duration(self) -> float:
+        """Get the average time jobs took to run.
+        """
+        return self.total_duration / self.completed if self.completed > 0 else 0.0
+
+    @property
+    def average_latency(self) -> float:
+        """Get the average time from the submission of jobs to the delivery of their results.
+        """
+        delivered = self.completed + self.failed
+        return self.total_latency / delivered if delivered > 0 else 0.0
+
+
+class JobPools:
+    """Thread pool and process pool shared by the whole application.
+
+    Use thread jobs for work that releases the GIL (e.g. NumPy, I/O), and process jobs for pure Python CPU-heavy work.
+    Process jobs must be picklable: their function has to be defined at module level, and their arguments and result
+    are copied between processes.
+
+    Pools are created the first time a job is submitted to them. Use :data:`job_pools` to access the pools.
+    """
+
+    THREAD = 'thread'
+    PROCESS = 'process'
+
+    def __init__(self, thread_workers: int | None = None, process_workers: int | None = None):
+        """Create the pools, without starting any worker.
+
+        :param thread_workers: The number of worker threads, or ``None`` to pick it from the number of CPUs.
+        :param process_workers: The number of worker processes, or ``None`` to use the number of CPUs.
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+        self._executors: dict[str, Executor] = {}
+        self._pending: set[Job] = set()
+        self._finished: queue.SimpleQueue[Job] = queue.SimpleQueue()
+        self._statistics = {self.THREAD: JobStatistics(), self.PROCESS: JobStatistics()}
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'JobPools(pending={len(self._pending)}, pools={list(self._executors)})'
+
+    @property
+    def pending_jobs(self) -> int:
+        """Get the number of jobs whose results have not been delivered yet.
+        """
+        return len(self._pending)
+
+    def configure(self, thread_workers: int | None, process_workers: int | None):
+        """Set the number of workers of the pools. This only affects pools not created yet.
+
+        :param thread_workers: The number of worker threads, or ``None`` to pick it from the number of CPUs.
+        :param process_workers: The number of worker processes, or ``None`` to use the number of CPUs.
+        """
+        self.thread_workers = thread_workers
+        self.process_workers = process_workers
+
+    def submit(
+        self,
+        function: Callable[..., Any],
+        *args: Any,
+        callback: Callable[[Any], None] | None = None,
+        error_callback: Callable[[BaseException], None] | None = None,
+        process: bool = False,
+        **kwargs: Any,
+    ) -> Job:
+        """Run a function in a worker.
+
+        :param function: The function to run.
+        :param args: Positional arguments for the function.
+        :param callback: Function called on the game loop with the result of the job.
+        :param error_callback: Function called on the game loop with the exception raised by the job. If not given,
+            the exception is raised by :meth:`deliver_results`.
+        :param process: If true, the job runs in the process pool. Otherwise, it runs in the thread pool.
+        :param kwargs: Keyword arguments for the function.
+        :return: The handle to the job.
+        """
+        pool = self.PROCESS if process else self.THREAD
+        future = self._get_executor(pool).submit(_run_timed, function, args, kwargs)
+        job = Job(pool, future, callback, error_callback)
+        self._pending.add(job)
+        self._statistics[pool].submitted += 1
+        future.add_done_callback(lambda _: self._finished.put(job))
+        return job
+
+    def deliver_results(self):
+        """Call the callbacks of the jobs finished so far, in the order they finished.
+
+        :raise BaseException: The exception raised by a job without an error callback.
+        """
+        while True:
+            try:
+                job = self._finished.get_nowait()
+            except queue.Empty:
+                return
+            self._pending.discard(job)
+            future = job.future
+            if future.cancelled():
+                continue
+
+            now = time.monotonic()
+            statistics = self._statistics[job.pool]
+            latency = now - job.submitted_at
+            statistics.total_latency += latency
+            statistics.max_latency = max(statistics.max_latency, latency)
+            exception = future.exception()
+            if exception is not None:
+                statistics.failed += 1
+                if job.error_callback is None:
+                    raise exception
+                job.error_callback(exception)
+                continue
+
+            job.started_at, result = future.result()
+            job.finished_at = now
+            statistics.completed += 1
+            statistics.total_wait += job.started_at - job.submitted_at
+            statistics.total_duration += now - job.started_at
+            if job.callback is not None:
+                job.callback(result)
+
+    def get_statistics(self) -> dict[str, JobStatistics]:
+        """Get the metrics of each pool.
+
+        :return: The metrics of the thread pool and the process pool, by pool name.
+        """
+        for statistics in self._statistics.values():
+            statistics.queue_depth = 0
+            statistics.running = 0
+        for job in self._pending:
+            if job.future.running():
+                self._statistics[job.pool].running += 1
+            elif not job.future.done():
+                self._statistics[job.pool].queue_depth += 1
+        return self._statistics
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """Cancel the jobs that have not started, wait for the running ones and stop the workers.
+
+        Results of jobs not delivered yet are discarded. Jobs still running after the timeout are abandoned: their
+        workers stop once they finish, but this method does not wait for them.
+
+        :param timeout: The maximum time to wait for the running jobs, in seconds.
+        """
+        for executor in self._executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+        _, running = wait([job.future for job in self._pending], timeout)
+        if running:
+            logger.warning(f'{len(running)} job(s) still running after {timeout} seconds, not waiting for them.')
+        self._executors.clear()
+        self._pending.clear()
+        self._finished = queue.SimpleQueue()
+
+    def _get_executor(self, pool: str) -> Executor:
+        executor = self._executors.get(pool)
+        if executor is None:
+            if pool == self.PROCESS:
+                # Spawn rather than fork, so that workers do not inherit the state of the windowing library.
+                executor = ProcessPoolExecutor(self.process_workers, multiprocessing.get_context('spawn'))
+            else:
+                executor = ThreadPoolExecutor(self.thread_workers, thread_name_prefix='kizuna-job')
+            self._executors[pool] = executor
+            logger.info(f'Job pool "{pool}" started.')
+        return executor
+
+
+job_pools = JobPools()
+"""Job pools singleton instance.
+"""
@@ -0,0 +1,226 @@
+"""Quality scaling driven by the frame time budget.
+
+Controllers and systems register quality steps: pairs of functions that lower the quality of something to save time,
+and restore it. The game loop reports the time it spends working in each frame, stepping and drawing but not waiting
+for the next frame. When the average over the last frames exceeds the budget of ``1 / FRAMES_PER_SECOND``, the next
+step is degraded. When it falls well below it, the last degraded step is restored.
+
+The thresholds to degrade and to restore are apart, and no decision is made until the frames measured are all from
+after the last change, so the quality does not oscillate between two steps.
+
+Frames drawn below the full frame rate, e.g. while the window does not have the focus, are not measured: the steps
+done between two of them would add up to more than one frame interval.
+
+..  code-block:: python
+
+    def on_init(self):
+        quality_governor.register(
+            'particles',
+            degrade=lambda: self.set_particle_density(0.5),
+            restore=lambda: self.set_particle_density(1.0),
+        )
+"""
+
+from typing import Callable
+
+from kizuna.core.validation import validate_positive_float, validate_positive_int
+
+
+class QualityStep:
+    """Handle to a step registered in a :class:`QualityGovernor`.
+    """
+    __slots__ = ('name', 'degrade', 'restore', 'order', 'is_degraded')
+
+    def __init__(self, name: str, degrade: Callable[[], None], restore: Callable[[], None], order: int):
+        self.name = name
+        self.degrade = degrade
+        self.restore = restore
+        self.order = order
+        self.is_degraded = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'QualityStep("{self.name}", order={self.order}, degraded={self.is_degraded})'
+
+
+class QualityGovernor:
+    """Degrades and restores quality steps to keep the frame time within the budget.
+
+    Use :data:`quality_governor` to access the governor. It is configured with the ``FRAMES_PER_SECOND`` setting when
+    the application is initialized, and fed by the game loop.
+    """
+
+    def __init__(
+        self,
+        frames_per_second: float = 60.0,
+        window_size: int = 60,
+        degrade_threshold: float = 1.0,
+        restore_threshold: float = 0.6,
+    ):
+        """Create the governor.
+
+        :param frames_per_second: The frame rate the budget is derived from.
+        :param window_size: The number of frames the frame time is averaged over.
+        :param degrade_threshold: The fraction of the budget above which the quality is degraded.
+        :param restore_threshold: The fraction of the budget below which the quality is restored. It should be well
+            below ``degrade_threshold``, since restoring a step makes frames slower again.
+        """
+        self.window_size = validate_positive_int(window_size)
+        self.degrade_threshold = validate_positive_float(degrade_threshold)
+        self.restore_threshold = validate_positive_float(restore_threshold)
+        if self.restore_threshold >= self.degrade_threshold:
+            raise ValueError('The restore threshold must be lower than the degrade threshold.')
+        self.budget = 1 / validate_positive_float(frames_per_second)
+
+        # Steps by order of degradation, and the degraded ones, from the first degraded to the last.
+        self._steps: list[QualityStep] = []
+        self._degraded: list[QualityStep] = []
+
+        # Ring of the last frame times, their sum, and the work reported for the frame in progress.
+        self._frame_times = [0.0] * self.window_size
+        self._frame_time_sum = 0.0
+        self._frames_measured = 0
+        self._pending_work = 0.0
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'QualityGovernor(budget={self.budget}, level={self.level}, steps={len(self._steps)})'
+
+    @property
+    def level(self) -> int:
+        """Get the number of degraded steps. Level ``0`` is the full quality.
+        """
+        return len(self._degraded)
+
+    @property
+    def average_frame_time(self) -> float | None:
+        """Get the average frame time over the frames measured since the last change, or ``None`` if there are none.
+        """
+        count = min(self._frames_measured, self.window_size)
+        return self._frame_time_sum / count if count else None
+
+    def configure(self, frames_per_second: float):
+        """Set the frame rate the budget is derived from.
+
+        :param frames_per_second: The frame rate.
+        """
+        self.budget = 1 / validate_positive_float(frames_per_second)
+        self._reset_frame_times()
+
+    def register(
+        self,
+        name: str,
+        degrade: Callable[[], None],
+        restore: Callable[[], None],
+        order: int = 0,
+    ) -> QualityStep:
+        """Register a quality step.
+
+        :param name: The name of the step, for debugging.
+        :param degrade: The function lowering the quality.
+        :param restore: The function restoring the quality lowered by ``degrade``.
+        :param order: The order the step is degraded in. Steps with lower order are degraded first, and steps with
+            the same order are degraded in the order they were registered.
+        :return: The handle to the step.
+        """
+        step = QualityStep(name, degrade, restore, order)
+        index = len(self._steps)
+        while index > 0 and self._steps[index - 1].order > order:
+            index -= 1
+        self._steps.insert(index, step)
+        return step
+
+    def unregister(self, step: QualityStep):
+        """Remove a quality step, restoring it first if it is degraded.
+
+        :param step: The handle to the step.
+        """
+        if step.is_degraded:
+            step.is_degraded = False
+            self._degraded.remove(step)
+            step.restore()
+        if step in self._steps:
+            self._steps.remove(step)
+
+    def add_work(self, seconds: float):
+        """Report time spent working on the frame in progress, e.g. stepping the simulation.
+
+        :param seconds: The time spent, in seconds.
+        """
+        self._pending_work += seconds
+
+    def end_frame(self, seconds: float = 0.0):
+        """Report the end of a frame, and degrade or restore a step if needed.
+
+        :param seconds: More time spent working on the frame, e.g. drawing it, in seconds.
+        """
+        frame_time = self._pending_work + seconds
+        self._pending_work = 0.0
+        index = self._frames_measured % self.window_size
+        self._frame_time_sum += frame_time - self._frame_times[index]
+        self._frame_times[index] = frame_time
+        self._frames_measured += 1
+        if self._frames_measured < self.window_size:
+            return
+
+        average = self._frame_time_sum / self.window_size
+        if average > self.budget * self.degrade_threshold:
+            self.degrade()
+        elif average < self.budget * self.restore_threshold:
+            self.restore()
+
+    def skip_frame(self):
+        """Report the end of a frame that is not measured, and forget the time reported for it.
+
+        This is done for frames drawn below the full frame rate, whose work covers more than one frame interval.
+        """
+        self._pending_work = 0.0
+
+    def degrade(self) -> bool:
+        """Degrade the next step.
+
+        :return: Whether there was a step to degrade.
+        """
+        step = next((step for step in self._steps if not step.is_degraded), None)
+        if step is None:
+            return False
+        step.is_degraded = True
+        self._degraded.append(step)
+        self._reset_frame_times()
+        step.degrade()
+        return True
+
+    def restore(self) -> bool:
+        """Restore the last degraded step.
+
+        :return: Whether there was a step to restore.
+        """
+        if not self._degraded:
+            return False
+        step = self._degraded.pop()
+        step.is_degraded = False
+        self._reset_frame_times()
+        step.restore()
+        return True
+
+    def clear(self):
+        """Forget every step without restoring them, and the frames measured. This is done when the game loop stops.
+        """
+        self._steps.clear()
+        self._degraded.clear()
+        self._reset_frame_times()
+
+    def _reset_frame_times(self):
+        self._frame_times = [0.0] * self.window_size
+        self._frame_time_sum = 0.0
+        self._frames_measured = 0
+        self._pending_work = 0.0
+
+
+quality_governor = QualityGovernor()
+"""Quality governor singleton instance.
+"""
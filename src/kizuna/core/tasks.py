@@ -0,0 +1,230 @@
+"""Cooperative tasks that spread long-running work across steps.
+
+A task is a generator. Every ``yield`` is a point where the task may be paused: the scheduler keeps resuming tasks
+until the time budget of the step is spent, and the remaining work continues at the next step. Yield
+:data:`NEXT_STEP` to pause until the next step regardless of the budget left.
+
+..  code-block:: python
+
+    def generate_level(self, width, height):
+        tiles = []
+        for y in range(height):
+            tiles.append([self.pick_tile(x, y) for x in range(width)])
+            yield
+        return tiles
+
+    controller.start_task(self.generate_level(512, 512), callback=self.on_level_generated)
+"""
+
+import heapq
+import itertools
+import time
+from typing import Any, Callable, Generator
+
+
+class _NextStep:
+
+    def __repr__(self) -> str:
+        return 'NEXT_STEP'
+
+
+NEXT_STEP = _NextStep()
+"""Value to yield from a task to pause it until the next step.
+"""
+
+type TaskGenerator = Generator[Any, None, Any]
+"""Generator run as a task. The value it returns is passed to the callback of the task.
+"""
+
+
+class Task:
+    """Handle to a generator scheduled in a :class:`TaskScheduler`.
+    """
+    __slots__ = ('generator', 'priority', 'callback', 'name', 'is_done', 'is_cancelled', '_running')
+
+    def __init__(
+        self,
+        generator: TaskGenerator,
+        priority: int,
+        callback: Callable[[Any], None] | None,
+        name: str | None,
+    ):
+        self.generator = generator
+        self.priority = priority
+        self.callback = callback
+        self.name = name if name is not None else getattr(generator, '__qualname__', 'task')
+        self.is_done = False
+        self.is_cancelled = False
+        self._running = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Task("{self.name}", priority={self.priority}, done={self.is_done})'
+
+    def cancel(self):
+        """Stop the task. The generator is closed, so its ``finally`` blocks run, and the callback is not called.
+
+        A task may cancel itself while running, e.g. by destroying the entity that owns it. The generator is then
+        closed by the scheduler once it yields.
+        """
+        if self.is_done:
+            return
+        self.is_done = True
+        self.is_cancelled = True
+        if not self._running:
+            self.generator.close()
+
+
+class TaskStatistics:
+    """Metrics of a :class:`TaskScheduler`. Times are in seconds.
+
+    A step overruns its deadline when a slice is still running when the budget of the step is spent. Slices cannot be
+    interrupted, so tasks should yield often enough for their slices to stay well below the budget.
+    """
+    __slots__ = ('steps', 'slices', 'completed', 'overruns', 'total_overrun', 'max_slice')
+
+    def __init__(self):
+        self.steps = 0
+        self.slices = 0
+        self.completed = 0
+        self.overruns = 0
+        self.total_overrun = 0.0
+        self.max_slice = 0.0
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'TaskStatistics(steps={self.steps}, slices={self.slices}, overruns={self.overruns}, '
+            f'max_slice={self.max_slice:.6f})'
+        )
+
+
+class TaskScheduler:
+    """Runs tasks within a time budget per step.
+
+    Tasks with higher priority run first. Tasks with the same priority take turns: each task is resumed once, and
+    then goes after the other tasks of its priority, so that a single task cannot spend the whole budget. Use
+    :data:`task_scheduler` to access the scheduler.
+    """
+
+    def __init__(self):
+        self.statistics = TaskStatistics()
+        self._queue: list[tuple[int, int, Task]] = []
+        self._order = itertools.count()
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'TaskScheduler(tasks={self.pending_tasks})'
+
+    @property
+    def pending_tasks(self) -> int:
+        """Get the number of tasks that have not finished yet.
+        """
+        return sum(1 for _, _, task in self._queue if not task.is_done)
+
+    def spawn(
+        self,
+        generator: TaskGenerator,
+        priority: int = 0,
+        callback: Callable[[Any], None] | None = None,
+        name: str | None = None,
+    ) -> Task:
+        """Schedule a generator to run as a task, starting at the next step.
+
+        :param generator: The generator to run.
+        :param priority: The priority of the task. Tasks with higher priority run first.
+        :param callback: Function called with the value returned by the generator once it finishes.
+        :param name: Name of the task, for debugging.
+        :return: The handle to the task.
+        """
+        task = Task(generator, priority, callback, name)
+        self._push(task)
+        return task
+
+    def run_until(self, deadline: float):
+        """Resume tasks until the deadline is reached or every task has paused until the next step.
+
+        At least one slice is run, so that tasks progress even with a tiny budget.
+
+        :param deadline: The time to stop at, as returned by :func:`time.perf_counter`.
+        :raise Exception: The exception raised by a task. The task is removed from the scheduler.
+        """
+        queue = self._queue
+        if not queue:
+            return
+        statistics = self.statistics
+        statistics.steps += 1
+        paused = []
+        first = True
+        try:
+            while queue:
+                if not first and time.perf_counter() >= deadline:
+                    break
+                first = False
+                _, _, task = heapq.heappop(queue)
+                if task.is_done:
+                    continue
+
+                # Resume the task for a single slice, then let the other tasks of its priority take their turn.
+                task._running = True
+                start = time.perf_counter()
+                try:
+                    value = next(task.generator)
+                except StopIteration as e:
+                    if not task.is_cancelled:
+                        task.is_done = True
+                        statistics.completed += 1
+                        if task.callback is not None:
+                            task.callback(e.value)
+                    continue
+                except BaseException:
+                    task.is_done = True
+                    raise
+                finally:
+                    task._running = False
+                    end = time.perf_counter()
+                    statistics.slices += 1
+                    statistics.max_slice = max(statistics.max_slice, end - start)
+
+                if task.is_cancelled:
+                    # The task cancelled itself while running.
+                    task.generator.close()
+                elif value is NEXT_STEP:
+                    paused.append(task)
+                else:
+                    self._push(task)
+        finally:
+            for task in paused:
+                self._push(task)
+            end = time.perf_counter()
+            if end > deadline:
+                statistics.overruns += 1
+                statistics.total_overrun += end - deadline
+
+    def run_for(self, budget: float):
+        """Resume tasks for at most the given time, except for the slice running when the budget is spent.
+
+        :param budget: The time budget, in seconds.
+        """
+        self.run_until(time.perf_counter() + budget)
+
+    def shutdown(self):
+        """Cancel every task.
+        """
+        for _, _, task in self._queue:
+            task.cancel()
+        self._queue.clear()
+
+    def _push(self, task: Task):
+        heapq.heappush(self._queue, (-task.priority, next(self._order), task))
+
+
+task_scheduler = TaskScheduler()
+"""Task scheduler singleton instance.
+"""
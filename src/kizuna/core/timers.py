@@ -0,0 +1,344 @@
+"""Timers and tweens driven by game time.
+
+Game time advances by the time step of every step of the game loop. Pending timers are kept in a heap ordered by
+the time they fire at, so each step only looks at the timers that are due, no matter how many are pending. Active
+tweens are kept in arrays and interpolated all at once.
+
+Timers and tweens are created with the methods of :class:`kizuna.core.controllers.Controller` and
+:class:`kizuna.systems.stage2d.Entity2D`, or with :data:`timer_service` directly.
+"""
+
+import heapq
+import itertools
+from typing import Callable
+
+import numpy
+
+from kizuna.core.datatypes import Vector2, Vector2Like, validate_vector2
+from kizuna.core.validation import validate_float
+
+
+def _ease_in_out_quad(t: numpy.ndarray) -> numpy.ndarray:
+    return numpy.where(t < 0.5, 2 * t * t, 1 - (-2 * t + 2) ** 2 / 2)
+
+
+def _ease_in_out_cubic(t: numpy.ndarray) -> numpy.ndarray:
+    return numpy.where(t < 0.5, 4 * t ** 3, 1 - (-2 * t + 2) ** 3 / 2)
+
+
+EASINGS: dict[str, Callable[[numpy.ndarray], numpy.ndarray]] = {
+    'linear': lambda t: t,
+    'in_quad': lambda t: t * t,
+    'out_quad': lambda t: 1 - (1 - t) ** 2,
+    'in_out_quad': _ease_in_out_quad,
+    'in_cubic': lambda t: t ** 3,
+    'out_cubic': lambda t: 1 - (1 - t) ** 3,
+    'in_out_cubic': _ease_in_out_cubic,
+    'in_out_sine': lambda t: -(numpy.cos(numpy.pi * t) - 1) / 2,
+}
+"""Easing functions available for tweens, by name. Each one maps an array of progress values in ``[0, 1]`` to eased
+values.
+"""
+
+_EASING_NAMES = list(EASINGS)
+
+
+class Timer:
+    """Handle to a callback scheduled in a :class:`TimerService`.
+    """
+    __slots__ = ('service', 'callback', 'fire_time', 'interval', 'is_cancelled', 'is_done')
+
+    def __init__(
+        self,
+        service: 'TimerService',
+        callback: Callable[[], None],
+        fire_time: float,
+        interval: float | None,
+    ):
+        self.service = service
+        self.callback = callback
+        self.fire_time = fire_time
+        self.interval = interval
+        self.is_cancelled = False
+        self.is_done = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Timer(fire_time={self.fire_time}, interval={self.interval}, done={self.is_done})'
+
+    def cancel(self):
+        """Stop the timer, so that its callback is no longer called.
+        """
+        if self.is_done:
+            return
+        self.is_cancelled = True
+        self.is_done = True
+        # Cancelled timers stay in the heap until they are due, so drop the callback and whatever it references.
+        self.callback = None
+        self.service._on_timer_cancelled()  # noqa
+
+
+class Tween:
+    """Handle to a value interpolated over time by a :class:`TimerService`.
+
+    Read :attr:`value` whenever the current value is needed, or pass an ``on_update`` callback to have it pushed to a
+    target at each step. Reading on demand is cheaper when many tweens are active.
+    """
+    __slots__ = ('service', 'index', 'is_vector', 'end', 'on_update', 'on_complete', 'is_done')
+
+    def __init__(
+        self,
+        service: 'TimerService',
+        is_vector: bool,
+        end: float | Vector2,
+        on_update: Callable[[float | Vector2], None] | None,
+        on_complete: Callable[[], None] | None,
+    ):
+        self.service = service
+        self.index = -1
+        self.is_vector = is_vector
+        self.end = end
+        self.on_update = on_update
+        self.on_complete = on_complete
+        self.is_done = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Tween(value={self.value}, end={self.end}, done={self.is_done})'
+
+    @property
+    def value(self) -> float | Vector2:
+        """Get the current value of the tween. Once the tween is done, this is its end value.
+        """
+        if self.is_done:
+            return self.end
+        x, y = self.service._tween_values[self.index]  # noqa
+        return Vector2(float(x), float(y)) if self.is_vector else float(x)
+
+    def cancel(self):
+        """Stop the tween where it is. Its completion callback is not called.
+        """
+        if not self.is_done:
+            self.service._remove_tween(self)  # noqa
+
+
+class TimerService:
+    """Keeps game time and runs the timers and tweens scheduled on it.
+
+    Use :data:`timer_service` to access the service. It is advanced at the start of each step of the game loop.
+    """
+
+    def __init__(self, tween_capacity: int = 64):
+        """Create the service.
+
+        :param tween_capacity: Initial capacity of the tween arrays. They grow as needed.
+        """
+        self.time = 0.0
+        self._timers: list[tuple[float, int, Timer]] = []
+        self._cancelled_timers = 0
+        self._order = itertools.count()
+
+        # Active tweens occupy the first ``_tween_count`` rows of the arrays. Tweens with an update callback are also
+        # kept apart, since only those need Python work at each step.
+        self._tweens: list[Tween] = []
+        self._updated_tweens: dict[Tween, None] = {}
+        self._tween_count = 0
+        self._tween_starts = numpy.zeros((tween_capacity, 2))
+        self._tween_ends = numpy.zeros((tween_capacity, 2))
+        self._tween_start_times = numpy.zeros(tween_capacity)
+        self._tween_durations = numpy.ones(tween_capacity)
+        self._tween_easings = numpy.zeros(tween_capacity, dtype=numpy.int8)
+        self._tween_values = numpy.zeros((tween_capacity, 2))
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'TimerService(time={self.time}, timers={self.pending_timers}, tweens={self.active_tweens})'
+
+    @property
+    def pending_timers(self) -> int:
+        """Get the number of timers that have not fired or been cancelled yet.
+        """
+        return len(self._timers) - self._cancelled_timers
+
+    @property
+    def active_tweens(self) -> int:
+        """Get the number of tweens in progress.
+        """
+        return self._tween_count
+
+    def schedule(self, delay: float, callback: Callable[[], None], interval: float | None = None) -> Timer:
+        """Call a function after some game time.
+
+        Timers fire at the earliest during the next :meth:`advance`, even with a zero delay, so that a timer scheduled
+        by the callback of another one does not fire in the same step.
+
+        :param delay: The game time to wait, in seconds.
+        :param callback: The function to call.
+        :param interval: If given, the timer repeats with this period, in seconds, until cancelled.
+        :return: The handle to the timer.
+        :raise ValueError: If the delay is negative, or the interval is not positive.
+        """
+        delay = validate_float(delay)
+        if delay < 0:
+            raise ValueError('Delay must not be negative.')
+        if interval is not None:
+            interval = validate_float(interval)
+            if interval <= 0:
+                raise ValueError('Interval must be positive.')
+        timer = Timer(self, callback, self.time + delay, interval)
+        heapq.heappush(self._timers, (timer.fire_time, next(self._order), timer))
+        return timer
+
+    def tween(
+        self,
+        start: float | Vector2Like,
+        end: float | Vector2Like,
+        duration: float,
+        easing: str = 'linear',
+        on_update: Callable[[float | Vector2], None] | None = None,
+        on_complete: Callable[[], None] | None = None,
+    ) -> Tween:
+        """Interpolate a number or a vector over some game time.
+
+        :param start: The start value.
+        :param end: The end value. It must be of the same kind as the start value.
+        :param duration: The game time to go from the start to the end value, in seconds.
+        :param easing: The name of the easing function, one of :data:`EASINGS`.
+        :param on_update: Function called with the new value at each step.
+        :param on_complete: Function called once the end value is reached.
+        :return: The handle to the tween.
+        :raise ValueError: If the easing function does not exist.
+        """
+        if easing not in EASINGS:
+            raise ValueError(f'Unknown easing "{easing}". Available easings: {", ".join(EASINGS)}.')
+        duration = validate_float(duration)
+        is_vector = not isinstance(start, int | float)
+        if is_vector:
+            start = validate_vector2(start)
+            end = validate_vector2(end)
+        else:
+            start = validate_float(start)
+            end = validate_float(end)
+            start, end = Vector2(start, 0.0), Vector2(end, 0.0)
+
+        tween = Tween(self, is_vector, end if is_vector else end.x, on_update, on_complete)
+        index = self._tween_count
+        if index == len(self._tween_start_times):
+            self._grow_tweens()
+        self._tween_starts[index] = tuple(start)
+        self._tween_ends[index] = tuple(end)
+        self._tween_values[index] = tuple(start)
+        self._tween_start_times[index] = self.time
+        self._tween_durations[index] = max(duration, 1e-9)
+        self._tween_easings[index] = _EASING_NAMES.index(easing)
+        tween.index = index
+        self._tweens.append(tween)
+        if on_update is not None:
+            self._updated_tweens[tween] = None
+        self._tween_count += 1
+        return tween
+
+    def advance(self, dt: float):
+        """Advance game time, firing the timers that are due and updating the tweens.
+
+        :param dt: The time step, in seconds.
+        """
+        self.time += dt
+        self._fire_timers()
+        if self._tween_count > 0:
+            self._update_tweens()
+
+    def clear(self):
+        """Cancel every timer and tween, and reset game time.
+        """
+        for _, _, timer in self._timers:
+            timer.is_cancelled = timer.is_done = True
+        for tween in self._tweens:
+            tween.is_done = True
+        self.time = 0.0
+        self._timers.clear()
+        self._cancelled_timers = 0
+        self._tweens.clear()
+        self._updated_tweens.clear()
+        self._tween_count = 0
+
+    def _fire_timers(self):
+        # Timers scheduled by callbacks during this pass are due no earlier than now, so they come after every timer
+        # scheduled before it that is due. Stopping at the first of them leaves them for the next pass.
+        timers = self._timers
+        now = self.time
+        first_new_order = next(self._order)
+        while timers and timers[0][0] <= now and timers[0][1] < first_new_order:
+            fire_time, order, timer = heapq.heappop(timers)
+            if timer.is_cancelled:
+                self._cancelled_timers -= 1
+                continue
+            if timer.interval is not None:
+                # Repeating timers keep their order number, so that they catch up within the pass after a long step.
+                timer.fire_time = fire_time + timer.interval
+                heapq.heappush(timers, (timer.fire_time, order, timer))
+            else:
+                timer.is_done = True
+            timer.callback()
+
+    def _on_timer_cancelled(self):
+        # Cancelled timers are left in the heap until they are due, unless they pile up, so cancelling is cheap.
+        self._cancelled_timers += 1
+        if self._cancelled_timers > 1024 and self._cancelled_timers > len(self._timers) // 2:
+            self._timers = [entry for entry in self._timers if not entry[2].is_cancelled]
+            heapq.heapify(self._timers)
+            self._cancelled_timers = 0
+
+    def _update_tweens(self):
+        count = self._tween_count
+        progress = numpy.clip((self.time - self._tween_start_times[:count]) / self._tween_durations[:count], 0.0, 1.0)
+        finished = [self._tweens[index] for index in numpy.flatnonzero(progress >= 1.0)]
+        easings = self._tween_easings[:count]
+        for easing_index in numpy.unique(easings):
+            mask = easings == easing_index
+            progress[mask] = EASINGS[_EASING_NAMES[easing_index]](progress[mask])
+        starts = self._tween_starts[:count]
+        self._tween_values[:count] = starts + (self._tween_ends[:count] - starts) * progress[:, numpy.newaxis]
+
+        # Callbacks may cancel other tweens, so iterate over copies.
+        for tween in list(self._updated_tweens):
+            if not tween.is_done:
+                tween.on_update(tween.value)
+        for tween in finished:
+            if not tween.is_done:
+                self._remove_tween(tween)
+                if tween.on_complete is not None:
+                    tween.on_complete()
+
+    def _remove_tween(self, tween: Tween):
+        # Move the last tween into the row of the removed one, so that active tweens stay packed.
+        index = tween.index
+        last = self._tween_count - 1
+        last_tween = self._tweens[last]
+        if index != last:
+            for array in (self._tween_starts, self._tween_ends, self._tween_start_times, self._tween_durations,
+                          self._tween_easings, self._tween_values):
+                array[index] = array[last]
+            last_tween.index = index
+            self._tweens[index] = last_tween
+        self._tweens.pop()
+        self._updated_tweens.pop(tween, None)
+        self._tween_count = last
+        tween.is_done = True
+
+    def _grow_tweens(self):
+        for name in ('_tween_starts', '_tween_ends', '_tween_start_times', '_tween_durations', '_tween_easings',
+                     '_tween_values'):
+            array = getattr(self, name)
+            setattr(self, name, numpy.concatenate([array, numpy.zeros_like(array)]))
+
+
+timer_service = TimerService()
+"""Timer service singleton instance.
+"""
@@ -47,6 +47,20 @@ def validate_int(value: int) -> int:
     return validate_type(value, int)
 
 
+def validate_positive_int(value: int) -> int:
+    """Validate that the given value is a positive integer.
+
+    :param value: The value to validate.
+    :return: The validated value.
+    :raise TypeError: If the value is not an integer.
+    :raise ValueError: If the value is not positive.
+    """
+    value = validate_int(value)
+    if value <= 0:
+        raise ValueError('Value must be positive.')
+    return value
+
+
 def clamp_int(value: int, min_value: int, max_value: int) -> int:
     """Clamp the given value to an integer.
 
@@ -121,6 +135,21 @@ def validate_identifier(value: str) -> str:
     return value
 
 
+def validate_choice(value: str, choices: tuple[str, ...]) -> str:
+    """Validate that the given value is one of a fixed set of strings.
+
+    :param value: The value to validate.
+    :param choices: The allowed values.
+    :return: The validated value.
+    :raise TypeError: If the value is not a string.
+    :raise ValueError: If the value is not one of the allowed values.
+    """
+    value = validate_str(value)
+    if value not in choices:
+        raise ValueError(f'"{value}" is not one of: {", ".join(choices)}.')
+    return value
+
+
 def validate_and_import_module_path(value: str) -> Any:
     """Validate that the given value is an existing module path and import it.
 
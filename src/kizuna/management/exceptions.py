@@ -44,3 +44,76 @@ class ControllerDependencyInjectionError(ManagementError):
             f'Cannot instantiate "{fullname(dependent_controller)}" because it depends on '
             f'"{fullname(dependency_controller)}", which is not declared in "settings.CONTROLLERS" before.'
         )
+
+
+class ControllerProcessError(ManagementError):
+    """Exception raised when a controller depends on a controller running in a different process.
+    """
+
+    def __init__(self, dependent_controller: type, dependency_controller: type):
+        super().__init__(
+            f'Cannot instantiate "{fullname(dependent_controller)}" because it depends on '
+            f'"{fullname(dependency_controller)}", which runs in a different process. Check the "render_process" '
+            f'attribute of both controllers.'
+        )
+
+
+class ControllerScheduleError(ManagementError):
+    """Exception raised when the step rate or phase of a controller is not valid.
+    """
+
+    def __init__(self, controller: type, error: TypeError | ValueError):
+        super().__init__(f'Cannot schedule "{fullname(controller)}": {error}')
+
+
+class SimulationSnapshotOverflowError(ManagementError):
+    """Exception raised when a frame recorded by the simulation process does not fit in the snapshot buffer.
+    """
+
+    def __init__(self, count: int, capacity: int):
+        super().__init__(
+            f'The frame has {count} drawing commands, but the snapshot buffer only fits {capacity}. Increase the '
+            f'"SIMULATION_SNAPSHOT_CAPACITY" setting.'
+        )
+
+
+class SimulationProcessError(ManagementError):
+    """Exception raised in the render process when the simulation process exits unexpectedly.
+    """
+
+    def __init__(self, exit_code: int):
+        super().__init__(f'The simulation process exited unexpectedly with code {exit_code}. Check the log file.')
+
+
+class SimulationProcessLostError(ManagementError):
+    """Exception raised in the render process when the simulation process stops sending the descriptions of what it
+    draws, usually because it exited.
+    """
+
+    def __init__(self, timeout: float):
+        super().__init__(
+            f'The simulation process sent nothing for {timeout} seconds while a snapshot was waiting for it. It has '
+            f'probably exited. Check the log file.'
+        )
+
+
+class SimulationProcessUnsupportedError(ManagementError):
+    """Exception raised in the simulation process when something is drawn that cannot be recorded into snapshots.
+    """
+
+    def __init__(self, what: str):
+        super().__init__(
+            f'{what} cannot be drawn by the simulation process when the "SIMULATION_MODE" setting is "process". Draw '
+            f'them from a controller whose "render_process" attribute is true, or use the "inline" simulation mode.'
+        )
+
+
+class InputControllerNotFoundError(ManagementError):
+    """Exception raised when recording or replaying input without an input controller.
+    """
+
+    def __init__(self):
+        super().__init__(
+            'Cannot record or replay input because no "kizuna.systems.input.InputController" is declared in '
+            '"settings.CONTROLLERS".'
+        )
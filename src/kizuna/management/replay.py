@@ -0,0 +1,100 @@
+"""Headless replay of input recordings, to re-run and profile the exact same simulation.
+
+Record a session with ``kizuna run --record-input FILE``, then replay it with ``kizuna replay FILE``. The replay runs
+as fast as the CPU allows with the recorded time steps, so slow steps can be found from their index and reproduced.
+
+Replays are only exact if the game logic only depends on the input and the time step. Results of background jobs and
+coroutines may arrive at different steps.
+"""
+
+from pathlib import Path
+
+import numpy
+
+from kizuna.management.setup import run_headless
+from kizuna.systems.input import InputRecording
+
+
+class StepTimings:
+    """Durations of the steps of a headless run, in seconds.
+    """
+
+    def __init__(self, durations: numpy.ndarray):
+        """Create the timings.
+
+        :param durations: The duration of each step, in seconds.
+        """
+        self.durations = durations
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'StepTimings(steps={self.count}, mean={self.mean:.6f}, max={self.max:.6f})'
+
+    @property
+    def count(self) -> int:
+        """Get the number of steps.
+        """
+        return len(self.durations)
+
+    @property
+    def total(self) -> float:
+        """Get the total time of the run.
+        """
+        return float(self.durations.sum())
+
+    @property
+    def mean(self) -> float:
+        """Get the mean duration of a step.
+        """
+        return float(self.durations.mean()) if self.count > 0 else 0.0
+
+    @property
+    def max(self) -> float:
+        """Get the duration of the slowest step.
+        """
+        return float(self.durations.max()) if self.count > 0 else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Get a percentile of the step durations.
+
+        :param q: The percentile, between 0 and 100.
+        :return: The duration below which ``q`` percent of the steps are.
+        """
+        return float(numpy.percentile(self.durations, q)) if self.count > 0 else 0.0
+
+    def slowest_steps(self, n: int) -> list[tuple[int, float]]:
+        """Get the slowest steps.
+
+        :param n: The number of steps to return.
+        :return: Pairs of step index and duration, slowest first.
+        """
+        indices = numpy.argsort(self.durations)[::-1][:n]
+        return [(int(index), float(self.durations[index])) for index in indices]
+
+    def save_csv(self, path: str | Path):
+        """Write the duration of each step to a CSV file, with the step index in the first column.
+
+        :param path: The path of the file.
+        """
+        rows = numpy.column_stack([numpy.arange(self.count), self.durations])
+        numpy.savetxt(path, rows, fmt=('%d', '%.9f'), delimiter=',', header='step,duration', comments='')
+
+
+def run_replay(recording_path: str | Path, dt: float | None = None, steps: int | None = None) -> StepTimings:
+    """Replay an input recording headless and measure each step. The application must be initialized.
+
+    :param recording_path: The path of the recording file.
+    :param dt: The time step passed to the controllers, in seconds. Defaults to the time step of each recorded step.
+        Replays with a different time step may diverge from the recorded session.
+    :param steps: The number of steps to run. Defaults to the number of recorded steps.
+    :return: The duration of each step.
+    :raise ValueError: If the file is not a valid recording, or if ``dt`` is not positive.
+    :raise InputControllerNotFoundError: If there is no input controller.
+    """
+    recording = InputRecording.load(recording_path)
+    steps = steps if steps is not None else recording.step_count
+    step_times = []
+    run_headless(steps, dt, recording, step_times)
+    return StepTimings(numpy.array(step_times))
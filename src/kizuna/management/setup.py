@@ -1,11 +1,26 @@
+import asyncio
+import inspect
 import logging
+import math
 import sys
+import time
 from pathlib import Path
 
 from kizuna import __version__
+from kizuna.backends import FrameCapture
 from kizuna.config import settings
+from kizuna.core.async_runtime import async_runtime
 from kizuna.core.controllers import Controller
-from kizuna.management.exceptions import ControllerDependencyInjectionError
+from kizuna.core.jobs import job_pools
+from kizuna.core.quality import quality_governor
+from kizuna.core.tasks import task_scheduler
+from kizuna.core.timers import timer_service
+from kizuna.core.validation import validate_float, validate_positive_float
+from kizuna.management.exceptions import (
+    ControllerDependencyInjectionError, ControllerProcessError, ControllerScheduleError, InputControllerNotFoundError,
+)
+from kizuna.systems.input import InputController, InputRecording
+from kizuna.utils import fullname
 
 
 logger = logging.getLogger(__name__)
@@ -38,20 +53,138 @@ def initialize(base_directory: Path, standalone: bool, enable_kizuna_log: bool):
     # Load and validate settings.
     settings.load('src.settings')
 
+    # Size the job pools. They are only started when jobs are submitted.
+    job_pools.configure(settings.JOB_THREAD_WORKERS, settings.JOB_PROCESS_WORKERS)
+
+    # Derive the frame time budget of the quality governor.
+    quality_governor.configure(settings.FRAMES_PER_SECOND)
+
     # Create the backend instance and initialize it.
     settings.backend.initialize(base_directory, standalone)
 
 
-def launch_app():
+def launch_app(
+    base_directory: Path,
+    standalone: bool,
+    enable_kizuna_log: bool,
+    input_recording_path: Path | None = None,
+    capture: FrameCapture | None = None,
+):
+    """Run the game loop until the application exits.
+
+    :param base_directory: The base directory of the project.
+    :param standalone: If true, runs the application in standalone mode.
+    :param enable_kizuna_log: If true, configure logging.
+    :param input_recording_path: If given, record the input events to this file.
+    :param capture: If given, capture the drawn frames with it.
+    """
+    if capture is not None:
+        settings.backend.start_capture(capture)
+    try:
+        if settings.SIMULATION_MODE == 'process':
+            from kizuna.management.simulation import launch_split_app
+            launch_split_app(base_directory, standalone, enable_kizuna_log, input_recording_path)
+        else:
+            launch_inline_app(input_recording_path)
+    finally:
+        settings.backend.stop_capture()
+
+
+def launch_inline_app(input_recording_path: Path | None = None):
+    """Run the game loop with the simulation and the rendering in the same process.
+
+    This is called once the application is initialized.
+
+    :param input_recording_path: If given, record the input events to this file.
+    """
     controllers = setup_controllers()
-    step_fn = lambda dt: step_function(dt, controllers)
-    draw_fn = lambda: draw_function(controllers)
-    settings.backend.launch_game_loop(step_fn, draw_fn, controllers)
+    scheduler = ControllerScheduler(controllers, settings.STEPS_PER_SECOND)
+    register_quality_steps(scheduler)
+    step_fn = lambda dt: step_function(dt, scheduler)
+    draw_fn = lambda: draw_function(scheduler)
+    input_controller = None
+    if input_recording_path is not None:
+        input_controller = find_input_controller(controllers)
+        input_controller.start_recording(input_recording_path, settings.STEPS_PER_SECOND)
+    try:
+        settings.backend.launch_game_loop(step_fn, draw_fn, controllers)
+    finally:
+        if input_controller is not None:
+            input_controller.stop_recording()
+        shutdown_services()
 
 
-def setup_controllers() -> list[Controller]:
+def run_headless(
+    steps: int,
+    dt: float | None = None,
+    recording: InputRecording | None = None,
+    step_times: list[float] | None = None,
+) -> list[Controller]:
+    """Run the game loop without a window, stepping the controllers a fixed number of times as fast as possible.
+
+    Nothing is drawn, and the quality governor is not involved, so the steps run at full quality whatever their
+    duration. This is meant for tests, benchmarks and tools that run the game logic once the application is
+    initialized.
+
+    :param steps: The number of steps to run.
+    :param dt: The time step passed to the controllers, in seconds. Defaults to the time step of each recorded step
+        when replaying a recording, and to ``1 / STEPS_PER_SECOND`` otherwise.
+    :param recording: If given, replay the input events of this recording.
+    :param step_times: If given, the duration of each step is appended to this list, in seconds.
+    :return: The controllers, so that their final state can be inspected.
+    :raise ValueError: If ``dt`` is not positive.
+    :raise InputControllerNotFoundError: If a recording is given, but there is no input controller.
+    """
+    recorded_dts = recording.step_dts if recording is not None and dt is None else []
+    dt = validate_positive_float(dt) if dt is not None else 1 / settings.STEPS_PER_SECOND
+    controllers = setup_controllers()
+    scheduler = ControllerScheduler(controllers, settings.STEPS_PER_SECOND)
+    if recording is not None:
+        if recording.steps_per_second != settings.STEPS_PER_SECOND:
+            logger.warning(
+                f'The input recording was made at {recording.steps_per_second} steps per second, but the project '
+                f'runs at {settings.STEPS_PER_SECOND}. Controllers with their own step rate may not replay exactly.'
+            )
+        find_input_controller(controllers).start_replay(recording)
+    try:
+        for index in range(steps):
+            step_dt = recorded_dts[index] if index < len(recorded_dts) else dt
+            if step_times is None:
+                simulate_step(step_dt, scheduler)
+                continue
+            start = time.perf_counter()
+            simulate_step(step_dt, scheduler)
+            step_times.append(time.perf_counter() - start)
+    finally:
+        shutdown_services()
+    return controllers
+
+
+def find_input_controller(controllers: list[Controller]) -> InputController:
+    """Return the input controller among the controllers of the application.
+
+    :param controllers: The controllers.
+    :return: The first instance of :class:`kizuna.systems.input.InputController`.
+    :raise InputControllerNotFoundError: If there is no input controller.
+    """
+    input_controller = next((ctr for ctr in controllers if isinstance(ctr, InputController)), None)
+    if input_controller is None:
+        raise InputControllerNotFoundError()
+    return input_controller
+
+
+def setup_controllers(render_process: bool | None = None) -> list[Controller]:
+    """Instantiate the controllers and call their ``on_init`` method.
+
+    :param render_process: If given, only the controllers whose ``render_process`` attribute has this value are
+        instantiated. This is used when the simulation and rendering run in different processes.
+    :return: The controllers, in the order they are dispatched.
+    """
     controllers_dict = {}
     for controller_class in settings.CONTROLLERS:
+        if render_process is not None and controller_class.render_process != render_process:
+            continue
+
         # Instantiate the controller.
         controller = controller_class()
 
@@ -61,7 +194,9 @@ def setup_controllers() -> list[Controller]:
             if not isinstance(annotation, type) or not issubclass(annotation, Controller):
                 continue
 
-            # Ensure the dependent controllers have been specified before.
+            # Ensure the dependent controllers have been specified before, and run in the same process.
+            if render_process is not None and annotation.render_process != render_process:
+                raise ControllerProcessError(controller_class, annotation)
             if annotation not in controllers_dict:
                 raise ControllerDependencyInjectionError(controller_class, annotation)
 
@@ -79,22 +214,215 @@ def setup_controllers() -> list[Controller]:
     return controllers_list
 
 
-def step_function(dt: float, controllers: list[Controller]):
-    for controller in controllers:
-        controller.on_step(dt)
+class ScheduledController:
+    """Dispatch state of a controller in a :class:`ControllerScheduler`.
+    """
+    __slots__ = ('controller', 'base_interval', 'interval', 'offset', 'elapsed', 'is_async', 'task')
+
+    def __init__(self, controller: Controller, interval: int, offset: int):
+        """Create the dispatch state of a controller.
+
+        :param controller: The controller.
+        :param interval: The number of steps between calls to ``on_step``.
+        :param offset: The first step ``on_step`` is called at, from ``0`` to ``interval - 1``.
+        """
+        self.controller = controller
+        self.base_interval = interval
+        self.interval = interval
+        self.offset = offset
+        self.elapsed = 0.0
+        self.is_async = inspect.iscoroutinefunction(type(controller).on_step)
+        self.task: asyncio.Task | None = None
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'ScheduledController({fullname(type(self.controller))}, interval={self.interval}, offset={self.offset})'
+        )
+
+
+class ControllerScheduler:
+    """Dispatches the ``on_step`` and ``on_draw`` methods of the controllers.
+
+    Controllers with a ``step_rate`` are called every few steps, with the time passed since their last call. Those
+    without a ``step_phase`` are placed on the steps least used by other low-rate controllers, so that their work is
+    spread across steps instead of piling up on the same ones.
+
+    Controllers that do not override ``on_step`` or ``on_draw`` are left out of the corresponding dispatch.
+    """
+
+    def __init__(self, controllers: list[Controller], steps_per_second: float):
+        """Schedule the given controllers.
+
+        :param controllers: The controllers, in the order they are dispatched.
+        :param steps_per_second: The number of steps per second of the game loop.
+        :raise ControllerScheduleError: If the step rate or phase of a controller is not valid.
+        """
+        self.step_index = 0
+        self.stepped: list[ScheduledController] = []
+        self.drawn = [ctr for ctr in controllers if type(ctr).on_draw is not Controller.on_draw]
+        for controller in controllers:
+            if type(controller).on_step is not Controller.on_step:
+                self.stepped.append(self._schedule(controller, steps_per_second))
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'ControllerScheduler(stepped={len(self.stepped)}, drawn={len(self.drawn)})'
+
+    def step(self, dt: float):
+        """Call ``on_step`` on the controllers due at the current step.
+
+        :param dt: Time passed since the previous step, in seconds.
+        """
+        step_index = self.step_index
+        for scheduled in self.stepped:
+            scheduled.elapsed += dt
+            if (step_index - scheduled.offset) % scheduled.interval == 0:
+                if scheduled.is_async:
+                    # Wait for the previous call to finish, keeping the time passed for the next one. Its exception,
+                    # if any, is raised here as for synchronous controllers, so the runtime does not log it.
+                    task = scheduled.task
+                    if task is not None:
+                        if not task.done():
+                            continue
+                        task.result()
+                    scheduled.task = async_runtime.spawn(
+                        scheduled.controller.on_step(scheduled.elapsed), log_exceptions=False,
+                    )
+                else:
+                    scheduled.controller.on_step(scheduled.elapsed)
+                scheduled.elapsed = 0.0
+        self.step_index = step_index + 1
+
+    def draw(self):
+        """Call ``on_draw`` on the controllers.
+        """
+        for controller in self.drawn:
+            controller.on_draw()
+
+    def set_interval_scale(self, scale: int):
+        """Multiply the number of steps between calls to controllers with a ``step_rate``, e.g. to halve their rate
+        when the game runs slow. Controllers called at every step are not affected.
+
+        :param scale: The factor, ``1`` to restore the rates.
+        """
+        for scheduled in self.stepped:
+            if scheduled.base_interval > 1:
+                scheduled.interval = scheduled.base_interval * scale
+
+    def _schedule(self, controller: Controller, steps_per_second: float) -> ScheduledController:
+        controller_class = type(controller)
+        try:
+            rate = controller_class.step_rate
+            if rate is not None:
+                rate = validate_positive_float(rate)
+            phase = controller_class.step_phase
+            if phase is not None:
+                phase = validate_float(phase)
+                if not 0.0 <= phase < 1.0:
+                    raise ValueError(f'Step phase must be in [0, 1), got {phase}.')
+        except (TypeError, ValueError) as e:
+            raise ControllerScheduleError(controller_class, e) from e
 
+        interval = 1 if rate is None else max(1, round(steps_per_second / rate))
+        if interval == 1:
+            offset = 0
+        elif phase is not None:
+            offset = math.floor(phase * interval)
+        else:
+            offset = self._find_least_used_offset(interval)
+        return ScheduledController(controller, interval, offset)
 
-def draw_function(controllers: list[Controller]):
-    for controller in controllers:
-        controller.on_draw()
+    def _find_least_used_offset(self, interval: int) -> int:
+        # Two controllers called every ``a`` and ``b`` steps meet once every ``lcm(a, b)`` steps if their offsets are
+        # congruent modulo ``gcd(a, b)``, and never otherwise. Controllers called at every step are left out, since
+        # they use every offset equally.
+        best_offset = 0
+        best_usage = math.inf
+        for offset in range(interval):
+            usage = 0.0
+            for scheduled in self.stepped:
+                other = scheduled.interval
+                if other > 1 and (offset - scheduled.offset) % math.gcd(interval, other) == 0:
+                    usage += 1 / math.lcm(interval, other)
+            if usage < best_usage:
+                best_offset = offset
+                best_usage = usage
+        return best_offset
+
+
+def register_quality_steps(scheduler: ControllerScheduler):
+    """Register the quality steps of Kizuna in the quality governor.
+
+    :param scheduler: The scheduler of the controllers of the game loop.
+    """
+    quality_governor.register(
+        'low-rate controllers',
+        degrade=lambda: scheduler.set_interval_scale(2),
+        restore=lambda: scheduler.set_interval_scale(1),
+    )
+
+
+def step_function(dt: float, scheduler: ControllerScheduler):
+    start = time.perf_counter()
+    simulate_step(dt, scheduler)
+    quality_governor.add_work(time.perf_counter() - start)
+
+
+def simulate_step(dt: float, scheduler: ControllerScheduler):
+    """Run one step of the simulation, without reporting it to the quality governor.
+
+    :param dt: Time passed since the previous step, in seconds.
+    :param scheduler: The scheduler of the controllers of the game loop.
+    """
+    job_pools.deliver_results()
+    timer_service.advance(dt)
+    scheduler.step(dt)
+    task_scheduler.run_for(settings.TASK_BUDGET_MS / 1000)
+    async_runtime.run_for(settings.ASYNC_BUDGET_MS / 1000)
+
+
+def draw_function(scheduler: ControllerScheduler):
+    start = time.perf_counter()
+    scheduler.draw()
+    backend = settings.backend
+    if backend.capture is not None:
+        backend.capture_frame()
+    backend.statistics.end_frame()
+    if backend.is_frame_throttled():
+        quality_governor.skip_frame()
+    else:
+        quality_governor.end_frame(time.perf_counter() - start)
+
+
+def shutdown_services():
+    """Stop the services driven by the game loop: timers, quality steps, tasks, coroutines and job pools.
+    """
+    timer_service.clear()
+    quality_governor.clear()
+    task_scheduler.shutdown()
+    async_runtime.shutdown()
+    job_pools.shutdown()
 
 
-def bootstrap(base_directory: Path, standalone: bool, enable_kizuna_log: bool = True):
+def bootstrap(
+    base_directory: Path,
+    standalone: bool,
+    enable_kizuna_log: bool = True,
+    input_recording_path: Path | None = None,
+    capture: FrameCapture | None = None,
+):
     """Entrypoint for Kizuna applications.
 
     :param base_directory: The base directory of the project.
     :param standalone: If true, runs the application in standalone mode.
     :param enable_kizuna_log: If true, configure logging.
+    :param input_recording_path: If given, record the input events to this file.
+    :param capture: If given, capture the drawn frames with it.
     """
     initialize(base_directory, standalone, enable_kizuna_log)
-    launch_app()
+    launch_app(base_directory, standalone, enable_kizuna_log, input_recording_path, capture)
@@ -0,0 +1,164 @@
+"""Run mode where the simulation and the rendering run in different processes.
+
+When the ``SIMULATION_MODE`` setting is ``'process'``, the process that owns the window spawns a simulation process.
+The simulation process runs the controllers at the step rate, with a :class:`kizuna.backends.snapshot.SnapshotBackend`
+recording what they draw into a shared-memory double buffer. The render process replays the latest snapshot at the
+frame rate and forwards input events back, so slow steps no longer delay frames.
+"""
+
+import logging
+import multiprocessing
+from pathlib import Path
+
+from kizuna.backends.snapshot import SnapshotBackend, SnapshotBuffer, SnapshotPlayer
+from kizuna.config import settings
+from kizuna.management.exceptions import SimulationProcessError
+from kizuna.systems.input import InputController, InputEvent
+
+
+logger = logging.getLogger(__name__)
+
+# Seconds given to the simulation process to finish its current step once the window is closed.
+SIMULATION_STOP_TIMEOUT = 5.0
+
+
+class InputForwarder(InputController):
+    """Input controller of the render process, which sends every input event to the simulation process.
+    """
+
+    def __init__(self, inputs: multiprocessing.Queue):
+        """Create the forwarder.
+
+        :param inputs: The queue read by the simulation process.
+        """
+        super().__init__()
+        self.inputs = inputs
+
+    def push_event(self, event: InputEvent):
+        self.inputs.put(event)
+
+
+def launch_split_app(
+    base_directory: Path,
+    standalone: bool,
+    enable_kizuna_log: bool,
+    input_recording_path: Path | None = None,
+):
+    """Run the game loop with the simulation in a separate process.
+
+    This is called in the render process, once the application is initialized.
+
+    :param base_directory: The base directory of the project.
+    :param standalone: If true, runs the application in standalone mode.
+    :param enable_kizuna_log: If true, configure logging in the simulation process.
+    :param input_recording_path: If given, the simulation process records the input events to this file.
+    """
+    from kizuna.management.setup import (
+        ControllerScheduler, draw_function, register_quality_steps, setup_controllers, shutdown_services,
+        step_function,
+    )
+
+    # Spawn rather than fork, so that the simulation process does not inherit the state of the windowing library.
+    context = multiprocessing.get_context('spawn')
+    lock = context.Lock()
+    buffer = SnapshotBuffer(settings.SIMULATION_SNAPSHOT_CAPACITY, lock=lock)
+    messages = context.Queue()
+    inputs = context.Queue()
+    stop_event = context.Event()
+    process = context.Process(
+        target=run_simulation_process,
+        args=(base_directory, standalone, enable_kizuna_log, buffer.name, buffer.capacity, lock, messages, inputs,
+              stop_event, input_recording_path),
+        name='kizuna-simulation',
+        daemon=True,
+    )
+    process.start()
+    logger.info(f'Simulation process started with PID {process.pid}.')
+
+    player = SnapshotPlayer(buffer, messages)
+    controllers = setup_controllers(render_process=True)
+    scheduler = ControllerScheduler(controllers, settings.STEPS_PER_SECOND)
+    register_quality_steps(scheduler)
+
+    def step_fn(dt: float):
+        if process.exitcode is not None:
+            raise SimulationProcessError(process.exitcode)
+        player.receive_messages()
+        step_function(dt, scheduler)
+
+    def draw_fn():
+        player.play()
+        draw_function(scheduler)
+
+    try:
+        settings.backend.launch_game_loop(step_fn, draw_fn, [InputForwarder(inputs), *controllers])
+    finally:
+        shutdown_services()
+        stop_event.set()
+        process.join(SIMULATION_STOP_TIMEOUT)
+        if process.is_alive():
+            logger.warning('The simulation process did not stop in time and was terminated.')
+            process.terminate()
+        player.close()
+        buffer.close()
+
+
+def run_simulation_process(
+    base_directory: Path,
+    standalone: bool,
+    enable_kizuna_log: bool,
+    buffer_name: str,
+    buffer_capacity: int,
+    lock: multiprocessing.Lock,
+    messages: multiprocessing.Queue,
+    inputs: multiprocessing.Queue,
+    stop_event: multiprocessing.Event,
+    input_recording_path: Path | None = None,
+):
+    """Entrypoint of the simulation process.
+
+    :param base_directory: The base directory of the project.
+    :param standalone: If true, runs the application in standalone mode.
+    :param enable_kizuna_log: If true, configure logging.
+    :param buffer_name: The name of the shared memory block of the snapshot buffer.
+    :param buffer_capacity: The capacity of the snapshot buffer.
+    :param lock: The lock of the snapshot buffer.
+    :param messages: The queue to send asset, batch and text descriptions to the render process.
+    :param inputs: The queue to receive input events from the render process.
+    :param stop_event: The event set by the render process when the application exits.
+    :param input_recording_path: If given, record the input events to this file.
+    """
+    from kizuna.management.setup import (
+        ControllerScheduler, draw_function, find_input_controller, initialize, register_quality_steps,
+        setup_controllers, shutdown_services, step_function,
+    )
+
+    initialize(base_directory, standalone, enable_kizuna_log)
+
+    # Replace the backend loaded from the settings with one that records snapshots.
+    buffer = SnapshotBuffer(buffer_capacity, buffer_name, lock)
+    backend = SnapshotBackend(settings, buffer, messages, inputs, stop_event)
+    backend.initialize(base_directory, standalone)
+    settings._backend = backend
+
+    input_controller = None
+    try:
+        controllers = setup_controllers(render_process=False)
+        scheduler = ControllerScheduler(controllers, settings.STEPS_PER_SECOND)
+        register_quality_steps(scheduler)
+        if input_recording_path is not None:
+            input_controller = find_input_controller(controllers)
+            input_controller.start_recording(input_recording_path, settings.STEPS_PER_SECOND)
+        backend.launch_game_loop(
+            lambda dt: step_function(dt, scheduler),
+            lambda: draw_function(scheduler),
+            controllers,
+        )
+    except Exception:
+        logger.exception('The simulation process crashed.')
+        raise
+    finally:
+        if input_controller is not None:
+            input_controller.stop_recording()
+        shutdown_services()
+        buffer.close()
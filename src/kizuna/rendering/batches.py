@@ -2,17 +2,71 @@ from kizuna.config import settings
 
 
 class DrawBatch:
+    """Group of drawables drawn together.
+
+    Batches can be marked as static, for layers that rarely change such as backgrounds. The backend renders static
+    batches once to an offscreen texture, and then draws that texture as a single quad until a drawable of the batch
+    changes, is added or is removed. Changes are detected by the backend when the drawables are prepared; call
+    :meth:`invalidate` to render the batch again for any other reason.
+
+    The texture covers the window and a margin around it in world space, so a moving camera only renders static batches
+    again once the view leaves that region. Batches whose drawables change most frames should not be static.
+    """
     _next_id: int = 0
 
-    def __init__(self, priority: int = 0, name: str | None = None):
+    # Incremented whenever the priority of any batch changes, so that sorted collections of batches can tell when
+    # they need to be sorted again.
+    priority_revision: int = 0
+
+    def __init__(self, priority: int = 0, name: str | None = None, static: bool = False):
+        """Create a new batch.
+
+        :param priority: The priority of the batch. Batches with higher priority are drawn first.
+        :param name: The name of the batch, which must be unique. Defaults to a generated name.
+        :param static: Whether the batch is rendered once and reused until it changes.
+        """
         self.name = name if name is not None else f'batch-{DrawBatch._next_id}'
-        self.priority = priority
+        self._priority = priority
+        self._static = static
+        self._revision = 0
         DrawBatch._next_id += 1
 
+    @property
+    def priority(self) -> int:
+        """Get the priority of the batch. Batches with higher priority are drawn first.
+        """
+        return self._priority
+
+    @priority.setter
+    def priority(self, value: int):
+        if value != self._priority:
+            self._priority = value
+            DrawBatch.priority_revision += 1
+
+    @property
+    def static(self) -> bool:
+        """Get whether the batch is rendered once and reused until it changes.
+        """
+        return self._static
+
+    @property
+    def revision(self) -> int:
+        """Get the number of times the batch has been invalidated.
+        """
+        return self._revision
+
+    def invalidate(self):
+        """Make the backend render a static batch again the next time it is drawn. This has no effect on other batches.
+        """
+        self._revision += 1
+        settings.backend.request_redraw()
+
     def __str__(self):
         return repr(self)
 
     def __repr__(self):
+        if self._static:
+            return f'DrawBatch("{self.name}", priority={self.priority}, static=True)'
         return f'DrawBatch("{self.name}", priority={self.priority})'
 
     def __hash__(self):
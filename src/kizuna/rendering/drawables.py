@@ -1,15 +1,23 @@
+from typing import MutableSequence, TYPE_CHECKING
+
 from kizuna.config import settings
-from kizuna.core.assets import ImageAsset, FontAsset, DEFAULT_FONT_ASSET
-from kizuna.core.datatypes import validate_vector2, Vector2Like
-from kizuna.core.validation import validate_float, validate_type
+from kizuna.core.assets import ImageAsset, FontAsset, DEFAULT_FONT_ASSET, BitmapFontAsset
+from kizuna.core.datatypes import IVector2Like, validate_ivector2, validate_vector2, Vector2, Vector2Like
+from kizuna.core.validation import validate_float, validate_int, validate_type
 from kizuna.rendering.batches import DrawBatch
 
+if TYPE_CHECKING:
+    import numpy
+
 
 class Drawable:
     """Representation of anything that can be drawn to the screen.
 
-    :ivar visible: Whether the drawable should be visible. If this is false, the backend should not actually draw
-        the drawable.
+    Setting a property of a drawable to a different value asks the backend for a redraw, see
+    :meth:`Backend.request_redraw`.
+
+    :ivar culled: Whether the drawable has been found to be out of view by the system managing it. Culled drawables
+        are not drawn either, but this flag is controlled by Kizuna and is independent of :attr:`visible`.
     """
 
     def __init__(self, visible: bool = True):
@@ -19,7 +27,21 @@ class Drawable:
 
         :param bool visible: Whether the drawable should be visible.
         """
-        self.visible = visible
+        self._visible = visible
+        self.culled = False
+
+    @property
+    def visible(self) -> bool:
+        """Get or set whether the drawable should be visible. If this is false, the backend should not actually draw
+        the drawable.
+        """
+        return self._visible
+
+    @visible.setter
+    def visible(self, value: bool):
+        if value != self._visible:
+            self._visible = value
+            settings.backend.request_redraw()
 
     def on_prepare_draw(self, batch: DrawBatch):
         """Implement this method to prepare this drawable to be drawn as part of a batch.
@@ -52,10 +74,46 @@ class TextDrawable(Drawable):
         visible: bool = True,
     ):
         super().__init__(visible)
-        self.text = str(text)
-        self.font = validate_type(font, FontAsset)
+        self._text = str(text)
+        self._font = validate_type(font, FontAsset)
         font.load()
-        self.position = validate_vector2(position)
+        self._position = validate_vector2(position)
+
+    @property
+    def text(self) -> str:
+        """Get or set the text.
+        """
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        value = str(value)
+        if value != self._text:
+            self._text = value
+            settings.backend.request_redraw()
+
+    @property
+    def font(self) -> FontAsset:
+        """Get or set the font the text is drawn with.
+        """
+        return self._font
+
+    @font.setter
+    def font(self, value: FontAsset):
+        if value is not self._font:
+            self._font = validate_type(value, FontAsset)
+            value.load()
+            settings.backend.request_redraw()
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the left end of the baseline.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        _set_position(self, value)
 
     def on_prepare_draw(self, batch: DrawBatch):
         settings.backend.prepare_draw_text(self, batch)
@@ -67,6 +125,61 @@ class TextDrawable(Drawable):
         return f'{self.__class__.__name__}("{self.text}", asset={repr(self.font)})'
 
 
+class BitmapTextDrawable(Drawable):
+    """Line of text drawn with a bitmap font, as one quad per character.
+
+    Unlike :class:`TextDrawable`, changing the text does not lay it out again: the backend only rewrites the quads of
+    the characters that changed. This makes it suited to text that changes every frame, such as scores and timers.
+
+    The position is the left end of the baseline, as in :class:`TextDrawable`.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        position: Vector2Like,
+        font: BitmapFontAsset,
+        visible: bool = True,
+    ):
+        super().__init__(visible)
+        self._text = str(text)
+        self.font = validate_type(font, BitmapFontAsset)
+        font.load()
+        self._position = validate_vector2(position)
+
+    @property
+    def text(self) -> str:
+        """Get or set the text.
+        """
+        return self._text
+
+    @text.setter
+    def text(self, value: str):
+        value = str(value)
+        if value != self._text:
+            self._text = value
+            settings.backend.request_redraw()
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the left end of the baseline.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        _set_position(self, value)
+
+    def on_prepare_draw(self, batch: DrawBatch):
+        settings.backend.prepare_draw_bitmap_text(self, batch)
+
+    def on_destroy(self):
+        settings.backend.destroy_bitmap_text(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}("{self.text}", asset={repr(self.font)})'
+
+
 class SpriteDrawable(Drawable):
     """Encapsulation of an image that can be drawn to the screen.
     """
@@ -79,11 +192,46 @@ class SpriteDrawable(Drawable):
         visible: bool = True,
     ):
         super().__init__(visible)
-        self.asset = validate_type(asset, ImageAsset)
+        self._asset = validate_type(asset, ImageAsset)
         asset.load()
-        self.position = validate_vector2(position)
-        self.rotation = validate_float(rotation)
-        self.visible = True
+        self._position = validate_vector2(position)
+        self._rotation = validate_float(rotation)
+        self._visible = True
+
+    @property
+    def asset(self) -> ImageAsset:
+        """Get or set the image.
+        """
+        return self._asset
+
+    @asset.setter
+    def asset(self, value: ImageAsset):
+        if value is not self._asset:
+            self._asset = validate_type(value, ImageAsset)
+            value.load()
+            settings.backend.request_redraw()
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the anchor of the image.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        _set_position(self, value)
+
+    @property
+    def rotation(self) -> float:
+        """Get or set the rotation, counterclockwise in degrees.
+        """
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: float):
+        if value != self._rotation:
+            self._rotation = validate_float(value)
+            settings.backend.request_redraw()
 
     def on_prepare_draw(self, batch: DrawBatch):
         settings.backend.prepare_draw_sprite(self, batch)
@@ -93,3 +241,150 @@ class SpriteDrawable(Drawable):
 
     def __repr__(self):
         return f'{self.__class__.__name__}({repr(self.asset)})'
+
+
+class TileChunkDrawable(Drawable):
+    """Block of tiles taken from a tileset image, drawn as a single static mesh.
+
+    The backend builds the mesh the first time the chunk is drawn, and only rebuilds it after :meth:`invalidate` is
+    called. Call it whenever :attr:`tiles` changes.
+
+    :ivar tiles: Tile indices in row-major order, starting from the bottom-left tile of the chunk. Tiles of the tileset
+        image are numbered in row-major order starting from its top-left tile. Negative indices are empty tiles.
+    :ivar revision: Number that changes every time the tiles are invalidated.
+    """
+
+    def __init__(
+        self,
+        asset: ImageAsset,
+        tile_size: IVector2Like,
+        columns: int,
+        tiles: MutableSequence[int],
+        position: Vector2Like,
+        visible: bool = True,
+    ):
+        """Create a new tile chunk.
+
+        :param asset: The tileset image.
+        :param tile_size: The size of each tile in pixels, both in the tileset image and on screen.
+        :param columns: The number of tiles in each row of the chunk.
+        :param tiles: The tile indices of the chunk. This sequence is not copied.
+        :param position: The position of the bottom-left corner of the chunk.
+        :param visible: Whether the drawable should be visible.
+        """
+        super().__init__(visible)
+        self.asset = validate_type(asset, ImageAsset)
+        asset.load()
+        self.tile_size = validate_ivector2(tile_size)
+        self.columns = validate_int(columns)
+        self.tiles = tiles
+        self._position = validate_vector2(position)
+        self.revision = 0
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the bottom-left corner of the chunk.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        _set_position(self, value)
+
+    def invalidate(self):
+        """Mark the tiles as changed, so that the backend rebuilds the mesh the next time the chunk is drawn.
+        """
+        self.revision += 1
+        settings.backend.request_redraw()
+
+    def on_prepare_draw(self, batch: DrawBatch):
+        settings.backend.prepare_draw_tile_chunk(self, batch)
+
+    def on_destroy(self):
+        settings.backend.destroy_tile_chunk(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({repr(self.asset)}, position={self.position})'
+
+
+class ParticlesDrawable(Drawable):
+    """Collection of particles sharing the same image, drawn in bulk from arrays.
+
+    The arrays are owned by the system simulating the particles, and only the first :attr:`count` rows are alive.
+    The backend uploads them every time the drawable is prepared, without going through the particles one by one.
+
+    :ivar positions: Array of shape ``(capacity, 2)`` with the position of each particle.
+    :ivar rotations: Array of shape ``(capacity,)`` with the rotation of each particle, counterclockwise in degrees.
+    :ivar colors: Array of shape ``(capacity, 4)`` and type ``uint8`` with the RGBA color of each particle.
+    :ivar revision: Number that changes every time the arrays are invalidated.
+    """
+
+    def __init__(
+        self,
+        asset: ImageAsset,
+        positions: 'numpy.ndarray',
+        rotations: 'numpy.ndarray',
+        colors: 'numpy.ndarray',
+        visible: bool = True,
+    ):
+        """Create a new particles drawable.
+
+        :param asset: The image of each particle.
+        :param positions: The positions of the particles. This array is not copied.
+        :param rotations: The rotations of the particles. This array is not copied.
+        :param colors: The colors of the particles. This array is not copied.
+        :param visible: Whether the drawable should be visible.
+        """
+        super().__init__(visible)
+        self.asset = validate_type(asset, ImageAsset)
+        asset.load()
+        self.positions = positions
+        self.rotations = rotations
+        self.colors = colors
+        self._count = 0
+        self.revision = 0
+
+    @property
+    def count(self) -> int:
+        """Get or set the number of particles alive.
+        """
+        return self._count
+
+    @count.setter
+    def count(self, value: int):
+        if value != self._count:
+            self._count = value
+            settings.backend.request_redraw()
+
+    @property
+    def capacity(self) -> int:
+        """Get the maximum number of particles.
+        """
+        return len(self.positions)
+
+    def invalidate(self):
+        """Mark the particle arrays as changed, asking for a redraw. Call it whenever the arrays are written to.
+        """
+        self.revision += 1
+        settings.backend.request_redraw()
+
+    def on_prepare_draw(self, batch: DrawBatch):
+        settings.backend.prepare_draw_particles(self, batch)
+
+    def on_destroy(self):
+        settings.backend.destroy_particles(self)
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({repr(self.asset)}, count={self.count})'
+
+
+def _set_position(
+    drawable: TextDrawable | BitmapTextDrawable | SpriteDrawable | TileChunkDrawable,
+    value: Vector2Like,
+):
+    # Positions are often set again to the same cached vector, which is checked first as it is the cheapest.
+    if value is not drawable._position:  # noqa
+        value = validate_vector2(value)
+        if value != drawable._position:  # noqa
+            drawable._position = value  # noqa
+            settings.backend.request_redraw()
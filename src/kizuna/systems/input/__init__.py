@@ -1 +1,3 @@
+from .constants import *
 from .controller import *
+from .recording import *
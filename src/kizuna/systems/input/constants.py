@@ -1,8 +1,148 @@
-from enum import Enum
+from enum import IntEnum
+from typing import NamedTuple
 
+from kizuna.core.datatypes import Vector2
 
-class Key(Enum):
-    LEFT = 'left'
-    RIGHT = 'right'
-    UP = 'up'
-    DOWN = 'down'
+
+class Key(IntEnum):
+    """Keys of the keyboard, independent of the backend.
+
+    Values are consecutive, so that they can be used as indexes of state tables.
+    """
+    LEFT = 0
+    RIGHT = 1
+    UP = 2
+    DOWN = 3
+
+    A = 4
+    B = 5
+    C = 6
+    D = 7
+    E = 8
+    F = 9
+    G = 10
+    H = 11
+    I = 12  # noqa: E741
+    J = 13
+    K = 14
+    L = 15
+    M = 16
+    N = 17
+    O = 18  # noqa: E741
+    P = 19
+    Q = 20
+    R = 21
+    S = 22
+    T = 23
+    U = 24
+    V = 25
+    W = 26
+    X = 27
+    Y = 28
+    Z = 29
+
+    DIGIT_0 = 30
+    DIGIT_1 = 31
+    DIGIT_2 = 32
+    DIGIT_3 = 33
+    DIGIT_4 = 34
+    DIGIT_5 = 35
+    DIGIT_6 = 36
+    DIGIT_7 = 37
+    DIGIT_8 = 38
+    DIGIT_9 = 39
+
+    F1 = 40
+    F2 = 41
+    F3 = 42
+    F4 = 43
+    F5 = 44
+    F6 = 45
+    F7 = 46
+    F8 = 47
+    F9 = 48
+    F10 = 49
+    F11 = 50
+    F12 = 51
+
+    SPACE = 52
+    ENTER = 53
+    ESCAPE = 54
+    TAB = 55
+    BACKSPACE = 56
+    DELETE = 57
+    INSERT = 58
+    HOME = 59
+    END = 60
+    PAGE_UP = 61
+    PAGE_DOWN = 62
+
+    LEFT_SHIFT = 63
+    RIGHT_SHIFT = 64
+    LEFT_CTRL = 65
+    RIGHT_CTRL = 66
+    LEFT_ALT = 67
+    RIGHT_ALT = 68
+
+    MINUS = 69
+    EQUAL = 70
+    COMMA = 71
+    PERIOD = 72
+    SLASH = 73
+    BACKSLASH = 74
+    SEMICOLON = 75
+    APOSTROPHE = 76
+    GRAVE = 77
+    LEFT_BRACKET = 78
+    RIGHT_BRACKET = 79
+
+    NUMPAD_0 = 80
+    NUMPAD_1 = 81
+    NUMPAD_2 = 82
+    NUMPAD_3 = 83
+    NUMPAD_4 = 84
+    NUMPAD_5 = 85
+    NUMPAD_6 = 86
+    NUMPAD_7 = 87
+    NUMPAD_8 = 88
+    NUMPAD_9 = 89
+    NUMPAD_ADD = 90
+    NUMPAD_SUBTRACT = 91
+    NUMPAD_MULTIPLY = 92
+    NUMPAD_DIVIDE = 93
+    NUMPAD_DECIMAL = 94
+    NUMPAD_ENTER = 95
+
+
+class MouseButton(IntEnum):
+    """Buttons of the mouse, independent of the backend.
+    """
+    LEFT = 0
+    MIDDLE = 1
+    RIGHT = 2
+    BACK = 3
+    FORWARD = 4
+
+
+class InputEventType(IntEnum):
+    """Kinds of :class:`InputEvent`.
+    """
+    KEY_PRESS = 0
+    KEY_RELEASE = 1
+    MOUSE_PRESS = 2
+    MOUSE_RELEASE = 3
+    MOUSE_MOTION = 4
+
+
+class InputEvent(NamedTuple):
+    """Input event sent by the backend to the :class:`kizuna.systems.input.InputController`.
+
+    :ivar timestamp: The time of the event, as returned by :func:`time.perf_counter`.
+    :ivar type: The kind of event.
+    :ivar code: The :class:`Key` or :class:`MouseButton` of the event, or 0 for mouse motion.
+    :ivar position: The position of the mouse in the window, for mouse events.
+    """
+    timestamp: float
+    type: InputEventType
+    code: int
+    position: Vector2 | None = None
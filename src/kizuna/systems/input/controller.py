@@ -1,12 +1,239 @@
+import time
+from collections import deque
+from pathlib import Path
+
 from kizuna.core.controllers import Controller
-from kizuna.systems.input.constants import Key
+from kizuna.core.datatypes import Vector2
+from kizuna.systems.input.constants import InputEvent, InputEventType, Key, MouseButton
+from kizuna.systems.input.recording import InputRecorder, InputRecording
+
+
+KEY_STATE_SIZE = max(Key) + 1
+MOUSE_BUTTON_STATE_SIZE = max(MouseButton) + 1
 
 
 class InputController(Controller):
-    held_keys: dict[str, bool]
+    """Controller that keeps the state of the keyboard and the mouse.
+
+    The backend pushes timestamped events into a queue as soon as they happen. The queue is drained at the start of
+    each step, so every press and release is seen by the step that follows it, even if the key was pressed and
+    released between two steps. Mouse motion is coalesced, so that only the last position of each step is processed.
+
+    Place this controller before the controllers that query it in the ``CONTROLLERS`` setting, so that they see the
+    input of the current step.
+
+    :ivar step_index: The number of steps processed so far.
+    :ivar events: The events processed in the current step, in the order they happened.
+    :ivar mouse_position: The position of the mouse in the window.
+    :ivar mouse_motion: How much the mouse moved in the current step.
+    :ivar input_latency: The time the oldest event processed in the current step waited in the queue, in seconds.
+    """
+    step_index: int
+    events: list[InputEvent]
+    mouse_position: Vector2
+    mouse_motion: Vector2
+    input_latency: float
+
+    # State tables indexed by key or button value. The pressed and released tables only hold the current step, and the
+    # entries set are listed, so that they can be reset without going through the whole table.
+    _held_keys: bytearray
+    _pressed_keys: bytearray
+    _released_keys: bytearray
+    _held_buttons: bytearray
+    _pressed_buttons: bytearray
+    _released_buttons: bytearray
+    _edges: list[tuple[bytearray, int]]
+
+    _queue: deque[InputEvent]
+
+    # Recording being written, and recording being replayed along with the position of its next event.
+    _recorder: InputRecorder | None
+    _replay: InputRecording | None
+    _replay_index: int
 
     def __init__(self):
-        self.held_keys = {}
+        self.step_index = 0
+        self.events = []
+        self.mouse_position = Vector2(0.0, 0.0)
+        self.mouse_motion = Vector2(0.0, 0.0)
+        self.input_latency = 0.0
+        self._held_keys = bytearray(KEY_STATE_SIZE)
+        self._pressed_keys = bytearray(KEY_STATE_SIZE)
+        self._released_keys = bytearray(KEY_STATE_SIZE)
+        self._held_buttons = bytearray(MOUSE_BUTTON_STATE_SIZE)
+        self._pressed_buttons = bytearray(MOUSE_BUTTON_STATE_SIZE)
+        self._released_buttons = bytearray(MOUSE_BUTTON_STATE_SIZE)
+        self._edges = []
+        self._queue = deque()
+        self._recorder = None
+        self._replay = None
+        self._replay_index = 0
+
+    def on_step(self, dt: float):
+        self.process_events()
+        if self._recorder is not None:
+            self._recorder.record_step(dt, self.events)
 
     def is_key_held(self, key: Key) -> bool:
-        return key.value in self.held_keys and self.held_keys[key.value]
+        """Return whether a key is held down.
+
+        :param key: The key to check.
+        """
+        return self._held_keys[key] != 0
+
+    def is_key_pressed(self, key: Key) -> bool:
+        """Return whether a key was pressed since the previous step.
+
+        :param key: The key to check.
+        """
+        return self._pressed_keys[key] != 0
+
+    def is_key_released(self, key: Key) -> bool:
+        """Return whether a key was released since the previous step.
+
+        :param key: The key to check.
+        """
+        return self._released_keys[key] != 0
+
+    def is_mouse_button_held(self, button: MouseButton) -> bool:
+        """Return whether a mouse button is held down.
+
+        :param button: The button to check.
+        """
+        return self._held_buttons[button] != 0
+
+    def is_mouse_button_pressed(self, button: MouseButton) -> bool:
+        """Return whether a mouse button was pressed since the previous step.
+
+        :param button: The button to check.
+        """
+        return self._pressed_buttons[button] != 0
+
+    def is_mouse_button_released(self, button: MouseButton) -> bool:
+        """Return whether a mouse button was released since the previous step.
+
+        :param button: The button to check.
+        """
+        return self._released_buttons[button] != 0
+
+    def start_recording(self, path: str | Path, steps_per_second: float):
+        """Write the time step and the events of every step from the next one on to a recording file, until
+        :meth:`stop_recording`.
+
+        :param path: The path of the recording file.
+        :param steps_per_second: The step rate of the application.
+        """
+        self.stop_recording()
+        self._recorder = InputRecorder(path, steps_per_second)
+
+    def stop_recording(self):
+        """Close the recording file, if recording.
+        """
+        if self._recorder is not None:
+            self._recorder.close()
+            self._recorder = None
+
+    def start_replay(self, recording: InputRecording):
+        """Process the events of a recording at the steps they were recorded at, counting from the next step.
+
+        :param recording: The recording to replay.
+        """
+        self.step_index = 0
+        self._replay = recording
+        self._replay_index = 0
+
+    def push_event(self, event: InputEvent):
+        """Called by the backend to queue an input event. It is processed at the start of the next step.
+
+        :param event: The event.
+        """
+        queue = self._queue
+        if event.type == InputEventType.MOUSE_MOTION and queue and queue[-1].type == InputEventType.MOUSE_MOTION:
+            # Only the latest position matters, but keep the timestamp of the first motion for latency measurement.
+            queue[-1] = event._replace(timestamp=queue[-1].timestamp)
+        else:
+            queue.append(event)
+
+    def press_key(self, key: Key):
+        """Called by the backend when a key is pressed.
+
+        :param key: The key pressed.
+        """
+        self.push_event(InputEvent(time.perf_counter(), InputEventType.KEY_PRESS, key))
+
+    def release_key(self, key: Key):
+        """Called by the backend when a key is released.
+
+        :param key: The key released.
+        """
+        self.push_event(InputEvent(time.perf_counter(), InputEventType.KEY_RELEASE, key))
+
+    def press_mouse_button(self, button: MouseButton, position: Vector2):
+        """Called by the backend when a mouse button is pressed.
+
+        :param button: The button pressed.
+        :param position: The position of the mouse in the window.
+        """
+        self.push_event(InputEvent(time.perf_counter(), InputEventType.MOUSE_PRESS, button, position))
+
+    def release_mouse_button(self, button: MouseButton, position: Vector2):
+        """Called by the backend when a mouse button is released.
+
+        :param button: The button released.
+        :param position: The position of the mouse in the window.
+        """
+        self.push_event(InputEvent(time.perf_counter(), InputEventType.MOUSE_RELEASE, button, position))
+
+    def move_mouse(self, position: Vector2):
+        """Called by the backend when the mouse moves.
+
+        :param position: The new position of the mouse in the window.
+        """
+        self.push_event(InputEvent(time.perf_counter(), InputEventType.MOUSE_MOTION, 0, position))
+
+    def process_events(self):
+        """Apply the queued events to the state tables. This is called at the start of each step.
+        """
+        for table, index in self._edges:
+            table[index] = 0
+        self._edges.clear()
+        previous_position = self.mouse_position
+
+        queue = self._queue
+        events = self.events = []
+        now = time.perf_counter()
+        if self._replay is not None:
+            self._push_replayed_events(now)
+        self.input_latency = now - queue[0].timestamp if queue else 0.0
+        while queue:
+            event = queue.popleft()
+            events.append(event)
+            event_type = event.type
+            if event_type == InputEventType.KEY_PRESS:
+                self._set_edge(self._held_keys, self._pressed_keys, event.code, 1)
+            elif event_type == InputEventType.KEY_RELEASE:
+                self._set_edge(self._held_keys, self._released_keys, event.code, 0)
+            elif event_type == InputEventType.MOUSE_PRESS:
+                self._set_edge(self._held_buttons, self._pressed_buttons, event.code, 1)
+            elif event_type == InputEventType.MOUSE_RELEASE:
+                self._set_edge(self._held_buttons, self._released_buttons, event.code, 0)
+            if event.position is not None:
+                self.mouse_position = event.position
+        self.mouse_motion = self.mouse_position - previous_position
+        self.step_index += 1
+
+    def _push_replayed_events(self, now: float):
+        replayed = self._replay.events
+        index = self._replay_index
+        while index < len(replayed) and replayed[index][0] <= self.step_index:
+            self._queue.append(replayed[index][1]._replace(timestamp=now))
+            index += 1
+        self._replay_index = index
+        if index == len(replayed):
+            self._replay = None
+
+    def _set_edge(self, held: bytearray, edges: bytearray, index: int, value: int):
+        held[index] = value
+        if not edges[index]:
+            edges[index] = 1
+            self._edges.append((edges, index))
@@ -0,0 +1,134 @@
+"""Compact binary recordings of the input events processed by the :class:`kizuna.systems.input.InputController`.
+
+A recording starts with a header holding the step rate of the application, followed by one record per step with its
+time step and its number of events, each followed by one fixed-size record per event. Replaying the events at the same
+steps with the same time steps re-runs the exact same simulation, so that it can be profiled.
+"""
+
+import math
+import struct
+from pathlib import Path
+from typing import BinaryIO
+
+from kizuna.core.datatypes import Vector2
+from kizuna.systems.input.constants import InputEvent, InputEventType
+
+
+RECORDING_MAGIC = b'KZIR'
+RECORDING_VERSION = 2
+
+# Magic, version and steps per second.
+_HEADER = struct.Struct('<4sHd')
+# Time step and number of events of a step.
+_STEP = struct.Struct('<dI')
+# Event type, key or button code, and mouse position, with NaN coordinates for events without one.
+_EVENT = struct.Struct('<BBdd')
+
+
+class InputRecorder:
+    """Writes the input events of an application to a recording file.
+    """
+
+    def __init__(self, path: str | Path, steps_per_second: float):
+        """Create the recording file, overwriting it if it exists.
+
+        :param path: The path of the file.
+        :param steps_per_second: The step rate of the application, stored to replay the recording at the same rate.
+        """
+        self.path = Path(path)
+        self.step_count = 0
+        self.event_count = 0
+        self._file: BinaryIO | None = open(self.path, 'wb')
+        self._file.write(_HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, steps_per_second))
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'InputRecorder("{self.path}", steps={self.step_count}, events={self.event_count})'
+
+    def record_step(self, dt: float, events: list[InputEvent]):
+        """Append a step to the recording.
+
+        :param dt: The time step of the step, in seconds.
+        :param events: The events processed by the step.
+        """
+        write = self._file.write
+        write(_STEP.pack(dt, len(events)))
+        for event in events:
+            x, y = event.position if event.position is not None else (math.nan, math.nan)
+            write(_EVENT.pack(event.type, event.code, x, y))
+        self.step_count += 1
+        self.event_count += len(events)
+
+    def close(self):
+        """Flush and close the recording file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class InputRecording:
+    """Input events read from a recording file, sorted by step.
+
+    :ivar steps_per_second: The step rate of the recorded application.
+    :ivar step_dts: The time step of each recorded step, in seconds.
+    :ivar events: Pairs of step index and event.
+    """
+
+    def __init__(self, steps_per_second: float, step_dts: list[float], events: list[tuple[int, InputEvent]]):
+        self.steps_per_second = steps_per_second
+        self.step_dts = step_dts
+        self.events = events
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return (
+            f'InputRecording(steps_per_second={self.steps_per_second}, steps={self.step_count}, '
+            f'events={len(self.events)})'
+        )
+
+    @property
+    def step_count(self) -> int:
+        """Get the number of recorded steps.
+        """
+        return len(self.step_dts)
+
+    @classmethod
+    def load(cls, path: str | Path) -> 'InputRecording':
+        """Read a recording file.
+
+        :param path: The path of the file.
+        :return: The recording.
+        :raise ValueError: If the file is not a valid recording.
+        """
+        data = Path(path).read_bytes()
+        if len(data) < _HEADER.size:
+            raise ValueError(f'"{path}" is not an input recording.')
+        magic, version, steps_per_second = _HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f'"{path}" is not an input recording.')
+        if version != RECORDING_VERSION:
+            raise ValueError(f'Unsupported input recording version {version} in "{path}".')
+
+        step_dts = []
+        events = []
+        offset = _HEADER.size
+        while offset < len(data):
+            if offset + _STEP.size > len(data):
+                raise ValueError(f'Input recording "{path}" is truncated.')
+            dt, event_count = _STEP.unpack_from(data, offset)
+            offset += _STEP.size
+            if offset + event_count * _EVENT.size > len(data):
+                raise ValueError(f'Input recording "{path}" is truncated.')
+            step_index = len(step_dts)
+            for _ in range(event_count):
+                event_type, code, x, y = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                position = Vector2(x, y) if not math.isnan(x) else None
+                events.append((step_index, InputEvent(0.0, InputEventType(event_type), code, position)))
+            step_dts.append(dt)
+        return cls(steps_per_second, step_dts, events)
@@ -0,0 +1 @@
+from .emitters import *
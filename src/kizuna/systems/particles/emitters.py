@@ -0,0 +1,244 @@
+import math
+from typing import TYPE_CHECKING
+
+import numpy
+
+from kizuna.core.assets import ImageAsset
+from kizuna.core.datatypes import ColorLike, Vector2, Vector2Like, validate_color, validate_vector2
+from kizuna.core.validation import validate_float, validate_int, validate_type
+from kizuna.rendering import DrawBatch, ParticlesDrawable
+from kizuna.systems.stage2d import Entity2D, StageLayer
+from kizuna.systems.stage2d.spatial import Bounds, bounds_overlap
+
+if TYPE_CHECKING:
+    from kizuna.systems.stage2d import Stage2DController
+
+
+type FloatRange = tuple[float, float]
+"""Range of floats in ``(min, max)`` format, used to pick random values for each particle.
+"""
+
+
+def validate_float_range(value: FloatRange | float) -> FloatRange:
+    """Validate that the given value is a range of floats, or a single float used as both ends of the range.
+
+    :param value: The value to validate.
+    :return: The validated value.
+    :raise TypeError: If the value is not a float or a pair of floats.
+    :raise ValueError: If the minimum is greater than the maximum.
+    """
+    if isinstance(value, tuple | list) and len(value) == 2:
+        low, high = validate_float(value[0]), validate_float(value[1])
+    else:
+        low = high = validate_float(value)
+    if low > high:
+        raise ValueError(f'Range minimum must not be greater than its maximum, got ({low}, {high}).')
+    return low, high
+
+
+class ParticleEmitter(StageLayer):
+    """Source of particles drawn by a :class:`kizuna.systems.stage2d.Stage2DController`.
+
+    Particles are not entities: the state of every particle of an emitter lives in NumPy arrays, so they are simulated,
+    expired and drawn in bulk, without any per-particle Python code. This makes it possible to have a large number of
+    particles alive at once.
+
+    Each particle is spawned at the position of the emitter with a random lifetime, speed, direction and angular
+    velocity picked from the given ranges. Particles then move in a straight line, affected by the emitter
+    acceleration, while their color fades from ``color_start`` to ``color_end``.
+
+    Emitters can follow an entity with :meth:`attach`.
+    """
+
+    def __init__(
+        self,
+        controller: 'Stage2DController',
+        image: ImageAsset,
+        capacity: int = 10000,
+        position: Vector2Like = (0.0, 0.0),
+        batch: DrawBatch | None = None,
+        rate: float = 0.0,
+        lifetime: FloatRange | float = 1.0,
+        speed: FloatRange | float = (0.0, 100.0),
+        direction: FloatRange | float = (0.0, 360.0),
+        angular_velocity: FloatRange | float = 0.0,
+        acceleration: Vector2Like = (0.0, 0.0),
+        color_start: ColorLike = (255, 255, 255, 255),
+        color_end: ColorLike = (255, 255, 255, 0),
+        seed: int | None = None,
+    ):
+        """Create a new particle emitter.
+
+        :param controller: The controller that draws the particles.
+        :param image: The image of each particle.
+        :param capacity: The maximum number of particles alive at once. Particles that would exceed it are not spawned.
+        :param position: The position where particles are spawned.
+        :param batch: The batch the particles are drawn to.
+        :param rate: The number of particles spawned per second.
+        :param lifetime: The range of lifetimes of the particles, in seconds.
+        :param speed: The range of initial speeds of the particles, in pixels per second.
+        :param direction: The range of initial directions of the particles, counterclockwise in degrees.
+        :param angular_velocity: The range of angular velocities of the particles, counterclockwise in degrees per
+            second.
+        :param acceleration: The acceleration applied to every particle, such as gravity.
+        :param color_start: The color of the particles when spawned.
+        :param color_end: The color of the particles when they expire.
+        :param seed: Seed for the random generator, to get reproducible particles.
+        """
+        self.capacity = validate_int(capacity)
+        if self.capacity <= 0:
+            raise ValueError('Capacity must be positive.')
+        self.position = validate_vector2(position)
+        self.batch = batch if batch is not None else DrawBatch()
+        self.rate = validate_float(rate)
+        self.lifetime = validate_float_range(lifetime)
+        if self.lifetime[0] <= 0:
+            raise ValueError('Lifetime must be positive.')
+        self.speed = validate_float_range(speed)
+        self.direction = validate_float_range(direction)
+        self.angular_velocity = validate_float_range(angular_velocity)
+        self.acceleration = validate_vector2(acceleration)
+        self.color_start = validate_color(color_start)
+        self.color_end = validate_color(color_end)
+
+        # Particle state. Only the first ``count`` rows of each array are alive.
+        self._positions = numpy.zeros((self.capacity, 2), dtype=numpy.float32)
+        self._velocities = numpy.zeros((self.capacity, 2), dtype=numpy.float32)
+        self._ages = numpy.zeros(self.capacity, dtype=numpy.float32)
+        self._lifetimes = numpy.ones(self.capacity, dtype=numpy.float32)
+        self._rotations = numpy.zeros(self.capacity, dtype=numpy.float32)
+        self._angular_velocities = numpy.zeros(self.capacity, dtype=numpy.float32)
+        self._colors = numpy.zeros((self.capacity, 4), dtype=numpy.uint8)
+        self._drawable = ParticlesDrawable(image, self._positions, self._rotations, self._colors)
+        self._random = numpy.random.default_rng(seed)
+        self._pending_spawns = 0.0
+
+        # Entity followed by the emitter, if any.
+        self._entity: Entity2D | None = None
+        self._offset = Vector2(0.0, 0.0)
+        self._destroy_with_entity = False
+        self._destroy_when_empty = False
+
+        super().__init__(controller)
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'ParticleEmitter({repr(self._drawable.asset)}, count={self.count}, capacity={self.capacity})'
+
+    @property
+    def count(self) -> int:
+        """Get the number of particles alive.
+        """
+        return self._drawable.count
+
+    @property
+    def batches(self) -> set[DrawBatch]:
+        return {self.batch}
+
+    def attach(self, entity: Entity2D, offset: Vector2Like = (0.0, 0.0), destroy_with_entity: bool = True):
+        """Make the emitter follow an entity.
+
+        When the entity is destroyed, the emitter stops spawning particles.
+
+        :param entity: The entity to follow.
+        :param offset: The position of the emitter relative to the entity, turning with it.
+        :param destroy_with_entity: If true, the emitter is destroyed once the entity is destroyed and the remaining
+            particles expire.
+        """
+        self._entity = validate_type(entity, Entity2D)
+        self._offset = validate_vector2(offset)
+        self._destroy_with_entity = destroy_with_entity
+        self.position = entity.world_transform.apply(self._offset)
+
+    def detach(self):
+        """Stop following the entity the emitter is attached to, if any.
+        """
+        self._entity = None
+
+    def emit(self, count: int):
+        """Spawn particles at the position of the emitter right away.
+
+        :param count: The number of particles to spawn. Particles that would exceed the capacity are not spawned.
+        """
+        start = self._drawable.count
+        count = min(count, self.capacity - start)
+        if count <= 0:
+            return
+        end = start + count
+        random = self._random
+
+        angles = numpy.radians(random.uniform(*self.direction, count))
+        speeds = random.uniform(*self.speed, count)
+        self._positions[start:end] = tuple(self.position)
+        self._velocities[start:end, 0] = numpy.cos(angles) * speeds
+        self._velocities[start:end, 1] = numpy.sin(angles) * speeds
+        self._ages[start:end] = 0.0
+        self._lifetimes[start:end] = random.uniform(*self.lifetime, count)
+        self._rotations[start:end] = numpy.degrees(angles)
+        self._angular_velocities[start:end] = random.uniform(*self.angular_velocity, count)
+        self._colors[start:end] = tuple(self.color_start)
+        self._drawable.count = end
+
+    def step(self, dt: float):
+        # Follow the attached entity.
+        if self._entity is not None:
+            if self._entity.is_alive:
+                self.position = self._entity.world_transform.apply(self._offset)
+            else:
+                self._entity = None
+                self.rate = 0.0
+                self._destroy_when_empty = self._destroy_with_entity
+
+        # Spawn new particles, carrying over fractions of particles to the next steps.
+        self._pending_spawns += self.rate * dt
+        if self._pending_spawns >= 1.0:
+            spawns = math.floor(self._pending_spawns)
+            self._pending_spawns -= spawns
+            self.emit(spawns)
+
+        count = self._drawable.count
+        if count == 0:
+            if self._destroy_when_empty:
+                self.destroy()
+            return
+
+        # Move the particles.
+        velocities = self._velocities[:count]
+        velocities += numpy.array(tuple(self.acceleration), dtype=numpy.float32) * dt
+        self._positions[:count] += velocities * dt
+        self._rotations[:count] += self._angular_velocities[:count] * dt
+        self._ages[:count] += dt
+
+        # Expire particles by moving the ones alive to the front of the arrays.
+        alive = self._ages[:count] < self._lifetimes[:count]
+        if not alive.all():
+            indices = numpy.flatnonzero(alive)
+            count = len(indices)
+            for array in (self._positions, self._velocities, self._ages, self._lifetimes, self._rotations,
+                          self._angular_velocities):
+                array[:count] = array[indices]
+            self._drawable.count = count
+
+        # Fade the colors.
+        progress = self._ages[:count] / self._lifetimes[:count]
+        color_start = numpy.array(tuple(self.color_start), dtype=numpy.float32)
+        color_end = numpy.array(tuple(self.color_end), dtype=numpy.float32)
+        self._colors[:count] = color_start + (color_end - color_start) * progress[:, numpy.newaxis]
+        self._drawable.invalidate()
+
+    def prepare_draw(self, view: Bounds):
+        count = self._drawable.count
+        if count > 0:
+            positions = self._positions[:count]
+            low = positions.min(axis=0)
+            high = positions.max(axis=0)
+            radius = max(self._drawable.asset.size) if self._drawable.asset.size is not None else 0
+            self._drawable.culled = not bounds_overlap(
+                (low[0] - radius, low[1] - radius, high[0] + radius, high[1] + radius), view,
+            )
+        self._drawable.on_prepare_draw(self.batch)
+
+    def on_destroy(self):
+        self._drawable.on_destroy()
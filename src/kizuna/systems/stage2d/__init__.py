@@ -1,2 +1,5 @@
+from .camera import *
+from .scripts import *
 from .entities import *
+from .layers import *
 from .controller import *
@@ -0,0 +1,69 @@
+from kizuna.config import settings
+from kizuna.core.datatypes import Vector2, Vector2Like, validate_vector2
+from kizuna.systems.stage2d.spatial import Bounds
+
+
+class Camera2D:
+    """Rectangular region of the stage that is shown in the window.
+
+    Entities whose sprites fall completely outside the camera are not prepared for drawing.
+    """
+
+    def __init__(self, position: Vector2Like, size: Vector2Like):
+        """Create a camera.
+
+        :param position: The stage position shown at the bottom-left corner of the window.
+        :param size: The width and height of the region shown.
+        """
+        self._position = validate_vector2(position)
+        self._size = validate_vector2(size)
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Camera2D(position={self.position}, size={self.size})'
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the stage position shown at the bottom-left corner of the window.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        value = validate_vector2(value)
+        if value != self._position:
+            self._position = value
+            settings.backend.request_redraw()
+
+    @property
+    def size(self) -> Vector2:
+        """Get or set the width and height of the region shown, usually the window size.
+        """
+        return self._size
+
+    @size.setter
+    def size(self, value: Vector2Like):
+        self._size = validate_vector2(value)
+
+    @property
+    def bounds(self) -> Bounds:
+        """Get the region of the stage shown by the camera.
+        """
+        x, y = self.position
+        width, height = self.size
+        return x, y, x + width, y + height
+
+    def center_on(self, point: Vector2Like):
+        """Move the camera so that the given point is shown at the center of the window.
+
+        :param point: The point to center on.
+        """
+        self.position = validate_vector2(point) - self.size / 2
+
+    @property
+    def center(self) -> Vector2:
+        """Get the stage position shown at the center of the window.
+        """
+        return self.position + self.size / 2
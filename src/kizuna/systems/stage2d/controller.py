@@ -1,7 +1,15 @@
 from typing import TypeVar
 
+from kizuna.config import SettingSpec, settings
 from kizuna.core.controllers import Controller
+from kizuna.core.datatypes import Vector2, ivector2_to_vector
+from kizuna.core.validation import validate_positive_float
+from kizuna.rendering import DrawBatch
+from kizuna.systems.stage2d.camera import Camera2D
 from kizuna.systems.stage2d.entities import Entity2D
+from kizuna.systems.stage2d.layers import StageLayer
+from kizuna.systems.stage2d.scripts import ScriptScheduler
+from kizuna.systems.stage2d.spatial import SpatialGrid, bounds_overlap
 
 
 E = TypeVar('E', bound=Entity2D)
@@ -10,12 +18,164 @@ E = TypeVar('E', bound=Entity2D)
 class Stage2DController(Controller):
     """Controller to manage a collection of 2D entities representing different game objects following a simplification
     of the Entity-Component-System (ECS) architectural pattern.
+
+    Only the entities in view of the :attr:`camera` are prepared for drawing. Entities are looked up in a spatial
+    grid, so the cost of culling depends on the number of entities near the camera rather than on the total number
+    of entities.
+
+    Besides entities, the stage draws any :class:`kizuna.systems.stage2d.layers.StageLayer` bound to it, such as
+    tile maps.
+
+    :ivar camera: The camera that determines which part of the stage is shown.
+    :ivar scripts: The scheduler of the scripts started by the entities of the stage.
+    :ivar drawn_entity_count: The number of entities drawn in the last frame.
+    :ivar culled_entity_count: The number of entities skipped in the last frame because they were out of view.
     """
-    _entities: set[Entity2D] = set()
+    settings = [
+        SettingSpec.optional('STAGE2D_CULLING_CELL_SIZE', validate_positive_float, 256.0),
+    ]
+
+    camera: Camera2D
+    scripts: ScriptScheduler
+    drawn_entity_count: int
+    culled_entity_count: int
+
+    _entities: set[Entity2D]
+    _layers: list[StageLayer]
+
+    # Number of entities using each batch, and the batches sorted in drawing order. Both are maintained when entities
+    # are created or destroyed, so drawing does not need to go through every entity to find the batches.
+    _batch_users: dict[DrawBatch, int]
+    _render_queue: list[DrawBatch]
+    _render_queue_dirty: bool
+    _render_queue_revision: int
+
+    # Spatial index of the entities and entities that were in view in the last frame.
+    _grid: SpatialGrid
+    _entities_in_view: set[Entity2D]
+
+    # Entities whose transform became dirty while the one of their parent was not, updated before drawing. Entities
+    # destroyed or updated since are dropped at each step, so the list does not grow while nothing is drawn.
+    _dirty_transforms: list[Entity2D]
+
+    def __init__(self):
+        self.camera = Camera2D((0.0, 0.0), ivector2_to_vector(settings.WINDOW_SIZE))
+        self.scripts = ScriptScheduler()
+        self.drawn_entity_count = 0
+        self.culled_entity_count = 0
+        self._entities = set()
+        self._layers = []
+        self._batch_users = {}
+        self._render_queue = []
+        self._render_queue_dirty = False
+        self._render_queue_revision = DrawBatch.priority_revision
+        self._grid = SpatialGrid(settings.STAGE2D_CULLING_CELL_SIZE)
+        self._entities_in_view = set()
+        self._dirty_transforms = []
+
+    def on_step(self, dt: float):
+        self.scripts.step()
+
+        # Iterate over a copy, since layers may destroy themselves while stepping.
+        for layer in tuple(self._layers):
+            layer.step(dt)
+
+        self._compact_dirty_transforms()
 
     def on_draw(self):
-        for entity in self._entities:
-            entity.prepare_draw()
-        all_batches = {batch for entity in self._entities for batch in entity.batches}
-        for batch in sorted(all_batches, key=lambda b: -b.priority):
-            batch.draw()
+        # Update the world transforms of the entities that moved, and their place in the spatial grid.
+        self._update_transforms()
+
+        # Find the entities in view, and hide the ones that left the view since the last frame.
+        view = self.camera.bounds
+        entities_in_view = {entity for entity in self._grid.query(view) if bounds_overlap(entity.bounds, view)}
+        for entity in self._entities_in_view - entities_in_view:
+            entity.set_culled(True)
+        for entity in entities_in_view - self._entities_in_view:
+            entity.set_culled(False)
+        self._entities_in_view = entities_in_view
+        self.drawn_entity_count = len(entities_in_view)
+        self.culled_entity_count = len(self._entities) - len(entities_in_view)
+
+        # Prepare and draw. The sprites of the entities are submitted to the backend in a single call per batch.
+        submissions = {}
+        for entity in entities_in_view:
+            entity._collect_sprites(submissions)  # noqa
+        backend = settings.backend
+        for batch, (drawables, positions, rotations) in submissions.items():
+            backend.prepare_draw_sprites(drawables, positions, rotations, batch)
+        for layer in self._layers:
+            layer.prepare_draw(view)
+        backend.set_view_offset(self.camera.position)
+        backend.draw_batches(self._get_render_queue())
+        backend.set_view_offset(Vector2(0.0, 0.0))
+
+    def _register_entity(self, entity: Entity2D):
+        self._entities.add(entity)
+        self._grid.insert(entity, entity.bounds)
+        self._acquire_batches(entity.batches)
+
+    def _unregister_entity(self, entity: Entity2D):
+        self._entities.remove(entity)
+        self._grid.remove(entity)
+        self._entities_in_view.discard(entity)
+        self._release_batches(entity.batches)
+
+    def _register_layer(self, layer: StageLayer):
+        self._layers.append(layer)
+        self._acquire_batches(layer.batches)
+
+    def _unregister_layer(self, layer: StageLayer):
+        self._layers.remove(layer)
+        self._release_batches(layer.batches)
+
+    def _acquire_batches(self, batches: set[DrawBatch]):
+        for batch in batches:
+            users = self._batch_users.get(batch, 0)
+            if users == 0:
+                self._render_queue_dirty = True
+            self._batch_users[batch] = users + 1
+
+    def _release_batches(self, batches: set[DrawBatch]):
+        for batch in batches:
+            users = self._batch_users[batch] - 1
+            if users == 0:
+                del self._batch_users[batch]
+                self._render_queue_dirty = True
+            else:
+                self._batch_users[batch] = users
+
+    def _on_entity_moved(self, entity: Entity2D):
+        self._dirty_transforms.append(entity)
+
+    def _on_entity_transformed(self, entity: Entity2D):
+        self._grid.update(entity, entity.bounds)
+
+    def _update_transforms(self):
+        # Each subtree of moved entities is updated in one pass from its top. Entities that were already updated,
+        # because an ancestor was updated first or their world transform was read, are clean and skipped.
+        dirty_transforms = self._dirty_transforms
+        if not dirty_transforms:
+            return
+        self._dirty_transforms = []
+        for entity in dirty_transforms:
+            entity._transform_queued = False  # noqa
+            if entity.is_alive and entity._transform_dirty:  # noqa
+                entity._update_transforms()  # noqa
+
+    def _compact_dirty_transforms(self):
+        # Drop the entities that no longer need an update, without updating the others, which is left to drawing.
+        dirty_transforms = []
+        for entity in self._dirty_transforms:
+            if entity.is_alive and entity._transform_dirty:  # noqa
+                dirty_transforms.append(entity)
+            else:
+                entity._transform_queued = False  # noqa
+        self._dirty_transforms = dirty_transforms
+
+    def _get_render_queue(self) -> list[DrawBatch]:
+        if self._render_queue_dirty or self._render_queue_revision != DrawBatch.priority_revision:
+            self._render_queue = sorted(self._batch_users, key=lambda b: -b.priority)
+            self._render_queue_dirty = False
+            self._render_queue_revision = DrawBatch.priority_revision
+        return self._render_queue
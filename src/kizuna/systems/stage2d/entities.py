@@ -1,10 +1,16 @@
-from typing import TYPE_CHECKING
+import math
+from typing import TYPE_CHECKING, Any, Callable
 
-from kizuna.core.datatypes import Vector2, validate_vector2, Vector2Like
+from kizuna.config import settings
+from kizuna.core.datatypes import Transform2D, Vector2, validate_vector2, Vector2Like
+from kizuna.core.tasks import Task, TaskGenerator, task_scheduler
+from kizuna.core.timers import Timer, Tween, timer_service
 from kizuna.core.validation import validate_float, validate_type
 from kizuna.rendering import DrawBatch, SpriteDrawable
 from kizuna.systems.stage2d.components import SpriteComponent
 from kizuna.systems.stage2d.exceptions import EntityDestroyedException
+from kizuna.systems.stage2d.scripts import EntityScript, Script
+from kizuna.systems.stage2d.spatial import Bounds
 from kizuna.utils import fullname
 
 if TYPE_CHECKING:
@@ -16,12 +22,20 @@ class Entity2D:
 
     Entities have 2D position and rotation attributes.
 
+    Entities can be attached to another entity with :meth:`attach_to`, so that they move and rotate along with it.
+    Their position and rotation are then relative to the parent entity, and :attr:`world_position` and
+    :attr:`world_rotation` give their placement in the stage. World transforms are cached: they are only computed
+    again when the position or rotation of the entity or one of its ancestors changes, and the controller updates
+    all the entities that moved in a single pass before drawing, so entities that do not move cost nothing.
+
     Existing entities in the scene must always be bound to the Stage2DController.
 
     To define different types of entities that will appear in the scene, subclass this class and define the following:
 
     *   The ``sprites`` class attribute is a list of :class:`kizuna.systems.stage2d.components.SpriteComponent` objects
         that define the sprite or sprites that will appear.
+    *   Optionally, set the ``rotate_sprite_offsets`` class attribute to ``True`` so that the position offsets of the
+        sprites turn with the entity. By default, they are added to the position of the entity as they are.
 
     Entities are instantiated calling the entity class with the controller, its position and optionally a rotation,
     along with any additional arguments you may add specific to a subclass, and can be destroyed to free resources
@@ -34,6 +48,25 @@ class Entity2D:
         Do not store references to such entities to let the garbage collector free the memory used by them.
     """
     sprites: list[SpriteComponent] = []
+    rotate_sprite_offsets: bool = False
+
+    # Bounds of the sprites of each entity class relative to the entity position, cached on first use.
+    _local_bounds_by_class: dict[type, Bounds] = {}
+
+    _parent: 'Entity2D | None'
+    _children: list['Entity2D']
+
+    # The world transform and rotation, and the world position and rotation of each sprite. They are computed again
+    # only when the transform is dirty. If an entity is dirty, all its descendants are dirty too.
+    _world_transform: Transform2D
+    _world_rotation: float
+    _sprite_positions: list[Vector2]
+    _sprite_rotations: list[float]
+    _transform_dirty: bool
+
+    # Whether the entity is in the list of moved entities of the controller. Reading the world transform cleans the
+    # entity but leaves it in the list, so this flag keeps it from being added again.
+    _transform_queued: bool
 
     def __init__(self, controller: 'Stage2DController', position: Vector2Like, rotation: float = 0.0):
         """Creates a new entity.
@@ -44,11 +77,12 @@ class Entity2D:
 
         # Associate the controller with this entity.
         self.controller = validate_type(controller, Stage2DController)
-        self.controller._entities.add(self)  # noqa
 
         # Set initial position and rotation.
-        self.position = validate_vector2(position) if position is not None else Vector2(0.0, 0.0)
-        self.rotation = validate_float(rotation)
+        self._position = validate_vector2(position) if position is not None else Vector2(0.0, 0.0)
+        self._rotation = validate_float(rotation)
+        self._parent = None
+        self._children = []
 
         # Instantiate sprite components as drawables.
         self._drawables = [
@@ -56,6 +90,15 @@ class Entity2D:
             for component in self.sprites
         ]
 
+        # Scripts, tasks, timers and tweens started by the entity, cancelled when it is destroyed.
+        self._owned: list[Script | Task | Timer | Tween] = []
+
+        # Compute the world transform, and register the entity once it is fully initialized.
+        self._transform_dirty = True
+        self._transform_queued = False
+        self._compute_world_transform()
+        self.controller._register_entity(self)  # noqa
+
     def __str__(self) -> str:
         return repr(self)
 
@@ -65,6 +108,81 @@ class Entity2D:
             text += '[DESTROYED]'
         return text
 
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the entity, relative to its parent if it is attached to one.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        self._position = validate_vector2(value)
+        self._invalidate_transform()
+
+    @property
+    def rotation(self) -> float:
+        """Get or set the rotation of the entity, relative to its parent if it is attached to one, counterclockwise
+        in degrees.
+        """
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: float):
+        self._rotation = validate_float(value)
+        self._invalidate_transform()
+
+    @property
+    def parent(self) -> 'Entity2D | None':
+        """Get the entity this entity is attached to, or ``None``.
+        """
+        return self._parent
+
+    @property
+    def children(self) -> tuple['Entity2D', ...]:
+        """Get the entities attached to this entity.
+        """
+        return tuple(self._children)
+
+    @property
+    def local_transform(self) -> Transform2D:
+        """Get the transform from the space of the entity to the space of its parent, or of the stage if it has none.
+        """
+        return Transform2D.from_components(self._position, self._rotation)
+
+    @property
+    def world_transform(self) -> Transform2D:
+        """Get the transform from the space of the entity to the space of the stage.
+        """
+        if self._transform_dirty:
+            self._update_transforms()
+        return self._world_transform
+
+    @property
+    def world_position(self) -> Vector2:
+        """Get the position of the entity in the stage.
+        """
+        return self.world_transform.translation
+
+    @property
+    def world_rotation(self) -> float:
+        """Get the rotation of the entity in the stage, counterclockwise in degrees.
+        """
+        if self._transform_dirty:
+            self._update_transforms()
+        return self._world_rotation
+
+    @property
+    def bounds(self) -> Bounds:
+        """Get a rectangle that contains the sprites of the entity for any rotation, in the space of the stage.
+        """
+        local_bounds = Entity2D._local_bounds_by_class.get(self.__class__)
+        if local_bounds is None:
+            local_bounds = Entity2D._local_bounds_by_class[self.__class__] = self._compute_local_bounds()
+        world_transform = self.world_transform
+        x = world_transform.tx
+        y = world_transform.ty
+        return x + local_bounds[0], y + local_bounds[1], x + local_bounds[2], y + local_bounds[3]
+
     @property
     def batches(self) -> set[DrawBatch]:
         """Returns a set of the batches used by the sprites.
@@ -88,27 +206,288 @@ class Entity2D:
         """
         return self._drawables[index]
 
+    def attach_to(self, parent: 'Entity2D | None', keep_world_transform: bool = False):
+        """Attach the entity to another entity, so that it moves and rotates along with it, or detach it.
+
+        :param parent: The entity to attach to, or ``None`` to detach the entity.
+        :param keep_world_transform: If true, the position and rotation of the entity are changed so that it stays
+            where it is in the stage. Otherwise, they are kept, and are now relative to the new parent.
+        :raise ValueError: If the parent belongs to another controller, or is the entity itself or one of its
+            descendants.
+        :raise EntityDestroyedException: If the entity or the parent has been destroyed.
+        """
+        self._ensure_alive()
+        if parent is self._parent:
+            return
+        if parent is not None:
+            parent._ensure_alive()
+            if parent.controller is not self.controller:
+                raise ValueError(f'{parent!r} belongs to another controller.')
+            ancestor = parent
+            while ancestor is not None:
+                if ancestor is self:
+                    raise ValueError(f'{self!r} cannot be attached to itself or one of its descendants.')
+                ancestor = ancestor._parent
+
+        if keep_world_transform:
+            world_transform = self.world_transform
+            world_rotation = self._world_rotation
+            if parent is not None:
+                self._position = parent.world_transform.inverse().apply(world_transform.translation)
+                self._rotation = world_rotation - parent._world_rotation
+            else:
+                self._position = world_transform.translation
+                self._rotation = world_rotation
+
+        if self._parent is not None:
+            self._parent._children.remove(self)
+        self._parent = parent
+        if parent is not None:
+            parent._children.append(self)
+        # The entity may already be dirty because its old parent moved, in which case it would be updated along with
+        # the old parent, so register it with the controller regardless.
+        self._invalidate_transform(force=True)
+
+    def detach(self, keep_world_transform: bool = True):
+        """Detach the entity from its parent. This is a shortcut for :meth:`attach_to` with ``None``.
+
+        :param keep_world_transform: If true, the entity stays where it is in the stage. Otherwise, its position and
+            rotation are now relative to the stage.
+        :raise EntityDestroyedException: If the entity has been destroyed.
+        """
+        self.attach_to(None, keep_world_transform)
+
+    def start_script(self, generator: EntityScript, callback: Callable[[Any], None] | None = None) -> Script:
+        """Run a script describing the behavior of the entity over time. The script is cancelled when the entity is
+        destroyed.
+
+        The script runs until its first ``yield`` right away. See :mod:`kizuna.systems.stage2d.scripts`.
+
+        :param generator: The generator to run.
+        :param callback: Function called with the value returned by the generator once it finishes.
+        :return: The handle to the script.
+        :raise EntityDestroyedException: If the entity has been destroyed.
+        """
+        self._ensure_alive()
+        return self._own(self.controller.scripts.start(generator, callback))
+
+    def schedule_timer(self, delay: float, callback: Callable[[], None], interval: float | None = None) -> Timer:
+        """Call a function after some game time. The timer is cancelled when the entity is destroyed.
+
+        See :meth:`kizuna.core.controllers.Controller.schedule_timer`.
+
+        :param delay: The game time to wait, in seconds.
+        :param callback: The function to call.
+        :param interval: If given, the timer repeats with this period, in seconds, until cancelled.
+        :return: The handle to the timer.
+        :raise ValueError: If the delay is negative, or the interval is not positive.
+        :raise EntityDestroyedException: If the entity has been destroyed.
+        """
+        self._ensure_alive()
+        return self._own(timer_service.schedule(delay, callback, interval))
+
+    def start_tween(
+        self,
+        start: float | Vector2Like,
+        end: float | Vector2Like,
+        duration: float,
+        easing: str = 'linear',
+        on_update: Callable[[float | Vector2], None] | None = None,
+        on_complete: Callable[[], None] | None = None,
+    ) -> Tween:
+        """Interpolate a number or a vector over some game time. The tween is cancelled when the entity is destroyed.
+
+        See :meth:`kizuna.core.controllers.Controller.start_tween`.
+
+        :param start: The start value.
+        :param end: The end value. It must be of the same kind as the start value.
+        :param duration: The game time to go from the start to the end value, in seconds.
+        :param easing: The name of the easing function, one of :data:`kizuna.core.timers.EASINGS`.
+        :param on_update: Function called with the new value at each step.
+        :param on_complete: Function called once the end value is reached.
+        :return: The handle to the tween.
+        :raise EntityDestroyedException: If the entity has been destroyed.
+        """
+        self._ensure_alive()
+        return self._own(timer_service.tween(start, end, duration, easing, on_update, on_complete))
+
+    def start_task(
+        self,
+        generator: TaskGenerator,
+        priority: int = 0,
+        callback: Callable[[Any], None] | None = None,
+    ) -> Task:
+        """Spread long-running work of the entity across steps. The task is cancelled when the entity is destroyed.
+
+        See :meth:`kizuna.core.controllers.Controller.start_task`.
+
+        :param generator: The generator to run.
+        :param priority: The priority of the task. Tasks with higher priority run first.
+        :param callback: Function called with the value returned by the generator once it finishes.
+        :return: The handle to the task.
+        :raise EntityDestroyedException: If the entity has been destroyed.
+        """
+        self._ensure_alive()
+        return self._own(task_scheduler.spawn(generator, priority, callback))
+
     def destroy(self) -> None:
         """Destroys the entity from the stage, cleaning up any resources.
 
-        Destroyed entities will not be drawn to the screen and should no longer be processed.
+        Destroyed entities will not be drawn to the screen and should no longer be processed. The entities attached
+        to it are destroyed too.
         """
+        # Destroy the children and detach from the parent.
+        for child in tuple(self._children):
+            child.destroy()
+        if self._parent is not None:
+            self._parent._children.remove(self)
+            self._parent = None
+
         # Unlink the controller.
-        self.controller._entities.remove(self)  # noqa
+        self.controller._unregister_entity(self)  # noqa
         self.controller = None
 
         # Destroy the associated drawables.
         for sprite in self._drawables:
             sprite.on_destroy()
 
+        # Stop the scripts, tasks, timers and tweens of the entity.
+        for handle in self._owned:
+            handle.cancel()
+        self._owned.clear()
+
+    def set_culled(self, culled: bool):
+        """Mark the drawables of the entity as culled or not.
+
+        Culled drawables are hidden in the backend right away, so that they do not need to be prepared again until
+        the entity is back in view.
+
+        :param culled: Whether the entity is out of view.
+        """
+        for component, sprite in zip(self.sprites, self._drawables):
+            sprite.culled = culled
+            if culled:
+                sprite.on_prepare_draw(component.batch)
+
     def prepare_draw(self):
         if not self.is_alive:
             return
-        for component, sprite in zip(self.sprites, self._drawables):
-            sprite.position = self.position + component.position_offset
-            sprite.rotation = self.rotation + component.rotation_offset
+        if self._transform_dirty:
+            self._update_transforms()
+        for component, sprite, position, rotation in zip(
+            self.sprites, self._drawables, self._sprite_positions, self._sprite_rotations,
+        ):
+            sprite.position = position
+            sprite.rotation = rotation
             sprite.on_prepare_draw(component.batch)
 
+    def _collect_sprites(self, submissions: dict[DrawBatch, tuple[list, list, list]]):
+        # Add the sprites of the entity to the drawables, positions and rotations to submit to each batch. Entities
+        # that customize prepare_draw are prepared on their own instead.
+        if not self.is_alive:
+            return
+        if type(self).prepare_draw is not Entity2D.prepare_draw:
+            self.prepare_draw()
+            return
+        if self._transform_dirty:
+            self._update_transforms()
+        # The world positions of the sprites are cached with the world transform, so nothing is allocated here.
+        for component, sprite, position, rotation in zip(
+            self.sprites, self._drawables, self._sprite_positions, self._sprite_rotations,
+        ):
+            submission = submissions.get(component.batch)
+            if submission is None:
+                submission = submissions[component.batch] = ([], [], [])
+            submission[0].append(sprite)
+            submission[1].append(position)
+            submission[2].append(rotation)
+
+    def _invalidate_transform(self, force: bool = False):
+        # Mark the entity and its descendants as dirty. Descendants of dirty entities are already dirty, so the walk
+        # stops there, and moving an entity again before it is updated costs nothing.
+        if self._transform_dirty and not force:
+            return
+        stack = [self]
+        while stack:
+            entity = stack.pop()
+            entity._transform_dirty = True
+            stack.extend(child for child in entity._children if not child._transform_dirty)
+        if self.controller is not None:
+            if not self._transform_queued:
+                self._transform_queued = True
+                self.controller._on_entity_moved(self)  # noqa
+            settings.backend.request_redraw()
+
+    def _update_transforms(self):
+        # Update the topmost dirty ancestor and all its descendants, parents before children. The whole subtree is
+        # updated at once, rather than the path to this entity, so that no dirty entity is left under a clean one.
+        root = self
+        while root._parent is not None and root._parent._transform_dirty:
+            root = root._parent
+        controller = self.controller
+        stack = [root]
+        while stack:
+            entity = stack.pop()
+            entity._compute_world_transform()
+            if controller is not None:
+                controller._on_entity_transformed(entity)  # noqa
+            stack.extend(entity._children)
+
+    def _compute_world_transform(self):
+        # Compute the world transform from the one of the parent, which must be up to date.
+        parent = self._parent
+        local_transform = Transform2D.from_components(self._position, self._rotation)
+        if parent is None:
+            self._world_transform = local_transform
+            self._world_rotation = self._rotation
+        else:
+            self._world_transform = parent._world_transform @ local_transform
+            self._world_rotation = parent._world_rotation + self._rotation
+        if self.rotate_sprite_offsets:
+            self._sprite_positions = [
+                self._world_transform.apply(component.position_offset) for component in self.sprites
+            ]
+        else:
+            x = self._world_transform.tx
+            y = self._world_transform.ty
+            self._sprite_positions = [
+                Vector2(x + offset_x, y + offset_y) for offset_x, offset_y in (
+                    component.position_offset for component in self.sprites
+                )
+            ]
+        self._sprite_rotations = [self._world_rotation + component.rotation_offset for component in self.sprites]
+        self._transform_dirty = False
+
+    def _compute_local_bounds(self) -> Bounds:
+        # Each sprite rotates around its origin, so it always fits in the circle centered at the origin that goes
+        # through the farthest corner of the image. If the offsets turn with the entity, the origin itself moves on
+        # the circle centered at the entity position that goes through it.
+        left = bottom = right = top = 0.0
+        for component in self.sprites:
+            width, height = component.asset.size
+            origin_x, origin_y = component.asset.origin
+            radius = math.hypot(
+                width * max(origin_x, 1.0 - origin_x),
+                height * max(origin_y, 1.0 - origin_y),
+            )
+            offset_x, offset_y = component.position_offset
+            if self.rotate_sprite_offsets:
+                radius += math.hypot(offset_x, offset_y)
+                offset_x = offset_y = 0.0
+            left = min(left, offset_x - radius)
+            bottom = min(bottom, offset_y - radius)
+            right = max(right, offset_x + radius)
+            top = max(top, offset_y + radius)
+        return left, bottom, right, top
+
+    def _own[T: Script | Task | Timer | Tween](self, handle: T) -> T:
+        # Forget the handles that are done once in a while, so that the list does not keep growing.
+        owned = self._owned
+        if len(owned) >= 16 and len(owned) & (len(owned) - 1) == 0:
+            owned[:] = [owned_handle for owned_handle in owned if not owned_handle.is_done]
+        owned.append(handle)
+        return handle
+
     def _ensure_alive(self):
         if not self.is_alive:
             raise EntityDestroyedException(self)
@@ -0,0 +1,72 @@
+from typing import TYPE_CHECKING
+
+from kizuna.core.validation import validate_type
+from kizuna.rendering import DrawBatch
+from kizuna.systems.stage2d.spatial import Bounds
+
+if TYPE_CHECKING:
+    from kizuna.systems.stage2d.controller import Stage2DController
+
+
+class StageLayer:
+    """Content of the stage that is not made of entities, such as tile maps, drawn by the
+    :class:`kizuna.systems.stage2d.controller.Stage2DController` along with its entities.
+
+    Layers manage their own culling: they are given the region shown by the camera every frame and are expected to
+    prepare only what falls inside it.
+
+    To implement a layer, subclass this class and implement :attr:`batches`, :meth:`prepare_draw` and
+    :meth:`on_destroy`, and optionally :meth:`step`. The batches of a layer must not change while the layer is alive.
+    """
+
+    def __init__(self, controller: 'Stage2DController'):
+        """Create a new layer and bind it to a :class:`kizuna.systems.stage2d.Stage2DController` instance.
+
+        Subclasses must call this constructor once they are ready to be drawn.
+
+        :param controller: The controller that draws the layer.
+        """
+        from kizuna.systems.stage2d.controller import Stage2DController
+
+        self.controller = validate_type(controller, Stage2DController)
+        self.controller._register_layer(self)  # noqa
+
+    @property
+    def is_alive(self) -> bool:
+        """Returns whether the layer has not been destroyed yet.
+        """
+        return self.controller is not None
+
+    @property
+    def batches(self) -> set[DrawBatch]:
+        """Returns the set of batches the layer draws to.
+        """
+        raise NotImplementedError()
+
+    def step(self, dt: float):
+        """Called at each step of the game loop while the layer is alive.
+
+        :param dt: Time step or "delta time", in seconds.
+        """
+        ...
+
+    def prepare_draw(self, view: Bounds):
+        """Implement this method to prepare the drawables of the layer that are in view.
+
+        :param view: The region of the stage shown by the camera.
+        """
+        raise NotImplementedError()
+
+    def destroy(self):
+        """Destroys the layer, cleaning up any resources.
+        """
+        if not self.is_alive:
+            return
+        self.controller._unregister_layer(self)  # noqa
+        self.controller = None
+        self.on_destroy()
+
+    def on_destroy(self):
+        """Implement this method to release the drawables of the layer.
+        """
+        raise NotImplementedError()
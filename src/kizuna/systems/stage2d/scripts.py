@@ -0,0 +1,243 @@
+"""Scripts that describe the behavior of entities over time.
+
+A script is a generator that yields what it is waiting for. Scripts waiting for some time sleep in the heap of the
+:class:`kizuna.core.timers.TimerService` and are not touched until they are due, so idle entities cost nothing per
+step. Only the conditions of scripts waiting with :func:`until` are checked at each step.
+
+..  code-block:: python
+
+    class Guard(Entity2D):
+
+        def __init__(self, controller, position):
+            super().__init__(controller, position)
+            self.alarm = False
+            self.start_script(self.patrol())
+
+        def patrol(self):
+            while not self.alarm:
+                yield wait(2.0)
+                self.rotation += 180.0
+            yield until(lambda: self.controller.player_is_visible)
+            self.shout()
+
+Yield ``None`` to wait until the next step.
+"""
+
+from typing import Any, Callable, Generator
+
+from kizuna.core.timers import Timer, TimerService, timer_service
+
+
+class Wait:
+    """Instruction to resume a script after some game time. Create it with :func:`wait`.
+    """
+    __slots__ = ('seconds',)
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+
+    def __repr__(self) -> str:
+        return f'wait({self.seconds})'
+
+
+class Until:
+    """Instruction to resume a script once a condition holds. Create it with :func:`until`.
+    """
+    __slots__ = ('condition',)
+
+    def __init__(self, condition: Callable[[], bool]):
+        self.condition = condition
+
+    def __repr__(self) -> str:
+        return f'until({self.condition})'
+
+
+def wait(seconds: float) -> Wait:
+    """Yield the result from a script to resume it after some game time.
+
+    Waiting for zero seconds or less resumes the script at the next step, as yielding ``None`` does.
+
+    :param seconds: The game time to wait, in seconds.
+    :return: The instruction to yield.
+    """
+    return Wait(float(seconds))
+
+
+def until(condition: Callable[[], bool]) -> Until:
+    """Yield the result from a script to resume it at the first step in which a condition holds.
+
+    The condition is checked once per step, starting at the next step.
+
+    :param condition: Function that returns whether the script can be resumed.
+    :return: The instruction to yield.
+    """
+    return Until(condition)
+
+
+type EntityScript = Generator[Wait | Until | None, None, Any]
+"""Generator run as a script. The value it returns is passed to the callback of the script.
+"""
+
+
+class Script:
+    """Handle to a generator run by a :class:`ScriptScheduler`.
+    """
+    __slots__ = ('scheduler', 'generator', 'callback', 'waiting_for', 'is_done', 'is_cancelled', '_timer', '_running')
+
+    def __init__(
+        self,
+        scheduler: 'ScriptScheduler',
+        generator: EntityScript,
+        callback: Callable[[Any], None] | None,
+    ):
+        self.scheduler = scheduler
+        self.generator = generator
+        self.callback = callback
+        self.waiting_for: Wait | Until | None = None
+        self.is_done = False
+        self.is_cancelled = False
+        self._timer: Timer | None = None
+        self._running = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        name = getattr(self.generator, '__qualname__', 'script')
+        return f'Script("{name}", waiting_for={self.waiting_for}, done={self.is_done})'
+
+    def cancel(self):
+        """Stop the script. The generator is closed, so its ``finally`` blocks run, and the callback is not called.
+
+        A script may cancel itself, e.g. by destroying its entity. It then stops at its next ``yield``.
+        """
+        if self.is_done:
+            return
+        self.is_done = True
+        self.is_cancelled = True
+        self.scheduler._scripts.discard(self)  # noqa
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._running:
+            self.generator.close()
+
+
+class ScriptScheduler:
+    """Resumes scripts when what they are waiting for happens.
+
+    Each :class:`kizuna.systems.stage2d.Stage2DController` has its own scheduler, stepped at the beginning of its
+    ``on_step``. Scripts waiting for some time are resumed as soon as the timer service fires them, before the
+    controllers are stepped.
+    """
+
+    def __init__(self, timers: TimerService | None = None):
+        """Create the scheduler.
+
+        :param timers: The timer service used to wait for some time. Defaults to
+            :data:`kizuna.core.timers.timer_service`.
+        """
+        self.timers = timers if timers is not None else timer_service
+        self._next_step: list[Script] = []
+        self._conditions: list[Script] = []
+        self._scripts: set[Script] = set()
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'ScriptScheduler(scripts={self.running_scripts}, polled={len(self._conditions)})'
+
+    @property
+    def running_scripts(self) -> int:
+        """Get the number of scripts that have not finished or been cancelled yet.
+        """
+        return len(self._scripts)
+
+    def start(self, generator: EntityScript, callback: Callable[[Any], None] | None = None) -> Script:
+        """Run a script until its first ``yield``, and schedule it to be resumed when what it yields happens.
+
+        :param generator: The generator to run.
+        :param callback: Function called with the value returned by the generator once it finishes.
+        :return: The handle to the script.
+        """
+        script = Script(self, generator, callback)
+        self._scripts.add(script)
+        self._resume(script)
+        return script
+
+    def step(self):
+        """Resume the scripts waiting for the next step, and the scripts whose condition holds.
+
+        :raise Exception: The exception raised by a script. The script is stopped.
+        """
+        next_step, self._next_step = self._next_step, []
+        conditions, self._conditions = self._conditions, []
+        resumed = checked = 0
+        try:
+            for script in next_step:
+                resumed += 1
+                if not script.is_done:
+                    self._resume(script)
+            for script in conditions:
+                checked += 1
+                if script.is_done:
+                    continue
+                try:
+                    ready = script.waiting_for.condition()
+                except BaseException:
+                    self._finish(script)
+                    raise
+                if ready:
+                    self._resume(script)
+                else:
+                    self._conditions.append(script)
+        finally:
+            # If a script raised, keep the scripts that were not resumed or checked yet for the next step.
+            self._next_step[:0] = next_step[resumed:]
+            self._conditions.extend(conditions[checked:])
+
+    def shutdown(self):
+        """Cancel every script.
+        """
+        for script in tuple(self._scripts):
+            script.cancel()
+        self._next_step.clear()
+        self._conditions.clear()
+
+    def _resume(self, script: Script):
+        script._timer = None
+        script._running = True
+        try:
+            instruction = next(script.generator)
+        except StopIteration as e:
+            cancelled = script.is_cancelled
+            self._finish(script)
+            if not cancelled and script.callback is not None:
+                script.callback(e.value)
+            return
+        except BaseException:
+            self._finish(script)
+            raise
+        finally:
+            script._running = False
+
+        if script.is_cancelled:
+            # The script cancelled itself while running.
+            script.generator.close()
+            return
+        script.waiting_for = instruction
+        if isinstance(instruction, Wait) and instruction.seconds > 0:
+            script._timer = self.timers.schedule(instruction.seconds, lambda: self._resume(script))
+        elif isinstance(instruction, Until):
+            self._conditions.append(script)
+        elif instruction is None or isinstance(instruction, Wait):
+            self._next_step.append(script)
+        else:
+            script.cancel()
+            raise TypeError(f'Scripts must yield wait(...), until(...) or None, got {instruction!r}.')
+
+    def _finish(self, script: Script):
+        self._scripts.discard(script)
+        script.is_done = True
+        script.waiting_for = None
@@ -0,0 +1,108 @@
+import math
+from typing import Hashable, Iterator
+
+
+type Bounds = tuple[float, float, float, float]
+"""Axis-aligned rectangle in ``(left, bottom, right, top)`` format.
+"""
+
+
+def bounds_overlap(a: Bounds, b: Bounds) -> bool:
+    """Check whether two axis-aligned rectangles overlap.
+
+    :param a: The first rectangle.
+    :param b: The second rectangle.
+    :return: True if the rectangles overlap, false otherwise.
+    """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class SpatialGrid:
+    """Uniform grid that buckets items by the cells their bounds overlap, to find the items in a region without going
+    through every item.
+
+    Moving an item only touches the grid if it crosses a cell boundary, so items that move a little every step are
+    cheap to keep up to date.
+    """
+
+    def __init__(self, cell_size: float):
+        """Create an empty grid.
+
+        :param cell_size: The width and height of each cell. Ideally, this is a few times the size of the typical item.
+        """
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[Hashable]] = {}
+        self._item_cells: dict[Hashable, tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._item_cells)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._item_cells
+
+    def insert(self, item: Hashable, bounds: Bounds):
+        """Add an item to the grid.
+
+        :param item: The item to add.
+        :param bounds: The bounds of the item.
+        """
+        cell_range = self._get_cell_range(bounds)
+        self._item_cells[item] = cell_range
+        for cell in self._iterate_cells(cell_range):
+            self._cells.setdefault(cell, set()).add(item)
+
+    def update(self, item: Hashable, bounds: Bounds):
+        """Update the bounds of an item already in the grid.
+
+        :param item: The item to update.
+        :param bounds: The new bounds of the item.
+        """
+        cell_range = self._get_cell_range(bounds)
+        if cell_range != self._item_cells[item]:
+            self.remove(item)
+            self.insert(item, bounds)
+
+    def remove(self, item: Hashable):
+        """Remove an item from the grid.
+
+        :param item: The item to remove.
+        :raise KeyError: If the item is not in the grid.
+        """
+        for cell in self._iterate_cells(self._item_cells.pop(item)):
+            items = self._cells[cell]
+            items.discard(item)
+            if not items:
+                del self._cells[cell]
+
+    def query(self, bounds: Bounds) -> set[Hashable]:
+        """Get the items in the cells overlapped by the given region.
+
+        The result may include items near the region that do not actually overlap it. Use :func:`bounds_overlap` to
+        discard them if needed.
+
+        :param bounds: The region to look up.
+        :return: A set with the items found.
+        """
+        result = set()
+        cells = self._cells
+        for cell in self._iterate_cells(self._get_cell_range(bounds)):
+            items = cells.get(cell)
+            if items is not None:
+                result.update(items)
+        return result
+
+    def _get_cell_range(self, bounds: Bounds) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(bounds[0] / size),
+            math.floor(bounds[1] / size),
+            math.floor(bounds[2] / size),
+            math.floor(bounds[3] / size),
+        )
+
+    @staticmethod
+    def _iterate_cells(cell_range: tuple[int, int, int, int]) -> Iterator[tuple[int, int]]:
+        left, bottom, right, top = cell_range
+        for x in range(left, right + 1):
+            for y in range(bottom, top + 1):
+                yield x, y
@@ -0,0 +1,2 @@
+from .tilesets import *
+from .tilemaps import *
@@ -0,0 +1,221 @@
+import math
+from array import array
+from typing import TYPE_CHECKING
+
+from kizuna.core.datatypes import IVector2, IVector2Like, Vector2, Vector2Like, validate_ivector2, validate_vector2
+from kizuna.core.validation import validate_int, validate_type
+from kizuna.rendering import DrawBatch, TileChunkDrawable
+from kizuna.systems.stage2d import StageLayer
+from kizuna.systems.stage2d.spatial import Bounds
+from kizuna.systems.tilemap.tilesets import Tileset
+
+if TYPE_CHECKING:
+    from kizuna.systems.stage2d import Stage2DController
+
+
+EMPTY_TILE = -1
+"""Tile index of cells without a tile.
+"""
+
+
+class TileMap(StageLayer):
+    """Grid of tiles drawn by a :class:`kizuna.systems.stage2d.Stage2DController`.
+
+    Tile indices are stored as a compact grid of integers instead of entities, and are drawn in square chunks. Each
+    chunk is drawn as a single static mesh that is only rebuilt when one of its tiles changes, and only the chunks in
+    view of the camera are drawn. All the chunks of a tile map share the same batch and texture, so drawing a tile map
+    takes a single draw call regardless of its size.
+
+    Tiles are addressed by their column and row as an :type:`kizuna.core.datatypes.IVector2`, starting from ``(0, 0)``
+    at the bottom-left tile:
+
+    ..  code-block::
+
+        tile_map[3, 5] = 12
+        tile_index = tile_map[IVector2(3, 5)]
+    """
+
+    def __init__(
+        self,
+        controller: 'Stage2DController',
+        tileset: Tileset,
+        size: IVector2Like,
+        position: Vector2Like = (0.0, 0.0),
+        batch: DrawBatch | None = None,
+        chunk_size: int = 32,
+    ):
+        """Create an empty tile map.
+
+        :param controller: The controller that draws the tile map.
+        :param tileset: The tileset the tiles are taken from.
+        :param size: The number of columns and rows of the tile map.
+        :param position: The position of the bottom-left corner of the tile map.
+        :param batch: The batch the tile map is drawn to.
+        :param chunk_size: The number of columns and rows of tiles in each chunk.
+        """
+        self.tileset = validate_type(tileset, Tileset)
+        self.size = validate_ivector2(size)
+        if self.size.x <= 0 or self.size.y <= 0:
+            raise ValueError('Tile map size must be positive.')
+        self._position = validate_vector2(position)
+        self.batch = batch if batch is not None else DrawBatch()
+        self.chunk_size = validate_int(chunk_size)
+        if self.chunk_size <= 0:
+            raise ValueError('Chunk size must be positive.')
+
+        # Tiles are stored chunk by chunk, so that each chunk drawable can reference its own tiles without copying.
+        self._chunk_columns = math.ceil(self.size.x / self.chunk_size)
+        self._chunk_rows = math.ceil(self.size.y / self.chunk_size)
+        self._chunks = [
+            TileChunkDrawable(
+                self.tileset.image,
+                self.tileset.tile_size,
+                self.chunk_size,
+                array('i', [EMPTY_TILE]) * (self.chunk_size * self.chunk_size),
+                self._get_chunk_position(index),
+            )
+            for index in range(self._chunk_rows * self._chunk_columns)
+        ]
+        self._chunks_in_view: set[int] = set()
+
+        super().__init__(controller)
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'TileMap({repr(self.tileset)}, size={self.size})'
+
+    def __getitem__(self, cell: IVector2Like) -> int:
+        """Get the tile index at the given cell.
+
+        :param cell: The column and row of the cell.
+        :return: The tile index, or :data:`EMPTY_TILE`.
+        :raise IndexError: If the cell is outside the tile map.
+        """
+        chunk, index = self._locate(cell)
+        return chunk.tiles[index]
+
+    def __setitem__(self, cell: IVector2Like, tile: int):
+        """Set the tile index at the given cell.
+
+        :param cell: The column and row of the cell.
+        :param tile: The tile index, or :data:`EMPTY_TILE` to clear the cell.
+        :raise IndexError: If the cell is outside the tile map.
+        :raise ValueError: If the tile index is not a tile of the tileset.
+        """
+        tile = self._validate_tile(tile)
+        chunk, index = self._locate(cell)
+        if chunk.tiles[index] != tile:
+            chunk.tiles[index] = tile
+            chunk.invalidate()
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the bottom-left corner of the tile map.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        value = validate_vector2(value)
+        if value != self._position:
+            self._position = value
+            for index, chunk in enumerate(self._chunks):
+                chunk.position = self._get_chunk_position(index)
+
+    @property
+    def batches(self) -> set[DrawBatch]:
+        return {self.batch}
+
+    def fill(self, tile: int, origin: IVector2Like = (0, 0), size: IVector2Like | None = None):
+        """Set the tile index of a rectangular region of cells.
+
+        :param tile: The tile index, or :data:`EMPTY_TILE` to clear the cells.
+        :param origin: The column and row of the bottom-left cell of the region.
+        :param size: The number of columns and rows of the region. By default, up to the top-right cell of the map.
+        :raise IndexError: If the region is not inside the tile map.
+        :raise ValueError: If the tile index is not a tile of the tileset.
+        """
+        tile = self._validate_tile(tile)
+        origin = validate_ivector2(origin)
+        size = validate_ivector2(size) if size is not None else self.size - origin
+        if size.x <= 0 or size.y <= 0:
+            return
+        self._locate(origin)
+        self._locate(origin + size - (1, 1))
+
+        chunk_size = self.chunk_size
+        changed_chunks = set()
+        for y in range(origin.y, origin.y + size.y):
+            for x in range(origin.x, origin.x + size.x):
+                chunk = self._chunks[(y // chunk_size) * self._chunk_columns + x // chunk_size]
+                index = (y % chunk_size) * chunk_size + x % chunk_size
+                if chunk.tiles[index] != tile:
+                    chunk.tiles[index] = tile
+                    changed_chunks.add(chunk)
+        for chunk in changed_chunks:
+            chunk.invalidate()
+
+    def get_cell_at(self, point: Vector2Like) -> IVector2 | None:
+        """Get the cell containing a point of the stage.
+
+        :param point: The point, in stage coordinates.
+        :return: The column and row of the cell, or ``None`` if the point is outside the tile map.
+        """
+        x, y = validate_vector2(point) - self.position
+        column = math.floor(x / self.tileset.tile_size.x)
+        row = math.floor(y / self.tileset.tile_size.y)
+        if not (0 <= column < self.size.x and 0 <= row < self.size.y):
+            return None
+        return IVector2(column, row)
+
+    def prepare_draw(self, view: Bounds):
+        # Find the range of chunks in view.
+        chunk_width = self.chunk_size * self.tileset.tile_size.x
+        chunk_height = self.chunk_size * self.tileset.tile_size.y
+        x, y = self.position
+        first_column = max(0, math.floor((view[0] - x) / chunk_width))
+        first_row = max(0, math.floor((view[1] - y) / chunk_height))
+        last_column = min(self._chunk_columns - 1, math.floor((view[2] - x) / chunk_width))
+        last_row = min(self._chunk_rows - 1, math.floor((view[3] - y) / chunk_height))
+        chunks_in_view = {
+            row * self._chunk_columns + column
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+        }
+
+        # Hide the chunks that left the view, and prepare the ones in view. Unchanged chunks are not rebuilt.
+        for index in self._chunks_in_view - chunks_in_view:
+            chunk = self._chunks[index]
+            chunk.culled = True
+            chunk.on_prepare_draw(self.batch)
+        for index in chunks_in_view:
+            chunk = self._chunks[index]
+            chunk.culled = False
+            chunk.on_prepare_draw(self.batch)
+        self._chunks_in_view = chunks_in_view
+
+    def on_destroy(self):
+        for chunk in self._chunks:
+            chunk.on_destroy()
+        self._chunks_in_view = set()
+
+    def _validate_tile(self, tile: int) -> int:
+        tile = validate_int(tile)
+        if tile != EMPTY_TILE and not 0 <= tile < self.tileset.tile_count:
+            raise ValueError(f'Tile index {tile} is not in the tileset, which has {self.tileset.tile_count} tiles.')
+        return tile
+
+    def _locate(self, cell: IVector2Like) -> tuple[TileChunkDrawable, int]:
+        x, y = validate_ivector2(cell)
+        if not (0 <= x < self.size.x and 0 <= y < self.size.y):
+            raise IndexError(f'Cell ({x}, {y}) is outside the tile map.')
+        chunk_size = self.chunk_size
+        chunk = self._chunks[(y // chunk_size) * self._chunk_columns + x // chunk_size]
+        return chunk, (y % chunk_size) * chunk_size + x % chunk_size
+
+    def _get_chunk_position(self, index: int) -> Vector2:
+        row, column = divmod(index, self._chunk_columns)
+        tile_width, tile_height = self.tileset.tile_size
+        return self._position + (column * self.chunk_size * tile_width, row * self.chunk_size * tile_height)
@@ -0,0 +1,41 @@
+from kizuna.core.assets import ImageAsset
+from kizuna.core.datatypes import IVector2, IVector2Like, validate_ivector2
+from kizuna.core.validation import validate_type
+
+
+class Tileset:
+    """Image divided in a grid of equally sized tiles.
+
+    Tiles are numbered in row-major order starting from 0 at the top-left tile of the image.
+    """
+
+    def __init__(self, image: ImageAsset, tile_size: IVector2Like):
+        """Define a tileset.
+
+        :param image: The image containing the tiles.
+        :param tile_size: The size of each tile in pixels.
+        """
+        self.image = validate_type(image, ImageAsset)
+        self.tile_size = validate_ivector2(tile_size)
+        if self.tile_size.x <= 0 or self.tile_size.y <= 0:
+            raise ValueError('Tile size must be positive.')
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'Tileset({repr(self.image)}, tile_size={self.tile_size})'
+
+    @property
+    def grid_size(self) -> IVector2:
+        """Get the number of columns and rows of tiles in the image, loading the image if needed.
+        """
+        self.image.load()
+        return IVector2(self.image.size.x // self.tile_size.x, self.image.size.y // self.tile_size.y)
+
+    @property
+    def tile_count(self) -> int:
+        """Get the number of tiles in the image, loading the image if needed.
+        """
+        grid_size = self.grid_size
+        return grid_size.x * grid_size.y
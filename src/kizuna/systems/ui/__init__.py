@@ -1 +1,2 @@
+from .widgets import *
 from .controller import *
@@ -1,16 +1,71 @@
+from kizuna.config import settings
 from kizuna.core.controllers import Controller
-from kizuna.rendering import DrawBatch, TextDrawable
+from kizuna.core.datatypes import Vector2Like, ivector2_to_vector, validate_vector2
+from kizuna.rendering import DrawBatch
+from kizuna.systems.ui.widgets import Widget
 
 
-batch = DrawBatch()
+class UIController(Controller):
+    """Controller that draws a tree of retained-mode widgets on top of the game.
 
+    Add widgets to :attr:`root`, which covers the whole window. Widgets are laid out and prepared for drawing only
+    when they change, so a user interface that does not change only costs drawing its batches.
 
-class UIController(Controller):
+    Clicks are not read from the input by this controller. Forward them with :meth:`dispatch_click`, e.g. from the
+    controller handling the input of the game.
 
+    :ivar root: The root of the widget tree.
+    :ivar background_batch: The batch the backgrounds of the widgets are drawn to.
+    :ivar text_batch: The batch the texts of the widgets are drawn to, on top of the backgrounds.
+    :ivar prepared_widget_count: The number of widgets prepared in the last frame.
+    """
+    root: Widget
+    background_batch: DrawBatch
+    text_batch: DrawBatch
+    prepared_widget_count: int
 
-    def on_init(self):
-        self.label = TextDrawable('Hello Kizuna!', (50, 50))
+    # Widgets whose visuals changed since the last frame.
+    _dirty_widgets: list[Widget]
+
+    def __init__(self):
+        self.background_batch = DrawBatch(priority=1, name=f'ui-background-{id(self)}')
+        self.text_batch = DrawBatch(priority=0, name=f'ui-text-{id(self)}')
+        self.prepared_widget_count = 0
+        self._dirty_widgets = []
+        self.root = Widget(size=ivector2_to_vector(settings.WINDOW_SIZE))
+        self.root._attach(self)  # noqa
 
     def on_draw(self):
-        self.label.on_prepare_draw(batch)
-        batch.draw()
+        self.update()
+        settings.backend.draw_batches((self.background_batch, self.text_batch))
+
+    def update(self):
+        """Lay out the widgets that changed and prepare the ones whose visuals changed. This is called before drawing.
+        """
+        root = self.root
+        if root._layout_dirty:  # noqa
+            root._layout(root.position)  # noqa
+
+        dirty_widgets = self._dirty_widgets
+        self.prepared_widget_count = len(dirty_widgets)
+        if dirty_widgets:
+            self._dirty_widgets = []
+            for widget in dirty_widgets:
+                widget._visuals_dirty = False  # noqa
+                if widget._ui is self:  # noqa
+                    widget.prepare_draw()
+
+    def dispatch_click(self, point: Vector2Like) -> Widget | None:
+        """Send a click to the topmost widget at a point of the window. If the widget does not handle it, it is sent
+        to its parent, and so on.
+
+        :param point: The point clicked, e.g. the position of the mouse.
+        :return: The widget that handled the click, or ``None`` if no widget did.
+        """
+        point = validate_vector2(point)
+        widget = self.root.find_widget_at(point)
+        while widget is not None:
+            if widget.on_click(point):
+                return widget
+            widget = widget.parent
+        return None
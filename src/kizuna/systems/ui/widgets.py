@@ -0,0 +1,518 @@
+"""Retained-mode widgets drawn by the :class:`kizuna.systems.ui.UIController`.
+
+Widgets form a tree rooted at :attr:`kizuna.systems.ui.UIController.root`. Positions are in window coordinates, with
+the origin at the bottom-left corner, and the position of a widget is relative to its parent.
+
+Layout is cached: when the content of a widget changes, only that widget and its ancestors are measured and arranged
+again, and siblings are only visited to move them if they need to. Widgets only prepare their drawables again when
+their position, text or visibility changed, so frames where nothing changes only draw the batches of the UI.
+"""
+
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from kizuna.config import settings
+from kizuna.core.assets import DEFAULT_FONT_ASSET, FontAsset, ImageAsset
+from kizuna.core.datatypes import Vector2, Vector2Like, ivector2_to_vector, validate_vector2
+from kizuna.core.validation import validate_choice, validate_float, validate_type
+from kizuna.rendering import SpriteDrawable, TextDrawable
+
+if TYPE_CHECKING:
+    from kizuna.systems.ui.controller import UIController
+
+
+class Widget:
+    """Element of the user interface. Plain widgets have no visuals, and lay out their children at their positions.
+
+    The size of a widget is the one given when creating it, or otherwise the one computed by :meth:`measure`.
+    Subclasses override :meth:`measure`, :meth:`arrange` and :meth:`prepare_draw`, and call
+    :meth:`invalidate_layout` and :meth:`invalidate_visuals` when their content changes.
+    """
+
+    def __init__(self, position: Vector2Like = (0.0, 0.0), size: Vector2Like | None = None, visible: bool = True):
+        """Create a widget, not attached to any tree yet.
+
+        :param position: The position of the bottom-left corner of the widget, relative to its parent.
+        :param size: The size of the widget. If not given, it is computed from its content.
+        :param visible: Whether the widget and its children are visible.
+        """
+        self.parent: Widget | None = None
+        self.children: list[Widget] = []
+        self._position = validate_vector2(position)
+        self._fixed_size = validate_vector2(size) if size is not None else None
+        self._visible = bool(visible)
+        self._ui: 'UIController | None' = None
+
+        # Cached layout: the size of the widget and the absolute position of its bottom-left corner. A widget whose
+        # layout is dirty has all its ancestors dirty as well.
+        self._size = Vector2(0.0, 0.0)
+        self._origin: Vector2 | None = None
+        self._size_dirty = True
+        self._layout_dirty = True
+        self._visuals_dirty = False
+
+    def __str__(self) -> str:
+        return repr(self)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(position={self._position}, size={self._size})'
+
+    @property
+    def position(self) -> Vector2:
+        """Get or set the position of the widget, relative to its parent.
+
+        Children of panels that stack their children are placed by the panel, so their position is ignored.
+        """
+        return self._position
+
+    @position.setter
+    def position(self, value: Vector2Like):
+        value = validate_vector2(value)
+        if value != self._position:
+            self._position = value
+            if self.parent is not None:
+                self.parent.invalidate_layout()
+
+    @property
+    def size(self) -> Vector2:
+        """Get the size of the widget, as of the last layout.
+        """
+        return self._size
+
+    @property
+    def fixed_size(self) -> Vector2 | None:
+        """Get or set the size of the widget, or ``None`` to compute it from its content.
+        """
+        return self._fixed_size
+
+    @fixed_size.setter
+    def fixed_size(self, value: Vector2Like | None):
+        self._fixed_size = validate_vector2(value) if value is not None else None
+        self.invalidate_layout()
+
+    @property
+    def absolute_position(self) -> Vector2:
+        """Get the position of the bottom-left corner of the widget in the window, as of the last layout.
+        """
+        return self._origin if self._origin is not None else Vector2(0.0, 0.0)
+
+    @property
+    def visible(self) -> bool:
+        """Get or set whether the widget and its children are visible.
+        """
+        return self._visible
+
+    @visible.setter
+    def visible(self, value: bool):
+        value = bool(value)
+        if value != self._visible:
+            self._visible = value
+            for widget in self.walk():
+                widget.invalidate_visuals()
+
+    @property
+    def is_shown(self) -> bool:
+        """Get whether the widget is visible and so are all its ancestors.
+        """
+        widget = self
+        while widget is not None:
+            if not widget._visible:
+                return False
+            widget = widget.parent
+        return True
+
+    def add_child[W: 'Widget'](self, child: W) -> W:
+        """Add a widget at the end of the children of this widget, on top of the previous children.
+
+        :param child: The widget to add.
+        :return: The widget added.
+        :raise ValueError: If the widget already has a parent.
+        """
+        validate_type(child, Widget)
+        if child.parent is not None:
+            raise ValueError(f'{child} already has a parent.')
+        child.parent = self
+        self.children.append(child)
+        if self._ui is not None:
+            child._attach(self._ui)  # noqa
+        self.invalidate_layout()
+        return child
+
+    def destroy(self):
+        """Remove the widget from its parent and destroy it along with its children, cleaning up their drawables.
+        """
+        if self.parent is not None:
+            self.parent.children.remove(self)
+            self.parent.invalidate_layout()
+            self.parent = None
+        for widget in self.walk():
+            widget._ui = None
+            widget.on_destroy()
+
+    def walk(self):
+        """Iterate over the widget and its descendants, parents first.
+        """
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
+    def contains(self, point: Vector2Like) -> bool:
+        """Return whether a point of the window is inside the widget, as of the last layout.
+
+        :param point: The point.
+        """
+        x, y = point
+        left, bottom = self.absolute_position
+        width, height = self._size
+        return left <= x <= left + width and bottom <= y <= bottom + height
+
+    def find_widget_at(self, point: Vector2Like) -> 'Widget | None':
+        """Find the topmost visible widget of this subtree at a point of the window.
+
+        :param point: The point.
+        :return: The deepest widget containing the point, or ``None`` if there is none.
+        """
+        if not self._visible or not self.contains(point):
+            return None
+        for child in reversed(self.children):
+            found = child.find_widget_at(point)
+            if found is not None:
+                return found
+        return self
+
+    def invalidate_layout(self):
+        """Mark the size and arrangement of the widget as changed, so that it is laid out again before drawing.
+        """
+        widget = self
+        while widget is not None and not widget._layout_dirty:
+            widget._size_dirty = widget._layout_dirty = True
+            widget = widget.parent
+        if self._ui is not None:
+            settings.backend.request_redraw()
+
+    def invalidate_visuals(self):
+        """Mark the visual state of the widget as changed, so that it prepares its drawables again before drawing.
+        """
+        if not self._visuals_dirty and self._ui is not None:
+            self._visuals_dirty = True
+            self._ui._dirty_widgets.append(self)  # noqa
+            settings.backend.request_redraw()
+
+    def measure(self) -> Vector2:
+        """Compute the size of the widget from its content, when it has no fixed size.
+
+        Sizes of the children are up to date when this is called. By default, the widget fits its children.
+        """
+        width = height = 0.0
+        for child in self.children:
+            x, y = child.position
+            width = max(width, x + child.size.x)
+            height = max(height, y + child.size.y)
+        return Vector2(width, height)
+
+    def arrange(self):
+        """Lay out the children with :meth:`layout_child`, once the size and position of the widget are known.
+
+        By default, each child is placed at its position.
+        """
+        for child in self.children:
+            self.layout_child(child, self._origin + child.position)
+
+    def layout_child(self, child: 'Widget', origin: Vector2):
+        """Place a child at an absolute position, and lay it out if needed.
+
+        :param child: The child.
+        :param origin: The absolute position of the bottom-left corner of the child.
+        """
+        child._layout(origin)  # noqa
+
+    def prepare_draw(self):
+        """Prepare the drawables of the widget. Only called when its visuals have been invalidated.
+        """
+
+    def on_click(self, point: Vector2) -> bool:
+        """Handle a click on the widget.
+
+        :param point: The point of the window clicked.
+        :return: True if the click was handled, false to let the parent handle it.
+        """
+        return False
+
+    def on_destroy(self):
+        """Destroy the drawables of the widget.
+        """
+
+    def _update_size(self):
+        if self._size_dirty:
+            for child in self.children:
+                child._update_size()
+            self._size = self._fixed_size if self._fixed_size is not None else self.measure()
+            self._size_dirty = False
+
+    def _layout(self, origin: Vector2):
+        if not self._layout_dirty and origin == self._origin:
+            return
+        self._update_size()
+        self._layout_dirty = False
+        if origin != self._origin:
+            self._origin = origin
+            self.invalidate_visuals()
+        self.arrange()
+
+    def _attach(self, ui: 'UIController'):
+        for widget in self.walk():
+            widget._ui = ui
+            widget.invalidate_visuals()
+
+
+class Label(Widget):
+    """Single line of text.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        position: Vector2Like = (0.0, 0.0),
+        font: FontAsset = DEFAULT_FONT_ASSET,
+        size: Vector2Like | None = None,
+        visible: bool = True,
+    ):
+        """Create a label.
+
+        :param text: The text.
+        :param position: The position of the bottom-left corner of the label, relative to its parent.
+        :param font: The font of the text.
+        :param size: The size of the label. If not given, it fits the text.
+        :param visible: Whether the label is visible.
+        """
+        super().__init__(position, size, visible)
+        self._drawable = TextDrawable(text, (0.0, 0.0), validate_type(font, FontAsset))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}("{self.text}", position={self._position})'
+
+    @property
+    def text(self) -> str:
+        """Get or set the text of the label.
+        """
+        return self._drawable.text
+
+    @text.setter
+    def text(self, value: str):
+        value = str(value)
+        if value != self._drawable.text:
+            self._drawable.text = value
+            if self._fixed_size is None:
+                self.invalidate_layout()
+            self.invalidate_visuals()
+
+    def measure(self) -> Vector2:
+        return settings.backend.measure_text(self._drawable.text, self._drawable.font)
+
+    def prepare_draw(self):
+        drawable = self._drawable
+        drawable.position = self.absolute_position
+        drawable.visible = self.is_shown
+        drawable.on_prepare_draw(self._ui.text_batch)
+
+    def on_destroy(self):
+        self._drawable.on_destroy()
+
+
+class Panel(Widget):
+    """Container with an optional background image, which can stack its children.
+
+    The background image is drawn at its natural size, anchored at the bottom-left corner of the panel.
+    """
+    ABSOLUTE = 'absolute'
+    VERTICAL = 'vertical'
+    HORIZONTAL = 'horizontal'
+
+    def __init__(
+        self,
+        position: Vector2Like = (0.0, 0.0),
+        size: Vector2Like | None = None,
+        background: ImageAsset | None = None,
+        direction: str = ABSOLUTE,
+        spacing: float = 0.0,
+        padding: float = 0.0,
+        visible: bool = True,
+    ):
+        """Create a panel.
+
+        :param position: The position of the bottom-left corner of the panel, relative to its parent.
+        :param size: The size of the panel. If not given, it fits its children.
+        :param background: The background image.
+        :param direction: How children are placed: at their positions (``'absolute'``), stacked from top to bottom
+            (``'vertical'``), or from left to right (``'horizontal'``).
+        :param spacing: The space between stacked children.
+        :param padding: The space between the border of the panel and its children.
+        :param visible: Whether the panel and its children are visible.
+        """
+        super().__init__(position, size, visible)
+        self.direction = validate_choice(direction, (self.ABSOLUTE, self.VERTICAL, self.HORIZONTAL))
+        self.spacing = validate_float(spacing)
+        self.padding = validate_float(padding)
+        self._background = (
+            SpriteDrawable(validate_type(background, ImageAsset), (0.0, 0.0), 0.0) if background is not None else None
+        )
+
+    def measure(self) -> Vector2:
+        padding = self.padding
+        if self.direction == self.ABSOLUTE:
+            return super().measure() + Vector2(2 * padding, 2 * padding)
+        sizes = [child.size for child in self.children]
+        gaps = self.spacing * max(len(sizes) - 1, 0)
+        if self.direction == self.VERTICAL:
+            width, height = max((size.x for size in sizes), default=0.0), sum(size.y for size in sizes) + gaps
+        else:
+            width, height = sum(size.x for size in sizes) + gaps, max((size.y for size in sizes), default=0.0)
+        return Vector2(width + 2 * padding, height + 2 * padding)
+
+    def arrange(self):
+        left, bottom = self._origin
+        padding = self.padding
+        if self.direction == self.ABSOLUTE:
+            offset = Vector2(left + padding, bottom + padding)
+            for child in self.children:
+                self.layout_child(child, offset + child.position)
+        elif self.direction == self.VERTICAL:
+            y = bottom + self._size.y - padding
+            for child in self.children:
+                y -= child.size.y
+                self.layout_child(child, Vector2(left + padding, y))
+                y -= self.spacing
+        else:
+            x = left + padding
+            for child in self.children:
+                self.layout_child(child, Vector2(x, bottom + padding))
+                x += child.size.x + self.spacing
+
+    def prepare_draw(self):
+        background = self._background
+        if background is not None:
+            asset = background.asset
+            background.position = self.absolute_position + ivector2_to_vector(asset.size) * asset.origin
+            background.visible = self.is_shown
+            background.on_prepare_draw(self._ui.background_batch)
+
+    def on_destroy(self):
+        if self._background is not None:
+            self._background.on_destroy()
+
+
+class Button(Panel):
+    """Panel with a centered label that calls a function when clicked.
+    """
+
+    def __init__(
+        self,
+        text: str,
+        on_press: Callable[[], None] | None = None,
+        position: Vector2Like = (0.0, 0.0),
+        size: Vector2Like | None = None,
+        background: ImageAsset | None = None,
+        font: FontAsset = DEFAULT_FONT_ASSET,
+        padding: float = 4.0,
+        visible: bool = True,
+    ):
+        """Create a button.
+
+        :param text: The text of the button.
+        :param on_press: The function called when the button is clicked.
+        :param position: The position of the bottom-left corner of the button, relative to its parent.
+        :param size: The size of the button. If not given, it fits the text.
+        :param background: The background image.
+        :param font: The font of the text.
+        :param padding: The space around the text.
+        :param visible: Whether the button is visible.
+        """
+        super().__init__(position, size, background, padding=padding, visible=visible)
+        self.on_press = on_press
+        self.enabled = True
+        self.label = self.add_child(Label(text, font=font))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}("{self.text}", position={self._position})'
+
+    @property
+    def text(self) -> str:
+        """Get or set the text of the button.
+        """
+        return self.label.text
+
+    @text.setter
+    def text(self, value: str):
+        self.label.text = value
+
+    def arrange(self):
+        self.layout_child(self.label, self._origin + (self._size - self.label.size) / 2)
+
+    def on_click(self, point: Vector2) -> bool:
+        if not self.enabled:
+            return False
+        if self.on_press is not None:
+            self.on_press()
+        return True
+
+
+class ListView(Panel):
+    """Vertical list of labels built from a sequence of strings.
+
+    Setting the items again reuses the existing labels, so only the labels whose text changed are updated.
+    """
+
+    def __init__(
+        self,
+        items: Sequence[str] = (),
+        on_select: Callable[[int], None] | None = None,
+        position: Vector2Like = (0.0, 0.0),
+        size: Vector2Like | None = None,
+        background: ImageAsset | None = None,
+        font: FontAsset = DEFAULT_FONT_ASSET,
+        spacing: float = 2.0,
+        padding: float = 0.0,
+        visible: bool = True,
+    ):
+        """Create a list.
+
+        :param items: The text of each item.
+        :param on_select: The function called with the index of an item when it is clicked.
+        :param position: The position of the bottom-left corner of the list, relative to its parent.
+        :param size: The size of the list. If not given, it fits the items.
+        :param background: The background image.
+        :param font: The font of the items.
+        :param spacing: The space between items.
+        :param padding: The space between the border of the list and the items.
+        :param visible: Whether the list is visible.
+        """
+        super().__init__(position, size, background, self.VERTICAL, spacing, padding, visible)
+        self.on_select = on_select
+        self.font = validate_type(font, FontAsset)
+        self.items = items
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(items={len(self.children)}, position={self._position})'
+
+    @property
+    def items(self) -> list[str]:
+        """Get or set the text of each item.
+        """
+        return [label.text for label in self.children]
+
+    @items.setter
+    def items(self, value: Sequence[str]):
+        value = [str(item) for item in value]
+        for label, text in zip(self.children, value):
+            label.text = text
+        for text in value[len(self.children):]:
+            self.add_child(Label(text, font=self.font))
+        for label in self.children[len(value):]:
+            label.destroy()
+
+    def on_click(self, point: Vector2) -> bool:
+        for index, label in enumerate(self.children):
+            if label.contains(point):
+                if self.on_select is not None:
+                    self.on_select(index)
+                return True
+        return False
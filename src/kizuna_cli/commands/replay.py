@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+
+import click
+
+from kizuna.core.validation import validate_positive_float
+from kizuna.management.exceptions import ManagementError, SettingsValidationError
+from kizuna.management.replay import run_replay
+from kizuna.management.setup import initialize
+
+
+@click.command()
+@click.argument('recording', type=click.Path(exists=True, dir_okay=False, resolve_path=True))
+@click.option('--dt', type=float, help='Time step in seconds. Defaults to the recorded time steps.')
+@click.option('--steps', type=click.IntRange(min=0), help='Number of steps to run. Defaults to the whole recording.')
+@click.option('--slowest', type=click.IntRange(min=0), default=10, show_default=True, help='Slowest steps to list.')
+@click.option(
+    '-o', '--output',
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help='Write the duration of each step to a CSV file.',
+)
+def command(recording: str, dt: float | None, steps: int | None, slowest: int, output: str | None):
+    """Replay an input recording without a window, as fast as possible, and report the step timings.
+    """
+    # Validate the ``--dt`` option.
+    if dt is not None:
+        try:
+            dt = validate_positive_float(dt)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint='dt')
+
+    try:
+        initialize(Path(os.getcwd()), standalone=False, enable_kizuna_log=False)
+        timings = run_replay(recording, dt, steps)
+    except SettingsValidationError as e:
+        raise click.ClickException(str(e) + '\n' + '\n'.join(
+            f'- {setting}: {validation_error}' for setting, validation_error in e.errors.items()
+        ))
+    except (ManagementError, ValueError) as e:
+        raise click.ClickException(str(e))
+
+    click.echo(f'Replayed {timings.count} steps in {timings.total:.3f} s.')
+    click.echo(
+        f'Step time (ms): mean {timings.mean * 1000:.3f}, p50 {timings.percentile(50) * 1000:.3f}, '
+        f'p95 {timings.percentile(95) * 1000:.3f}, p99 {timings.percentile(99) * 1000:.3f}, '
+        f'max {timings.max * 1000:.3f}'
+    )
+    if slowest > 0 and timings.count > 0:
+        click.echo('Slowest steps:')
+        for step_index, duration in timings.slowest_steps(slowest):
+            click.echo(f'- Step {step_index}: {duration * 1000:.3f} ms')
+    if output is not None:
+        timings.save_csv(output)
+        click.echo(f'Step timings written to "{output}".')
@@ -3,16 +3,39 @@ from pathlib import Path
 
 import click
 
+from kizuna.backends import CAPTURE_FORMATS, FrameCapture
 from kizuna.management.exceptions import ManagementError, SettingsValidationError
 from kizuna.management.setup import bootstrap
 
 
 @click.command()
-def command():
+@click.option(
+    '--record-input',
+    type=click.Path(dir_okay=False, writable=True, resolve_path=True),
+    help='Record the input events to a file, to replay them later with "kizuna replay".',
+)
+@click.option(
+    '--capture',
+    type=click.Path(file_okay=False, writable=True, resolve_path=True),
+    help='Capture the drawn frames to a directory. Frames are dropped if they cannot be written fast enough.',
+)
+@click.option(
+    '--capture-format',
+    type=click.Choice(CAPTURE_FORMATS),
+    default='png',
+    show_default=True,
+    help='Write the captured frames as a PNG sequence, or as raw RGBA video.',
+)
+def command(record_input: str | None, capture: str | None, capture_format: str):
     """Run the project.
     """
     try:
-        bootstrap(Path(os.getcwd()), standalone=False)
+        bootstrap(
+            Path(os.getcwd()),
+            standalone=False,
+            input_recording_path=Path(record_input) if record_input is not None else None,
+            capture=FrameCapture(capture, capture_format) if capture is not None else None,
+        )
     except SettingsValidationError as e:
         raise click.ClickException(str(e) + '\n' + '\n'.join(
             f'- {setting}: {validation_error}' for setting, validation_error in e.errors.items()
@@ -0,0 +1,37 @@
+import unittest
+
+from kizuna.backends.base import BackendStatistics
+
+
+class BackendStatisticsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.statistics = BackendStatistics(history_size=3)
+
+    def test_end_frame_records_and_resets_the_counters(self):
+        # Arrange
+        self.statistics.batch_draws += 2
+        self.statistics.sprites_created += 1
+
+        # Act
+        self.statistics.end_frame()
+
+        # Assert
+        last_frame = self.statistics.get_last_frame()
+        self.assertEqual(2, last_frame['batch_draws'])
+        self.assertEqual(1, last_frame['sprites_created'])
+        self.assertEqual(0, last_frame['labels_created'])
+        self.assertEqual(0, self.statistics.batch_draws)
+
+    def test_history_keeps_the_latest_frames_in_order(self):
+        # Arrange
+        for batch_draws in range(5):
+            self.statistics.batch_draws = batch_draws
+            self.statistics.end_frame()
+
+        # Act
+        history = self.statistics.get_history()
+
+        # Assert
+        self.assertEqual([2, 3, 4], history['batch_draws'].tolist())
+        self.assertEqual(5, self.statistics.frame_count)
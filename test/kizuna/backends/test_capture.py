@@ -0,0 +1,82 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy
+from pyglet.extlibs import png
+
+from kizuna.backends.capture import FrameCapture, encode_png
+
+
+def make_frames(count: int) -> list[numpy.ndarray]:
+    return [numpy.random.default_rng(i).integers(0, 256, (3, 5, 4), dtype=numpy.uint8) for i in range(count)]
+
+
+class EncodePngTests(unittest.TestCase):
+
+    def test_encoded_png_is_decoded_to_the_same_pixels(self):
+        # Arrange
+        frame, = make_frames(1)
+
+        # Act
+        data = encode_png(frame)
+
+        # Assert
+        width, height, rows, _ = png.Reader(bytes=data).asRGBA8()
+        self.assertEqual((5, 3), (width, height))
+        numpy.testing.assert_array_equal(frame, numpy.array(list(rows)).reshape(3, 5, 4))
+
+
+class FrameCaptureTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'capture'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_png_sequence_is_written_from_the_top_row(self):
+        # Arrange
+        frames = make_frames(3)
+        capture = FrameCapture(self.path, 'png')
+        capture.start()
+
+        # Act
+        for frame in frames:
+            capture.submit(frame)
+        capture.close()
+
+        # Assert
+        self.assertEqual(['frame-000000.png', 'frame-000001.png', 'frame-000002.png'],
+                         sorted(path.name for path in self.path.iterdir()))
+        _, _, rows, _ = png.Reader(filename=str(self.path / 'frame-000002.png')).asRGBA8()
+        numpy.testing.assert_array_equal(frames[2][::-1], numpy.array(list(rows)).reshape(3, 5, 4))
+
+    def test_raw_video_concatenates_frames(self):
+        # Arrange
+        frames = make_frames(4)
+        capture = FrameCapture(self.path, 'raw')
+        capture.start()
+
+        # Act
+        for frame in frames:
+            capture.submit(frame)
+        capture.close()
+
+        # Assert
+        data = numpy.frombuffer((self.path / 'frames.rgba').read_bytes(), dtype=numpy.uint8)
+        numpy.testing.assert_array_equal(numpy.stack([frame[::-1] for frame in frames]), data.reshape(4, 3, 5, 4))
+        self.assertEqual((4, 0), (capture.written_frames, capture.dropped_frames))
+
+    def test_frames_are_dropped_when_the_capture_is_not_running(self):
+        # Arrange
+        frame, = make_frames(1)
+        capture = FrameCapture(self.path)
+
+        # Act
+        accepted = capture.submit(frame)
+
+        # Assert
+        self.assertFalse(accepted)
+        self.assertEqual((1, 1), (capture.submitted_frames, capture.dropped_frames))
@@ -0,0 +1,225 @@
+import ctypes
+import gc
+import unittest
+
+import numpy
+
+from kizuna.backends.pyglet import FrameRatePolicy, PygletBackend, PygletResource
+from kizuna.config import settings
+from kizuna.core.assets import ImageAsset
+from kizuna.rendering import DrawBatch, Drawable, ParticlesDrawable
+
+from test.kizuna.helpers import BackendTestCase
+
+
+class FrameRatePolicyTests(unittest.TestCase):
+
+    def test_interval_follows_focus_and_minimization(self):
+        # Arrange
+        policy = FrameRatePolicy(60.0, unfocused_frames_per_second=10.0)
+
+        # Act
+        focused = policy.interval
+        policy.focused = False
+        unfocused = policy.interval
+        policy.minimized = True
+        minimized = policy.interval
+
+        # Assert
+        self.assertEqual((1 / 60, 1 / 10, None), (focused, unfocused, minimized))
+
+    def test_redraw_on_change_draws_until_frames_stop_changing(self):
+        # Arrange
+        policy = FrameRatePolicy(60.0, redraw_on_change=True)
+        drawn = []
+
+        # Act
+        for changed in (True, False, None, None):
+            drawn.append(policy.begin_frame())
+            if drawn[-1]:
+                policy.frame_drawn(changed)
+
+        # Assert
+        self.assertEqual([True, True, False, False], drawn)
+
+    def test_input_requests_a_redraw_after_the_next_step(self):
+        # Arrange
+        policy = FrameRatePolicy(60.0, redraw_on_change=True)
+        policy.begin_frame()
+        policy.frame_drawn(False)
+
+        # Act
+        policy.input_received()
+        before_step = policy.begin_frame()
+        policy.step_done()
+        after_step = policy.begin_frame()
+
+        # Assert
+        self.assertEqual((False, True), (before_step, after_step))
+
+    def test_frames_drawn_after_missed_frames_or_unfocused_are_throttled(self):
+        # Arrange
+        policy = FrameRatePolicy(60.0, unfocused_frames_per_second=10.0, redraw_on_change=True)
+        throttled = []
+
+        # Act
+        policy.begin_frame()
+        throttled.append(policy.throttled)
+        policy.begin_frame()
+        policy.request_redraw()
+        policy.begin_frame()
+        throttled.append(policy.throttled)
+        policy.request_redraw()
+        policy.begin_frame()
+        throttled.append(policy.throttled)
+        policy.focused = False
+        policy.request_redraw()
+        policy.begin_frame()
+        throttled.append(policy.throttled)
+
+        # Assert
+        self.assertEqual([False, True, False, True], throttled)
+
+
+class PygletBackendBatchTests(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = PygletBackend(settings)
+        self.background = DrawBatch(priority=1)
+        self.foreground = DrawBatch(priority=0)
+        self.backend._acquire_batch(self.background)  # noqa
+        self.backend._acquire_batch(self.foreground)  # noqa
+
+    def test_batches_drawn_together_share_a_pyglet_batch_in_order(self):
+        # Act
+        pyglet_batch = self.backend._share_batch((self.background, self.foreground))  # noqa
+
+        # Assert
+        self.assertIs(pyglet_batch, self.backend.batches[self.background])
+        self.assertIs(pyglet_batch, self.backend.batches[self.foreground])
+        self.assertEqual(
+            [0, 1], [self.backend.layer_groups[batch].order for batch in (self.background, self.foreground)],
+        )
+
+    def test_batches_are_merged_again_only_when_the_batches_drawn_together_change(self):
+        # Arrange
+        self.backend._share_batch((self.background, self.foreground))  # noqa
+
+        # Act
+        self.backend._share_batch((self.foreground, self.background))  # noqa
+        merges_after_reordering = self.backend.statistics.batch_merges
+        self.backend._share_batch((self.foreground,))  # noqa
+
+        # Assert
+        self.assertEqual(1, merges_after_reordering)
+        self.assertEqual(1, self.backend.layer_groups[self.background].order)
+        self.assertIsNot(self.backend.batches[self.background], self.backend.batches[self.foreground])
+
+
+class FakePygletObject:
+
+    def __init__(self):
+        self.deleted = False
+
+    def delete(self):
+        self.deleted = True
+
+
+class PygletBackendResourceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.backend = PygletBackend(settings)
+        self.batch = DrawBatch()
+
+    def track_sprite(self, drawable: Drawable) -> FakePygletObject:
+        pyglet_object = FakePygletObject()
+        resource = self.backend.sprites[drawable] = self.backend._track(drawable, PygletResource(pyglet_object))  # noqa
+        self.backend._assign_batch(resource, self.batch)  # noqa
+        return pyglet_object
+
+    def test_destroyed_drawables_release_their_pyglet_object_and_batch(self):
+        # Arrange
+        drawable = Drawable()
+        pyglet_object = self.track_sprite(drawable)
+
+        # Act
+        self.backend.destroy_sprite(drawable)
+
+        # Assert
+        self.assertTrue(pyglet_object.deleted)
+        self.assertEqual(0, self.backend.get_resource_usage()['sprites'].count)
+        self.assertNotIn(self.batch, self.backend.batches)
+
+    def test_garbage_collected_drawables_release_their_pyglet_object_and_batch(self):
+        # Arrange
+        drawable = Drawable()
+        pyglet_object = self.track_sprite(drawable)
+
+        # Act
+        del drawable
+        gc.collect()
+
+        # Assert
+        self.assertTrue(pyglet_object.deleted)
+        self.assertEqual(0, self.backend.get_resource_usage()['sprites'].count)
+        self.assertNotIn(self.batch, self.backend.batches)
+
+    def test_batches_are_kept_while_any_drawable_uses_them(self):
+        # Arrange
+        first, second = Drawable(), Drawable()
+        self.track_sprite(first)
+        self.track_sprite(second)
+
+        # Act
+        self.backend.destroy_sprite(first)
+
+        # Assert
+        self.assertIn(self.batch, self.backend.batches)
+        self.assertEqual(1, self.backend.get_resource_usage()['sprites'].count)
+
+
+class FakeParticlesVertexList:
+
+    def __init__(self, capacity: int):
+        vertices = capacity * 4
+        self.scale = (ctypes.c_float * (vertices * 2))()
+        self.translate = (ctypes.c_float * (vertices * 3))()
+        self.rotation = (ctypes.c_float * vertices)()
+        self.colors = (ctypes.c_ubyte * (vertices * 4))()
+
+
+class PygletBackendParticlesTests(BackendTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pyglet_backend = PygletBackend(settings)
+        self.batch = DrawBatch()
+        self.drawable = ParticlesDrawable(
+            ImageAsset('/particle.png'), numpy.zeros((4, 2)), numpy.zeros(4), numpy.zeros((4, 4), dtype=numpy.uint8),
+        )
+        self.pyglet_backend.particles[self.drawable] = PygletResource(FakeParticlesVertexList(4))
+
+    def prepare(self, times: int) -> int:
+        for _ in range(times):
+            self.pyglet_backend.prepare_draw_particles(self.drawable, self.batch)
+        return self.pyglet_backend.statistics.vertex_list_updates
+
+    def test_empty_particles_are_uploaded_once(self):
+        # Act
+        updates = self.prepare(3)
+
+        # Assert
+        self.assertEqual(1, updates)
+
+    def test_particles_are_uploaded_again_only_once_invalidated(self):
+        # Arrange
+        self.drawable.count = 2
+
+        # Act
+        unchanged_updates = self.prepare(2)
+        self.drawable.invalidate()
+        invalidated_updates = self.prepare(2)
+
+        # Assert
+        self.assertEqual(1, unchanged_updates)
+        self.assertEqual(2, invalidated_updates)
@@ -0,0 +1,188 @@
+import queue
+import threading
+import unittest
+
+from kizuna.backends.snapshot import SnapshotBackend, SnapshotBuffer, SnapshotPlayer
+from kizuna.config import settings
+from kizuna.core.assets import ImageAsset
+from kizuna.management.exceptions import (
+    SimulationProcessLostError, SimulationProcessUnsupportedError, SimulationSnapshotOverflowError,
+)
+from kizuna.rendering import DrawBatch, SpriteDrawable, TileChunkDrawable
+
+from test.kizuna.helpers import BackendTestCase
+
+
+class SnapshotBufferTests(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = SnapshotBuffer(4)
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def test_read_returns_latest_snapshot_only_once(self):
+        # Arrange
+        self.buffer.publish([(1, 1, 2, 3, 4, 1.0, 2.0, 3.0)])
+        self.buffer.publish([(4, 0, 5, 0, 0, 0.0, 0.0, 0.0)])
+
+        # Act
+        first = self.buffer.read(0)
+        second = self.buffer.read(first[0])
+
+        # Assert
+        self.assertEqual((2, [(4, 0, 5, 0, 0, 0.0, 0.0, 0.0)]), first)
+        self.assertIsNone(second)
+
+    def test_read_from_another_attachment(self):
+        # Arrange
+        other = SnapshotBuffer(4, self.buffer.name, self.buffer.lock)
+        self.buffer.publish([(1, 1, 2, 3, 4, 1.5, 2.5, 3.5)])
+
+        # Act
+        snapshot = other.read(0)
+        other.close()
+
+        # Assert
+        self.assertEqual((1, [(1, 1, 2, 3, 4, 1.5, 2.5, 3.5)]), snapshot)
+
+    def test_publish_raises_when_over_capacity(self):
+        # Act / Assert
+        with self.assertRaises(SimulationSnapshotOverflowError):
+            self.buffer.publish([(4, 0, 5, 0, 0, 0.0, 0.0, 0.0)] * 5)
+
+
+class SnapshotPlayerTests(BackendTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.buffer = SnapshotBuffer(16)
+        self.messages = queue.Queue()
+        self.recorder = SnapshotBackend(settings, self.buffer, self.messages, queue.Queue(), threading.Event())
+        self.player = SnapshotPlayer(self.buffer, self.messages, message_timeout=0.01)
+
+        # Describe the asset as the simulation process does when loading it.
+        self.asset = ImageAsset('/sprite.png')
+        self.recorder.asset_ids[self.asset] = 1
+        self.messages.put(('image', 1, str(self.asset.path), (0.5, 0.5)))
+
+    def tearDown(self):
+        self.buffer.close()
+        super().tearDown()
+
+    def record_frame(self, drawables: list[SpriteDrawable], batch: DrawBatch):
+        for drawable in drawables:
+            self.recorder.prepare_draw_sprite(drawable, batch)
+        self.recorder.draw_batch(batch)
+        self.buffer.publish(self.recorder._take_snapshot())  # noqa
+
+    def test_play_prepares_copies_and_draws_batches(self):
+        # Arrange
+        batch = DrawBatch(name='snapshot-batch')
+        sprite = SpriteDrawable(self.asset, (10, 20), 45.0)
+        self.record_frame([sprite], batch)
+
+        # Act
+        self.player.play()
+
+        # Assert
+        [copy] = self.backend.prepared_sprites
+        self.assertEqual((10.0, 20.0, 45.0), (copy.position.x, copy.position.y, copy.rotation))
+        self.assertEqual(['snapshot-batch'], [drawn.name for drawn in self.backend.drawn_batches])
+
+    def test_play_only_prepares_new_snapshots(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.asset, (0, 0), 0.0)
+        self.record_frame([sprite], batch)
+
+        # Act
+        self.player.play()
+        self.player.play()
+
+        # Assert
+        self.assertEqual(1, len(self.backend.prepared_sprites))
+        self.assertEqual(2, len(self.backend.drawn_batches))
+
+    def test_destroyed_drawables_are_not_created_again_by_older_snapshots(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.asset, (0, 0), 0.0)
+        self.record_frame([sprite], batch)
+        self.player.play()
+        self.record_frame([sprite], batch)
+        self.recorder.destroy_sprite(sprite)
+
+        # Act
+        self.player.play()
+
+        # Assert
+        self.assertEqual(1, len(self.backend.destroyed_sprites))
+        self.assertEqual(0, len(self.player.drawables))
+
+    def test_hidden_drawables_stay_hidden_when_a_snapshot_is_skipped(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.asset, (0, 0), 0.0)
+        self.record_frame([sprite], batch)
+        self.player.play()
+        sprite.culled = True
+        self.record_frame([sprite], batch)
+        self.record_frame([], batch)
+
+        # Act
+        self.player.play()
+
+        # Assert
+        [copy] = self.player.drawables.values()
+        self.assertFalse(copy.visible)
+        self.assertEqual(2, len(self.backend.prepared_sprites))
+
+    def test_copies_missing_from_a_snapshot_are_hidden(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.asset, (0, 0), 0.0)
+        self.record_frame([sprite], batch)
+        self.player.play()
+        self.recorder._drawable_rows.clear()  # noqa
+        self.record_frame([], batch)
+
+        # Act
+        self.player.play()
+
+        # Assert
+        [copy] = self.player.drawables.values()
+        self.assertFalse(copy.visible)
+
+    def test_static_batches_and_their_invalidations_are_forwarded(self):
+        # Arrange
+        batch = DrawBatch(name='static-batch', static=True)
+        sprite = SpriteDrawable(self.asset, (0, 0), 0.0)
+        self.record_frame([sprite], batch)
+        self.player.play()
+        batch.invalidate()
+        self.record_frame([sprite], batch)
+
+        # Act
+        self.player.play()
+
+        # Assert
+        copy = self.backend.drawn_batches[-1]
+        self.assertTrue(copy.static)
+        self.assertEqual(1, copy.revision)
+
+    def test_play_raises_when_descriptions_never_arrive(self):
+        # Arrange
+        self.buffer.publish([(4, 0, 99, 0, 0, 0.0, 0.0, 0.0)])
+
+        # Act / Assert
+        with self.assertRaises(SimulationProcessLostError):
+            self.player.play()
+
+    def test_recording_a_tile_chunk_raises(self):
+        # Arrange
+        chunk = TileChunkDrawable(self.asset, (16, 16), 1, [0], (0, 0))
+
+        # Act / Assert
+        with self.assertRaises(SimulationProcessUnsupportedError):
+            self.recorder.prepare_draw_tile_chunk(chunk, DrawBatch())
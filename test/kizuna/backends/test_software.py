@@ -0,0 +1,237 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import numpy
+from pyglet.extlibs import png
+
+from kizuna.backends.software import SoftwareBackend
+from kizuna.config import settings
+from kizuna.core.assets import BitmapFontAsset, FontAsset, ImageAsset
+from kizuna.core.constants import Alignment
+from kizuna.core.datatypes import IVector2, Vector2
+from kizuna.rendering import (
+    BitmapTextDrawable, DrawBatch, ParticlesDrawable, SpriteDrawable, TextDrawable, TileChunkDrawable,
+)
+from kizuna.systems.stage2d import Entity2D, Stage2DController
+from kizuna.systems.stage2d.components import SpriteComponent
+
+
+def write_png(path: Path, pixels: list[list[tuple[int, int, int, int]]]):
+    # Rows are given from the top, as they are stored in the file.
+    with open(path, 'wb') as file:
+        png.Writer(len(pixels[0]), len(pixels), greyscale=False, alpha=True).write(
+            file, [[channel for pixel in row for channel in pixel] for row in pixels],
+        )
+
+
+RED = (255, 0, 0, 255)
+BLUE = (0, 0, 255, 255)
+HALF_GREEN = (0, 255, 0, 128)
+
+
+class SoftwareBackendTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        base_directory = Path(self.directory.name)
+        (base_directory / 'assets').mkdir()
+        write_png(base_directory / 'assets' / 'red.png', [[RED] * 4] * 2)
+        write_png(base_directory / 'assets' / 'blue.png', [[BLUE] * 2] * 2)
+        write_png(base_directory / 'assets' / 'green.png', [[HALF_GREEN] * 2] * 2)
+        write_png(base_directory / 'assets' / 'tileset.png', [[RED, BLUE]])
+        settings._settings = {
+            'WINDOW_SIZE': IVector2(8, 6), 'STAGE2D_CULLING_CELL_SIZE': 256.0,
+            'SOFTWARE_BACKEND_FRAMES': 1, 'SOFTWARE_BACKEND_FRAME_DIRECTORY': None,
+        }
+        self.backend = settings._backend = SoftwareBackend(settings)
+        self.backend.initialize(base_directory, standalone=False)
+        self.red = ImageAsset('/red.png', origin=Alignment.BOTTOM_LEFT)
+        self.blue = ImageAsset('/blue.png', origin=Alignment.BOTTOM_LEFT)
+        self.green = ImageAsset('/green.png', origin=Alignment.BOTTOM_LEFT)
+
+    def tearDown(self):
+        settings._backend = None
+        settings._settings = {}
+        self.directory.cleanup()
+
+    def test_sprites_are_drawn_at_their_position(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.red, (1, 2), 0.0)
+        sprite.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        frame = self.backend.get_frame()
+        self.assertEqual(RED, tuple(frame[6 - 3, 1]))
+        self.assertEqual(RED, tuple(frame[6 - 4, 4]))
+        self.assertEqual((0, 0, 0, 0), tuple(frame[6 - 3, 0]))
+        self.assertEqual((0, 0, 0, 0), tuple(frame[6 - 4, 5]))
+        self.assertEqual(8, int((frame[..., 3] > 0).sum()))
+
+    def test_rotated_sprites_turn_around_their_origin(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.red, (4, 1), 90.0)
+        sprite.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        covered = numpy.argwhere(self.backend.get_frame()[::-1, :, 3] > 0)
+        self.assertEqual([(1, 2), (4, 3)], [tuple(covered.min(axis=0)), tuple(covered.max(axis=0))])
+
+    def test_translucent_sprites_are_blended(self):
+        # Arrange
+        batch = DrawBatch()
+        red = SpriteDrawable(self.red, (0, 0), 0.0)
+        green = SpriteDrawable(self.green, (0, 0), 0.0)
+        red.on_prepare_draw(batch)
+        green.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        self.assertEqual((127, 128, 0, 255), tuple(self.backend.get_frame()[5, 0]))
+
+    def test_stage_batches_are_composited_by_priority(self):
+        # Arrange
+        background = DrawBatch(priority=1)
+        foreground = DrawBatch(priority=0)
+        blue, red = self.blue, self.red
+
+        class Front(Entity2D):
+            sprites = [SpriteComponent(blue, foreground)]
+
+        class Back(Entity2D):
+            sprites = [SpriteComponent(red, background)]
+
+        controller = Stage2DController()
+        controller.camera.position = Vector2(0.0, 0.0)
+        Front(controller, (0, 0))
+        Back(controller, (0, 0))
+
+        # Act
+        controller.on_draw()
+
+        # Assert
+        frame = self.backend.get_frame()
+        self.assertEqual(BLUE, tuple(frame[5, 0]))
+        self.assertEqual(RED, tuple(frame[5, 3]))
+
+    def test_text_is_rasterized_from_the_font(self):
+        # Arrange
+        self.backend.framebuffer = numpy.zeros((40, 80, 4), dtype=numpy.uint8)
+        font = FontAsset('builtin:/fonts/mplus-1p/MPLUS1p-Regular.ttf', family_name='M PLUS 1p', size=12)
+        batch = DrawBatch()
+        text = TextDrawable('Hi', (4, 10), font)
+        text.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        covered = numpy.argwhere(self.backend.framebuffer[..., 3] > 0)
+        self.assertGreater(len(covered), 0)
+        self.assertGreaterEqual(covered[:, 0].min(), 10)
+        self.assertGreaterEqual(covered[:, 1].min(), 4)
+        self.assertLessEqual(covered[:, 1].max(), 4 + self.backend.measure_text('Hi', font).x)
+
+    def test_bitmap_fonts_generated_from_fonts_draw_the_same_glyphs(self):
+        # Arrange
+        self.backend.framebuffer = numpy.zeros((40, 80, 4), dtype=numpy.uint8)
+        font = FontAsset('builtin:/fonts/mplus-1p/MPLUS1p-Regular.ttf', family_name='M PLUS 1p', size=12)
+        bitmap_font = BitmapFontAsset(font, characters='AB')
+        batch = DrawBatch()
+        text = TextDrawable('AB', (4, 10), font)
+        bitmap_text = BitmapTextDrawable('AB', (4, 10), bitmap_font)
+        text.on_prepare_draw(batch)
+        batch.draw()
+        expected = self.backend.framebuffer.copy()
+        self.backend.clear()
+        text.on_destroy()
+        bitmap_text.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        numpy.testing.assert_array_equal(expected, self.backend.framebuffer)
+
+    def test_tile_chunks_are_composed_from_the_tileset(self):
+        # Arrange
+        tileset = ImageAsset('/tileset.png', origin=Alignment.BOTTOM_LEFT)
+        batch = DrawBatch()
+        chunk = TileChunkDrawable(tileset, (1, 1), 3, [1, -1, 0, 0], (2, 1))
+        chunk.on_prepare_draw(batch)
+
+        # Act
+        batch.draw()
+
+        # Assert
+        frame = self.backend.get_frame()
+        self.assertEqual(
+            [BLUE, (0, 0, 0, 0), RED, (0, 0, 0, 0)], [tuple(frame[6 - 2, x]) for x in (2, 3, 4, 5)],
+        )
+        self.assertEqual(RED, tuple(frame[6 - 3, 2]))
+
+    def test_particles_are_blended_in_order_as_single_sprites(self):
+        # Arrange
+        self.backend.framebuffer = numpy.zeros((30, 40, 4), dtype=numpy.uint8)
+        rng = numpy.random.default_rng(0)
+        positions = rng.uniform(-5.0, 45.0, (100, 2)).astype(numpy.float32)
+        rotations = rng.uniform(0.0, 360.0, 100).astype(numpy.float32)
+        colors = rng.integers(0, 256, (100, 4), dtype=numpy.uint8)
+        batch = DrawBatch()
+        particles = ParticlesDrawable(self.red, positions, rotations, colors)
+        particles.count = 100
+        particles.on_prepare_draw(batch)
+        image = self.backend.assets[self.red]
+        for (x, y), rotation, color in zip(positions.tolist(), rotations.tolist(), colors):
+            self.backend._blit(image.pixels, image.anchor, x, y, rotation, color)  # noqa
+        expected = self.backend.framebuffer.copy()
+        self.backend.clear()
+
+        # Act
+        batch.draw()
+
+        # Assert
+        numpy.testing.assert_array_equal(expected, self.backend.framebuffer)
+
+    def test_save_frame_writes_a_png(self):
+        # Arrange
+        batch = DrawBatch()
+        sprite = SpriteDrawable(self.red, (0, 0), 0.0)
+        sprite.on_prepare_draw(batch)
+        batch.draw()
+        path = Path(self.directory.name) / 'frame.png'
+
+        # Act
+        self.backend.save_frame(path)
+
+        # Assert
+        width, height, rows, _ = png.Reader(filename=str(path)).asRGBA8()
+        self.assertEqual((8, 6), (width, height))
+        numpy.testing.assert_array_equal(self.backend.get_frame(), numpy.array(list(rows)).reshape(6, 8, 4))
+
+    def test_hundreds_of_frames_render_quickly(self):
+        # Arrange
+        batch = DrawBatch()
+        sprites = [SpriteDrawable(self.red, (i % 8, i % 6), i * 10.0) for i in range(50)]
+
+        # Act
+        start = time.perf_counter()
+        for frame in range(300):
+            self.backend.clear()
+            self.backend.prepare_draw_sprites(sprites, [(frame % 8, 1)] * 50, [frame] * 50, batch)
+            batch.draw()
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(elapsed, 10.0)
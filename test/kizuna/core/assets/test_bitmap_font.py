@@ -0,0 +1,64 @@
+import unittest
+
+import numpy
+
+from kizuna.core.assets import BitmapFontAsset, parse_bmfont
+
+BMFONT_SOURCE = '''info face="Test" size=16
+common lineHeight=20 base=16 scaleW=64 scaleH=64 pages=1
+page id=0 file="test.png"
+chars count=4
+char id=48 x=0 y=0 width=8 height=12 xoffset=0 yoffset=4 xadvance=9 page=0
+char id=49 x=8 y=0 width=6 height=12 xoffset=1 yoffset=4 xadvance=9 page=0
+char id=63 x=16 y=0 width=7 height=12 xoffset=0 yoffset=4 xadvance=8 page=0
+char id=105 x=24 y=0 width=2 height=12 xoffset=0 yoffset=4 xadvance=3 page=0
+'''
+
+
+class BitmapFontAssetTests(unittest.TestCase):
+
+    def setUp(self):
+        self.font = BitmapFontAsset('/fonts/test.fnt')
+        line_height, base, _, glyphs = parse_bmfont(BMFONT_SOURCE)
+        self.font.set_glyphs(line_height, base, glyphs)
+
+    def test_parse_bmfont(self):
+        # Act
+        line_height, base, page, glyphs = parse_bmfont(BMFONT_SOURCE)
+
+        # Assert
+        self.assertEqual((20, 16, 'test.png'), (line_height, base, page))
+        self.assertEqual(['0', '1', '?', 'i'], list(glyphs))
+        self.assertEqual((8, 6, 1, 9), (glyphs['1'].x, glyphs['1'].width, glyphs['1'].x_offset, glyphs['1'].x_advance))
+
+    def test_parse_bmfont_rejects_multiple_pages(self):
+        # Act & Assert
+        with self.assertRaises(ValueError):
+            parse_bmfont(BMFONT_SOURCE.replace('pages=1', 'pages=2'))
+
+    def test_layout_places_glyphs_along_the_baseline(self):
+        # Act
+        quads, glyph_indices = self.font.layout('1i0')
+        end_quads, end_glyph_indices = self.font.layout('1i0', 1)
+
+        # Assert
+        numpy.testing.assert_array_equal([[1, 0, 7, 12], [9, 0, 11, 12], [12, 0, 20, 12]], quads)
+        self.assertEqual([1, 3, 0], glyph_indices.tolist())
+        numpy.testing.assert_array_equal(quads[1:], end_quads)
+        self.assertEqual([3, 0], end_glyph_indices.tolist())
+
+    def test_unknown_characters_use_the_fallback_glyph(self):
+        # Act
+        _, glyph_indices = self.font.layout('1x')
+
+        # Assert
+        self.assertEqual([1, 2], glyph_indices.tolist())
+
+    def test_changed_range(self):
+        # Act & Assert
+        self.assertIsNone(self.font.changed_range('100', '100'))
+        self.assertEqual((2, 3), self.font.changed_range('100', '101'))
+        self.assertEqual((0, 2), self.font.changed_range('10i', '01i'))
+        self.assertEqual((1, 3), self.font.changed_range('1i0', '100'))
+        self.assertEqual((3, 4), self.font.changed_range('100', '1001'))
+        self.assertEqual((1, 3), self.font.changed_range('100', '1'))
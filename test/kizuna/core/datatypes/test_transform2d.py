@@ -0,0 +1,65 @@
+import unittest
+
+from kizuna.core.datatypes import Transform2D, Vector2
+
+
+class Transform2DTests(unittest.TestCase):
+
+    def assertVectorAlmostEqual(self, expected, actual):
+        for expected_component, component in zip(expected, actual):
+            self.assertAlmostEqual(expected_component, component)
+
+    def test_from_components_scales_then_rotates_then_translates(self):
+        # Arrange
+        transform = Transform2D.from_components((10, 20), 90.0, (2, 1))
+
+        # Act
+        point = transform.apply((1, 0))
+
+        # Assert
+        self.assertIsInstance(point, Vector2)
+        self.assertVectorAlmostEqual((10.0, 22.0), point)
+        self.assertAlmostEqual(90.0, transform.rotation)
+
+    def test_composition_applies_the_right_transform_first(self):
+        # Arrange
+        parent = Transform2D.from_components((100, 0), 90.0)
+        child = Transform2D.from_components((10, 0))
+
+        # Act
+        world = parent @ child
+
+        # Assert
+        self.assertVectorAlmostEqual((100.0, 10.0), world.translation)
+        self.assertVectorAlmostEqual(parent @ (child @ (3, 4)), world @ (3, 4))
+
+    def test_inverse_undoes_the_transform(self):
+        # Arrange
+        transform = Transform2D.from_components((5, -3), 30.0, (2, 0.5))
+
+        # Act
+        identity = transform.inverse() @ transform
+
+        # Assert
+        for expected, coefficient in zip(Transform2D(), identity):
+            self.assertAlmostEqual(expected, coefficient)
+
+    def test_inverse_of_a_singular_transform_raises_value_error(self):
+        # Arrange
+        transform = Transform2D.from_components(scale=(0, 1))
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            transform.inverse()
+
+    def test_transform2d_eq_with_tuples(self):
+        # Arrange
+        transform = Transform2D(1, 0, 0, 1, 5, 6)
+
+        # Act
+        equals_tuple = transform == (1, 0, 0, 1, 5, 6)
+        equals_vector = transform == Vector2(5, 6)
+
+        # Assert
+        self.assertTrue(equals_tuple)
+        self.assertFalse(equals_vector)
@@ -0,0 +1,101 @@
+import asyncio
+import time
+import unittest
+
+from kizuna.core.async_runtime import AsyncRuntime
+
+
+class AsyncRuntimeTests(unittest.TestCase):
+
+    def setUp(self):
+        self.runtime = AsyncRuntime()
+
+    def tearDown(self):
+        self.runtime.shutdown()
+
+    def test_tasks_progress_while_the_runtime_is_driven(self):
+        # Arrange
+        progress = []
+
+        async def work():
+            for i in range(3):
+                progress.append(i)
+                await asyncio.sleep(0)
+
+        task = self.runtime.spawn(work())
+
+        # Act
+        self.runtime.run_for(1.0)
+
+        # Assert
+        self.assertEqual([0, 1, 2], progress)
+        self.assertTrue(task.done())
+        self.assertEqual(0, self.runtime.pending_tasks)
+
+    def test_run_until_stops_at_the_deadline(self):
+        # Arrange
+        async def busy():
+            while True:
+                time.sleep(0.002)
+                await asyncio.sleep(0)
+
+        self.runtime.spawn(busy())
+
+        # Act
+        start = time.perf_counter()
+        self.runtime.run_for(0.01)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(elapsed, 0.05)
+        self.assertEqual(1, self.runtime.pending_tasks)
+
+    def test_run_until_returns_when_tasks_are_only_waiting(self):
+        # Arrange
+        self.runtime.spawn(asyncio.sleep(60))
+
+        # Act
+        start = time.perf_counter()
+        self.runtime.run_for(1.0)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(1, self.runtime.pending_tasks)
+
+    def test_spawned_task_exceptions_are_logged(self):
+        # Arrange
+        async def fail():
+            raise RuntimeError('failed')
+
+        self.runtime.spawn(fail())
+
+        # Act / Assert
+        with self.assertLogs('kizuna.core.async_runtime', 'ERROR'):
+            self.runtime.run_for(0.1)
+
+    def test_spawned_task_exceptions_are_not_logged_when_disabled(self):
+        # Arrange
+        async def fail():
+            raise RuntimeError('failed')
+
+        task = self.runtime.spawn(fail(), log_exceptions=False)
+
+        # Act
+        with self.assertNoLogs('kizuna.core.async_runtime'):
+            self.runtime.run_for(0.1)
+
+        # Assert
+        self.assertIsInstance(task.exception(), RuntimeError)
+        self.assertEqual(0, self.runtime.pending_tasks)
+
+    def test_shutdown_cancels_pending_tasks(self):
+        # Arrange
+        task = self.runtime.spawn(asyncio.sleep(60))
+        self.runtime.run_for(0.0)
+
+        # Act
+        self.runtime.shutdown()
+
+        # Assert
+        self.assertTrue(task.cancelled())
@@ -0,0 +1,99 @@
+import threading
+import time
+import unittest
+
+from kizuna.core.jobs import JobPools
+
+
+def fail():
+    raise ValueError('Job failed.')
+
+
+class JobPoolsTests(unittest.TestCase):
+
+    def setUp(self):
+        self.pools = JobPools(thread_workers=1, process_workers=1)
+
+    def tearDown(self):
+        self.pools.shutdown()
+
+    def deliver_all(self):
+        while self.pools.pending_jobs > 0:
+            self.pools.deliver_results()
+
+    def test_callbacks_are_called_only_when_results_are_delivered(self):
+        # Arrange
+        results = []
+        job = self.pools.submit(sum, (1, 2, 3), callback=results.append)
+        job.future.exception()
+
+        # Act
+        before = list(results)
+        self.deliver_all()
+
+        # Assert
+        self.assertEqual([], before)
+        self.assertEqual([6], results)
+
+    def test_exceptions_go_to_error_callback(self):
+        # Arrange
+        errors = []
+        self.pools.submit(fail, error_callback=errors.append)
+
+        # Act
+        self.deliver_all()
+
+        # Assert
+        self.assertIsInstance(errors[0], ValueError)
+        self.assertEqual(1, self.pools.get_statistics()['thread'].failed)
+
+    def test_exceptions_without_error_callback_are_raised(self):
+        # Arrange
+        self.pools.submit(fail)
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            self.deliver_all()
+
+    def test_statistics_report_queue_depth(self):
+        # Arrange
+        release = threading.Event()
+        self.pools.submit(release.wait)
+        self.pools.submit(release.wait)
+
+        # Act
+        statistics = self.pools.get_statistics()['thread']
+        running, queue_depth = statistics.running, statistics.queue_depth
+        release.set()
+
+        # Assert
+        self.assertEqual((1, 1), (running, queue_depth))
+        self.assertEqual(2, statistics.submitted)
+
+    def test_shutdown_does_not_wait_for_running_jobs_past_the_timeout(self):
+        # Arrange
+        release = threading.Event()
+        self.pools.submit(release.wait)
+        self.addCleanup(release.set)
+
+        # Act
+        start = time.perf_counter()
+        with self.assertLogs('kizuna.core.jobs', 'WARNING'):
+            self.pools.shutdown(timeout=0.05)
+        elapsed = time.perf_counter() - start
+
+        # Assert
+        self.assertLess(elapsed, 0.5)
+        self.assertEqual(0, self.pools.pending_jobs)
+
+    def test_process_jobs_deliver_results(self):
+        # Arrange
+        results = []
+        self.pools.submit(pow, 2, 10, callback=results.append, process=True)
+
+        # Act
+        self.deliver_all()
+
+        # Assert
+        self.assertEqual([1024], results)
+        self.assertEqual(1, self.pools.get_statistics()['process'].completed)
@@ -0,0 +1,71 @@
+import unittest
+
+from kizuna.core.quality import QualityGovernor
+
+
+class QualityGovernorTests(unittest.TestCase):
+
+    def setUp(self):
+        # A budget of 10 ms per frame, averaged over 4 frames.
+        self.governor = QualityGovernor(frames_per_second=100.0, window_size=4)
+        self.events = []
+        for name, order in (('animations', 1), ('particles', 0)):
+            self.governor.register(
+                name,
+                degrade=lambda name=name: self.events.append(f'degrade {name}'),
+                restore=lambda name=name: self.events.append(f'restore {name}'),
+                order=order,
+            )
+
+    def run_frames(self, count: int, frame_time: float):
+        for _ in range(count):
+            self.governor.add_work(frame_time / 2)
+            self.governor.end_frame(frame_time / 2)
+
+    def test_steps_are_degraded_in_order_while_over_budget(self):
+        # Act
+        self.run_frames(12, 0.015)
+
+        # Assert
+        self.assertEqual(['degrade particles', 'degrade animations'], self.events)
+        self.assertEqual(2, self.governor.level)
+
+    def test_quality_is_kept_between_the_thresholds(self):
+        # Arrange
+        self.run_frames(4, 0.015)
+
+        # Act
+        self.run_frames(40, 0.008)
+
+        # Assert
+        self.assertEqual(['degrade particles'], self.events)
+
+    def test_last_degraded_step_is_restored_first_when_there_is_headroom(self):
+        # Arrange
+        self.run_frames(8, 0.015)
+
+        # Act
+        self.run_frames(4, 0.002)
+
+        # Assert
+        self.assertEqual(['degrade particles', 'degrade animations', 'restore animations'], self.events)
+
+    def test_skipped_frames_are_not_measured(self):
+        # Act
+        for _ in range(8):
+            self.governor.add_work(0.015)
+            self.governor.skip_frame()
+        self.run_frames(4, 0.008)
+
+        # Assert
+        self.assertEqual([], self.events)
+
+    def test_a_decision_waits_for_a_full_window_after_a_change(self):
+        # Arrange
+        self.run_frames(4, 0.015)
+
+        # Act
+        self.run_frames(3, 0.015)
+
+        # Assert
+        self.assertEqual(1, self.governor.level)
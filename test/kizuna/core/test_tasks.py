@@ -0,0 +1,122 @@
+import time
+import unittest
+
+from kizuna.core.tasks import NEXT_STEP, TaskScheduler
+
+
+def count_to(progress: list[int], n: int, pause: object = None):
+    for i in range(n):
+        progress.append(i)
+        yield pause
+    return n
+
+
+class TaskSchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = TaskScheduler()
+
+    def test_tasks_run_until_finished_within_budget(self):
+        # Arrange
+        progress = []
+        results = []
+        self.scheduler.spawn(count_to(progress, 5), callback=results.append)
+
+        # Act
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual([0, 1, 2, 3, 4], progress)
+        self.assertEqual([5], results)
+        self.assertEqual(0, self.scheduler.pending_tasks)
+
+    def test_next_step_pauses_until_the_next_run(self):
+        # Arrange
+        progress = []
+        self.scheduler.spawn(count_to(progress, 5, NEXT_STEP))
+
+        # Act
+        self.scheduler.run_for(1.0)
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual([0, 1], progress)
+
+    def test_higher_priority_tasks_run_first(self):
+        # Arrange
+        progress = []
+        self.scheduler.spawn(count_to(progress, 1, NEXT_STEP), priority=0, name='low')
+        self.scheduler.spawn((progress.append('high') for _ in range(1)), priority=5)
+
+        # Act
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual(['high', 0], progress)
+
+    def test_budget_spent_pauses_remaining_work_and_reports_overrun(self):
+        # Arrange
+        def slow():
+            while True:
+                time.sleep(0.005)
+                yield
+
+        self.scheduler.spawn(slow())
+
+        # Act
+        self.scheduler.run_for(0.001)
+
+        # Assert
+        self.assertEqual(1, self.scheduler.statistics.slices)
+        self.assertEqual(1, self.scheduler.statistics.overruns)
+        self.assertEqual(1, self.scheduler.pending_tasks)
+
+    def test_cancelled_tasks_do_not_run(self):
+        # Arrange
+        progress = []
+        task = self.scheduler.spawn(count_to(progress, 5))
+
+        # Act
+        task.cancel()
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual([], progress)
+        self.assertEqual(0, self.scheduler.pending_tasks)
+
+    def test_tasks_with_the_same_priority_take_one_slice_per_turn(self):
+        # Arrange
+        progress = []
+        self.scheduler.spawn((progress.append(('a', i)) for i in range(3)))
+        self.scheduler.spawn((progress.append(('b', i)) for i in range(3)))
+
+        # Act
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual([('a', 0), ('b', 0), ('a', 1), ('b', 1), ('a', 2), ('b', 2)], progress)
+
+    def test_task_can_cancel_itself(self):
+        # Arrange
+        progress = []
+        results = []
+
+        def cancel_self():
+            try:
+                progress.append('cancelling')
+                task.cancel()
+                yield
+                progress.append('resumed')
+            finally:
+                progress.append('closed')
+
+        task = self.scheduler.spawn(cancel_self(), callback=results.append)
+
+        # Act
+        self.scheduler.run_for(1.0)
+
+        # Assert
+        self.assertEqual(['cancelling', 'closed'], progress)
+        self.assertEqual([], results)
+        self.assertTrue(task.is_cancelled)
+        self.assertEqual(0, self.scheduler.pending_tasks)
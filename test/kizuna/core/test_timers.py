@@ -0,0 +1,166 @@
+import gc
+import unittest
+import weakref
+
+from kizuna.core.datatypes import Vector2
+from kizuna.core.timers import TimerService
+
+
+class TimerServiceTests(unittest.TestCase):
+
+    def setUp(self):
+        self.service = TimerService(tween_capacity=2)
+
+    def test_timers_fire_in_order_once_due(self):
+        # Arrange
+        fired = []
+        self.service.schedule(0.3, lambda: fired.append('late'))
+        self.service.schedule(0.1, lambda: fired.append('early'))
+        self.service.schedule(0.1, lambda: fired.append('early too'))
+
+        # Act
+        self.service.advance(0.05)
+        fired_before = list(fired)
+        self.service.advance(0.3)
+
+        # Assert
+        self.assertEqual([], fired_before)
+        self.assertEqual(['early', 'early too', 'late'], fired)
+        self.assertEqual(0, self.service.pending_timers)
+
+    def test_repeating_timers_fire_at_each_interval(self):
+        # Arrange
+        fired = []
+        timer = self.service.schedule(0.1, lambda: fired.append(self.service.time), interval=0.1)
+
+        # Act
+        for _ in range(5):
+            self.service.advance(0.1)
+        timer.cancel()
+        self.service.advance(0.1)
+
+        # Assert
+        self.assertEqual(5, len(fired))
+        self.assertEqual(0, self.service.pending_timers)
+
+    def test_cancelled_timers_do_not_fire(self):
+        # Arrange
+        fired = []
+        timer = self.service.schedule(0.1, lambda: fired.append(1))
+        self.service.schedule(0.2, lambda: fired.append(2))
+
+        # Act
+        timer.cancel()
+        pending = self.service.pending_timers
+        self.service.advance(1.0)
+
+        # Assert
+        self.assertEqual(1, pending)
+        self.assertEqual([2], fired)
+        self.assertTrue(timer.is_cancelled)
+
+    def test_cancelled_timers_release_their_callback(self):
+        # Arrange
+        class Target:
+            def on_timer(self):
+                pass
+
+        target = Target()
+        reference = weakref.ref(target)
+        timer = self.service.schedule(10.0, target.on_timer)
+
+        # Act
+        timer.cancel()
+        del target
+        gc.collect()
+
+        # Assert
+        self.assertIsNone(reference())
+        self.assertEqual(0, self.service.pending_timers)
+
+    def test_timers_scheduled_while_firing_wait_for_the_next_advance(self):
+        # Arrange
+        fired = []
+
+        def reschedule():
+            fired.append(self.service.time)
+            self.service.schedule(0.0, reschedule)
+
+        self.service.schedule(0.0, reschedule)
+
+        # Act
+        self.service.advance(0.1)
+        fired_first = len(fired)
+        self.service.advance(0.1)
+
+        # Assert
+        self.assertEqual(1, fired_first)
+        self.assertEqual(2, len(fired))
+        self.assertEqual(1, self.service.pending_timers)
+
+    def test_repeating_timers_catch_up_within_a_long_advance(self):
+        # Arrange
+        fired = []
+        self.service.schedule(0.1, lambda: fired.append(1), interval=0.1)
+
+        # Act
+        self.service.advance(0.35)
+
+        # Assert
+        self.assertEqual(3, len(fired))
+
+    def test_negative_delay_raises(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            self.service.schedule(-0.1, lambda: None)
+
+    def test_tweens_interpolate_and_complete(self):
+        # Arrange
+        updates = []
+        completed = []
+        number = self.service.tween(0.0, 10.0, 1.0, on_update=updates.append, on_complete=lambda: completed.append(1))
+        vector = self.service.tween((0, 0), (4, -2), 2.0)
+
+        # Act
+        self.service.advance(0.5)
+        halfway = number.value, vector.value
+        self.service.advance(0.5)
+
+        # Assert
+        self.assertEqual((5.0, Vector2(1.0, -0.5)), halfway)
+        self.assertEqual([5.0, 10.0], updates)
+        self.assertEqual([1], completed)
+        self.assertTrue(number.is_done)
+        self.assertEqual(Vector2(2.0, -1.0), vector.value)
+        self.assertEqual(1, self.service.active_tweens)
+
+    def test_tweens_apply_their_easing(self):
+        # Arrange
+        tween = self.service.tween(0.0, 1.0, 1.0, easing='in_quad')
+
+        # Act
+        self.service.advance(0.5)
+
+        # Assert
+        self.assertAlmostEqual(0.25, tween.value)
+
+    def test_cancelled_tweens_stop_without_completing(self):
+        # Arrange
+        completed = []
+        tweens = [self.service.tween(0.0, float(i), 1.0, on_complete=lambda: completed.append(1)) for i in range(5)]
+
+        # Act
+        tweens[1].cancel()
+        self.service.advance(0.5)
+        values = [tween.value for tween in tweens]
+        self.service.advance(0.5)
+
+        # Assert
+        self.assertEqual([0.0, 1.0, 1.0, 1.5, 2.0], values)
+        self.assertEqual(4, len(completed))
+        self.assertEqual(0, self.service.active_tweens)
+
+    def test_unknown_easing_raises(self):
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            self.service.tween(0.0, 1.0, 1.0, easing='bounce')
@@ -0,0 +1,94 @@
+"""Fixtures shared by the tests of the systems that draw through the backend.
+"""
+
+import unittest
+
+from kizuna.backends import Backend
+from kizuna.config import settings
+from kizuna.core.datatypes import IVector2, Vector2
+
+
+class RecordingBackend(Backend):
+    """Backend that draws nothing, and records what it is asked to prepare, draw and destroy.
+    """
+
+    def __init__(self, image_size: IVector2 = IVector2(32, 32)):
+        super().__init__(settings)
+        self.image_size = image_size
+        self.drawn_batches = []
+        self.prepared_sprites = []
+        self.destroyed_sprites = []
+        self.prepared_texts = []
+        self.destroyed_texts = []
+        self.prepared_particle_counts = []
+        self.built_chunks = []
+        self.hidden_chunks = []
+        self.revisions = {}
+        self.redraw_requests = 0
+
+    def load_image_asset(self, asset):
+        pass
+
+    def load_font_asset(self, asset):
+        pass
+
+    def get_image_size(self, asset):
+        return self.image_size
+
+    def measure_text(self, text, font):
+        return Vector2(10 * len(text), 20)
+
+    def prepare_draw_text(self, drawable, batch):
+        self.prepared_texts.append(drawable.text)
+
+    def prepare_draw_sprite(self, drawable, batch):
+        self.prepared_sprites.append(drawable)
+
+    def prepare_draw_tile_chunk(self, drawable, batch):
+        if drawable.culled:
+            self.hidden_chunks.append(drawable)
+            self.revisions.pop(drawable, None)
+        elif self.revisions.get(drawable) != drawable.revision:
+            self.built_chunks.append(drawable)
+            self.revisions[drawable] = drawable.revision
+
+    def prepare_draw_particles(self, drawable, batch):
+        self.prepared_particle_counts.append(0 if drawable.culled else drawable.count)
+
+    def set_view_offset(self, offset):
+        pass
+
+    def draw_batch(self, batch):
+        self.drawn_batches.append(batch)
+
+    def destroy_text(self, drawable):
+        self.destroyed_texts.append(drawable)
+
+    def destroy_sprite(self, drawable):
+        self.destroyed_sprites.append(drawable)
+
+    def destroy_tile_chunk(self, drawable):
+        self.revisions.pop(drawable, None)
+
+    def destroy_particles(self, drawable):
+        pass
+
+    def request_redraw(self):
+        self.redraw_requests += 1
+
+
+class BackendTestCase(unittest.TestCase):
+    """Test case that installs a :class:`RecordingBackend` and the settings the systems read while drawing.
+
+    :cvar image_size: The size the backend reports for every image.
+    """
+    image_size: IVector2 = IVector2(32, 32)
+
+    def setUp(self):
+        self.backend = RecordingBackend(self.image_size)
+        settings._backend = self.backend
+        settings._settings = {'WINDOW_SIZE': IVector2(640, 480), 'STAGE2D_CULLING_CELL_SIZE': 256.0}
+
+    def tearDown(self):
+        settings._backend = None
+        settings._settings = {}
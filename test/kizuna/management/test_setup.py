@@ -0,0 +1,133 @@
+import asyncio
+import unittest
+
+from kizuna.core.async_runtime import async_runtime
+from kizuna.core.controllers import Controller
+from kizuna.management.exceptions import ControllerScheduleError
+from kizuna.management.setup import ControllerScheduler
+
+
+class RecordingController(Controller):
+
+    def __init__(self):
+        self.steps = []
+        self.draws = 0
+
+    def on_step(self, dt: float):
+        self.steps.append(dt)
+
+    def on_draw(self):
+        self.draws += 1
+
+
+class SlowController(RecordingController):
+    step_rate = 10
+
+
+class IdleController(Controller):
+    pass
+
+
+class ControllerSchedulerTests(unittest.TestCase):
+
+    def test_controllers_without_step_rate_step_every_step(self):
+        # Arrange
+        controller = RecordingController()
+        scheduler = ControllerScheduler([controller], 60)
+
+        # Act
+        for _ in range(3):
+            scheduler.step(0.5)
+
+        # Assert
+        self.assertEqual([0.5, 0.5, 0.5], controller.steps)
+
+    def test_controllers_with_step_rate_receive_accumulated_time(self):
+        # Arrange
+        controller = SlowController()
+        scheduler = ControllerScheduler([controller], 60)
+
+        # Act
+        for _ in range(12):
+            scheduler.step(0.25)
+
+        # Assert
+        self.assertEqual([0.25, 1.5], controller.steps)
+
+    def test_interval_scale_slows_down_only_low_rate_controllers(self):
+        # Arrange
+        slow, fast = SlowController(), RecordingController()
+        scheduler = ControllerScheduler([slow, fast], 60)
+
+        # Act
+        scheduler.set_interval_scale(2)
+        for _ in range(24):
+            scheduler.step(0.5)
+
+        # Assert
+        self.assertEqual([0.5, 6.0], slow.steps)
+        self.assertEqual(24, len(fast.steps))
+
+    def test_controllers_not_overriding_methods_are_skipped(self):
+        # Arrange
+        scheduler = ControllerScheduler([IdleController(), RecordingController()], 60)
+
+        # Assert
+        self.assertEqual(1, len(scheduler.stepped))
+        self.assertEqual(1, len(scheduler.drawn))
+
+    def test_low_rate_controllers_are_spread_across_steps(self):
+        # Arrange
+        controllers = [SlowController() for _ in range(6)]
+
+        # Act
+        scheduler = ControllerScheduler(controllers, 60)
+
+        # Assert
+        self.assertEqual([0, 1, 2, 3, 4, 5], sorted(scheduled.offset for scheduled in scheduler.stepped))
+
+    def test_step_phase_sets_offset(self):
+        # Arrange
+        class PhasedController(SlowController):
+            step_phase = 0.5
+
+        # Act
+        scheduler = ControllerScheduler([PhasedController()], 60)
+
+        # Assert
+        self.assertEqual(3, scheduler.stepped[0].offset)
+
+    def test_invalid_step_phase_raises(self):
+        # Arrange
+        class InvalidController(SlowController):
+            step_phase = 1.0
+
+        # Act / Assert
+        with self.assertRaises(ControllerScheduleError):
+            ControllerScheduler([InvalidController()], 60)
+
+    def test_async_on_step_skips_steps_until_previous_call_finishes(self):
+        # Arrange
+        class AsyncController(Controller):
+            def __init__(self):
+                self.steps = []
+                self.release = asyncio.Event()
+
+            async def on_step(self, dt: float):
+                self.steps.append(dt)
+                await self.release.wait()
+
+        controller = AsyncController()
+        scheduler = ControllerScheduler([controller], 60)
+
+        # Act
+        for _ in range(3):
+            scheduler.step(0.5)
+            async_runtime.run_for(0.1)
+        controller.release.set()
+        async_runtime.run_for(0.1)
+        scheduler.step(0.5)
+        async_runtime.run_for(0.1)
+
+        # Assert
+        self.assertEqual([0.5, 1.5], controller.steps)
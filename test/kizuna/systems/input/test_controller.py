@@ -0,0 +1,67 @@
+import unittest
+
+from kizuna.core.datatypes import Vector2
+from kizuna.systems.input import InputController, Key, MouseButton
+
+
+class InputControllerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.controller = InputController()
+
+    def test_events_are_applied_at_the_start_of_the_step(self):
+        # Arrange
+        self.controller.press_key(Key.SPACE)
+
+        # Act
+        held_before = self.controller.is_key_held(Key.SPACE)
+        self.controller.on_step(0.1)
+
+        # Assert
+        self.assertFalse(held_before)
+        self.assertTrue(self.controller.is_key_held(Key.SPACE))
+        self.assertTrue(self.controller.is_key_pressed(Key.SPACE))
+        self.assertFalse(self.controller.is_key_released(Key.SPACE))
+
+    def test_taps_between_steps_are_not_lost(self):
+        # Arrange
+        self.controller.press_key(Key.A)
+        self.controller.release_key(Key.A)
+
+        # Act
+        self.controller.on_step(0.1)
+
+        # Assert
+        self.assertTrue(self.controller.is_key_pressed(Key.A))
+        self.assertTrue(self.controller.is_key_released(Key.A))
+        self.assertFalse(self.controller.is_key_held(Key.A))
+        self.assertEqual(2, len(self.controller.events))
+
+    def test_edges_only_last_one_step(self):
+        # Arrange
+        self.controller.press_mouse_button(MouseButton.LEFT, Vector2(10, 20))
+        self.controller.on_step(0.1)
+
+        # Act
+        self.controller.on_step(0.1)
+
+        # Assert
+        self.assertTrue(self.controller.is_mouse_button_held(MouseButton.LEFT))
+        self.assertFalse(self.controller.is_mouse_button_pressed(MouseButton.LEFT))
+        self.assertEqual([], self.controller.events)
+
+    def test_mouse_motion_is_coalesced(self):
+        # Arrange
+        self.controller.move_mouse(Vector2(1, 1))
+        self.controller.move_mouse(Vector2(2, 2))
+        self.controller.press_mouse_button(MouseButton.RIGHT, Vector2(3, 3))
+        self.controller.move_mouse(Vector2(4, 4))
+        self.controller.move_mouse(Vector2(5, 6))
+
+        # Act
+        self.controller.on_step(0.1)
+
+        # Assert
+        self.assertEqual(3, len(self.controller.events))
+        self.assertEqual(Vector2(5, 6), self.controller.mouse_position)
+        self.assertEqual(Vector2(5, 6), self.controller.mouse_motion)
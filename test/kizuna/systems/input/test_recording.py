@@ -0,0 +1,86 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from kizuna.core.datatypes import Vector2
+from kizuna.systems.input import InputController, InputEventType, InputRecording, Key, MouseButton
+
+
+class InputRecordingTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name) / 'input.kzir'
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record_session(self) -> InputController:
+        controller = InputController()
+        controller.start_recording(self.path, 60.0)
+        controller.on_step(0.01)
+        controller.press_key(Key.SPACE)
+        controller.move_mouse(Vector2(4, 5))
+        controller.on_step(0.02)
+        controller.on_step(0.03)
+        controller.release_key(Key.SPACE)
+        controller.press_mouse_button(MouseButton.LEFT, Vector2(6, 7))
+        controller.on_step(0.04)
+        controller.stop_recording()
+        return controller
+
+    def test_recordings_keep_events_and_their_steps(self):
+        # Arrange
+        self.record_session()
+
+        # Act
+        recording = InputRecording.load(self.path)
+
+        # Assert
+        self.assertEqual(60.0, recording.steps_per_second)
+        self.assertEqual(4, recording.step_count)
+        self.assertEqual([0.01, 0.02, 0.03, 0.04], recording.step_dts)
+        self.assertEqual(
+            [
+                (1, InputEventType.KEY_PRESS, Key.SPACE, None),
+                (1, InputEventType.MOUSE_MOTION, 0, Vector2(4, 5)),
+                (3, InputEventType.KEY_RELEASE, Key.SPACE, None),
+                (3, InputEventType.MOUSE_PRESS, MouseButton.LEFT, Vector2(6, 7)),
+            ],
+            [(step, event.type, event.code, event.position) for step, event in recording.events],
+        )
+
+    def test_replays_process_events_at_the_recorded_steps(self):
+        # Arrange
+        self.record_session()
+        controller = InputController()
+        controller.start_replay(InputRecording.load(self.path))
+        pressed_at = []
+
+        # Act
+        for step in range(4):
+            controller.on_step(1 / 60)
+            if controller.is_key_pressed(Key.SPACE) or controller.is_mouse_button_pressed(MouseButton.LEFT):
+                pressed_at.append(step)
+
+        # Assert
+        self.assertEqual([1, 3], pressed_at)
+        self.assertFalse(controller.is_key_held(Key.SPACE))
+        self.assertEqual(Vector2(6, 7), controller.mouse_position)
+
+    def test_invalid_files_raise(self):
+        # Arrange
+        self.path.write_bytes(b'not a recording')
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            InputRecording.load(self.path)
+
+    def test_truncated_files_raise(self):
+        # Arrange
+        self.record_session()
+        self.path.write_bytes(self.path.read_bytes()[:-1])
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            InputRecording.load(self.path)
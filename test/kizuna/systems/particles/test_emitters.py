@@ -0,0 +1,127 @@
+from kizuna.core.assets import ImageAsset
+from kizuna.core.datatypes import IVector2
+from kizuna.systems.particles import ParticleEmitter
+from kizuna.systems.stage2d import Entity2D, Stage2DController
+
+from test.kizuna.helpers import BackendTestCase
+
+
+PARTICLE = ImageAsset('/particle.png')
+
+
+class ParticleEmitterTests(BackendTestCase):
+    image_size = IVector2(4, 4)
+
+    def setUp(self):
+        super().setUp()
+        self.controller = Stage2DController()
+
+    def test_emit_spawns_particles_up_to_capacity(self):
+        # Arrange
+        emitter = ParticleEmitter(self.controller, PARTICLE, capacity=100)
+
+        # Act
+        emitter.emit(60)
+        emitter.emit(60)
+
+        # Assert
+        self.assertEqual(100, emitter.count)
+
+    def test_step_spawns_particles_at_rate(self):
+        # Arrange
+        emitter = ParticleEmitter(self.controller, PARTICLE, rate=30.0, lifetime=10.0, seed=0)
+
+        # Act
+        for _ in range(60):
+            self.controller.on_step(1 / 60)
+
+        # Assert
+        self.assertEqual(30, emitter.count)
+
+    def test_step_expires_particles(self):
+        # Arrange
+        emitter = ParticleEmitter(self.controller, PARTICLE, lifetime=(0.5, 2.0), seed=0)
+        emitter.emit(1000)
+
+        # Act
+        self.controller.on_step(1.0)
+
+        # Assert
+        self.assertLess(emitter.count, 1000)
+        self.assertTrue((emitter._ages[:emitter.count] < emitter._lifetimes[:emitter.count]).all())
+        self.controller.on_step(1.0)
+        self.assertEqual(0, emitter.count)
+
+    def test_step_moves_particles(self):
+        # Arrange
+        emitter = ParticleEmitter(
+            self.controller, PARTICLE, position=(100, 100), speed=50.0, direction=0.0, acceleration=(0, -10),
+        )
+        emitter.emit(1)
+
+        # Act
+        self.controller.on_step(1.0)
+
+        # Assert
+        x, y = emitter._positions[0]
+        self.assertAlmostEqual(150.0, x, places=4)
+        self.assertAlmostEqual(90.0, y, places=4)
+
+    def test_step_fades_colors(self):
+        # Arrange
+        emitter = ParticleEmitter(
+            self.controller, PARTICLE, lifetime=2.0, color_start=(255, 0, 0, 255), color_end=(0, 0, 255, 55),
+        )
+        emitter.emit(1)
+
+        # Act
+        self.controller.on_step(1.0)
+
+        # Assert
+        self.assertEqual([127, 0, 127, 155], emitter._colors[0].tolist())
+
+    def test_attached_emitter_follows_entity_and_is_destroyed_with_it(self):
+        # Arrange
+        entity = Entity2D(self.controller, (10, 20))
+        emitter = ParticleEmitter(self.controller, PARTICLE, rate=10.0, lifetime=0.5)
+        emitter.attach(entity, (5, 0))
+
+        # Act
+        entity.position = (30, 40)
+        self.controller.on_step(0.1)
+        position = emitter.position
+        entity.destroy()
+        for _ in range(10):
+            self.controller.on_step(0.1)
+
+        # Assert
+        self.assertEqual((35, 40), position)
+        self.assertFalse(emitter.is_alive)
+
+    def test_emitter_attached_to_a_child_entity_follows_its_world_transform(self):
+        # Arrange
+        parent = Entity2D(self.controller, (100, 0))
+        child = Entity2D(self.controller, (10, 0))
+        child.attach_to(parent)
+        emitter = ParticleEmitter(self.controller, PARTICLE)
+        emitter.attach(child, (5, 0))
+
+        # Act
+        parent.rotation = 90.0
+        self.controller.on_step(0.1)
+
+        # Assert
+        x, y = emitter.position
+        self.assertAlmostEqual(100.0, x, places=4)
+        self.assertAlmostEqual(15.0, y, places=4)
+
+    def test_particles_out_of_view_are_culled(self):
+        # Arrange
+        emitter = ParticleEmitter(self.controller, PARTICLE, position=(5000, 5000), speed=0.0)
+        emitter.emit(10)
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([0], self.backend.prepared_particle_counts)
@@ -0,0 +1,349 @@
+import gc
+import weakref
+
+from kizuna.core.assets import ImageAsset
+from kizuna.core.datatypes import Vector2
+from kizuna.core.timers import timer_service
+from kizuna.rendering import DrawBatch
+from kizuna.systems.stage2d import Entity2D, Stage2DController
+from kizuna.systems.stage2d.components import SpriteComponent
+
+from test.kizuna.helpers import BackendTestCase
+
+
+ASSET = ImageAsset('/sprite.png')
+BACKGROUND = DrawBatch(priority=10)
+FOREGROUND = DrawBatch(priority=0)
+
+
+class Background(Entity2D):
+    sprites = [SpriteComponent(ASSET, BACKGROUND)]
+
+
+class Foreground(Entity2D):
+    sprites = [SpriteComponent(ASSET, FOREGROUND)]
+
+
+class Turret(Entity2D):
+    sprites = [SpriteComponent(ASSET, FOREGROUND, Vector2(10.0, 0.0), 45.0)]
+    rotate_sprite_offsets = True
+
+
+class Shadow(Entity2D):
+    sprites = [SpriteComponent(ASSET, BACKGROUND, Vector2(10.0, 0.0))]
+
+
+class Stage2DControllerTests(BackendTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.controller = Stage2DController()
+
+    def tearDown(self):
+        timer_service.clear()
+        super().tearDown()
+
+    def test_on_draw_draws_batches_by_descending_priority(self):
+        # Arrange
+        Foreground(self.controller, (0, 0))
+        Background(self.controller, (0, 0))
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([BACKGROUND, FOREGROUND], self.backend.drawn_batches)
+
+    def test_on_draw_draws_each_batch_once(self):
+        # Arrange
+        for _ in range(3):
+            Foreground(self.controller, (0, 0))
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([FOREGROUND], self.backend.drawn_batches)
+
+    def test_on_draw_skips_batches_of_destroyed_entities(self):
+        # Arrange
+        Foreground(self.controller, (0, 0))
+        background = Background(self.controller, (0, 0))
+        self.controller.on_draw()
+        self.backend.drawn_batches.clear()
+
+        # Act
+        background.destroy()
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([FOREGROUND], self.backend.drawn_batches)
+
+    def test_on_draw_resorts_batches_when_priority_changes(self):
+        # Arrange
+        Foreground(self.controller, (0, 0))
+        Background(self.controller, (0, 0))
+        self.controller.on_draw()
+        self.backend.drawn_batches.clear()
+
+        # Act
+        FOREGROUND.priority = 20
+        try:
+            self.controller.on_draw()
+        finally:
+            FOREGROUND.priority = 0
+
+        # Assert
+        self.assertEqual([FOREGROUND, BACKGROUND], self.backend.drawn_batches)
+
+    def test_on_draw_skips_entities_out_of_view(self):
+        # Arrange
+        in_view = Foreground(self.controller, (100, 100))
+        Foreground(self.controller, (2000, 100))
+        Foreground(self.controller, (100, -2000))
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([in_view.get_drawable(0)], self.backend.prepared_sprites)
+        self.assertEqual(1, self.controller.drawn_entity_count)
+        self.assertEqual(2, self.controller.culled_entity_count)
+
+    def test_on_draw_draws_entities_partially_in_view(self):
+        # Arrange
+        Foreground(self.controller, (-10, 240))
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual(1, self.controller.drawn_entity_count)
+
+    def test_on_draw_hides_entities_that_leave_the_view(self):
+        # Arrange
+        entity = Foreground(self.controller, (100, 100))
+        self.controller.on_draw()
+
+        # Act
+        entity.position = (5000, 5000)
+        self.controller.on_draw()
+
+        # Assert
+        self.assertTrue(entity.get_drawable(0).culled)
+        self.assertEqual(0, self.controller.drawn_entity_count)
+
+    def test_on_draw_follows_the_camera(self):
+        # Arrange
+        entity = Foreground(self.controller, (5000, 5000))
+
+        # Act
+        self.controller.camera.center_on((5000, 5000))
+        self.controller.on_draw()
+
+        # Assert
+        self.assertFalse(entity.get_drawable(0).culled)
+        self.assertEqual(1, self.controller.drawn_entity_count)
+
+    def test_on_draw_submits_the_sprites_of_each_batch_at_once(self):
+        # Arrange
+        submissions = []
+        self.backend.prepare_draw_sprites = lambda drawables, positions, rotations, batch: submissions.append(
+            (batch, len(drawables), list(positions), list(rotations))
+        )
+        Foreground(self.controller, (0, 0), 90.0)
+        Foreground(self.controller, (0, 0), 90.0)
+        Background(self.controller, (10, 20))
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertCountEqual([
+            (FOREGROUND, 2, [(0.0, 0.0), (0.0, 0.0)], [90.0, 90.0]),
+            (BACKGROUND, 1, [(10.0, 20.0)], [0.0]),
+        ], submissions)
+
+    def test_on_draw_places_attached_entities_relative_to_their_parent(self):
+        # Arrange
+        submissions = []
+        self.backend.prepare_draw_sprites = lambda drawables, positions, rotations, batch: submissions.extend(
+            zip(drawables, positions, rotations)
+        )
+        parent = Foreground(self.controller, (100, 100), 90.0)
+        child = Turret(self.controller, (20, 0))
+        child.attach_to(parent)
+        parent_sprite = parent.get_drawable(0)
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        _, position, rotation = next(submission for submission in submissions if submission[0] is not parent_sprite)
+        self.assertAlmostEqual(100.0, position.x)
+        self.assertAlmostEqual(130.0, position.y)
+        self.assertAlmostEqual(135.0, rotation)
+
+    def test_moving_a_parent_updates_its_descendants_once(self):
+        # Arrange
+        root = Foreground(self.controller, (0, 0))
+        middle = Foreground(self.controller, (10, 0))
+        leaf = Foreground(self.controller, (10, 0))
+        middle.attach_to(root)
+        leaf.attach_to(middle)
+        static = Foreground(self.controller, (50, 50))
+        self.controller.on_draw()
+        static_transform = static.world_transform
+        updated = []
+        original = self.controller._on_entity_transformed  # noqa
+        self.controller._on_entity_transformed = lambda entity: (updated.append(entity), original(entity))
+
+        # Act
+        leaf.position = (20, 0)
+        root.position = (100, 0)
+        root.position = (200, 0)
+        self.controller.on_draw()
+
+        # Assert
+        self.assertCountEqual([root, middle, leaf], updated)
+        self.assertEqual((230.0, 0.0), leaf.world_position)
+        self.assertIs(static_transform, static.world_transform)
+
+    def test_attach_to_keeps_the_world_transform_if_requested(self):
+        # Arrange
+        parent = Foreground(self.controller, (100, 0), 90.0)
+        child = Foreground(self.controller, (100, 50), 30.0)
+
+        # Act
+        child.attach_to(parent, keep_world_transform=True)
+
+        # Assert
+        self.assertAlmostEqual(50.0, child.position.x)
+        self.assertAlmostEqual(0.0, child.position.y)
+        self.assertAlmostEqual(-60.0, child.rotation)
+        self.assertAlmostEqual(100.0, child.world_position.x)
+        self.assertAlmostEqual(50.0, child.world_position.y)
+
+    def test_attach_to_a_descendant_raises_value_error(self):
+        # Arrange
+        parent = Foreground(self.controller, (0, 0))
+        child = Foreground(self.controller, (0, 0))
+        child.attach_to(parent)
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            parent.attach_to(child)
+
+    def test_destroying_a_parent_destroys_its_children(self):
+        # Arrange
+        parent = Foreground(self.controller, (0, 0))
+        child = Foreground(self.controller, (0, 0))
+        child.attach_to(parent)
+
+        # Act
+        parent.destroy()
+
+        # Assert
+        self.assertFalse(child.is_alive)
+        self.assertEqual(0, len(self.controller._entities))  # noqa
+
+    def test_sprite_offsets_do_not_turn_with_the_entity_by_default(self):
+        # Arrange
+        entity = Shadow(self.controller, (100, 100), 90.0)
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual((110.0, 100.0), entity.get_drawable(0).position)
+
+    def test_detaching_an_entity_whose_parent_moved_updates_it_before_drawing(self):
+        # Arrange
+        parent = Foreground(self.controller, (5000, 5000))
+        child = Foreground(self.controller, (0, 0))
+        child.attach_to(parent)
+        self.controller.on_draw()
+
+        # Act
+        parent.position = (6000, 6000)
+        child.attach_to(None, keep_world_transform=False)
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([child.get_drawable(0)], self.backend.prepared_sprites)
+        self.assertEqual((0.0, 0.0), child.get_drawable(0).position)
+
+    def test_moving_an_entity_in_a_timer_requests_a_redraw(self):
+        # Arrange
+        entity = Foreground(self.controller, (0, 0))
+        self.controller.on_draw()
+        entity.schedule_timer(0.5, lambda: setattr(entity, 'position', (50, 50)))
+        self.backend.redraw_requests = 0
+
+        # Act
+        timer_service.advance(1.0)
+
+        # Assert
+        self.assertGreater(self.backend.redraw_requests, 0)
+
+    def test_drawing_an_unchanged_stage_does_not_request_a_redraw(self):
+        # Arrange
+        Foreground(self.controller, (0, 0))
+        self.controller.on_draw()
+        self.backend.redraw_requests = 0
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual(0, self.backend.redraw_requests)
+
+    def test_destroyed_entities_release_their_drawables_and_controller_references(self):
+        # Arrange
+        entity = Foreground(self.controller, (0, 0))
+        child = Background(self.controller, (10, 0))
+        child.attach_to(entity)
+        entity.schedule_timer(10.0, entity.set_culled)
+        self.controller.on_draw()
+        drawables = [entity.get_drawable(0), child.get_drawable(0)]
+        entity_ref = weakref.ref(entity)
+        child_ref = weakref.ref(child)
+
+        # Act
+        entity.destroy()
+        del entity, child
+        self.controller.on_draw()
+        gc.collect()
+
+        # Assert
+        self.assertCountEqual(drawables, self.backend.destroyed_sprites)
+        self.assertIsNone(entity_ref())
+        self.assertIsNone(child_ref())
+
+    def test_moved_entities_are_queued_once_while_nothing_is_drawn(self):
+        # Arrange
+        entity = Foreground(self.controller, (0, 0))
+
+        # Act
+        for step in range(100):
+            entity.position = Vector2(step, 0.0)
+            _ = entity.world_position
+            self.controller.on_step(1 / 60)
+
+        # Assert
+        self.assertLessEqual(len(self.controller._dirty_transforms), 1)  # noqa
+
+    def test_destroyed_entities_are_released_while_nothing_is_drawn(self):
+        # Arrange
+        entity = Foreground(self.controller, (0, 0))
+        entity.position = Vector2(10.0, 0.0)
+        entity_ref = weakref.ref(entity)
+
+        # Act
+        entity.destroy()
+        del entity
+        self.controller.on_step(1 / 60)
+        gc.collect()
+
+        # Assert
+        self.assertIsNone(entity_ref())
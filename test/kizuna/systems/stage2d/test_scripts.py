@@ -0,0 +1,149 @@
+import unittest
+
+from kizuna.core.timers import TimerService
+from kizuna.systems.stage2d.scripts import ScriptScheduler, until, wait
+
+
+class ScriptSchedulerTests(unittest.TestCase):
+
+    def setUp(self):
+        self.timers = TimerService()
+        self.scheduler = ScriptScheduler(self.timers)
+
+    def advance(self, dt: float):
+        self.timers.advance(dt)
+        self.scheduler.step()
+
+    def test_scripts_run_until_their_first_yield_when_started(self):
+        # Arrange
+        progress = []
+
+        def script():
+            progress.append('start')
+            yield
+            progress.append('next step')
+
+        # Act
+        self.scheduler.start(script())
+        started = list(progress)
+        self.advance(0.1)
+
+        # Assert
+        self.assertEqual(['start'], started)
+        self.assertEqual(['start', 'next step'], progress)
+        self.assertEqual(0, self.scheduler.running_scripts)
+
+    def test_wait_resumes_after_game_time(self):
+        # Arrange
+        results = []
+
+        def script():
+            yield wait(0.25)
+            return self.timers.time
+
+        self.scheduler.start(script(), callback=results.append)
+
+        # Act
+        self.advance(0.1)
+        self.advance(0.1)
+        waiting = list(results)
+        self.advance(0.1)
+
+        # Assert
+        self.assertEqual([], waiting)
+        self.assertEqual(1, len(results))
+        self.assertAlmostEqual(0.3, results[0])
+
+    def test_wait_zero_resumes_once_per_step(self):
+        # Arrange
+        resumes = []
+
+        def script():
+            while True:
+                resumes.append(self.timers.time)
+                yield wait(0)
+
+        self.scheduler.start(script())
+
+        # Act
+        self.advance(0.1)
+        self.advance(0.1)
+
+        # Assert
+        self.assertEqual(3, len(resumes))
+
+    def test_until_resumes_once_the_condition_holds(self):
+        # Arrange
+        state = {'open': False}
+        progress = []
+
+        def script():
+            yield until(lambda: state['open'])
+            progress.append('opened')
+
+        self.scheduler.start(script())
+
+        # Act
+        self.advance(0.1)
+        closed = list(progress)
+        state['open'] = True
+        self.advance(0.1)
+
+        # Assert
+        self.assertEqual([], closed)
+        self.assertEqual(['opened'], progress)
+
+    def test_cancelled_scripts_are_closed_and_do_not_resume(self):
+        # Arrange
+        progress = []
+
+        def script():
+            try:
+                yield wait(0.1)
+                progress.append('resumed')
+            finally:
+                progress.append('closed')
+
+        handle = self.scheduler.start(script())
+
+        # Act
+        handle.cancel()
+        self.advance(1.0)
+
+        # Assert
+        self.assertEqual(['closed'], progress)
+        self.assertEqual(0, self.scheduler.running_scripts)
+        self.assertEqual(0, self.timers.pending_timers)
+
+    def test_scripts_can_cancel_themselves(self):
+        # Arrange
+        progress = []
+        handles = []
+
+        def script():
+            yield
+            handles[0].cancel()
+            progress.append('cancelled')
+            yield
+            progress.append('resumed')
+
+        handles.append(self.scheduler.start(script()))
+
+        # Act
+        self.advance(0.1)
+        self.advance(0.1)
+
+        # Assert
+        self.assertEqual(['cancelled'], progress)
+        self.assertTrue(handles[0].is_done)
+        self.assertEqual(0, self.scheduler.running_scripts)
+
+    def test_invalid_instructions_raise(self):
+        # Arrange
+        def script():
+            yield 0.5
+
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            self.scheduler.start(script())
+        self.assertEqual(0, self.scheduler.running_scripts)
@@ -0,0 +1,62 @@
+import unittest
+
+from kizuna.systems.stage2d.spatial import SpatialGrid, bounds_overlap
+
+
+class SpatialGridTests(unittest.TestCase):
+
+    def test_query_returns_items_in_overlapped_cells(self):
+        # Arrange
+        grid = SpatialGrid(100.0)
+        grid.insert('near', (10, 10, 20, 20))
+        grid.insert('far', (1000, 1000, 1010, 1010))
+
+        # Act
+        result = grid.query((0, 0, 50, 50))
+
+        # Assert
+        self.assertEqual({'near'}, result)
+
+    def test_query_finds_items_spanning_several_cells(self):
+        # Arrange
+        grid = SpatialGrid(100.0)
+        grid.insert('wide', (-250, 0, 250, 10))
+
+        # Act
+        left = grid.query((-240, 0, -230, 10))
+        right = grid.query((230, 0, 240, 10))
+
+        # Assert
+        self.assertEqual({'wide'}, left)
+        self.assertEqual({'wide'}, right)
+
+    def test_update_moves_item_between_cells(self):
+        # Arrange
+        grid = SpatialGrid(100.0)
+        grid.insert('item', (10, 10, 20, 20))
+
+        # Act
+        grid.update('item', (510, 510, 520, 520))
+
+        # Assert
+        self.assertEqual(set(), grid.query((0, 0, 50, 50)))
+        self.assertEqual({'item'}, grid.query((500, 500, 550, 550)))
+
+    def test_remove_deletes_item_and_empty_cells(self):
+        # Arrange
+        grid = SpatialGrid(100.0)
+        grid.insert('item', (10, 10, 20, 20))
+
+        # Act
+        grid.remove('item')
+
+        # Assert
+        self.assertEqual(0, len(grid))
+        self.assertEqual({}, grid._cells)
+
+    def test_bounds_overlap(self):
+        # Act / Assert
+        self.assertTrue(bounds_overlap((0, 0, 10, 10), (5, 5, 15, 15)))
+        self.assertTrue(bounds_overlap((0, 0, 10, 10), (10, 10, 15, 15)))
+        self.assertFalse(bounds_overlap((0, 0, 10, 10), (11, 0, 15, 10)))
+        self.assertFalse(bounds_overlap((0, 0, 10, 10), (0, -10, 10, -1)))
@@ -0,0 +1,128 @@
+from kizuna.core.assets import ImageAsset
+from kizuna.core.datatypes import IVector2, Vector2
+from kizuna.systems.stage2d import Stage2DController
+from kizuna.systems.tilemap import EMPTY_TILE, TileMap, Tileset
+
+from test.kizuna.helpers import BackendTestCase
+
+
+TILESET = Tileset(ImageAsset('/tiles.png'), (16, 16))
+
+
+class TileMapTests(BackendTestCase):
+    image_size = IVector2(64, 64)
+
+    def setUp(self):
+        super().setUp()
+        self.controller = Stage2DController()
+
+    def test_tiles_are_empty_by_default(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (100, 100))
+
+        # Act / Assert
+        self.assertEqual(EMPTY_TILE, tile_map[0, 0])
+        self.assertEqual(EMPTY_TILE, tile_map[IVector2(99, 99)])
+
+    def test_set_and_get_tile(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (100, 100))
+
+        # Act
+        tile_map[40, 70] = 3
+
+        # Assert
+        self.assertEqual(3, tile_map[40, 70])
+        self.assertEqual(EMPTY_TILE, tile_map[70, 40])
+
+    def test_get_tile_out_of_bounds_raises_index_error(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (100, 100))
+
+        # Act / Assert
+        with self.assertRaises(IndexError):
+            _ = tile_map[100, 0]
+        with self.assertRaises(IndexError):
+            tile_map[0, -1] = 1
+
+    def test_set_tile_outside_the_tileset_raises_value_error(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (100, 100))
+
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            tile_map[0, 0] = 16
+        with self.assertRaises(ValueError):
+            tile_map.fill(-2)
+
+    def test_fill_sets_region(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (100, 100))
+
+        # Act
+        tile_map.fill(5, (30, 30), (4, 2))
+
+        # Assert
+        self.assertEqual(5, tile_map[30, 30])
+        self.assertEqual(5, tile_map[33, 31])
+        self.assertEqual(EMPTY_TILE, tile_map[34, 31])
+        self.assertEqual(EMPTY_TILE, tile_map[30, 32])
+
+    def test_only_chunks_in_view_are_drawn(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (1000, 1000), chunk_size=32)
+
+        # Act
+        self.controller.on_draw()
+
+        # Assert: 640x480 pixels are 40x30 tiles, which span 2x1 chunks of 32x32 tiles.
+        self.assertEqual(2, len(self.backend.built_chunks))
+        self.assertTrue(tile_map.is_alive)
+
+    def test_only_changed_chunks_are_rebuilt(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (1000, 1000), chunk_size=32)
+        self.controller.on_draw()
+        self.backend.built_chunks.clear()
+
+        # Act
+        tile_map[35, 10] = 1
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([tile_map._chunks[1]], self.backend.built_chunks)
+
+    def test_chunks_leaving_the_view_are_hidden(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (1000, 1000), chunk_size=32)
+        self.controller.on_draw()
+
+        # Act
+        self.controller.camera.position = (5000, 5000)
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual({tile_map._chunks[0], tile_map._chunks[1]}, set(self.backend.hidden_chunks))
+
+    def test_get_cell_at(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (10, 10), position=(100, 100))
+
+        # Act / Assert
+        self.assertEqual(IVector2(0, 0), tile_map.get_cell_at((100, 100)))
+        self.assertEqual(IVector2(2, 1), tile_map.get_cell_at((140, 120)))
+        self.assertIsNone(tile_map.get_cell_at((99, 100)))
+        self.assertIsNone(tile_map.get_cell_at((260, 100)))
+
+    def test_moving_the_tile_map_moves_its_chunks(self):
+        # Arrange
+        tile_map = TileMap(self.controller, TILESET, (64, 64), chunk_size=32)
+
+        # Act
+        tile_map.position = (100, 50)
+
+        # Assert
+        self.assertEqual(Vector2(100, 50), tile_map._chunks[0].position)
+        self.assertEqual(Vector2(612, 50), tile_map._chunks[1].position)
+        self.assertEqual(Vector2(100, 562), tile_map._chunks[2].position)
+        self.assertEqual(IVector2(0, 0), tile_map.get_cell_at((100, 50)))
@@ -0,0 +1,92 @@
+from kizuna.core.datatypes import Vector2
+from kizuna.systems.ui import Button, Label, ListView, Panel, UIController
+
+from test.kizuna.helpers import BackendTestCase
+
+
+class UIControllerTests(BackendTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.controller = UIController()
+
+    def test_unchanged_widgets_are_not_prepared_again(self):
+        # Arrange
+        panel = self.controller.root.add_child(Panel((10, 10), direction=Panel.VERTICAL))
+        for i in range(500):
+            panel.add_child(Label(f'Item {i}'))
+        self.controller.on_draw()
+
+        # Act
+        self.backend.prepared_texts.clear()
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual([], self.backend.prepared_texts)
+        self.assertEqual(0, self.controller.prepared_widget_count)
+
+    def test_changes_only_prepare_the_affected_widgets(self):
+        # Arrange
+        panel = self.controller.root.add_child(Panel(direction=Panel.HORIZONTAL))
+        first, second, third = (panel.add_child(Label(text)) for text in ('a', 'b', 'c'))
+        self.controller.on_draw()
+        self.backend.prepared_texts.clear()
+
+        # Act
+        second.text = 'bbb'
+        self.controller.on_draw()
+
+        # Assert
+        self.assertEqual(['bbb', 'c'], self.backend.prepared_texts)
+        self.assertEqual(Vector2(10, 0), second.absolute_position)
+        self.assertEqual(Vector2(40, 0), third.absolute_position)
+        self.assertEqual(Vector2(50, 20), panel.size)
+
+    def test_vertical_panels_stack_children_from_the_top(self):
+        # Arrange
+        panel = self.controller.root.add_child(Panel((100, 100), direction=Panel.VERTICAL, spacing=5, padding=2))
+        top = panel.add_child(Label('top'))
+        bottom = panel.add_child(Label('bottom'))
+
+        # Act
+        self.controller.update()
+
+        # Assert
+        self.assertEqual(Vector2(64, 49), panel.size)
+        self.assertEqual(Vector2(102, 127), top.absolute_position)
+        self.assertEqual(Vector2(102, 102), bottom.absolute_position)
+
+    def test_clicks_are_dispatched_to_the_topmost_widget_that_handles_them(self):
+        # Arrange
+        presses = []
+        selections = []
+        self.controller.root.add_child(Button('OK', lambda: presses.append(1), position=(0, 0)))
+        self.controller.root.add_child(ListView(['a', 'b'], selections.append, position=(200, 200), spacing=0))
+        self.controller.update()
+
+        # Act
+        button = self.controller.dispatch_click((5, 5))
+        self.controller.dispatch_click((205, 205))
+        missed = self.controller.dispatch_click((400, 400))
+
+        # Assert
+        self.assertIsInstance(button, Button)
+        self.assertEqual([1], presses)
+        self.assertEqual([1], selections)
+        self.assertIsNone(missed)
+
+    def test_list_views_reuse_their_labels(self):
+        # Arrange
+        list_view = self.controller.root.add_child(ListView(['a', 'b', 'c']))
+        labels = list(list_view.children)
+        self.controller.update()
+        self.backend.prepared_texts.clear()
+
+        # Act
+        list_view.items = ['a', 'x']
+        self.controller.update()
+
+        # Assert
+        self.assertEqual(labels[:2], list_view.children)
+        self.assertEqual(['a', 'x'], list_view.items)
+        self.assertEqual(['a', 'x'], sorted(self.backend.prepared_texts))